@@ -16,7 +16,17 @@ app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 
 from routes.routes import register_routes
+from routes.health import register_health_routes
+from routes.usage import register_usage_routes
+from routes.assets import register_asset_routes
+from routes.realtime import register_realtime_routes
+from routes.admin import register_admin_routes
 register_routes(app)
+register_health_routes(app)
+register_usage_routes(app)
+register_asset_routes(app)
+register_realtime_routes(app)
+register_admin_routes(app)
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5001, debug=True)
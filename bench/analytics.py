@@ -0,0 +1,177 @@
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+ADMIN_TOKEN = 'bench-admin'
+ONBOARDING_POINTS = 6
+DAY = 86400
+
+
+def synthesize(np, catalog, count, seed):
+    """count finished sessions with a plausible funnel: some stop in onboarding, the rest drop off along the way."""
+    from constants import TIERS
+
+    rng = np.random.default_rng(seed)
+    questions = len(catalog.questions)
+    hazard = np.full(questions, 0.03)
+    hazard[[q.index for q in catalog.questions if 'financ' in q.id or 'profit' in q.id]] = 0.09
+    leaves = rng.random((count, questions)) < hazard
+    stopped_at = np.where(leaves.any(axis=1), leaves.argmax(axis=1), -1).astype(np.int16)
+    stopped_at[rng.random(count) < 0.12] = -2
+    position = np.arange(questions)
+    passed = (stopped_at[:, None] == -1) | (position[None, :] < stopped_at[:, None])
+    passed[stopped_at == -2] = False
+    skipped = passed & (rng.random((count, questions)) < 0.05)
+    completed = passed & ~skipped
+    retried = passed & (rng.random((count, questions)) < 0.1)
+    optional = np.array([q.optional for q in catalog.questions])
+    points = ((stopped_at != -2) * ONBOARDING_POINTS + 3 * (completed & ~optional).sum(axis=1)
+              + 5 * (completed & optional).sum(axis=1)).astype(np.int32)
+    thresholds = np.array([tier['points_required'] for tier in TIERS])
+    tier = (np.searchsorted(thresholds, points, side='right') - 1).astype(np.int8)
+    outcome = np.where(stopped_at == -1, 0, np.where(rng.random(count) < 0.15, 2, 1)).astype(np.int8)
+    finished_at = (time.time() - rng.random(count) * 90 * DAY).astype(np.int64)
+
+    def pack(bits):
+        return np.packbits(bits, axis=1, bitorder='little')
+
+    return {'stopped_at': stopped_at, 'outcome': outcome, 'points': points, 'tier': tier,
+            'finished_at': finished_at, 'completed': pack(completed), 'skipped': pack(skipped),
+            'retried': pack(retried)}
+
+
+def records(sessions, start, stop, key, question_ids):
+    for row in range(start, stop):
+        yield {
+            'session': f'bench-{row}', 'tenant': 'default', 'catalog': key, 'question_ids': question_ids,
+            'finished_at': int(sessions['finished_at'][row]), 'outcome': int(sessions['outcome'][row]),
+            'stopped_at': int(sessions['stopped_at'][row]), 'points': int(sessions['points'][row]),
+            'tier': int(sessions['tier'][row]), 'language': 'en',
+            'completed': sessions['completed'][row].tobytes(), 'skipped': sessions['skipped'][row].tobytes(),
+            'retried': sessions['retried'][row].tobytes(),
+        }
+
+
+def python_summary(connection, key, questions):
+    """The same per-question counts with a plain loop over every row, to check the NumPy path and time it."""
+    reached = [0] * questions
+    answered = [0] * questions
+    dropped = [0] * questions
+    for outcome, stopped_at, completed in connection.execute(
+            'SELECT outcome, stopped_at, completed FROM sessions WHERE catalog = ?', (key,)):
+        bits = int.from_bytes(completed, 'little')
+        for index in range(questions):
+            if stopped_at == -1 or stopped_at >= index:
+                reached[index] += 1
+            answered[index] += bits >> index & 1
+        if outcome == 1 and stopped_at >= 0:
+            dropped[stopped_at] += 1
+    return reached, answered, dropped
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fill the session analytics store with synthetic finished sessions, then time the funnel "
+                    "query cold, warm, after new sessions arrive and through /api/admin/stats, and check it "
+                    "against a plain Python pass.",
+    )
+    parser.add_argument('--sessions', type=int, default=1000000, help="Synthetic sessions to store.")
+    parser.add_argument('--arrivals', type=int, default=1000, help="Sessions recorded between queries.")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--skip-check', action='store_true', help="Skip the plain Python comparison.")
+    args = parser.parse_args()
+
+    from bench.startup import bench_environment
+
+    workdir = tempfile.mkdtemp(prefix='aino-analytics-')
+    os.environ.update(bench_environment())
+    os.environ.update({'ANALYTICS_DB_PATH': os.path.join(workdir, 'sessions.sqlite3'), 'ADMIN_TOKEN': ADMIN_TOKEN})
+    try:
+        import numpy as np
+        from app import app
+        from models.state import get_catalog
+        from services import analytics_query
+        from services.analytics_service import catalog_key, connect, write_records
+
+        catalog = get_catalog()
+        key, question_ids = catalog_key(catalog)
+        total = args.sessions + args.arrivals
+        sessions = synthesize(np, catalog, total, args.seed)
+        connection = connect()
+        started = time.perf_counter()
+        seq = 0
+        for start in range(0, args.sessions, 10000):
+            seq = write_records(connection, records(sessions, start, min(start + 10000, args.sessions), key,
+                                                    question_ids), seq)
+        ingest_s = time.perf_counter() - started
+        size_mb = os.path.getsize(os.path.join(workdir, 'sessions.sqlite3')) / 1e6
+
+        cold, cold_ms = timed(analytics_query.catalog_stats, key)
+        _, warm_ms = timed(analytics_query.catalog_stats, key)
+        since = analytics_query.window_start(30)
+        _, window_ms = timed(analytics_query.catalog_stats, key, since)
+        _, totals_ms = timed(analytics_query.tenant_totals, 'default')
+
+        started = time.perf_counter()
+        seq = write_records(connection, records(sessions, args.sessions, total, key, question_ids), seq)
+        # Half of the arrivals are sessions coming back and replacing their earlier record.
+        replaced = [dict(record, session=f'bench-{index}') for index, record in
+                    enumerate(records(sessions, args.sessions, args.sessions + args.arrivals // 2, key,
+                                      question_ids))]
+        seq = write_records(connection, replaced, seq)
+        arrival_ms = (time.perf_counter() - started) * 1000
+        updated, updated_ms = timed(analytics_query.catalog_stats, key)
+
+        client = app.test_client()
+        headers = {'Authorization': f'Bearer {ADMIN_TOKEN}'}
+        client.get('/api/admin/stats', headers=headers)
+        endpoint = []
+        for _ in range(20):
+            started = time.perf_counter()
+            response = client.get('/api/admin/stats', headers=headers)
+            endpoint.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, response.get_data(as_text=True)
+        forbidden = client.get('/api/admin/stats').status_code
+
+        checked = None
+        if not args.skip_check:
+            (reached, answered, dropped), python_ms = timed(python_summary, connection, key, len(question_ids))
+            questions = updated['questions']
+            checked = (reached == [q['reached'] for q in questions]
+                       and answered == [q['answered'] for q in questions]
+                       and dropped == [q['dropped'] for q in questions])
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{args.sessions} sessions, {len(question_ids)} questions: ingest {args.sessions / ingest_s:,.0f} rows/s, "
+          f"store {size_mb:.0f} MB")
+    print(f"{'query':<42}{'ms':>10}")
+    for label, ms in (('first query (load columns + aggregate)', cold_ms), ('repeat query (cached)', warm_ms),
+                      ('last 30 days', window_ms), ('tenant totals', totals_ms),
+                      (f'after {args.arrivals} arrivals ({args.arrivals // 2} replace a record)', updated_ms)):
+        print(f"{label:<42}{ms:>10.1f}")
+    endpoint.sort()
+    print(f"{'/api/admin/stats p50 / max':<42}{endpoint[len(endpoint) // 2]:>10.1f}{endpoint[-1]:>8.1f}")
+    print(f"writing {args.arrivals + args.arrivals // 2} records took {arrival_ms:.0f} ms; "
+          f"sessions after arrivals: {updated['sessions']} (was {cold['sessions']}); without token: {forbidden}")
+    if checked is not None:
+        print(f"plain Python pass: {python_ms:.0f} ms, matches NumPy: {checked}")
+        if not checked:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
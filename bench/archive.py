@@ -0,0 +1,175 @@
+import argparse
+import itertools
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+ADMIN_TOKEN = 'bench-admin'
+TURNS_PER_CONVERSATION = 30
+BATCH = 512
+
+INDUSTRIES = ['café and bakery', 'software consulting', 'cleaning services', 'hair salon', 'food truck',
+              'web shop for clothing', 'bicycle repair', 'daycare', 'accounting', 'photography', 'construction',
+              'yoga studio', 'translation services', 'gardening', 'restaurant']
+LOCATIONS = ['Espoo Tapiola', 'Espoo Leppävaara', 'Espoo Matinkylä', 'Helsinki Kallio', 'Vantaa Tikkurila',
+             'Kauniainen', 'Kirkkonummi']
+WORDS = ('customers price marketing website instagram loan funding budget competitors rent premises employees '
+         'license insurance accountant invoice margin subsidy startup grant coffee pastries delivery subscription '
+         'students families tourists yritys asiakkaat kahvila leipomo päiväkoti ravintola hinta markkinointi '
+         'rahoitus vuokra työntekijät kilpailijat verkkosivut laskutus').split()
+# Probe words: one in roughly every N messages, so the queries cover rare, medium and common terms.
+PROBES = {'sourdough': 20000, 'espresso': 2000, 'vegan': 200}
+REPLY = "Thanks! Next, tell me about your {topic}: who is it for, and what makes it different?"
+
+
+def message_words(rng, vocabulary, weights):
+    return rng.choices(vocabulary, cum_weights=weights, k=rng.randint(6, 40))
+
+
+def synthesize(rng, turns):
+    """Conversations of synthetic turns; returns the records and, for each probe word, the conversations using it."""
+    vocabulary = WORDS + [f'w{index}' for index in range(6000)]
+    weights = list(itertools.accumulate(1.0 / (rank + 1) ** 1.07 for rank in range(len(vocabulary))))
+    records = []
+    with_probe = {probe: set() for probe in PROBES}
+    conversations = (turns + TURNS_PER_CONVERSATION - 1) // TURNS_PER_CONVERSATION
+    started_at = int(time.time()) - 90 * 86400
+    for number in range(conversations):
+        session = f'bench-{number}'
+        form_data = {'company_name': f'Company {number}', 'sphere': rng.choice(INDUSTRIES),
+                     'location': rng.choice(LOCATIONS), 'language': rng.choice(['English', 'Finnish', 'Swedish'])}
+        for turn in range(min(TURNS_PER_CONVERSATION, turns - number * TURNS_PER_CONVERSATION)):
+            words = message_words(rng, vocabulary, weights)
+            for probe, every in PROBES.items():
+                if rng.randrange(every) == 0:
+                    words.insert(rng.randrange(len(words) + 1), probe)
+                    with_probe[probe].add(session)
+            records.append({
+                'session': session, 'tenant': 'default', 'fresh': turn == 0,
+                'at': started_at + number * 60 + turn, 'step': f'bp_q{turn}', 'answered': [f'q{turn}'],
+                'user': ' '.join(words), 'reply': REPLY.format(topic=rng.choice(WORDS)), 'form_data': form_data,
+            })
+    return records, with_probe
+
+
+def timed(function, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return result, samples[len(samples) // 2], samples[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fill the conversation archive with synthetic turns, then report the ingest rate, the cost "
+                    "of archiving on the request thread and search latency for rare to common terms.",
+    )
+    parser.add_argument('--turns', type=int, default=1000000, help="Chat turns to store (two messages each).")
+    parser.add_argument('--repeat', type=int, default=20, help="Runs of each query.")
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    from bench.startup import bench_environment
+
+    workdir = tempfile.mkdtemp(prefix='aino-archive-')
+    path = os.path.join(workdir, 'conversations.sqlite3')
+    os.environ.update(bench_environment())
+    os.environ.update({'ARCHIVE_DB_PATH': path, 'ADMIN_TOKEN': ADMIN_TOKEN})
+    try:
+        from app import app
+        from services import archive_service
+        from services.archive_search import search
+
+        rng = random.Random(args.seed)
+        started = time.perf_counter()
+        records, with_probe = synthesize(rng, args.turns)
+        synth_s = time.perf_counter() - started
+
+        writer = archive_service.ArchiveWriter(archive_service.connect())
+        started = time.perf_counter()
+        for start in range(0, len(records), BATCH):
+            writer.write(records[start:start + BATCH])
+        ingest_s = time.perf_counter() - started
+        size_mb = sum(os.path.getsize(os.path.join(workdir, name)) for name in os.listdir(workdir)) / 1e6
+
+        checked = {}
+        for probe, sessions in with_probe.items():
+            checked[probe] = (search(probe, per_page=1)['total'], len(sessions))
+
+        queries = [
+            ('rare word', {'query': 'sourdough'}),
+            ('medium word', {'query': 'espresso'}),
+            ('common word', {'query': 'vegan'}),
+            ('very common word', {'query': 'customers'}),
+            ('two words', {'query': 'vegan customers'}),
+            ('prefix', {'query': 'sourd*'}),
+            ('diacritics folded', {'query': 'paivakoti'}),
+            ('industry only', {'industry': 'bakery'}),
+            ('industry + location', {'industry': 'bakery', 'location': 'tapiola'}),
+            ('word + industry + location', {'query': 'espresso', 'industry': 'bakery', 'location': 'espoo'}),
+            ('very common word + industry + location', {'query': 'customers', 'industry': 'bakery',
+                                                         'location': 'tapiola'}),
+            ('common word, page 10', {'query': 'vegan', 'page': 10}),
+            ('very common word, page 10', {'query': 'customers', 'page': 10}),
+            ('common word, newest first', {'query': 'vegan', 'sort': 'recent'}),
+            ('latest, no criteria', {}),
+        ]
+        rows = []
+        for label, kwargs in queries:
+            found, p50, worst = timed(lambda: search(**kwargs), args.repeat)
+            rows.append((label, found['matched_messages'], found['total'], found['order'], len(found['results']),
+                         p50, worst))
+
+        client = app.test_client()
+        headers = {'Authorization': f'Bearer {ADMIN_TOKEN}'}
+        response, endpoint_p50, endpoint_max = timed(
+            lambda: client.get('/api/admin/archive/search?q=espresso&per_page=20', headers=headers), args.repeat)
+        assert response.status_code == 200, response.get_data(as_text=True)
+        first = response.get_json()['results'][0]['conversation']
+        conversation, view_p50, _ = timed(
+            lambda: client.get(f'/api/admin/archive/conversations/{first}?per_page=50', headers=headers),
+            args.repeat)
+        assert conversation.status_code == 200
+        forbidden = client.get('/api/admin/archive/search?q=espresso').status_code
+
+        # What a chat turn pays: building the record and queueing it for the writer thread.
+        sample = records[:2000]
+        started = time.perf_counter()
+        for record in sample:
+            archive_service.archive_turn(f"live-{record['session']}", 'default', record['form_data'],
+                                         record['user'], record['reply'], record['step'], record['answered'])
+        enqueue_us = (time.perf_counter() - started) / len(sample) * 1e6
+        flushed = archive_service.flush(timeout=60)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    conversations = (args.turns + TURNS_PER_CONVERSATION - 1) // TURNS_PER_CONVERSATION
+    print(f"{args.turns} turns ({2 * args.turns} messages) in {conversations} conversations, "
+          f"synthesized in {synth_s:.1f} s")
+    print(f"ingest: {args.turns / ingest_s:,.0f} turns/s in batches of {BATCH}, store {size_mb:.0f} MB; "
+          f"archive_turn on the request thread: {enqueue_us:.1f} us (writer caught up: {flushed})")
+    print(f"{'query':<40}{'messages':>9}{'convs':>7}{'order':>11}{'page':>6}{'p50 ms':>9}{'max ms':>9}")
+    for label, matched, total, order, count, p50, worst in rows:
+        print(f"{label:<40}{'-' if matched is None else matched:>9}{'-' if total is None else total:>7}{order:>11}"
+              f"{count:>6}{p50:>9.1f}{worst:>9.1f}")
+    print(f"/api/admin/archive/search p50 {endpoint_p50:.1f} ms, max {endpoint_max:.1f} ms; "
+          f"conversation page p50 {view_p50:.1f} ms; without token: {forbidden}")
+    mismatched = {probe: counts for probe, counts in checked.items() if counts[0] != counts[1]}
+    print("conversations per probe word (search / generated): "
+          + ', '.join(f"{probe} {found}/{expected}" for probe, (found, expected) in checked.items()))
+    if mismatched:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
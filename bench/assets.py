@@ -0,0 +1,184 @@
+import argparse
+import gzip
+import http.client
+import os
+import re
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench.startup import BASE_DIR, bench_environment, export_revision
+
+SERVER = """
+import sys
+from werkzeug.serving import make_server
+import app
+server = make_server('127.0.0.1', int(sys.argv[1]), app.app, threaded=True)
+print('ready', flush=True)
+server.serve_forever()
+"""
+
+ACCEPT_ENCODING = 'br, gzip'
+STRUCTURE_URL = '/api/business-plan-structure'
+ASSET_PATTERN = re.compile(r'(?:href|src)="(/static/[^"]+)"')
+MAX_AGE_PATTERN = re.compile(r'max-age=(\d+)')
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(tree):
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-c', SERVER, str(port)],
+        cwd=tree, env=bench_environment(), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    if process.stdout.readline().strip() != 'ready':
+        process.kill()
+        raise RuntimeError(f"App server failed to start in {tree}")
+    return process, port
+
+
+def decode(body, encoding):
+    if encoding == 'gzip':
+        return gzip.decompress(body)
+    if encoding == 'br':
+        import brotli
+        return brotli.decompress(body)
+    return body
+
+
+def fetch(port, url, cache):
+    """Fetch like a browser with an HTTP cache: skip fresh entries, revalidate stale ones."""
+    entry = cache.get(url)
+    if entry and entry['fresh_until'] > time.time():
+        return {'url': url, 'status': 'cache', 'bytes': 0, 'ms': 0.0}
+    headers = {'Accept-Encoding': ACCEPT_ENCODING}
+    if entry and entry['etag']:
+        headers['If-None-Match'] = entry['etag']
+    if entry and entry['last_modified']:
+        headers['If-Modified-Since'] = entry['last_modified']
+
+    started = time.perf_counter()
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    connection.request('GET', url, headers=headers)
+    response = connection.getresponse()
+    body = response.read()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    connection.close()
+
+    header_bytes = len(f"HTTP/1.1 {response.status} {response.reason}\r\n") + sum(
+        len(f"{name}: {value}\r\n") for name, value in response.getheaders()) + 2
+    cache_control = response.getheader('Cache-Control', '')
+    max_age = MAX_AGE_PATTERN.search(cache_control)
+    if response.status == 200:
+        fresh = int(max_age.group(1)) if max_age and 'no-cache' not in cache_control else 0
+        cache[url] = {
+            'etag': response.getheader('ETag'),
+            'last_modified': response.getheader('Last-Modified'),
+            'fresh_until': time.time() + fresh,
+            'body': decode(body, response.getheader('Content-Encoding')),
+        }
+    elif response.status != 304:
+        raise RuntimeError(f"GET {url} returned {response.status}")
+    return {'url': url, 'status': response.status, 'bytes': header_bytes + len(body), 'ms': elapsed_ms}
+
+
+def visit(port, cache):
+    html = fetch(port, '/', cache)
+    assets = [fetch(port, url, cache) for url in ASSET_PATTERN.findall(cache['/']['body'].decode('utf-8'))]
+    structure = fetch(port, STRUCTURE_URL, cache)
+    return [html], assets, [structure]
+
+
+def modeled_ms(phases, rtt_ms, kbps):
+    """Page load on a slow link: HTML, then CSS/JS in parallel, then the structure call made by chat.js."""
+    total = 0.0
+    for phase in phases:
+        requests = [r for r in phase if r['status'] != 'cache']
+        if requests:
+            total += rtt_ms + sum(r['bytes'] for r in requests) * 8 / kbps
+    return total
+
+
+def summarize(phases, rtt_ms, kbps):
+    flat = [r for phase in phases for r in phase]
+    return {
+        'requests': sum(1 for r in flat if r['status'] != 'cache'),
+        'not_modified': sum(1 for r in flat if r['status'] == 304),
+        'bytes': sum(r['bytes'] for r in flat),
+        'local_ms': sum(r['ms'] for r in flat),
+        'modeled_ms': modeled_ms(phases, rtt_ms, kbps),
+    }
+
+
+def measure(tree, runs, rtt_ms, kbps):
+    process, port = start_server(tree)
+    try:
+        cold, warm = [], []
+        for _ in range(runs):
+            cache = {}
+            cold.append(summarize(visit(port, cache), rtt_ms, kbps))
+            warm.append(summarize(visit(port, cache), rtt_ms, kbps))
+        script = next(entry['body'] for url, entry in cache.items() if url.endswith('.js'))
+        with open(os.path.join(tree, 'static', 'js', 'chat.js'), 'rb') as f:
+            if script != f.read():
+                raise RuntimeError(f"Decoded chat.js from {tree} does not match the file on disk")
+    finally:
+        process.terminate()
+        process.wait()
+    return {label: {key: statistics.median(row[key] for row in rows) for key in rows[0]}
+            for label, rows in (('cold', cold), ('repeat', warm))}
+
+
+def build_assets(tree):
+    if os.path.exists(os.path.join(tree, 'build_assets.py')):
+        subprocess.run([sys.executable, 'build_assets.py'], cwd=tree, env=bench_environment(),
+                       check=True, capture_output=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load the chat page like a browser (cold cache, then a repeat visit) and report requests, "
+                    "bytes transferred and load time, optionally against another git revision.",
+    )
+    parser.add_argument('--runs', type=int, default=5, help="Page loads per measurement (median).")
+    parser.add_argument('--rtt-ms', type=float, default=150.0, help="Round-trip time of the modeled link.")
+    parser.add_argument('--kbps', type=float, default=1600.0, help="Bandwidth of the modeled link.")
+    parser.add_argument('--no-build', action='store_true', help="Do not run build_assets.py before measuring.")
+    parser.add_argument('--compare', metavar='REF', help="Also measure this git revision, e.g. HEAD~1.")
+    args = parser.parse_args()
+
+    results = {}
+    workdir = None
+    try:
+        if args.compare:
+            workdir = tempfile.mkdtemp(prefix='aino-assets-')
+            export_revision(args.compare, workdir)
+            if not args.no_build:
+                build_assets(workdir)
+            results[args.compare] = measure(workdir, args.runs, args.rtt_ms, args.kbps)
+        if not args.no_build:
+            build_assets(BASE_DIR)
+        results['working tree'] = measure(BASE_DIR, args.runs, args.rtt_ms, args.kbps)
+    finally:
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"modeled link: {args.rtt_ms:.0f} ms RTT, {args.kbps:.0f} kbit/s")
+    print(f"{'':<14}{'visit':<8}{'requests':>9}{'304s':>6}{'KiB':>9}{'local ms':>10}{'modeled ms':>12}")
+    for label, visits in results.items():
+        for name, row in visits.items():
+            print(f"{label:<14}{name:<8}{row['requests']:>9.0f}{row['not_modified']:>6.0f}"
+                  f"{row['bytes'] / 1024:>9.1f}{row['local_ms']:>10.1f}{row['modeled_ms']:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
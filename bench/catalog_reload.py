@@ -0,0 +1,180 @@
+import argparse
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from bench.routing import ANSWERS, ONBOARDING
+
+TENANTS = ['espoo', 'vantaa', 'kauniainen', 'kirkkonummi']
+EDITED = TENANTS[0]
+_FIRST_FILL = re.compile(r'^(  fill: ")([^"]*)(")$', re.MULTILINE)
+
+
+def make_tenants(directory):
+    source = os.path.join(BASE_DIR, 'config', 'improved_business_plan.yaml')
+    for tenant in TENANTS:
+        os.makedirs(os.path.join(directory, tenant))
+        shutil.copyfile(source, os.path.join(directory, tenant, 'business_plan.yaml'))
+
+
+def edit_catalog(path, revision):
+    """Change the guidance text of the first question, as an editor would; returns the new text."""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    marker = f"Keep it simple and clear (revision {revision})."
+    content = _FIRST_FILL.sub(lambda m: m.group(1) + re.sub(r'Keep it simple and clear.*', marker, m.group(2))
+                              + m.group(3), content, count=1)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    return marker
+
+
+def drive(app, tenant, number, stop, rows):
+    """One user of a tenant: answer the checklist in order, reloading the checklist structure every few turns."""
+    client = app.test_client()
+    headers = {'X-Tenant-Id': tenant, 'X-Session-Id': f'reload-{tenant}-{number}'}
+    messages = ONBOARDING + list(ANSWERS.values())
+    turn = 0
+    while not stop.is_set():
+        if turn % len(messages) == 0:
+            client.post('/api/reset', headers=headers)
+        if turn % 4 == 0:
+            started = time.perf_counter()
+            response = client.get('/api/business-plan-structure?lang=fi', headers=headers)
+            rows.append((tenant, 'structure', (time.perf_counter() - started) * 1000, response.status_code == 200))
+        started = time.perf_counter()
+        response = client.post('/api/chat', json={'message': messages[turn % len(messages)]}, headers=headers)
+        rows.append((tenant, 'chat', (time.perf_counter() - started) * 1000, response.status_code == 200))
+        turn += 1
+
+
+def run_phase(app, seconds, users, editor=None):
+    stop = threading.Event()
+    rows = []
+    threads = [threading.Thread(target=drive, args=(app, tenant, number, stop, rows))
+               for tenant in TENANTS for number in range(users)]
+    for thread in threads:
+        thread.start()
+    if editor:
+        editor(stop, seconds)
+    else:
+        time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return rows
+
+
+def percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * q / 100))]
+
+
+def main():
+    from bench.mock_openai import MockOpenAIServer, add_latency_arguments, parse_latencies
+    from bench.run import prepare_environment
+    from bench.smtp_sink import SMTPSink
+
+    parser = argparse.ArgumentParser(
+        description="Serve several tenants' checklists under load while one tenant's catalog file is edited over "
+                    "and over, and report how fast each edit goes live, what the reloads cost the requests in "
+                    "flight, and which caches were rebuilt.",
+    )
+    parser.add_argument('--seconds', type=float, default=8.0, help="Length of each phase.")
+    parser.add_argument('--users', type=int, default=2, help="Concurrent users per tenant.")
+    parser.add_argument('--edit-interval-ms', type=float, default=250.0, help="Pause between catalog edits.")
+    parser.add_argument('--watch-ms', type=float, default=100.0, help="Catalog watcher polling interval.")
+    add_latency_arguments(parser)
+    args = parser.parse_args()
+
+    mock = MockOpenAIServer(latencies=parse_latencies(args.latency or ['chat=fixed:20'])).start()
+    sink = SMTPSink().start()
+    workdir = tempfile.mkdtemp(prefix='aino-catalogs-')
+    tenants_dir = os.path.join(workdir, 'tenants')
+    make_tenants(tenants_dir)
+    answers_yaml_path = os.path.join(workdir, 'improved_business_plan.yaml')
+    shutil.copyfile(os.path.join(BASE_DIR, 'config', 'improved_business_plan.yaml'), answers_yaml_path)
+    prepare_environment(mock, sink, answers_yaml_path)
+    os.environ['TENANTS_DIR'] = tenants_dir
+    os.environ['CATALOG_WATCH_INTERVAL'] = str(args.watch_ms / 1000)
+    try:
+        from app import app
+        from routes import routes
+        from services import catalog_registry, relevance_service
+
+        edited_path = os.path.join(tenants_dir, EDITED, 'business_plan.yaml')
+        # Load every catalog and the OpenAI client up front so the steady phase is not a cold start.
+        for tenant in TENANTS:
+            catalog_registry.get_tenant_catalog(tenant)
+        app.test_client().post('/api/chat', json={'message': ONBOARDING[0]}, headers={'X-Session-Id': 'warm-up'})
+        steady = run_phase(app, args.seconds, args.users)
+
+        others = [tenant for tenant in TENANTS if tenant != EDITED]
+        before = {tenant: (routes._structure_bodies.get((tenant, 'fi')),
+                           relevance_service._indexes.get(id(catalog_registry.get_tenant_catalog(tenant))))
+                  for tenant in others}
+        stats_before = catalog_registry.get_catalog_stats()
+        visible_ms = []
+
+        def editor(stop, seconds):
+            deadline = time.monotonic() + seconds
+            revision = 0
+            while time.monotonic() < deadline:
+                revision += 1
+                marker = edit_catalog(edited_path, revision)
+                written = time.perf_counter()
+                while catalog_registry.get_tenant_catalog(EDITED).questions[0].fill.find(marker) < 0:
+                    if time.perf_counter() - written > 10:
+                        raise RuntimeError(f"Edit {revision} never went live")
+                    time.sleep(0.001)
+                visible_ms.append((time.perf_counter() - written) * 1000)
+                time.sleep(args.edit_interval_ms / 1000)
+
+        reloading = run_phase(app, args.seconds, args.users, editor)
+        stats_after = catalog_registry.get_catalog_stats()
+        kept = sum(1 for tenant in others
+                   if (routes._structure_bodies.get((tenant, 'fi')),
+                       relevance_service._indexes.get(id(catalog_registry.get_tenant_catalog(tenant))))
+                   == before[tenant])
+    finally:
+        mock.stop()
+        sink.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{len(TENANTS)} tenants x {args.users} users, {args.seconds:.0f} s per phase, "
+          f"'{EDITED}' edited every {args.edit_interval_ms:.0f} ms during reloads (ms)")
+    print(f"{'phase':<11}{'tenants':<9}{'route':<11}{'requests':>9}{'errors':>8}{'p50':>8}{'p95':>8}{'p99':>8}"
+          f"{'max':>8}")
+    for phase, rows in (('steady', steady), ('reloading', reloading)):
+        for group, members in (('edited', {EDITED}), ('others', set(TENANTS) - {EDITED})):
+            for route in ('chat', 'structure'):
+                values = [row[2] for row in rows if row[0] in members and row[1] == route]
+                errors = sum(1 for row in rows if row[0] in members and row[1] == route and not row[3])
+                print(f"{phase:<11}{group:<9}{route:<11}{len(values):>9}{errors:>8}{percentile(values, 50):>8.1f}"
+                      f"{percentile(values, 95):>8.1f}{percentile(values, 99):>8.1f}{max(values, default=0):>8.1f}")
+    swaps = stats_after['swaps'] - stats_before['swaps']
+    print(f"edits live: {len(visible_ms)}, edit to live p50 {percentile(visible_ms, 50):.1f} ms, "
+          f"p95 {percentile(visible_ms, 95):.1f} ms, max {max(visible_ms, default=0):.1f} ms "
+          f"(watcher polls every {args.watch_ms:.0f} ms)")
+    print(f"swaps: {swaps}, recompiles with unchanged questions: "
+          f"{stats_after['unchanged'] - stats_before['unchanged']}, failed: "
+          f"{stats_after['failed'] - stats_before['failed']}, slowest recompile {stats_after['max_reload_ms']} ms")
+    print(f"caches of the other tenants kept through the reloads: {kept}/{len(others)}")
+    if kept != len(others) or any(not row[3] for row in steady + reloading):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from bench.mock_openai import MockOpenAIServer, add_latency_arguments, parse_latencies
+
+SAMPLE_ANSWER = (
+    "We will run a small specialty coffee shop near Espoo station for commuters and students, with locally "
+    "baked pastries, a lunch offer and catering for nearby offices. {label} is covered by our plan."
+)
+
+
+def sample_answers(business_plan_sections, answered):
+    answers = {
+        'Company Name': 'Aino Coffee Oy',
+        'Business Sphere / Industry': 'Food and beverage',
+        'Location': 'Espoo',
+    }
+    questions = [q for s in business_plan_sections for q in s['core_questions'] + s['optional_questions']]
+    for question in questions[:answered]:
+        answers[question['label']] = SAMPLE_ANSWER.format(label=question['label'])
+    return answers
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare single-request and section-parallel business plan filling against a mock OpenAI "
+                    "server with simulated generation latency.",
+    )
+    parser.add_argument('--rounds', type=int, default=5, help="Fills per mode.")
+    parser.add_argument('--answered', type=int, default=26, help="How many checklist questions have answers.")
+    add_latency_arguments(parser)
+    args = parser.parse_args()
+
+    latencies = parse_latencies(args.latency or ['chat=lognormal:600:0.3+8/tok'])
+    mock = MockOpenAIServer(latencies=latencies).start()
+    for key, value in (('OPENAI_API_KEY', 'mock-key'), ('ASSISTANT_ID', 'asst_mock'), ('SMTP_SERVER', '127.0.0.1'),
+                       ('SMTP_USERNAME', 'mock'), ('SMTP_PASSWORD', 'mock'), ('FROM_EMAIL', 'bench@ainoespoo.com')):
+        os.environ.setdefault(key, value)
+    os.environ['OPENAI_BASE_URL'] = mock.base_url
+
+    from services.business_plan_service import load_business_plan_sections
+    from services import docx_service
+
+    answers = sample_answers(load_business_plan_sections(), args.answered)
+    template_path = docx_service.get_template_path()
+    modes = {
+        'single': docx_service.fill_business_plan_markdown_from_answers,
+        'sections': docx_service.fill_business_plan_markdown_by_section,
+    }
+
+    print(f"{len(answers)} answers, chat latency {latencies.get('chat')}, concurrency "
+          f"{docx_service.FILL_CONCURRENCY}")
+    print(f"{'mode':<10} {'calls':>6} {'prompt tok':>11} {'output tok':>11} {'p50 ms':>9} {'max ms':>9}")
+    try:
+        for mode, fill in modes.items():
+            before = (mock.counts['chat'], mock.prompt_tokens, mock.completion_tokens)
+            timings = []
+            for _ in range(args.rounds):
+                start = time.perf_counter()
+                fill(template_path, answers)
+                timings.append((time.perf_counter() - start) * 1000)
+            calls = (mock.counts['chat'] - before[0]) / args.rounds
+            prompt_tokens = (mock.prompt_tokens - before[1]) / args.rounds
+            completion_tokens = (mock.completion_tokens - before[2]) / args.rounds
+            print(f"{mode:<10} {calls:>6.0f} {prompt_tokens:>11.0f} {completion_tokens:>11.0f} "
+                  f"{statistics.median(timings):>9.0f} {max(timings):>9.0f}")
+    finally:
+        mock.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+import argparse
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+DEFAULT_LATENCY = 'chat=lognormal:400:0.3+2/tok'
+BATCH_SIZES = (1, 8, 32)
+ONBOARDING_STEPS = ('company_name', 'language', 'sphere', 'education', 'experience', 'location')
+
+# What the owner of Aurora Bakery writes into the template's background section.
+BACKGROUND_FIELDS = {
+    'The name of the business': 'Aurora Bakery',
+    'Industry': 'Food and bakery',
+    'Company type': 'Limited company (osakeyhtiö)',
+    'Postal district': 'Espoo',
+    'Company owners and holdings as percentage': 'Aino Virtanen 100 %',
+}
+
+
+def filled_yaml(catalog, answers_by_id):
+    """The checklist YAML with every answer written in, as the app itself writes it."""
+    from services.yaml_service import update_yaml_with_answers
+
+    workdir = tempfile.mkdtemp(prefix='aino-import-yaml-')
+    path = os.path.join(workdir, 'plan.yaml')
+    try:
+        shutil.copyfile(os.path.join(BASE_DIR, 'config', 'improved_business_plan.yaml'), path)
+        update_yaml_with_answers(path, [(question.label, answers_by_id[question.id])
+                                        for question in catalog.questions])
+        with open(path, 'rb') as f:
+            return f.read()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def filled_docx(catalog, answers_by_id):
+    """The DOCX template with each answer written under the first heading or table cell that asks for it.
+
+    Questions the template has no place for stay unanswered, as they would in a plan written into it by hand.
+    """
+    from docx import Document
+    from services.import_service import DOCX_TEMPLATE_PATH, _HEADING_NUMBER, _catalog_question
+
+    document = Document(DOCX_TEMPLATE_PATH)
+    written = set()
+    for paragraph in list(document.paragraphs):
+        label = paragraph.text.partition(':')[0].strip()
+        if paragraph.style.name == 'Täytettävät tiedot' and label in BACKGROUND_FIELDS:
+            paragraph.add_run(BACKGROUND_FIELDS[label])
+        elif paragraph.style.name.startswith('Heading'):
+            question = _catalog_question(catalog, _HEADING_NUMBER.sub('', paragraph.text.strip()))
+            if question and question.id not in written:
+                written.add(question.id)
+                answer = document.add_paragraph(answers_by_id[question.id])
+                paragraph._p.addnext(answer._p)
+    for table in document.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                question = _catalog_question(catalog, cell.text.split('\n')[0].strip().rstrip(':'))
+                if question and question.id not in written:
+                    written.add(question.id)
+                    cell.add_paragraph(answers_by_id[question.id])
+    for table in document.tables:
+        first = table.cell(0, 0)
+        if first.text.startswith('Product / Service 1') and 'products_and_services' not in written:
+            written.add('products_and_services')
+            first.paragraphs[0].add_run(' ' + answers_by_id['products_and_services'])
+        elif 'strengths' in first.text and 'swot_analysis' not in written:
+            written.add('swot_analysis')
+            first.add_paragraph(answers_by_id['swot_analysis'])
+    data = io.BytesIO()
+    document.save(data)
+    return data.getvalue(), written
+
+
+def llm_calls(mock):
+    return sum(mock.counts[route] for route in ('chat', 'responses'))
+
+
+def validations(mock):
+    return mock.counts['validation'] + mock.counts['validation_batch']
+
+
+def chat(client, message):
+    response = client.post('/api/chat', json={'message': message})
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return response.get_json()['form_data']
+
+
+def run_flow(client, mock, catalog, answers_by_id, upload=None, onboard_first=True):
+    """Time and count the LLM calls from a fresh session to a complete checklist: by chat alone, or by importing
+    upload and chatting whatever it left open."""
+    from bench.routing import ONBOARDING
+
+    client.post('/api/reset')
+    form_data = {}
+    if onboard_first:
+        for message in ONBOARDING:
+            form_data = chat(client, message)
+    started_calls = llm_calls(mock)
+    started_validations = validations(mock)
+    started = time.perf_counter()
+    import_ms = None
+    imported = 0
+    if upload is not None:
+        filename, data = upload
+        response = client.post('/api/import', data={'file': (io.BytesIO(data), filename)},
+                               content_type='multipart/form-data')
+        assert response.status_code == 200, response.get_data(as_text=True)
+        import_ms = (time.perf_counter() - started) * 1000
+        payload = response.get_json()
+        form_data = payload['form_data']
+        imported = len(payload['imported'])
+    turns = 0
+    for step, message in zip(ONBOARDING_STEPS, ONBOARDING):
+        if not form_data.get(step):
+            form_data = chat(client, message)
+            turns += 1
+    question_ids = [question.id for question in catalog.questions]
+    while turns < 3 * len(question_ids):
+        open_ids = [question_id for question_id in question_ids if question_id not in form_data]
+        if not open_ids:
+            break
+        form_data = chat(client, answers_by_id[open_ids[0]])
+        turns += 1
+    return {
+        'seconds': time.perf_counter() - started,
+        'import_ms': import_ms,
+        'imported': imported,
+        'turns': turns,
+        'llm_calls': llm_calls(mock) - started_calls,
+        'validations': validations(mock) - started_validations,
+        'complete': all(answers_by_id[question_id] in (form_data.get(question_id) or '')
+                        for question_id in question_ids),
+    }
+
+
+def main():
+    from bench.mock_openai import MockOpenAIServer, add_latency_arguments, parse_latencies
+
+    parser = argparse.ArgumentParser(
+        description="Bring a session from onboarding to a complete checklist by answering every question in the "
+                    "chat, and by importing the same plan as YAML or as a filled DOCX template, under mock LLM "
+                    "latency; report wall time, chat turns and LLM calls for each.",
+    )
+    parser.add_argument('--batch-sizes', default=','.join(map(str, BATCH_SIZES)),
+                        help="Validation batch sizes to import with.")
+    add_latency_arguments(parser)
+    args = parser.parse_args()
+
+    from bench.run import prepare_environment
+    from bench.smtp_sink import SMTPSink
+
+    mock = MockOpenAIServer(latencies=parse_latencies(args.latency or [DEFAULT_LATENCY])).start()
+    sink = SMTPSink().start()
+    workdir = tempfile.mkdtemp(prefix='aino-import-')
+    answers_yaml_path = os.path.join(workdir, 'improved_business_plan.yaml')
+    shutil.copyfile(os.path.join(BASE_DIR, 'config', 'improved_business_plan.yaml'), answers_yaml_path)
+    prepare_environment(mock, sink, answers_yaml_path)
+    rows = []
+    try:
+        from app import app
+        from bench.routing import ANSWERS, oracle
+        from models.state import get_catalog
+        from services import validation_service
+
+        catalog = get_catalog()
+        mock.validator = oracle({question.label: question.id for question in catalog.questions})
+        client = app.test_client()
+        yaml_data = filled_yaml(catalog, ANSWERS)
+        docx_data, in_docx = filled_docx(catalog, ANSWERS)
+
+        rows.append(('chat only', run_flow(client, mock, catalog, ANSWERS)))
+        for batch_size in [int(size) for size in args.batch_sizes.split(',')]:
+            validation_service.VALIDATION_BATCH_SIZE = batch_size
+            rows.append((f'YAML import, batches of {batch_size}',
+                         run_flow(client, mock, catalog, ANSWERS, ('plan.yaml', yaml_data))))
+        validation_service.VALIDATION_BATCH_SIZE = BATCH_SIZES[1]
+        rows.append((f'DOCX import, batches of {BATCH_SIZES[1]}',
+                     run_flow(client, mock, catalog, ANSWERS, ('plan.docx', docx_data))))
+        rows.append(('DOCX import before onboarding',
+                     run_flow(client, mock, catalog, ANSWERS, ('plan.docx', docx_data), onboard_first=False)))
+    finally:
+        mock.stop()
+        sink.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{len(catalog.questions)} questions; the DOCX template has a place for {len(in_docx)} of them; "
+          f"latency {', '.join(f'{route}={model!r}' for route, model in mock.latencies.items())}")
+    print(f"{'flow':<34}{'seconds':>9}{'import ms':>11}{'imported':>10}{'turns':>7}{'LLM calls':>11}"
+          f"{'validations':>13}{'complete':>10}")
+    for label, row in rows:
+        import_ms = '-' if row['import_ms'] is None else f"{row['import_ms']:.0f}"
+        print(f"{label:<34}{row['seconds']:>9.1f}{import_ms:>11}{row['imported']:>10}{row['turns']:>7}"
+              f"{row['llm_calls']:>11}{row['validations']:>13}{str(row['complete']):>10}")
+    if not all(row['complete'] for _, row in rows):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+SAMPLE_TURN = {
+    'session': '37a8eec1ce19',
+    'step': 'bp_business_idea',
+    'verdict': 'valid',
+    'retry': False,
+    'skipping': False,
+    'message_chars': 142,
+    'report_sent': False,
+    'timings': {'validation_ms': 412.3, 'reply_ms': 655.1, 'total_ms': 1071.9},
+    'llm_calls': 2,
+    'prompt_tokens': 812,
+    'completion_tokens': 41,
+}
+
+
+def measure(log_event, threads, events):
+    per_call = []
+    lock = threading.Lock()
+
+    def worker():
+        samples = []
+        for _ in range(events):
+            start = time.perf_counter()
+            log_event('chat_turn', **SAMPLE_TURN)
+            samples.append(time.perf_counter() - start)
+        with lock:
+            per_call.extend(samples)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    wall = time.perf_counter() - start
+    per_call.sort()
+    return {
+        'p50_us': statistics.median(per_call) * 1e6,
+        'p99_us': per_call[int(len(per_call) * 0.99)] * 1e6,
+        'events_per_s': len(per_call) / wall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the request-thread cost of services.log_service.log_event under concurrent load.",
+    )
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--events', type=int, default=20000, help="Events per thread.")
+    parser.add_argument('--max-bytes', type=int, default=5 * 1024 * 1024, help="Rotation size for the run.")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='aino-log-')
+    os.environ['AINO_LOG_PATH'] = os.path.join(workdir, 'turns.jsonl')
+    os.environ['AINO_LOG_MAX_BYTES'] = str(args.max_bytes)
+    from services import log_service
+
+    results = measure(log_service.log_event, args.threads, args.events)
+    flushed_at = time.perf_counter()
+    log_service.flush(timeout=60)
+    drain = time.perf_counter() - flushed_at
+    stats = log_service.get_log_stats()
+    print(f"{args.threads} threads x {args.events} events, log in {workdir}")
+    print(f"log_event: p50 {results['p50_us']:.1f} us, p99 {results['p99_us']:.1f} us, "
+          f"{results['events_per_s']:,.0f} events/s accepted")
+    print(f"writer: {stats['written']} written, {stats['dropped']} dropped (queue full), "
+          f"{stats['rotations']} rotations, {drain:.2f}s to drain the backlog")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,493 @@
+import argparse
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+DEFAULT_REPLY = "Thanks, that's helpful! Could you tell me a little more about your plans?"
+DEFAULT_TRANSCRIPT = "We are planning to open a small bakery in Espoo."
+TTS_FRAME_BYTES = 4096
+
+
+class LatencyModel:
+    def __init__(self, kind='fixed', params=(0.0,), per_token_ms=0.0):
+        self.kind = kind
+        self.params = tuple(params)
+        self.per_token_ms = per_token_ms
+
+    @classmethod
+    def parse(cls, spec):
+        per_token_ms = 0.0
+        if '+' in spec:
+            spec, per_token = spec.split('+', 1)
+            per_token_ms = float(per_token.replace('/tok', ''))
+        parts = spec.split(':')
+        kind = parts[0]
+        params = [float(p) for p in parts[1:]] or [0.0]
+        if kind not in ('fixed', 'uniform', 'normal', 'lognormal'):
+            raise ValueError(f"Unknown latency distribution: {kind}")
+        return cls(kind, params, per_token_ms)
+
+    def sample_ms(self, completion_tokens=0):
+        if self.kind == 'fixed':
+            base = self.params[0]
+        elif self.kind == 'uniform':
+            base = random.uniform(self.params[0], self.params[1])
+        elif self.kind == 'normal':
+            base = random.gauss(self.params[0], self.params[1])
+        else:
+            base = random.lognormvariate(math.log(max(self.params[0], 1e-3)), self.params[1])
+        return max(base, 0.0) + self.per_token_ms * completion_tokens
+
+    def __repr__(self):
+        params = ':'.join(f"{p:g}" for p in self.params)
+        suffix = f"+{self.per_token_ms:g}/tok" if self.per_token_ms else ''
+        return f"{self.kind}:{params}{suffix}"
+
+
+class FaultModel:
+    KINDS = ('error', 'ratelimit', 'slow', 'hang')
+
+    def __init__(self, faults=()):
+        self.faults = list(faults)
+
+    @classmethod
+    def parse(cls, spec):
+        faults = []
+        for part in spec.split(','):
+            fields = part.strip().split(':')
+            kind = fields[0]
+            if kind not in cls.KINDS:
+                raise ValueError(f"Unknown fault kind: {kind}")
+            probability = float(fields[1]) if len(fields) > 1 else 1.0
+            default_ms = 30000.0 if kind == 'hang' else 2000.0
+            extra_ms = float(fields[2]) if len(fields) > 2 else default_ms
+            faults.append((kind, probability, extra_ms))
+        return cls(faults)
+
+    def sample(self):
+        roll = random.random()
+        for kind, probability, extra_ms in self.faults:
+            if roll < probability:
+                return kind, extra_ms
+            roll -= probability
+        return None, 0.0
+
+    def __repr__(self):
+        return ','.join(f"{kind}:{probability:g}:{extra_ms:g}" for kind, probability, extra_ms in self.faults)
+
+
+def _request_model(body):
+    try:
+        return json.loads(body or b'{}').get('model')
+    except (ValueError, AttributeError):
+        return None
+
+
+def estimate_tokens(text):
+    return max(1, len(text) // 4)
+
+
+def _message_text(messages):
+    parts = []
+    for message in messages:
+        content = message.get('content', '')
+        if isinstance(content, list):
+            content = ' '.join(part.get('text', '') for part in content if isinstance(part, dict))
+        parts.append(content or '')
+    return '\n'.join(parts)
+
+
+def _fill_template(prompt):
+    match = re.search(r"```markdown\n(.*?)\n```", prompt, re.S)
+    if not match:
+        return None
+    return match.group(1).replace('...', 'Filled in from the provided answers.')
+
+
+def _translate(prompt):
+    try:
+        phrases = json.loads(prompt.rsplit('\n\n', 1)[-1])
+    except ValueError:
+        return None
+    return json.dumps({'translations': [f"[mock] {phrase}" for phrase in phrases]}, ensure_ascii=False)
+
+
+def _batch_items(prompt):
+    try:
+        return json.loads(prompt.split('Items:\n', 1)[1].split('\n', 1)[0])
+    except (IndexError, ValueError):
+        return None
+
+
+def compose_reply(prompt, json_mode=False):
+    if json_mode and '"verdicts"' in prompt:
+        items = _batch_items(prompt)
+        if items is not None:
+            return json.dumps({'verdicts': [{'n': item['n'], 'valid': True} for item in items]})
+    if json_mode and '"translations"' in prompt:
+        translated = _translate(prompt)
+        if translated is not None:
+            return translated
+    filled = _fill_template(prompt)
+    if filled is not None:
+        return filled
+    if 'Respond with ONLY "YES"' in prompt:
+        return 'YES'
+    return DEFAULT_REPLY
+
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_bytes(self, body, content_type):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+
+    def do_POST(self):
+        path = self.path.split('?', 1)[0]
+        if path.startswith('/v1'):
+            path = path[3:]
+        body = self._read_body()
+        server = self.server
+        route = {
+            '/chat/completions': 'chat',
+            '/responses': 'responses',
+            '/audio/speech': 'tts',
+            '/audio/transcriptions': 'whisper',
+        }.get(path)
+        if route is None:
+            self._send_json({'error': {'message': f'Unknown route {path}', 'type': 'invalid_request_error'}}, 404)
+            return
+        server.count(route)
+        fault, extra_ms = server.fault_for(route, _request_model(body)).sample()
+        if fault:
+            server.count(f'fault:{fault}')
+        if fault == 'error':
+            self._send_json({'error': {'message': 'Injected upstream failure', 'type': 'server_error'}}, 500)
+            return
+        if fault == 'ratelimit':
+            self._send_json({'error': {'message': 'Injected rate limit', 'type': 'rate_limit_error'}}, 429)
+            return
+        if fault == 'hang':
+            time.sleep(extra_ms / 1000.0)
+            self.close_connection = True
+            return
+        if fault == 'slow':
+            time.sleep(extra_ms / 1000.0)
+        try:
+            getattr(self, f'_handle_{route}')(body)
+        except (ValueError, KeyError) as e:
+            self._send_json({'error': {'message': str(e), 'type': 'invalid_request_error'}}, 400)
+
+    def _usage(self, prompt, reply):
+        prompt_tokens = estimate_tokens(prompt)
+        completion_tokens = estimate_tokens(reply)
+        self.server.add_usage(prompt_tokens, completion_tokens)
+        return prompt_tokens, completion_tokens
+
+    def _handle_chat(self, body):
+        payload = json.loads(body or b'{}')
+        model = payload.get('model', 'gpt-4o-mini')
+        prompt = _message_text(payload.get('messages', []))
+        json_mode = (payload.get('response_format') or {}).get('type') == 'json_object'
+        reply = compose_reply(prompt, json_mode)
+        if reply == 'YES':
+            self.server.count('validation')
+            question = re.search(r'^Question: "(.*)"$', prompt, re.M)
+            answer = re.search(r'^User\'s answer: "(.*?)"\n\nDetermine', prompt, re.M | re.S)
+            if self.server.validator and question and answer:
+                reply = 'YES' if self.server.validator(question.group(1), answer.group(1)) else 'NO'
+        elif json_mode and reply.startswith('{"verdicts"'):
+            self.server.count('validation_batch')
+            if self.server.validator:
+                reply = json.dumps({'verdicts': [
+                    {'n': item['n'], 'valid': bool(self.server.validator(item['question'], item['answer']))}
+                    for item in _batch_items(prompt)
+                ]})
+        prompt_tokens, completion_tokens = self._usage(prompt, reply)
+        usage = {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'total_tokens': prompt_tokens + completion_tokens,
+            'prompt_tokens_details': {'cached_tokens': 0},
+        }
+        completion_id = f"chatcmpl-mock-{self.server.next_id()}"
+        created = int(time.time())
+
+        if payload.get('stream'):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            words = reply.split(' ')
+            delay = self.server.latency_for('chat').sample_ms(completion_tokens) / 1000.0
+            first_token_delay = delay / 2
+            per_word_delay = (delay - first_token_delay) / max(len(words), 1)
+            time.sleep(first_token_delay)
+            for index, word in enumerate(words):
+                chunk = {
+                    'id': completion_id,
+                    'object': 'chat.completion.chunk',
+                    'created': created,
+                    'model': model,
+                    'choices': [{
+                        'index': 0,
+                        'delta': {'content': word if index == 0 else ' ' + word},
+                        'finish_reason': None,
+                    }],
+                }
+                self._write_chunk(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+                time.sleep(per_word_delay)
+            final = {
+                'id': completion_id,
+                'object': 'chat.completion.chunk',
+                'created': created,
+                'model': model,
+                'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}],
+            }
+            if payload.get('stream_options', {}).get('include_usage'):
+                final['usage'] = usage
+            self._write_chunk(f"data: {json.dumps(final)}\n\n".encode('utf-8'))
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._write_chunk(b"")
+            return
+
+        time.sleep(self.server.latency_for('chat').sample_ms(completion_tokens) / 1000.0)
+        self._send_json({
+            'id': completion_id,
+            'object': 'chat.completion',
+            'created': created,
+            'model': model,
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': reply, 'refusal': None},
+                'finish_reason': 'stop',
+                'logprobs': None,
+            }],
+            'usage': usage,
+        })
+
+    def _handle_responses(self, body):
+        payload = json.loads(body or b'{}')
+        prompt = payload.get('input', '')
+        if isinstance(prompt, list):
+            prompt = _message_text(prompt)
+        reply = compose_reply(prompt)
+        prompt_tokens, completion_tokens = self._usage(prompt, reply)
+        time.sleep(self.server.latency_for('responses').sample_ms(completion_tokens) / 1000.0)
+        response_id = self.server.next_id()
+        self._send_json({
+            'id': f"resp-mock-{response_id}",
+            'object': 'response',
+            'created_at': int(time.time()),
+            'model': payload.get('model', 'gpt-4.1'),
+            'status': 'completed',
+            'parallel_tool_calls': True,
+            'tool_choice': 'auto',
+            'tools': [],
+            'output': [{
+                'type': 'message',
+                'id': f"msg-mock-{response_id}",
+                'role': 'assistant',
+                'status': 'completed',
+                'content': [{'type': 'output_text', 'text': reply, 'annotations': []}],
+            }],
+            'usage': {
+                'input_tokens': prompt_tokens,
+                'input_tokens_details': {'cached_tokens': 0},
+                'output_tokens': completion_tokens,
+                'output_tokens_details': {'reasoning_tokens': 0},
+                'total_tokens': prompt_tokens + completion_tokens,
+            },
+        })
+
+    def _handle_tts(self, body):
+        payload = json.loads(body or b'{}')
+        text = payload.get('input', '')
+        delay = self.server.latency_for('tts').sample_ms(estimate_tokens(text)) / 1000.0
+        audio = b'ID3\x03\x00\x00\x00\x00\x00\x00' + b'\x00' * (len(text) * 64)
+        # Like the real endpoint, audio is chunked as it is synthesized: the first frame after half the latency.
+        self.send_response(200)
+        self.send_header('Content-Type', 'audio/mpeg')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        frames = [audio[index:index + TTS_FRAME_BYTES] for index in range(0, len(audio), TTS_FRAME_BYTES)]
+        time.sleep(delay / 2)
+        for frame in frames:
+            self._write_chunk(frame)
+            time.sleep(delay / 2 / len(frames))
+        self._write_chunk(b"")
+
+    def _handle_whisper(self, body):
+        # Decoding cost grows with the speech in the clip: about three tokens per second of 16 kHz 16-bit audio.
+        tokens = round(len(body) / 32000 * 3)
+        time.sleep(self.server.latency_for('whisper').sample_ms(tokens) / 1000.0)
+        if b'verbose_json' in body:
+            self._send_json({'task': 'transcribe', 'language': 'english', 'duration': round(len(body) / 32000, 2),
+                             'text': self.server.transcript, 'segments': []})
+        else:
+            self._send_json({'text': self.server.transcript})
+
+
+class MockOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, host='127.0.0.1', port=0, latencies=None, transcript=DEFAULT_TRANSCRIPT, faults=None,
+                 validator=None):
+        super().__init__((host, port), MockOpenAIHandler)
+        # validator(question_label, answer) decides answer validation; without one every answer is accepted.
+        self.validator = validator
+        self.latencies = latencies or {}
+        self.faults = faults or {}
+        self.transcript = transcript
+        self.counts = defaultdict(int)
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+        self._ids = 0
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def latency_for(self, route):
+        return self.latencies.get(route) or self.latencies.get('default') or LatencyModel()
+
+    def handle_error(self, request, client_address):
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+
+    def fault_for(self, route, model=None):
+        return (self.faults.get(f'{route}@{model}') or self.faults.get(route) or self.faults.get('default')
+                or FaultModel())
+
+    def count(self, route):
+        with self._lock:
+            self.counts[route] += 1
+
+    def add_usage(self, prompt_tokens, completion_tokens):
+        with self._lock:
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+
+    def next_id(self):
+        with self._lock:
+            self._ids += 1
+            return self._ids
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name='mock-openai', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def parse_latencies(specs):
+    latencies = {}
+    for spec in specs or []:
+        route, _, distribution = spec.partition('=')
+        if not distribution:
+            route, distribution = 'default', route
+        latencies[route] = LatencyModel.parse(distribution)
+    return latencies
+
+
+def parse_faults(specs):
+    faults = {}
+    for spec in specs or []:
+        route, _, fault = spec.partition('=')
+        if not fault:
+            route, fault = 'default', route
+        faults[route] = FaultModel.parse(fault)
+    return faults
+
+
+def add_fault_arguments(parser):
+    parser.add_argument(
+        '--fault',
+        action='append',
+        default=[],
+        metavar='[ROUTE[@MODEL]=]FAULTS',
+        help=(
+            "Inject upstream faults, e.g. 'chat=error:0.05,slow:0.1:3000', 'chat@gpt-4o=error' or "
+            "'hang:0.01:30000'. "
+            "Kinds: error (HTTP 500), ratelimit (HTTP 429), slow:P:MS (extra latency), "
+            "hang:P:MS (no response, connection closed after MS)."
+        ),
+    )
+
+
+def add_latency_arguments(parser):
+    parser.add_argument(
+        '--latency',
+        action='append',
+        default=[],
+        metavar='[ROUTE=]DIST',
+        help=(
+            "Mock upstream latency, e.g. 'chat=lognormal:400:0.5+2/tok', 'tts=uniform:150:300' or "
+            "'fixed:50' for every route. Routes: chat, responses, tts, whisper. "
+            "Distributions (ms): fixed:V, uniform:LO:HI, normal:MEAN:SD, lognormal:MEDIAN:SIGMA; "
+            "'+N/tok' adds N ms per completion token (whisper: per third of a second of audio)."
+        ),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local mock of the OpenAI API used by the app.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--transcript', default=DEFAULT_TRANSCRIPT, help="Text returned by the Whisper mock.")
+    add_latency_arguments(parser)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockOpenAIServer(args.host, args.port, parse_latencies(args.latency), args.transcript,
+                              parse_faults(args.fault))
+    print(f"Mock OpenAI API listening on {server.base_url}")
+    print(f"Point the app at it with: OPENAI_BASE_URL={server.base_url} OPENAI_API_KEY=mock")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from constants import FORM_STEPS
+
+FORM_STEP_IDS = [step['id'] for step in FORM_STEPS]
+MAX_TURNS = 20
+
+# Each script opens with one free-form message and then answers whatever onboarding step the bot asks for next.
+SCRIPTS = [
+    {
+        'name': 'one-per-turn',
+        'opening': "It is called Aurora Bakery",
+        'answers': {
+            'language': "I would like to use English",
+            'sphere': "We are in the food and bakery business",
+            'education': "I have a Bachelor of Business Administration",
+            'experience': "I have 5 years of experience in the food business",
+            'location': "We are located in Espoo, Finland",
+        },
+        'expect': {'company_name': 'Aurora Bakery', 'location': 'Espoo'},
+    },
+    {
+        'name': 'comma-list',
+        'opening': "Acme Oy, Espoo, bakery, 5 years experience",
+        'answers': {'language': "English", 'education': "Vocational degree in baking"},
+        'expect': {'company_name': 'Acme Oy', 'location': 'Espoo', 'sphere': 'bakery', 'experience': '5 years'},
+    },
+    {
+        'name': 'everything-at-once',
+        'opening': ("Hi! My company is called Nordic Glow and we're based in Tapiola. Hair salon, I'm a tradenomi "
+                    "from Laurea, 8 years in the industry. Suomeksi kiitos"),
+        'answers': {},
+        'expect': {'company_name': 'Nordic Glow', 'language': 'Finnish', 'sphere': 'hair salon',
+                   'education': 'tradenomi', 'experience': '8 years', 'location': 'Espoo'},
+    },
+    {
+        'name': 'finnish',
+        'opening': "Yritykseni nimi on Leipomo Aino, toimimme Espoossa, kolme vuotta kokemusta",
+        'answers': {'language': "suomeksi", 'sphere': "leipomo ja kahvila", 'education': "tradenomi, Laurea AMK"},
+        'expect': {'company_name': 'Leipomo Aino', 'location': 'Espoo', 'experience': '3 years'},
+    },
+    {
+        'name': 'sentence',
+        'opening': "Hi! We are called Fixit and we do renovation work in Vantaa",
+        'answers': {'language': "English please", 'education': "Vocational qualification in construction",
+                    'experience': "about ten years"},
+        'expect': {'company_name': 'Fixit', 'sphere': 'renovation', 'location': 'Vantaa'},
+    },
+    {
+        'name': 'name-and-language',
+        'opening': "Bright Minds Tutoring Ky. English please.",
+        'answers': {'sphere': "Math tutoring for high school students", 'education': "Master of Science in mathematics",
+                    'experience': "2 years", 'location': "Leppävaara"},
+        'expect': {'company_name': 'Bright Minds Tutoring Ky', 'language': 'English'},
+    },
+    {
+        'name': 'startup-pitch',
+        'opening': ("My company is called Pixel Forge, a game studio in Otaniemi. I have an MSc in computer science "
+                    "and 3 years of experience."),
+        'answers': {'language': "English"},
+        'expect': {'company_name': 'Pixel Forge', 'sphere': 'game studio', 'location': 'Espoo',
+                   'education': 'MSc', 'experience': '3 years'},
+    },
+    {
+        'name': 'unknown-industry',
+        'opening': "Sunny Paws",
+        'answers': {'language': "English", 'sphere': "Pet grooming business in Kerava",
+                    'education': "High school", 'experience': "1 year", 'location': "Kerava"},
+        'expect': {'company_name': 'Sunny Paws', 'sphere': 'Pet grooming'},
+    },
+    {
+        'name': 'swedish-speaker',
+        'opening': "CleanCo Oy, cleaning services in Helsinki, vocational degree, no experience, svenska",
+        'answers': {},
+        'expect': {'company_name': 'CleanCo Oy', 'language': 'Swedish', 'sphere': 'cleaning',
+                   'location': 'Helsinki', 'experience': 'No prior experience', 'education': 'Vocational degree'},
+    },
+    {
+        'name': 'name-first',
+        'opening': "Kahvila Kuu, Tampere",
+        'answers': {'language': "Finnish", 'sphere': "Cafe", 'education': "Lukio", 'experience': "Kaksi vuotta"},
+        'expect': {'company_name': 'Kahvila Kuu', 'location': 'Tampere'},
+    },
+    {
+        'name': 'long-story',
+        'opening': ("It is called Green Roots. We do landscaping and gardening in Sipoo, I studied horticulture at "
+                    "a vocational school, 12 years in the field"),
+        'answers': {'language': "English"},
+        'expect': {'company_name': 'Green Roots', 'location': 'Sipoo', 'experience': '12 years',
+                   'sphere': 'landscaping'},
+    },
+    {
+        'name': 'email-first',
+        'opening': "maria@example.com, Maria's Catering Tmi",
+        'answers': {'language': "English", 'sphere': "Catering for events", 'education': "Chef diploma",
+                    'experience': "6 years", 'location': "Espoo"},
+        'expect': {'company_name': "Maria's Catering Tmi", 'email': 'maria@example.com'},
+    },
+    {
+        'name': 'greeting-first',
+        'opening': "Hello, my name is Pekka",
+        'answers': {'company_name': "Aurora Bakery", 'language': "English", 'sphere': "Bakery",
+                    'education': "I studied at a university in Helsinki", 'experience': "5 years",
+                    'location': "Espoo"},
+        'expect': {'company_name': 'Aurora Bakery', 'location': 'Espoo'},
+    },
+]
+
+
+def run_script(client, mock, script):
+    client.post('/api/reset')
+    chat_calls = mock.counts['chat']
+    response = client.post('/api/chat', json={'message': script['opening']}).get_json()
+    turns = 1
+    while turns < MAX_TURNS:
+        missing = [step for step in FORM_STEP_IDS if step not in response['completed_steps']]
+        if not missing:
+            break
+        answer = script['answers'].get(missing[0], "I would rather not say")
+        response = client.post('/api/chat', json={'message': answer}).get_json()
+        turns += 1
+    form_data = response['form_data']
+    wrong = [slot for slot, expected in script['expect'].items()
+             if expected.lower() not in str(form_data.get(slot, '')).lower()]
+    complete = all(step in response['completed_steps'] for step in FORM_STEP_IDS)
+    return {'name': script['name'], 'turns': turns, 'llm_calls': mock.counts['chat'] - chat_calls,
+            'complete': complete, 'wrong': wrong}
+
+
+def mean(rows, key):
+    return sum(row[key] for row in rows) / len(rows) if rows else 0.0
+
+
+def run_all():
+    from bench.mock_openai import MockOpenAIServer
+    from bench.run import prepare_environment
+    from bench.smtp_sink import SMTPSink
+
+    mock = MockOpenAIServer().start()
+    sink = SMTPSink().start()
+    workdir = tempfile.mkdtemp(prefix='aino-onboarding-')
+    answers_yaml_path = os.path.join(workdir, 'improved_business_plan.yaml')
+    shutil.copyfile(os.path.join(BASE_DIR, 'config', 'improved_business_plan.yaml'), answers_yaml_path)
+    prepare_environment(mock, sink, answers_yaml_path)
+    try:
+        from app import app
+        client = app.test_client()
+        return [run_script(client, mock, script) for script in SCRIPTS]
+    finally:
+        mock.stop()
+        sink.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run_revision(ref):
+    from bench.startup import bench_environment, export_revision
+
+    workdir = tempfile.mkdtemp(prefix='aino-onboarding-ref-')
+    try:
+        export_revision(ref, workdir)
+        shutil.copyfile(os.path.abspath(__file__), os.path.join(workdir, 'bench', 'onboarding.py'))
+        result = subprocess.run([sys.executable, '-m', 'bench.onboarding', '--json'], cwd=workdir,
+                                env=bench_environment(), capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"Onboarding run failed at {ref}:\n{result.stderr}")
+        return json.loads(result.stdout.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run scripted onboarding conversations through /api/chat and count the turns and LLM calls "
+                    "needed to fill every onboarding step, optionally against another git revision.",
+    )
+    parser.add_argument('--compare', metavar='REF', help="Also run the scripts at this git revision, e.g. HEAD~1.")
+    parser.add_argument('--json', action='store_true', help="Print the raw results as JSON.")
+    args = parser.parse_args()
+
+    results = run_all()
+    if args.json:
+        print(json.dumps(results))
+        return
+    baseline = {row['name']: row for row in run_revision(args.compare)} if args.compare else {}
+
+    print(f"{'script':<20}{'turns':>7}{'LLM calls':>11}{'saved turns':>13}{'saved calls':>13}  wrong slots")
+    for row in results:
+        before = baseline.get(row['name'])
+        if not before:
+            saved_turns = saved_calls = '-'
+        elif not before['complete']:
+            saved_turns = saved_calls = f"stuck@{before['turns']}"
+        else:
+            saved_turns, saved_calls = before['turns'] - row['turns'], before['llm_calls'] - row['llm_calls']
+        status = '' if row['complete'] else ' (stuck)'
+        print(f"{row['name'] + status:<20}{row['turns']:>7}{row['llm_calls']:>11}{saved_turns:>13}{saved_calls:>13}  "
+              f"{', '.join(row['wrong']) or '-'}")
+    print(f"per session: {mean(results, 'turns'):.2f} turns, {mean(results, 'llm_calls'):.2f} LLM calls")
+    if baseline:
+        # Scripts the old revision never finishes (answers rejected as gibberish) are left out of the comparison.
+        both = [row for row in results if row['complete'] and baseline[row['name']]['complete']]
+        before = [baseline[row['name']] for row in both]
+        stuck = [name for name, row in baseline.items() if not row['complete']]
+        print(f"{args.compare}: {len(stuck)} of {len(results)} scripts never finish ({', '.join(stuck) or '-'})")
+        print(f"over the {len(both)} scripts both finish: {mean(before, 'turns'):.2f} -> {mean(both, 'turns'):.2f} "
+              f"turns and {mean(before, 'llm_calls'):.2f} -> {mean(both, 'llm_calls'):.2f} LLM calls per session, "
+              f"saved {mean(before, 'turns') - mean(both, 'turns'):.2f} turns and "
+              f"{mean(before, 'llm_calls') - mean(both, 'llm_calls'):.2f} LLM calls per session")
+    if any(row['wrong'] or not row['complete'] for row in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
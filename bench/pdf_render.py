@@ -0,0 +1,91 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+COLD_RENDER = """
+import json, sys, time
+start = time.perf_counter()
+import markdown
+from weasyprint import HTML
+body = markdown.markdown(sys.stdin.read(), extensions=['extra', 'tables'])
+HTML(string=body).write_pdf()
+print(json.dumps({'render_ms': (time.perf_counter() - start) * 1000}))
+"""
+
+
+def sample_markdown():
+    from bench.mock_openai import MockOpenAIServer
+
+    mock = MockOpenAIServer().start()
+    for key, value in (('OPENAI_API_KEY', 'mock-key'), ('ASSISTANT_ID', 'asst_mock'), ('SMTP_SERVER', '127.0.0.1'),
+                       ('SMTP_USERNAME', 'mock'), ('SMTP_PASSWORD', 'mock'), ('FROM_EMAIL', 'bench@ainoespoo.com')):
+        os.environ.setdefault(key, value)
+    os.environ['OPENAI_BASE_URL'] = mock.base_url
+    from models.state import get_catalog
+    from services.docx_service import get_filled_markdown
+
+    catalog = get_catalog()
+    form_data = {}
+    for question in catalog.questions:
+        form_data[question.id] = f"Sample answer for {question.label.lower()}"
+    try:
+        return get_filled_markdown(form_data, catalog)
+    finally:
+        mock.stop()
+
+
+def cold_render(filled_markdown):
+    result = subprocess.run(
+        [sys.executable, '-c', COLD_RENDER],
+        input=filled_markdown, cwd=BASE_DIR, check=True, capture_output=True, text=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])['render_ms']
+
+
+def warm_render(filled_markdown, workers):
+    os.environ['RENDER_WORKERS'] = str(workers)
+    from services.pdf_service import render_pdf_bytes
+
+    start = time.perf_counter()
+    render_pdf_bytes(filled_markdown)
+    return (time.perf_counter() - start) * 1000
+
+
+def describe(label, timings):
+    timings = sorted(timings)
+    print(f"{label:<12} n={len(timings):<3} median {statistics.median(timings):8.1f} ms   "
+          f"min {timings[0]:8.1f} ms   max {timings[-1]:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare PDF report rendering in a fresh interpreter per document (cold) against the "
+                    "app's pre-warmed renderer (warm).",
+    )
+    parser.add_argument('--documents', type=int, default=10, help="Documents to render per mode.")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="RENDER_WORKERS for the warm run (0 renders in-process).")
+    parser.add_argument('--skip-cold', action='store_true')
+    args = parser.parse_args()
+
+    filled_markdown = sample_markdown()
+    print(f"Rendering a {len(filled_markdown)} character report {args.documents} times per mode")
+
+    if not args.skip_cold:
+        describe('cold', [cold_render(filled_markdown) for _ in range(args.documents)])
+
+    first = warm_render(filled_markdown, args.workers)
+    print(f"{'warm-up':<12} {first:8.1f} ms")
+    describe('warm', [warm_render(filled_markdown, args.workers) for _ in range(args.documents)])
+
+
+if __name__ == '__main__':
+    main()
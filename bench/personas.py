@@ -0,0 +1,49 @@
+GIBBERISH = "qwrtz pfkln brrmx"
+
+
+class Persona:
+    def __init__(self, name, onboarding, email, gibberish_every=0, skip_every=0):
+        self.name = name
+        self.onboarding = onboarding
+        self.email = email
+        self.gibberish_every = gibberish_every
+        self.skip_every = skip_every
+
+    def answer(self, question, index, attempt):
+        if self.skip_every and index % self.skip_every == self.skip_every - 1:
+            return GIBBERISH
+        if self.gibberish_every and index % self.gibberish_every == self.gibberish_every - 1 and attempt == 0:
+            return GIBBERISH
+        label = question['label'].lower()
+        return (
+            f"About {label}: we will keep it simple and focus on what our customers need. "
+            f"{question['fill'][:120]}"
+        )
+
+
+ONBOARDING = [
+    "It is called Aurora Bakery",
+    "I would like to use English",
+    "We are in the food and bakery business",
+    "I have a Bachelor of Business Administration",
+    "I have 5 years of experience in the food business",
+    "We are located in Espoo, Finland",
+]
+
+PERSONAS = {
+    'diligent': Persona('diligent', ONBOARDING, 'diligent@example.com'),
+    'hesitant': Persona('hesitant', ONBOARDING, 'hesitant@example.com', gibberish_every=3),
+    'skipper': Persona('skipper', ONBOARDING, 'skipper@example.com', skip_every=4),
+}
+
+
+def next_open_question(business_plan_progress, business_plan_sections):
+    done = set()
+    for section in business_plan_progress:
+        for key in ('core_completed', 'core_skipped', 'optional_completed', 'optional_skipped'):
+            done.update(section.get(key, []))
+    for section in business_plan_sections:
+        for question in section['core_questions'] + section['optional_questions']:
+            if question['id'] not in done:
+                return question
+    return None
@@ -0,0 +1,119 @@
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from bench.routing import ANSWERS, ONBOARDING, message_for, oracle
+
+UNCLEAR = "I am not sure yet, maybe later."
+SCRIPTS = ['diligent', 'hesitant', 'rambler']
+
+
+def answer(script, question_id, question_ids, said, turn, attempts):
+    if script == 'hesitant' and question_ids.index(question_id) % 3 == 2 and not attempts.get(question_id):
+        attempts[question_id] = 1
+        return UNCLEAR
+    return message_for('rambler' if script == 'rambler' else 'in-order', question_id, question_ids, said, turn)
+
+
+def run_script(client, mock, catalog, script, think_s, tts):
+    client.post('/api/reset')
+    for message in ONBOARDING:
+        form_data = client.post('/api/chat', json={'message': message}).get_json()['form_data']
+    question_ids = [question.id for question in catalog.questions]
+    calls = {route: mock.counts[route] for route in ('chat', 'tts')}
+    said, attempts, rows = set(), {}, []
+    turns = 0
+    while turns < 80:
+        open_ids = [question_id for question_id in question_ids if question_id not in form_data]
+        if not open_ids:
+            break
+        # Reading the question and typing the answer; prefetching happens meanwhile.
+        time.sleep(think_s)
+        message = answer(script, open_ids[0], question_ids, said, turns, attempts)
+        started = time.perf_counter()
+        data = client.post('/api/chat', json={'message': message}).get_json()
+        row = {'reply_ms': (time.perf_counter() - started) * 1000}
+        if tts:
+            client.post('/api/tts', json={'text': data['response']})
+            row['audio_ms'] = (time.perf_counter() - started) * 1000
+        rows.append(row)
+        form_data = data['form_data']
+        turns += 1
+    return {'turns': turns, 'rows': rows, 'chat_calls': mock.counts['chat'] - calls['chat'],
+            'tts_calls': mock.counts['tts'] - calls['tts']}
+
+
+def main():
+    from bench.mock_openai import MockOpenAIServer, add_latency_arguments, parse_latencies
+    from bench.run import prepare_environment
+    from bench.smtp_sink import SMTPSink
+
+    parser = argparse.ArgumentParser(
+        description="Answer the business plan checklist with a pause for reading and typing before every answer, "
+                    "with speculative prefetching off and on, and report reply and audio latency, prefetch hit "
+                    "rate and upstream calls.",
+    )
+    parser.add_argument('--think-ms', type=float, default=2500.0, help="Pause before every answer.")
+    parser.add_argument('--scripts', default=','.join(SCRIPTS), help="Comma-separated scripts to run.")
+    parser.add_argument('--no-tts', action='store_true', help="Do not request spoken replies.")
+    add_latency_arguments(parser)
+    args = parser.parse_args()
+
+    latencies = parse_latencies(args.latency or ['chat=fixed:800', 'tts=fixed:600'])
+    mock = MockOpenAIServer(latencies=latencies).start()
+    sink = SMTPSink().start()
+    workdir = tempfile.mkdtemp(prefix='aino-prefetch-')
+    answers_yaml_path = os.path.join(workdir, 'improved_business_plan.yaml')
+    shutil.copyfile(os.path.join(BASE_DIR, 'config', 'improved_business_plan.yaml'), answers_yaml_path)
+    prepare_environment(mock, sink, answers_yaml_path)
+    scripts = [name.strip() for name in args.scripts.split(',') if name.strip()]
+    results = []
+    try:
+        from app import app
+        from models.state import get_catalog
+        from services import prefetch_service
+
+        catalog = get_catalog()
+        mock.validator = oracle({question.label: question.id for question in catalog.questions})
+        client = app.test_client()
+        for script in scripts:
+            for enabled in (False, True):
+                prefetch_service.PREFETCH_ENABLED = enabled
+                before = prefetch_service.get_prefetch_stats()
+                result = run_script(client, mock, catalog, script, args.think_ms / 1000, not args.no_tts)
+                after = prefetch_service.get_prefetch_stats()
+                resolved = sum(after[key] - before[key] for key in ('hits', 'late_hits', 'misses'))
+                hits = sum(after[key] - before[key] for key in ('hits', 'late_hits'))
+                result.update(script=script, prefetch='on' if enabled else 'off',
+                              hit_rate=f"{hits}/{resolved}" if enabled else '-',
+                              wasted=after['wasted_calls'] - before['wasted_calls'] if enabled else '-')
+                results.append(result)
+    finally:
+        mock.stop()
+        sink.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"think time {args.think_ms:.0f} ms, medians per turn (ms)")
+    print(f"{'script':<10}{'prefetch':>9}{'turns':>7}{'reply p50':>11}{'reply p95':>11}{'audio p50':>11}"
+          f"{'chat calls':>12}{'tts calls':>11}{'hits':>8}{'wasted':>8}")
+    for result in results:
+        def percentile(key, q):
+            values = sorted(row[key] for row in result['rows'] if key in row)
+            if not values:
+                return '-'
+            return f"{statistics.median(values) if q == 50 else values[int(len(values) * 0.95) - 1]:.0f}"
+        print(f"{result['script']:<10}{result['prefetch']:>9}{result['turns']:>7}{percentile('reply_ms', 50):>11}"
+              f"{percentile('reply_ms', 95):>11}{percentile('audio_ms', 50):>11}{result['chat_calls']:>12}"
+              f"{result['tts_calls']:>11}{result['hit_rate']:>8}{result['wasted']:>8}")
+
+
+if __name__ == '__main__':
+    main()
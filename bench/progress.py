@@ -0,0 +1,106 @@
+import argparse
+import importlib.util
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from constants import FORM_STEPS
+
+
+def load_revision_module(ref):
+    source = subprocess.run(['git', 'show', f'{ref}:services/business_plan_service.py'], cwd=BASE_DIR,
+                            check=True, capture_output=True, text=True).stdout
+    path = os.path.join(tempfile.mkdtemp(prefix='aino-progress-'), 'business_plan_service_ref.py')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(source)
+    spec = importlib.util.spec_from_file_location('business_plan_service_ref', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def random_form_data(questions, rng):
+    form_data = {step['id']: 'answer' for step in FORM_STEPS}
+    reached = rng.randint(0, len(questions))
+    for question in questions[:reached]:
+        form_data[question.id] = '' if rng.random() < 0.15 else 'An answer to the question.'
+    return form_data
+
+
+def timed(label, sessions, turn):
+    start = time.perf_counter()
+    for session in sessions:
+        turn(*session)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed * 1000:9.1f} ms  {elapsed / len(sessions) * 1e6:7.1f} us/session")
+    return elapsed
+
+
+def allocated(build, count):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [build() for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return size / count
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure per-session answer state and progress computation (progress, points, current "
+                    "question) for many concurrent sessions, optionally against the dict-based code of a git ref.",
+    )
+    parser.add_argument('--sessions', type=int, default=10000)
+    parser.add_argument('--compare', metavar='REF', help="Also time services/business_plan_service.py from REF.")
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    from models.catalog import Catalog
+    from services import business_plan_service
+    from services.business_plan_service import load_business_plan_sections
+
+    section_dicts = load_business_plan_sections()
+    catalog = Catalog.from_sections(section_dicts)
+    rng = random.Random(args.seed)
+    forms = [random_form_data(catalog.questions, rng) for _ in range(args.sessions)]
+
+    bitmap_bytes = allocated(lambda: catalog.answers_from(forms[0]), 1000)
+    print(f"{args.sessions} sessions, {len(catalog.questions)} questions in {len(catalog)} sections")
+    print(f"answer bitmap:           {bitmap_bytes:7.0f} bytes per session")
+
+    def current(form_data, answers):
+        business_plan_service.get_current_business_plan_question(form_data, catalog, answers)
+        business_plan_service.calculate_points(form_data, catalog, answers)
+        business_plan_service.get_business_plan_progress(form_data, catalog, answers)
+
+    bitmaps = [(form_data, catalog.answers_from(form_data)) for form_data in forms]
+    progress_bytes = allocated(lambda: business_plan_service.get_business_plan_progress(forms[0], catalog,
+                                                                                        bitmaps[0][1]), 1000)
+    print(f"progress payload:        {progress_bytes:7.0f} bytes per response")
+    elapsed = timed('bitmap model', bitmaps, current)
+
+    if args.compare:
+        reference = load_revision_module(args.compare)
+
+        def legacy(form_data):
+            reference.get_current_business_plan_question(form_data, section_dicts)
+            reference.calculate_points(form_data, section_dicts)
+            reference.get_business_plan_progress(form_data, section_dicts)
+
+        legacy_bytes = allocated(lambda: reference.get_business_plan_progress(forms[0], section_dicts), 1000)
+        print(f"progress payload ({args.compare}): {legacy_bytes:7.0f} bytes per response")
+        legacy_elapsed = timed(f'dicts ({args.compare})', [(form_data,) for form_data in forms], legacy)
+        print(f"speedup: {legacy_elapsed / elapsed:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+import argparse
+import http.client
+import json
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+MESSAGES = [
+    "It is called Aurora Bakery",
+    "English please",
+    "We are a bakery and cafe",
+    "Bachelor of Business Administration",
+    "5 years in the food business",
+    "Espoo",
+    "We sell sourdough bread and pastries to families and offices nearby",
+    "Mostly young families in Espoo who want fresh bread every morning",
+]
+
+
+def frame_overhead(length, masked=False):
+    header = 2 if length < 126 else 4 if length < 65536 else 10
+    return header + (4 if masked else 0)
+
+
+def http_exchange(port, method, url, session_id, payload=None):
+    """One request on a fresh connection, like the page's fetch() calls; returns (status, data, bytes, ms)."""
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+    headers = {'Content-Type': 'application/json', 'X-Session-Id': session_id, 'Accept-Encoding': 'identity'}
+    started = time.perf_counter()
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    connection.request(method, url, body=body, headers=headers)
+    response = connection.getresponse()
+    data = response.read()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    connection.close()
+    request_bytes = len(f"{method} {url} HTTP/1.1\r\n") + sum(
+        len(f"{name}: {value}\r\n") for name, value in headers.items()) + 2 + len(body)
+    response_bytes = len(f"HTTP/1.1 {response.status} {response.reason}\r\n") + sum(
+        len(f"{name}: {value}\r\n") for name, value in response.getheaders()) + 2 + len(data)
+    return response.status, json.loads(data), request_bytes + response_bytes, elapsed_ms
+
+
+def run_http(port, tts):
+    """The page before the session channel: POST /api/chat, then POST /api/tts with the reply."""
+    session_id = uuid.uuid4().hex
+    turns = []
+    for message in MESSAGES:
+        status, data, chat_bytes, chat_ms = http_exchange(port, 'POST', '/api/chat', session_id, {'message': message})
+        if status != 200:
+            raise RuntimeError(f"/api/chat returned {status}: {data}")
+        turn = {'requests': 1, 'bytes': chat_bytes, 'first_token_ms': chat_ms, 'reply_ms': chat_ms,
+                'first_audio_ms': None, 'audio_ms': None, 'round_trips_to_reply': 1, 'round_trips_to_audio': None}
+        if tts:
+            status, audio, tts_bytes, tts_ms = http_exchange(port, 'POST', '/api/tts', session_id,
+                                                             {'text': data['response']})
+            if status != 200 or not audio.get('audio'):
+                raise RuntimeError(f"/api/tts returned {status}")
+            turn.update(requests=2, bytes=chat_bytes + tts_bytes, first_audio_ms=chat_ms + tts_ms,
+                        audio_ms=chat_ms + tts_ms, round_trips_to_audio=2)
+        turns.append(turn)
+    return turns
+
+
+def run_ws(port, tts):
+    """The session channel: one socket per visit, every turn is a single message frame."""
+    from simple_websocket import Client
+
+    session_id = uuid.uuid4().hex
+    ws = Client.connect(f"ws://127.0.0.1:{port}/ws", headers={'X-Session-Id': session_id})
+    turns = []
+    try:
+        while json.loads(ws.receive(timeout=10))['type'] != 'progress':
+            pass
+        for message in MESSAGES:
+            frame = json.dumps({'type': 'message', 'message': message, 'tts': tts})
+            started = time.perf_counter()
+            ws.send(frame)
+            turn = {'requests': 0, 'bytes': len(frame) + frame_overhead(len(frame), masked=True),
+                    'first_token_ms': None, 'reply_ms': None, 'first_audio_ms': None, 'audio_ms': None,
+                    'round_trips_to_reply': 1, 'round_trips_to_audio': 1 if tts else None}
+            while True:
+                data = ws.receive(timeout=30)
+                if data is None:
+                    raise RuntimeError("Session channel went quiet mid-turn")
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                turn['bytes'] += len(data) + frame_overhead(len(data))
+                if isinstance(data, bytes):
+                    if turn['first_audio_ms'] is None:
+                        turn['first_audio_ms'] = elapsed_ms
+                    continue
+                event = json.loads(data)
+                if event['type'] == 'token' and turn['first_token_ms'] is None:
+                    turn['first_token_ms'] = elapsed_ms
+                elif event['type'] == 'reply':
+                    turn['reply_ms'] = elapsed_ms
+                elif event['type'] == 'error':
+                    raise RuntimeError(f"Session channel error: {event}")
+                elif event['type'] == 'audio_end' or (event['type'] == 'progress' and not tts):
+                    turn['audio_ms'] = elapsed_ms if tts else None
+                    break
+                elif event['type'] == 'audio_error':
+                    raise RuntimeError("Session channel could not stream audio")
+            turns.append(turn)
+    finally:
+        ws.close()
+    return turns
+
+
+def summarize(turns, rtt_ms):
+    def median(key):
+        values = [turn[key] for turn in turns if turn[key] is not None]
+        return statistics.median(values) if values else None
+
+    row = {key: median(key) for key in ('requests', 'bytes', 'first_token_ms', 'reply_ms', 'first_audio_ms',
+                                        'audio_ms', 'round_trips_to_reply', 'round_trips_to_audio')}
+    # On a real link every request on the critical path pays a round trip (plus TCP setup for a new fetch).
+    row['modeled_reply_ms'] = row['first_token_ms'] + rtt_ms * row['round_trips_to_reply']
+    if row['first_audio_ms'] is not None:
+        row['modeled_audio_ms'] = row['first_audio_ms'] + rtt_ms * row['round_trips_to_audio']
+    return row
+
+
+def start_app():
+    from werkzeug.serving import make_server
+    from app import app
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, name='realtime-bench-app', daemon=True).start()
+    return server
+
+
+def main():
+    from bench.mock_openai import MockOpenAIServer, add_latency_arguments, parse_latencies
+    from bench.run import prepare_environment
+    from bench.smtp_sink import SMTPSink
+
+    parser = argparse.ArgumentParser(
+        description="Play a scripted conversation over HTTP (/api/chat + /api/tts per turn) and over the /ws "
+                    "session channel, and report requests, bytes, time to first token and time to first audio.",
+    )
+    parser.add_argument('--visits', type=int, default=5, help="Scripted conversations per transport.")
+    parser.add_argument('--rtt-ms', type=float, default=150.0, help="Round-trip time of the modeled link.")
+    parser.add_argument('--no-tts', action='store_true', help="Do not request spoken replies.")
+    add_latency_arguments(parser)
+    args = parser.parse_args()
+
+    latencies = parse_latencies(args.latency or ['chat=fixed:800', 'tts=fixed:600'])
+    mock = MockOpenAIServer(latencies=latencies).start()
+    sink = SMTPSink().start()
+    workdir = tempfile.mkdtemp(prefix='aino-realtime-')
+    answers_yaml_path = os.path.join(workdir, 'improved_business_plan.yaml')
+    shutil.copyfile(os.path.join(BASE_DIR, 'config', 'improved_business_plan.yaml'), answers_yaml_path)
+    prepare_environment(mock, sink, answers_yaml_path)
+    server = start_app()
+    tts = not args.no_tts
+    try:
+        results = {
+            'http': summarize([turn for _ in range(args.visits) for turn in run_http(server.port, tts)], args.rtt_ms),
+            'ws': summarize([turn for _ in range(args.visits) for turn in run_ws(server.port, tts)], args.rtt_ms),
+        }
+    finally:
+        server.shutdown()
+        mock.stop()
+        sink.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{len(MESSAGES)} turns x {args.visits} visits, medians per turn; modeled link: {args.rtt_ms:.0f} ms RTT")
+    print(f"{'':<6}{'requests':>9}{'bytes':>8}{'first token':>13}{'reply':>8}{'first audio':>13}{'audio done':>12}"
+          f"{'modeled reply':>15}{'modeled audio':>15}")
+
+    def ms(value):
+        return f"{value:.0f}" if value is not None else '-'
+
+    for label, row in results.items():
+        print(f"{label:<6}{row['requests']:>9.0f}{row['bytes']:>8.0f}{ms(row['first_token_ms']):>13}"
+              f"{ms(row['reply_ms']):>8}{ms(row['first_audio_ms']):>13}{ms(row['audio_ms']):>12}"
+              f"{ms(row['modeled_reply_ms']):>15}{ms(row.get('modeled_audio_ms')):>15}")
+
+
+if __name__ == '__main__':
+    main()
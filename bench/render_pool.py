@@ -0,0 +1,194 @@
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))] if samples else 0.0
+
+
+def probe(client, stop, latencies, interval_s):
+    """Time a light request over and over while reports render, as another user of the same worker would."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        client.get('/healthz')
+        latencies.append((time.perf_counter() - started) * 1000)
+        time.sleep(interval_s)
+
+
+def run_mode(render_service, client, kind, filled_markdown, workers, reports, concurrency, interval_s):
+    render_service.RENDER_WORKERS = workers
+    render_service.render_document(kind, filled_markdown)
+    stop = threading.Event()
+    probes = []
+    prober = threading.Thread(target=probe, args=(client, stop, probes, interval_s), daemon=True)
+    renders = []
+
+    def render(_):
+        started = time.perf_counter()
+        render_service.render_document(kind, filled_markdown)
+        renders.append((time.perf_counter() - started) * 1000)
+
+    prober.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(render, range(reports)))
+    wall_s = time.perf_counter() - started
+    stop.set()
+    prober.join()
+    idle = []
+    for _ in range(50):
+        request_started = time.perf_counter()
+        client.get('/healthz')
+        idle.append((time.perf_counter() - request_started) * 1000)
+    return {
+        'wall_s': wall_s,
+        'per_s': reports / wall_s,
+        'render_p50': percentile(renders, 0.5),
+        'render_p95': percentile(renders, 0.95),
+        'probe_p50': percentile(probes, 0.5),
+        'probe_p95': percentile(probes, 0.95),
+        'probe_max': max(probes) if probes else 0.0,
+        'probes': len(probes),
+        'idle_p50': percentile(idle, 0.5),
+    }
+
+
+def check_limits(render_service, kind, filled_markdown):
+    """A render over its timeout fails fast and only its worker is replaced, while a render beside it finishes;
+    renders queued behind others do not time out while they wait; a full queue turns callers away."""
+    started = time.perf_counter()
+    render_service.render_document(kind, filled_markdown)
+    render_s = time.perf_counter() - started
+    queued_timeout = max(4 * render_s, 0.2)
+    queued = []
+    restarts = render_service.get_render_stats()['restarts']
+
+    def queued_render():
+        try:
+            render_service.render_document(kind, filled_markdown, timeout=queued_timeout)
+            queued.append('rendered')
+        except render_service.RenderTimeoutError:
+            queued.append('timeout')
+
+    threads = [threading.Thread(target=queued_render) for _ in range(2 * render_service.RENDER_MAX_PENDING)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    queued_restarts = render_service.get_render_stats()['restarts'] - restarts
+
+    restarts = render_service.get_render_stats()['restarts']
+    neighbour = []
+
+    def render_beside():
+        try:
+            render_service.render_document(kind, filled_markdown * 4)
+            neighbour.append('rendered')
+        except Exception as e:
+            neighbour.append(e.__class__.__name__)
+
+    beside = threading.Thread(target=render_beside)
+    beside.start()
+    time.sleep(0.01)
+    started = time.perf_counter()
+    try:
+        render_service.render_document(kind, filled_markdown * 40, timeout=0.05)
+        timed_out = False
+    except render_service.RenderTimeoutError:
+        timed_out = True
+    timeout_ms = (time.perf_counter() - started) * 1000
+    beside.join()
+    started = time.perf_counter()
+    render_service.render_document(kind, filled_markdown)
+    recovery_ms = (time.perf_counter() - started) * 1000
+
+    slots, queue_timeout = render_service._slots, render_service.RENDER_QUEUE_TIMEOUT
+    render_service._slots = threading.BoundedSemaphore(1)
+    render_service.RENDER_QUEUE_TIMEOUT = 0.01
+    outcomes = []
+
+    def attempt():
+        try:
+            render_service.render_document(kind, filled_markdown)
+            outcomes.append('rendered')
+        except render_service.RenderBusyError:
+            outcomes.append('busy')
+
+    threads = [threading.Thread(target=attempt) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    render_service._slots, render_service.RENDER_QUEUE_TIMEOUT = slots, queue_timeout
+    return {
+        'queued': len(queued),
+        'queued_timeout_ms': queued_timeout * 1000,
+        'queued_timeouts': queued.count('timeout'),
+        'queued_restarts': queued_restarts,
+        'timed_out': timed_out,
+        'timeout_ms': timeout_ms,
+        'neighbour': neighbour[0] if neighbour else 'missing',
+        'restarted': render_service.get_render_stats()['restarts'] - restarts,
+        'recovery_ms': recovery_ms,
+        'busy': outcomes.count('busy'),
+        'rendered': outcomes.count('rendered'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Render the same filled report from several request threads at once, on those threads and "
+                    "through the render process pool, while another thread times a light request; then check "
+                    "per-job timeouts and backpressure.",
+    )
+    parser.add_argument('--kind', choices=('docx', 'pdf'), default='docx')
+    parser.add_argument('--reports', type=int, default=64, help="Reports to render per mode.")
+    parser.add_argument('--concurrency', type=int, default=8, help="Request threads rendering at once.")
+    parser.add_argument('--workers', type=int, default=max(2, os.cpu_count() or 1),
+                        help="RENDER_WORKERS for the pool run.")
+    parser.add_argument('--probe-interval-ms', type=float, default=10.0)
+    args = parser.parse_args()
+
+    from bench.pdf_render import sample_markdown
+
+    filled_markdown = sample_markdown()
+    os.environ['RENDER_WORKERS'] = str(args.workers)
+    from app import app
+    from services import render_service
+
+    client = app.test_client()
+    rows = []
+    for label, workers in (('request thread', 0), (f'pool of {args.workers}', args.workers)):
+        rows.append((label, run_mode(render_service, client, args.kind, filled_markdown, workers, args.reports,
+                                     args.concurrency, args.probe_interval_ms / 1000)))
+    limits = check_limits(render_service, args.kind, filled_markdown)
+
+    print(f"{args.reports} {args.kind} reports of {len(filled_markdown)} characters from {args.concurrency} threads, "
+          f"{os.cpu_count()} CPUs")
+    print(f"{'rendering on':<18}{'wall s':>8}{'docs/s':>8}{'render p50':>12}{'p95':>8}"
+          f"{'/healthz p50':>14}{'p95':>8}{'max':>8}{'idle p50':>10}")
+    for label, row in rows:
+        print(f"{label:<18}{row['wall_s']:>8.2f}{row['per_s']:>8.1f}{row['render_p50']:>12.0f}"
+              f"{row['render_p95']:>8.0f}{row['probe_p50']:>14.1f}{row['probe_p95']:>8.1f}{row['probe_max']:>8.1f}"
+              f"{row['idle_p50']:>10.2f}")
+    print(f"{limits['queued']} renders at once with a {limits['queued_timeout_ms']:.0f} ms timeout each: "
+          f"{limits['queued_timeouts']} timed out, {limits['queued_restarts']} workers replaced")
+    print(f"40x report with a 50 ms timeout: timed out {limits['timed_out']} after {limits['timeout_ms']:.0f} ms, "
+          f"{limits['restarted']} workers replaced, 4x report beside it {limits['neighbour']}, "
+          f"next render {limits['recovery_ms']:.0f} ms")
+    print(f"3 renders with 1 slot and a 10 ms queue timeout: {limits['rendered']} rendered, {limits['busy']} busy")
+    if limits['queued_timeouts'] or not limits['timed_out'] or limits['neighbour'] != 'rendered' or not limits['busy']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
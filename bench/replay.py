@@ -0,0 +1,164 @@
+import argparse
+import base64
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from bench.mock_openai import MockOpenAIServer, add_latency_arguments, parse_latencies
+from bench.run import HttpClient, InProcessClient, prepare_environment
+from bench.smtp_sink import SMTPSink
+from bench.stats import LatencyRecorder, compare_summaries, format_comparison, format_summary
+
+REPLAYED_ROUTES = ('/api/chat', '/api/tts', '/api/transcribe', '/api/reset', '/api/business-plan-structure',
+                   '/api/send-report', '/api/download-report')
+
+
+def load_sessions(path, routes):
+    sessions = OrderedDict()
+    skipped = 0
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry.get('path', '').split('?', 1)[0] not in routes:
+                skipped += 1
+                continue
+            entry.setdefault('t', float(line_number))
+            sessions.setdefault(str(entry.get('session', 'default')), []).append(entry)
+    for entries in sessions.values():
+        entries.sort(key=lambda entry: entry['t'])
+    return sessions, skipped
+
+
+def send(client, entry):
+    upload = entry.get('upload')
+    if upload:
+        return client.upload(
+            entry['path'],
+            upload.get('field', 'audio'),
+            upload.get('filename', 'recording.webm'),
+            base64.b64decode(upload['data']),
+            upload.get('content_type', 'application/octet-stream'),
+        )
+    return client.request(entry.get('method', 'POST'), entry['path'], entry.get('json'))
+
+
+def replay_session(client, entries, clock, speed, recorder, stop_on_error):
+    for entry in entries:
+        if speed > 0:
+            delay = clock['start'] + (entry['t'] - clock['first']) / speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        route = entry['path'].split('?', 1)[0]
+        start = time.perf_counter()
+        try:
+            status, _ = send(client, entry)
+        except OSError as e:
+            print(f"{route}: {e}")
+            status = 599
+        recorder.record(route, time.perf_counter() - start, ok=status < 400)
+        if status >= 400 and stop_on_error:
+            return
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay a JSONL request log through the app, one isolated conversation per recorded session.",
+    )
+    parser.add_argument('log', help="JSONL log, e.g. written by 'python3 -m bench.run --record log.jsonl'.")
+    parser.add_argument('--url', help="Replay against a running server over HTTP instead of in-process.")
+    parser.add_argument('--speed', type=float, default=0.0,
+                        help="1 keeps the recorded inter-arrival times, 2 plays twice as fast, "
+                             "0 (default) sends every request as soon as the previous one of its session returns.")
+    parser.add_argument('--max-sessions', type=int, default=256, help="Sessions replayed at the same time.")
+    parser.add_argument('--routes', default=','.join(REPLAYED_ROUTES), help="Comma-separated routes to replay.")
+    parser.add_argument('--session-prefix', default=f"replay-{os.getpid()}-{int(time.time())}-",
+                        help="Prefix for the X-Session-Id of every replayed session.")
+    parser.add_argument('--stop-on-error', action='store_true', help="Stop replaying a session after its first error.")
+    parser.add_argument('--json', dest='json_path', help="Write the summary as JSON to this path.")
+    parser.add_argument('--baseline', help="Summary JSON of another build to compare against.")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed latency regression vs the baseline.")
+    add_latency_arguments(parser)
+    args = parser.parse_args()
+
+    routes = {route.strip() for route in args.routes.split(',') if route.strip()}
+    sessions, skipped = load_sessions(args.log, routes)
+    total = sum(len(entries) for entries in sessions.values())
+    print(f"Replaying {total} requests from {len(sessions)} sessions ({skipped} log lines on other routes skipped)")
+
+    mock = sink = workdir = None
+    if args.url:
+        def make_client(headers):
+            return HttpClient(args.url, headers)
+    else:
+        mock = MockOpenAIServer(latencies=parse_latencies(args.latency)).start()
+        sink = SMTPSink().start()
+        workdir = tempfile.mkdtemp(prefix='aino-replay-')
+        answers_yaml_path = os.path.join(workdir, 'improved_business_plan.yaml')
+        shutil.copyfile(os.path.join(BASE_DIR, 'config', 'improved_business_plan.yaml'), answers_yaml_path)
+        prepare_environment(mock, sink, answers_yaml_path)
+        from app import app
+
+        def make_client(headers):
+            return InProcessClient(app, headers)
+
+    recorder = LatencyRecorder()
+    slots = threading.Semaphore(max(args.max_sessions, 1))
+    clock = {'start': time.perf_counter(), 'first': min(e[0]['t'] for e in sessions.values()) if sessions else 0.0}
+
+    def worker(session, entries):
+        with slots:
+            client = make_client({'X-Session-Id': f"{args.session_prefix}{session}"})
+            replay_session(client, entries, clock, args.speed, recorder, args.stop_on_error)
+
+    threads = [threading.Thread(target=worker, args=item, daemon=True) for item in sessions.items()]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        recorder.stop()
+        if mock:
+            mock.stop()
+            sink.stop()
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    summary = recorder.summary()
+    summary['sessions'] = len(sessions)
+    summary['speed'] = args.speed
+    if mock:
+        summary['upstream_calls'] = dict(mock.counts)
+        summary['emails_sent'] = sink.messages
+        summary['latency'] = {route: repr(model) for route, model in mock.latencies.items()}
+    print(format_summary(summary))
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print()
+        print(f"Compared with {args.baseline} (baseline>current):")
+        print(format_comparison(baseline, summary))
+        for regression in compare_summaries(baseline, summary, args.tolerance):
+            print(f"REGRESSION {regression}")
+            exit_code = 1
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
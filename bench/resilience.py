@@ -0,0 +1,264 @@
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from bench.mock_openai import MockOpenAIServer, parse_faults, parse_latencies
+
+POLICY_DEFAULTS = {
+    'LLM_CHAT_TIMEOUT': '2',
+    'LLM_CHAT_DEADLINE': '6',
+    'LLM_VALIDATION_TIMEOUT': '1',
+    'LLM_VALIDATION_DEADLINE': '2',
+    'LLM_FILL_TIMEOUT': '5',
+    'LLM_FILL_DEADLINE': '10',
+    'LLM_RETRY_BASE_DELAY': '0.05',
+    'BREAKER_COOLDOWN': '1',
+    'BREAKER_PROBE_INTERVAL': '0.2',
+}
+
+OUTAGE_TURNS = ['Aino Coffee', 'English', 'Food and beverage', 'Bachelor of Business', '5 years', 'Espoo']
+
+# Chat faults per scenario, and the policy counter that must move for the policy to have handled them.
+SCENARIOS = {
+    'errors': (['chat=error:0.2'], 'retries'),
+    'ratelimit': (['chat=ratelimit:0.2'], 'retries'),
+    'slow-tail': (['chat=slow:0.04:2000'], 'hedges'),
+    'hang': (['chat=hang:0.03:8000'], 'hedges'),
+}
+
+MESSAGES = [{'role': 'user', 'content': "We will open a small bakery in Espoo."}]
+
+
+def percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def measure(call, calls, concurrency):
+    latencies = []
+    failures = []
+    lock = threading.Lock()
+
+    def one(_):
+        start = time.perf_counter()
+        try:
+            call()
+        except Exception as e:
+            with lock:
+                failures.append(e.__class__.__name__)
+            return
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(calls)))
+    return {
+        'ok': calls - len(failures),
+        'calls': calls,
+        'p50': percentile(latencies, 0.50),
+        'p95': percentile(latencies, 0.95),
+        'p99': percentile(latencies, 0.99),
+        'max': max(latencies) if latencies else 0.0,
+    }
+
+
+def report(name, variant, result):
+    print(f"{name:<16} {variant:<8} {result['ok']:>4}/{result['calls']:<4} {result['p50']:>8.0f} "
+          f"{result['p95']:>8.0f} {result['p99']:>8.0f} {result['max']:>8.0f}")
+
+
+def check_scenario(name, baseline, result, stats, failures):
+    from services import llm_policy
+
+    counter = SCENARIOS[name][1]
+    if result['ok'] < result['calls'] * 0.97:
+        failures.append(f"{name}: only {result['ok']}/{result['calls']} calls succeeded with the policy")
+    if not stats.get(counter):
+        failures.append(f"{name}: the policy made no {counter}")
+    if counter == 'hedges':
+        # A hedge is only sent once a call is slower than the p95 seen so far, so hedges stay a small share.
+        limit = stats.get('calls', 0) * llm_policy.LLM_HEDGE_MAX_RATIO + 1
+        if stats.get('hedges', 0) > limit:
+            failures.append(f"{name}: {stats['hedges']} hedges for {stats.get('calls', 0)} calls, more than the "
+                            f"{limit:.0f} allowed")
+        delay = llm_policy.hedge_delay('chat')
+        if delay is None or delay < llm_policy.LLM_HEDGE_MIN_DELAY:
+            failures.append(f"{name}: hedge delay {delay} is below LLM_HEDGE_MIN_DELAY")
+        if result['p99'] >= baseline['p99'] * 0.6:
+            failures.append(f"{name}: policy p99 {result['p99']:.0f} ms is not well below direct "
+                            f"{baseline['p99']:.0f} ms")
+
+
+def check_deadline(mock, failures):
+    """A chat call to an upstream that never answers gives up within its deadline."""
+    from services import llm_policy
+
+    mock.faults = parse_faults(['chat=hang:1.0:30000'])
+    llm_policy.reset_policy_stats()
+    deadline = llm_policy.POLICIES['chat']['deadline']
+    start = time.perf_counter()
+    try:
+        llm_policy.call_llm('chat', 'gpt-4o-mini', llm_policy.chat_request(messages=MESSAGES, max_tokens=50))
+        outcome = 'answered'
+    except llm_policy.LLMUnavailableError:
+        outcome = 'unavailable'
+    elapsed = time.perf_counter() - start
+    stats = llm_policy.get_policy_stats().get('chat', {})
+    print(f"chat hangs: {outcome} after {elapsed:.1f}s (deadline {deadline:g}s), timeouts {stats.get('timeouts', 0)}")
+    if outcome != 'unavailable':
+        failures.append("chat answered while the upstream hangs")
+    if elapsed > deadline + 0.5:
+        failures.append(f"chat call took {elapsed:.1f}s, past its {deadline:g}s deadline")
+    if not stats.get('timeouts'):
+        failures.append("hanging chat attempts were not counted as timeouts")
+
+
+def run_outage(mock, failures):
+    from bench.run import VOICE_CLIP, InProcessClient
+    from services import circuit_breaker
+    from app import app
+
+    client = InProcessClient(app, {'X-Session-Id': 'resilience-outage'})
+    admin = InProcessClient(app, {'Authorization': f"Bearer {os.environ['ADMIN_TOKEN']}"})
+    client.request('POST', '/api/reset')
+    mock.faults = parse_faults(['chat=hang:1.0:3000', 'tts=error:1.0', 'whisper=error:1.0'])
+    print("outage: chat hangs, TTS and Whisper fail")
+    for message in OUTAGE_TURNS:
+        start = time.perf_counter()
+        status, body = client.request('POST', '/api/chat', {'message': message})
+        elapsed = (time.perf_counter() - start) * 1000
+        tts_status, _ = client.request('POST', '/api/tts', {'text': (body or {}).get('response', 'hello')})
+        print(f"  chat {status} in {elapsed:>6.0f} ms, tts {tts_status}, degraded {body.get('degraded')}: "
+              f"{body.get('response')!r}")
+        if status != 200:
+            failures.append(f"outage chat turn answered {status}")
+    if elapsed > 100:
+        failures.append(f"chat still waits for the upstream with the breaker open ({elapsed:.0f} ms)")
+    for _ in range(circuit_breaker.BREAKER_FAILURES):
+        client.upload('/api/transcribe', 'audio', 'clip.webm', VOICE_CLIP, 'audio/webm')
+    status, body = admin.request('GET', '/readyz')
+    print(f"  /readyz {status}, degraded {body['degraded']}")
+    if body['degraded'] != ['chat', 'transcription', 'tts']:
+        failures.append(f"expected all three breakers open, got {body['degraded']}")
+
+    mock.faults = {}
+    start = time.perf_counter()
+    while circuit_breaker.degraded_features() and time.perf_counter() - start < 15:
+        time.sleep(0.1)
+    recovered = time.perf_counter() - start
+    status, body = admin.request('GET', '/readyz')
+    print(f"  upstream back: breakers closed by background probes after {recovered:.1f}s, "
+          f"degraded {body['degraded']}")
+    if body['degraded']:
+        failures.append(f"breakers did not recover: {body['degraded']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the LLM call policy (deadlines, retries, hedging, fallbacks) against a fault-injecting "
+                    "mock OpenAI server and compare it with direct client calls.",
+    )
+    parser.add_argument('--calls', type=int, default=200, help="Chat calls per scenario and variant.")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help="Comma-separated chat fault scenarios.")
+    parser.add_argument('--latency', default='chat=lognormal:120:0.2', help="Base mock latency for chat.")
+    parser.add_argument('--skip-outage', action='store_true', help="Skip the full outage run through the app.")
+    args = parser.parse_args()
+
+    for key, value in POLICY_DEFAULTS.items():
+        os.environ.setdefault(key, value)
+    mock = MockOpenAIServer(latencies=parse_latencies([args.latency])).start()
+    for key, value in (('OPENAI_API_KEY', 'mock-key'), ('ASSISTANT_ID', 'asst_mock'), ('SMTP_SERVER', '127.0.0.1'),
+                       ('SMTP_USERNAME', 'mock'), ('SMTP_PASSWORD', 'mock'), ('FROM_EMAIL', 'bench@ainoespoo.com'),
+                       ('ADMIN_TOKEN', 'bench-admin')):
+        os.environ.setdefault(key, value)
+    os.environ['OPENAI_BASE_URL'] = mock.base_url
+    workdir = tempfile.mkdtemp(prefix='aino-resilience-')
+    answers_yaml_path = os.path.join(workdir, 'improved_business_plan.yaml')
+    shutil.copyfile(os.path.join(BASE_DIR, 'config', 'improved_business_plan.yaml'), answers_yaml_path)
+    os.environ.setdefault('ANSWERS_YAML_PATH', answers_yaml_path)
+
+    from services import llm_policy
+    from services.openai_client import get_client
+    from services.validation_service import heuristic_validation, validate_answer
+    from services import docx_service
+    from models.catalog import Question
+
+    def direct():
+        return get_client().chat.completions.create(model='gpt-4o-mini', messages=MESSAGES, max_tokens=50)
+
+    def with_policy():
+        return llm_policy.call_llm('chat', 'gpt-4o-mini', llm_policy.chat_request(messages=MESSAGES, max_tokens=50))
+
+    failures = []
+    print(f"chat latency {args.latency}, {args.calls} calls x {args.concurrency} threads per run")
+    print(f"{'scenario':<16} {'variant':<8} {'ok':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    try:
+        for name in [s for s in args.scenarios.split(',') if s]:
+            llm_policy.reset_policy_stats()
+            # The policy only hedges once it has seen enough latencies: measure it warm, as in production.
+            mock.faults = {}
+            measure(with_policy, llm_policy.LLM_HEDGE_MIN_SAMPLES, args.concurrency)
+            mock.faults = parse_faults(SCENARIOS[name][0])
+            baseline = measure(direct, args.calls, args.concurrency)
+            report(name, 'direct', baseline)
+            result = measure(with_policy, args.calls, args.concurrency)
+            report(name, 'policy', result)
+            stats = llm_policy.get_policy_stats().get('chat', {})
+            print(f"{'':<16} retries {stats.get('retries', 0)}, hedges {stats.get('hedges', 0)} "
+                  f"(won {stats.get('hedge_wins', 0)}), timeouts {stats.get('timeouts', 0)}")
+            check_scenario(name, baseline, result, stats, failures)
+
+        mock.faults = parse_faults(['chat=error:1.0'])
+        llm_policy.reset_policy_stats()
+        question = Question('business_idea', 'Business idea', 'Describe the business idea.', 0, False, 'section_1')
+        answers = ["We bake sourdough bread for cafes in Espoo", "bakery"]
+        for answer in answers:
+            start = time.perf_counter()
+            verdict = validate_answer(answer, 'bp_business_idea', question)
+            elapsed = time.perf_counter() - start
+            print(f"validation down: {answer!r} -> {verdict} in {elapsed * 1000:.0f} ms")
+            if verdict != heuristic_validation(answer):
+                failures.append(f"validation fallback returned {verdict} for {answer!r}")
+            if elapsed > llm_policy.POLICIES['validation']['deadline'] + 1:
+                failures.append(f"validation fallback took {elapsed:.1f}s")
+        if llm_policy.get_policy_stats().get('validation', {}).get('fallback_local') != len(answers):
+            failures.append("validation did not count its local heuristic fallbacks")
+
+        mock.faults = parse_faults([f'chat@{docx_service.FILL_MODEL}=error:1.0'])
+        llm_policy.reset_policy_stats()
+        filled = docx_service.fill_section("## 1. Business Idea\n\n...", {'Business idea': answers[0]})
+        stats = llm_policy.get_policy_stats().get('fill', {})
+        print(f"fill with {docx_service.FILL_MODEL} down: {len(filled)} chars via fallback model "
+              f"({stats.get('fallback_model', 0)} fallback calls)")
+        if not filled or stats.get('fallback_model') != 1:
+            failures.append("fill did not fall back to the configured fallback model")
+
+        # Last before the outage: the hanging calls may open the chat breaker.
+        check_deadline(mock, failures)
+
+        if not args.skip_outage:
+            run_outage(mock, failures)
+    finally:
+        mock.stop()
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+MAX_TURNS = 80
+
+# What the owner of Aurora Bakery would say to each checklist question, one or two sentences each.
+ANSWERS = {
+    'business_idea': "We will open a sourdough bakery and cafe in Tapiola that sells fresh bread, pastries and "
+                     "coffee to local families and offices.",
+    'vision_35_years': "In five years we want three locations in Espoo and a team of twelve employees. We dream of "
+                       "becoming the neighbourhood bakery everyone grows up with.",
+    'competence_skills': "I have worked as a baker for eight years and trained in a Paris bakery. My background "
+                         "in business studies helps with the numbers.",
+    'industry': "The bakery market in Finland is steady, but flour and energy prices have risen sharply. Sales are "
+                "seasonal, with the best months around Christmas.",
+    'customers_segments': "Our customers are young families living near Tapiola and small offices that order "
+                          "breakfast for their staff.",
+    'customer_purchase_motives': "Busy parents want healthy bread without additives and no time to bake it "
+                                 "themselves.",
+    'products_and_services': "Our main products are sourdough loaves at 7 euros, cinnamon buns at 4 euros and "
+                             "a weekly bread subscription for 25 euros.",
+    'competitive_situation_and_competitors': "Our main competitors are the supermarket chains and Fazer cafes. "
+                                             "Customers would choose us instead because everything is baked on site "
+                                             "every morning.",
+    'customer_purchase_criteria': "When choosing a bakery, people compare freshness, taste, location and price.",
+    'customer_risks': "Some customers may hesitate because our prices are higher than in the supermarket.",
+    'market_entry_and_launch_plan': "Our first steps are a pop-up stand at the Tapiola market and a free tasting "
+                                    "day before the opening. In the first month we will visit ten offices nearby.",
+    'sales_and_marketing_channels': "We will reach people through Instagram and word of mouth, plus flyers in "
+                                    "the local daycare centres.",
+    'production_and_logistics_goods': "We buy organic flour from a wholesale supplier in Loimaa with weekly "
+                                      "deliveries and a two day lead time.",
+    'delivery_operations_services': "Our opening hours are 7 to 18 on weekdays and 8 to 15 on Saturdays. Online "
+                                    "orders come in through a booking software for pickup.",
+    'distribution_network': "We will also sell through Wolt and Foodora, which take a commission of about "
+                            "thirty percent.",
+    'other_third_parties_and_partners_important_to_the_company': "We rely on an accountant for bookkeeping and a "
+                                                                  "local coffee roaster as a partner.",
+    'internationalization_plans': "We have no plans to expand abroad in the first years.",
+    'initial_financing_and_startup_costs': "We need about 60000 euros to start, mostly for the oven and other "
+                                           "equipment. The money comes from my savings and a bank loan.",
+    'swot_analysis': "Our strengths are quality and location, our weaknesses are a small team and high costs. "
+                     "The opportunity is catering, and the threat is rising energy prices.",
+    'background_information_company_basics': "The company will be a limited company, an osakeyhtiö, and I own "
+                                             "all of it.",
+    'profitability_timeline': "Our monthly fixed costs are about 9000 euros for rent and salaries, and we expect "
+                              "to break even after eight months.",
+    'potential_risks_in_the_operating_environment': "An economic downturn or new regulation on food production "
+                                                    "could hurt us, and inflation keeps pushing prices up.",
+    'intellectual_property_rights': "We have registered the Aurora Bakery trademark and the domain name.",
+    'permits_and_notices': "We need a food premises registration from the city food authority before opening.",
+    'insurance_and_contracts': "We will take out liability insurance and property insurance with a premium of "
+                               "about 1200 euros a year.",
+    'contracts_key_contracts': "The lease with our landlord runs for five years with a six month termination "
+                               "notice.",
+}
+
+SMALL_TALK = [
+    "Sorry, it has been a long week.",
+    "Good question, let me think.",
+    "Hmm.",
+]
+
+ONBOARDING = [
+    "It is called Aurora Bakery",
+    "I would like to use English",
+    "We are in the food and bakery business",
+    "I have a Bachelor of Business Administration",
+    "I have 5 years of experience in the food business",
+    "We are located in Espoo, Finland",
+]
+
+SCRIPTS = ['in-order', 'two-in-one', 'jumps-ahead', 'rambler']
+
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+
+def sentences(text):
+    return [sentence for sentence in _SENTENCE_SPLIT.split(text.strip()) if sentence]
+
+
+SENTENCE_OWNER = {sentence: question_id for question_id, text in ANSWERS.items() for sentence in sentences(text)}
+
+
+def message_for(script, question_id, question_ids, said, turn):
+    """What the user types when asked question_id; said holds the questions they have already answered."""
+    later = [other for other in question_ids[question_ids.index(question_id) + 1:] if other not in said]
+    parts = [ANSWERS[question_id]]
+    extra = None
+    if script == 'two-in-one' and later:
+        extra = later[0]
+    elif script == 'jumps-ahead' and turn % 3 == 0 and len(later) > 3:
+        extra = later[3]
+    elif script == 'rambler' and later:
+        extra = later[min(2, len(later) - 1)]
+        parts.insert(0, SMALL_TALK[turn % len(SMALL_TALK)])
+    if extra:
+        parts.append(ANSWERS[extra])
+        said.add(extra)
+    said.add(question_id)
+    return ' '.join(parts)
+
+
+def oracle(label_to_id):
+    """The mock's answer validation: YES only when the answer contains something meant for that question."""
+    def validate(label, answer):
+        question_id = label_to_id.get(label)
+        return any(owner == question_id and sentence in answer for sentence, owner in SENTENCE_OWNER.items())
+    return validate
+
+
+def run_script(client, mock, catalog, script):
+    client.post('/api/reset')
+    for message in ONBOARDING:
+        form_data = client.post('/api/chat', json={'message': message}).get_json()['form_data']
+    question_ids = [question.id for question in catalog.questions]
+    calls = {route: mock.counts[route] for route in ('chat', 'validation')}
+    said = set()
+    turns = asked_again = 0
+    previous = None
+    while turns < MAX_TURNS:
+        open_ids = [question_id for question_id in question_ids if question_id not in form_data]
+        if not open_ids:
+            break
+        current = open_ids[0]
+        asked_again += current == previous
+        previous = current
+        message = message_for(script, current, question_ids, said, turns)
+        form_data = client.post('/api/chat', json={'message': message}).get_json()['form_data']
+        turns += 1
+
+    misfiled = lost = 0
+    for sentence, owner in SENTENCE_OWNER.items():
+        if owner not in said:
+            continue
+        holders = [question_id for question_id in question_ids if sentence in (form_data.get(question_id) or '')]
+        misfiled += any(holder != owner for holder in holders)
+        lost += owner not in holders
+    return {'name': script, 'turns': turns, 'asked_again': asked_again,
+            'chat_calls': mock.counts['chat'] - calls['chat'],
+            'validation_calls': mock.counts['validation'] - calls['validation'],
+            'skipped': sum(1 for question_id in question_ids if form_data.get(question_id) == ''),
+            'misfiled': misfiled, 'lost': lost,
+            'complete': all(question_id in form_data for question_id in question_ids)}
+
+
+def run_all():
+    from bench.mock_openai import MockOpenAIServer
+    from bench.run import prepare_environment
+    from bench.smtp_sink import SMTPSink
+
+    mock = MockOpenAIServer().start()
+    sink = SMTPSink().start()
+    workdir = tempfile.mkdtemp(prefix='aino-routing-')
+    answers_yaml_path = os.path.join(workdir, 'improved_business_plan.yaml')
+    shutil.copyfile(os.path.join(BASE_DIR, 'config', 'improved_business_plan.yaml'), answers_yaml_path)
+    prepare_environment(mock, sink, answers_yaml_path)
+    try:
+        from app import app
+        from models.state import get_catalog
+        catalog = get_catalog()
+        mock.validator = oracle({question.label: question.id for question in catalog.questions})
+        client = app.test_client()
+        return [run_script(client, mock, catalog, script) for script in SCRIPTS]
+    finally:
+        mock.stop()
+        sink.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run_revision(ref):
+    from bench.startup import bench_environment, export_revision
+
+    workdir = tempfile.mkdtemp(prefix='aino-routing-ref-')
+    try:
+        export_revision(ref, workdir)
+        for name in ('routing.py', 'mock_openai.py'):
+            shutil.copyfile(os.path.join(BASE_DIR, 'bench', name), os.path.join(workdir, 'bench', name))
+        result = subprocess.run([sys.executable, '-m', 'bench.routing', '--json'], cwd=workdir,
+                                env=bench_environment(), capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"Routing run failed at {ref}:\n{result.stderr}")
+        return json.loads(result.stdout.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Answer the whole business plan checklist through /api/chat with scripted users who answer "
+                    "in order, answer ahead, or put two answers in one message, and count turns, LLM calls and "
+                    "answers stored under the wrong question, optionally against another git revision.",
+    )
+    parser.add_argument('--compare', metavar='REF', help="Also run the scripts at this git revision, e.g. HEAD~1.")
+    parser.add_argument('--json', action='store_true', help="Print the raw results as JSON.")
+    args = parser.parse_args()
+
+    results = run_all()
+    if args.json:
+        print(json.dumps(results))
+        return
+    runs = [(args.compare, run_revision(args.compare))] if args.compare else []
+    runs.append(('this tree', results))
+
+    print(f"{'script':<14}{'revision':<12}{'turns':>7}{'asked again':>13}{'chat calls':>12}{'validations':>13}"
+          f"{'skipped':>9}{'misfiled':>10}{'lost':>6}")
+    for index, script in enumerate(SCRIPTS):
+        for label, rows in runs:
+            row = rows[index]
+            status = '' if row['complete'] else ' (stuck)'
+            print(f"{script:<14}{label + status:<12}{row['turns']:>7}{row['asked_again']:>13}{row['chat_calls']:>12}"
+                  f"{row['validation_calls']:>13}{row['skipped']:>9}{row['misfiled']:>10}{row['lost']:>6}")
+    if any(row['misfiled'] or row['lost'] or not row['complete'] for row in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,284 @@
+import argparse
+import base64
+import http.client
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from urllib.parse import urlsplit
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from bench.mock_openai import MockOpenAIServer, add_latency_arguments, parse_latencies
+from bench.personas import PERSONAS, next_open_question
+from bench.smtp_sink import SMTPSink
+from bench.stats import LatencyRecorder, compare_summaries, format_summary
+
+MAX_TURNS = 200
+VOICE_CLIP = b'\x1aE\xdf\xa3' + bytes(2048)
+
+
+class InProcessClient:
+    def __init__(self, app, headers=None):
+        self.client = app.test_client()
+        self.headers = headers or {}
+
+    def request(self, method, path, payload=None):
+        response = self.client.open(path, method=method, json=payload, headers=self.headers)
+        return response.status_code, response.get_json(silent=True)
+
+    def upload(self, path, field, filename, content, content_type='application/octet-stream'):
+        response = self.client.post(
+            path,
+            data={field: (io.BytesIO(content), filename, content_type)},
+            headers=self.headers,
+            content_type='multipart/form-data',
+        )
+        return response.status_code, response.get_json(silent=True)
+
+
+class HttpClient:
+    def __init__(self, base_url, headers=None):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.headers = headers or {}
+        self.connection = http.client.HTTPConnection(self.host, self.port, timeout=120)
+
+    def _send(self, method, path, body, headers):
+        headers = {**self.headers, **headers}
+        try:
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+        except (http.client.HTTPException, OSError):
+            self.connection.close()
+            self.connection = http.client.HTTPConnection(self.host, self.port, timeout=120)
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+        data = response.read()
+        try:
+            parsed = json.loads(data) if response.getheader('Content-Type', '').startswith('application/json') else None
+        except ValueError:
+            parsed = None
+        return response.status, parsed
+
+    def request(self, method, path, payload=None):
+        body = json.dumps(payload).encode('utf-8') if payload is not None else None
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        return self._send(method, path, body, headers)
+
+    def upload(self, path, field, filename, content, content_type='application/octet-stream'):
+        boundary = uuid.uuid4().hex
+        body = (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'
+        ).encode('utf-8') + content + f'\r\n--{boundary}--\r\n'.encode('utf-8')
+        return self._send('POST', path, body, {'Content-Type': f'multipart/form-data; boundary={boundary}'})
+
+
+class RecordingClient:
+    def __init__(self, client, log, session):
+        self.client = client
+        self.log = log
+        self.session = session
+
+    def request(self, method, path, payload=None):
+        entry = {'t': time.time(), 'session': self.session, 'method': method, 'path': path}
+        if payload is not None:
+            entry['json'] = payload
+        self.log.write(entry)
+        return self.client.request(method, path, payload)
+
+    def upload(self, path, field, filename, content, content_type='application/octet-stream'):
+        self.log.write({
+            't': time.time(),
+            'session': self.session,
+            'method': 'POST',
+            'path': path,
+            'upload': {
+                'field': field,
+                'filename': filename,
+                'content_type': content_type,
+                'data': base64.b64encode(content).decode('ascii'),
+            },
+        })
+        return self.client.upload(path, field, filename, content, content_type)
+
+
+class RequestLog:
+    def __init__(self, path):
+        self._file = open(path, 'w', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def write(self, entry):
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + '\n')
+
+    def close(self):
+        self._file.close()
+
+
+def prepare_environment(mock, sink, answers_yaml_path):
+    os.environ.update({
+        'OPENAI_API_KEY': 'mock-key',
+        'OPENAI_BASE_URL': mock.base_url,
+        'ASSISTANT_ID': 'asst_mock',
+        'SMTP_SERVER': '127.0.0.1',
+        'SMTP_PORT': str(sink.port),
+        'SMTP_USERNAME': 'mock',
+        'SMTP_PASSWORD': 'mock',
+        'SMTP_STARTTLS': '0',
+        'FROM_EMAIL': 'bench@ainoespoo.com',
+        'ANSWERS_YAML_PATH': answers_yaml_path,
+    })
+    os.environ.setdefault('ANALYTICS_DB_PATH', os.path.join(os.path.dirname(answers_yaml_path), 'analytics.sqlite3'))
+    os.environ.setdefault('ARCHIVE_DB_PATH', os.path.join(os.path.dirname(answers_yaml_path), 'archive.sqlite3'))
+
+
+def run_persona(client, persona, business_plan_sections, recorder, tts=False, download=False, voice=False):
+    def call(method, route, payload=None):
+        start = time.perf_counter()
+        status, data = client.request(method, route, payload)
+        recorder.record(route, time.perf_counter() - start, ok=status < 400)
+        return status, data
+
+    def chat(message):
+        if voice:
+            start = time.perf_counter()
+            status, _ = client.upload('/api/transcribe', 'audio', 'recording.webm', VOICE_CLIP, 'audio/webm')
+            recorder.record('/api/transcribe', time.perf_counter() - start, ok=status < 400)
+        status, data = call('POST', '/api/chat', {'message': message})
+        if status < 400 and tts and data and data.get('response'):
+            call('POST', '/api/tts', {'text': data['response']})
+        return status, data
+
+    call('POST', '/api/reset')
+    call('GET', '/api/business-plan-structure')
+
+    data = None
+    for message in persona.onboarding:
+        status, data = chat(message)
+        if status >= 400:
+            return False
+
+    attempts = {}
+    asked = 0
+    for _ in range(MAX_TURNS):
+        question = next_open_question(data['business_plan_progress'], business_plan_sections)
+        if question is None:
+            break
+        attempt = attempts.get(question['id'], 0)
+        if attempt == 0:
+            asked += 1
+        attempts[question['id']] = attempt + 1
+        status, data = chat(persona.answer(question, asked - 1, attempt))
+        if status >= 400:
+            return False
+    else:
+        return False
+
+    status, data = chat(f"Please send the report to {persona.email}")
+    if status >= 400:
+        return False
+    if download:
+        call('GET', '/api/download-report')
+    return bool(data and data.get('report_sent'))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Drive scripted personas through the full /api/chat flow and report latency per route.",
+    )
+    parser.add_argument('--personas', default=','.join(PERSONAS), help="Comma-separated persona names.")
+    parser.add_argument('--rounds', type=int, default=1, help="How many times to run each persona.")
+    parser.add_argument('--url', help="Drive an already running server over HTTP instead of in-process.")
+    parser.add_argument('--tts', action='store_true', help="Request TTS audio for every assistant reply.")
+    parser.add_argument('--download', action='store_true', help="Download the DOCX report at the end of each run.")
+    parser.add_argument('--voice', action='store_true', help="Upload a voice clip to /api/transcribe before every message.")
+    parser.add_argument('--record', help="Write every request as a JSONL log that bench.replay can play back.")
+    parser.add_argument('--json', dest='json_path', help="Write the summary as JSON to this path.")
+    parser.add_argument('--baseline', help="Compare against a previous --json summary and fail on regressions.")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed latency regression vs the baseline.")
+    add_latency_arguments(parser)
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.personas.split(',') if name.strip()]
+    unknown = [name for name in names if name not in PERSONAS]
+    if unknown:
+        parser.error(f"Unknown personas: {', '.join(unknown)}")
+
+    mock = MockOpenAIServer(latencies=parse_latencies(args.latency)).start()
+    sink = SMTPSink().start()
+    workdir = tempfile.mkdtemp(prefix='aino-bench-')
+    answers_yaml_path = os.path.join(workdir, 'improved_business_plan.yaml')
+    shutil.copyfile(os.path.join(BASE_DIR, 'config', 'improved_business_plan.yaml'), answers_yaml_path)
+    prepare_environment(mock, sink, answers_yaml_path)
+
+    from services.business_plan_service import load_business_plan_from_yaml
+    business_plan_sections = load_business_plan_from_yaml()
+
+    if args.url:
+        client = HttpClient(args.url)
+        print(f"Driving {args.url} (start it with OPENAI_BASE_URL={mock.base_url} SMTP_PORT={sink.port} SMTP_STARTTLS=0)")
+    else:
+        from app import app
+        client = InProcessClient(app)
+
+    recorder = LatencyRecorder()
+    request_log = RequestLog(args.record) if args.record else None
+    failures = []
+    try:
+        for round_index in range(args.rounds):
+            for name in names:
+                persona_client = client
+                if request_log:
+                    persona_client = RecordingClient(client, request_log, f"{name}-{round_index + 1}")
+                if not run_persona(persona_client, PERSONAS[name], business_plan_sections, recorder,
+                                   args.tts, args.download, args.voice):
+                    failures.append(f"{name} (round {round_index + 1})")
+    finally:
+        recorder.stop()
+        if request_log:
+            request_log.close()
+        mock.stop()
+        sink.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    summary = recorder.summary()
+    summary['upstream_calls'] = dict(mock.counts)
+    summary['emails_sent'] = sink.messages
+    summary['latency'] = {route: repr(model) for route, model in mock.latencies.items()}
+
+    print(format_summary(summary))
+    print(f"upstream calls: {summary['upstream_calls']}, emails delivered: {sink.messages}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+
+    exit_code = 0
+    if failures:
+        print(f"Persona runs that did not finish: {', '.join(failures)}")
+        exit_code = 1
+    if summary['total_errors']:
+        exit_code = 1
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare_summaries(json.load(f), summary, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            exit_code = 1
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+SAMPLE_ANSWER = (
+    "We will run a small specialty coffee shop near Espoo station for commuters and students, with locally "
+    "baked pastries, a lunch offer and catering for nearby offices."
+)
+SAMPLE_REPLY = "Thanks, that's a clear answer! Next, could you tell me a little more about {label}?"
+
+
+def build_conversation(questions, answered):
+    form_data = {
+        'company_name': 'Aino Coffee', 'language': 'English', 'sphere': 'Food and beverage',
+        'education': 'Bachelor of Business', 'experience': '5 years', 'location': 'Espoo',
+    }
+    chat_history = []
+    for question in questions[:answered]:
+        form_data[question.id] = f"{SAMPLE_ANSWER} ({question.label})"
+        chat_history.append({'role': 'user', 'content': form_data[question.id]})
+        chat_history.append({'role': 'assistant', 'content': SAMPLE_REPLY.format(label=question.label)})
+    return form_data, chat_history, {}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure memory per idle session, snapshot size, eviction cost and resume latency of the "
+                    "session store in models/state.py.",
+    )
+    parser.add_argument('--sessions', type=int, default=2000)
+    parser.add_argument('--answered', type=int, default=26, help="Checklist answers per session.")
+    args = parser.parse_args()
+
+    os.environ['SESSION_SNAPSHOT_DIR'] = tempfile.mkdtemp(prefix='aino-sessions-')
+    os.environ['SESSION_IDLE_TTL'] = '0'
+    from models import state
+
+    questions = state.get_catalog().questions
+    session_ids = [f"bench-{index:06d}" for index in range(args.sessions)]
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for session_id in session_ids:
+        form_data, chat_history, _, answers = state.get_conversation(session_id)
+        seeded = build_conversation(questions, args.answered)
+        form_data.update(seeded[0])
+        chat_history.extend(seeded[1])
+        for question in questions[:args.answered]:
+            answers.mark(question, form_data[question.id])
+    resident = tracemalloc.get_traced_memory()[0]
+
+    start = time.perf_counter()
+    evicted = state.evict_idle_sessions(idle_ttl=0)
+    evict_seconds = time.perf_counter() - start
+    after_evict = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    disk_bytes = sum(os.path.getsize(os.path.join(state.SESSION_SNAPSHOT_DIR, name))
+                     for name in os.listdir(state.SESSION_SNAPSHOT_DIR))
+
+    resume = []
+    mismatches = 0
+    expected = build_conversation(questions, args.answered)
+    expected_answers = state.get_catalog().answers_from(expected[0])
+    for session_id in random.sample(session_ids, len(session_ids)):
+        start = time.perf_counter()
+        form_data, chat_history, _, answers = state.get_conversation(session_id)
+        resume.append((time.perf_counter() - start) * 1e6)
+        if (form_data != expected[0] or chat_history != expected[1][-state.SESSION_HISTORY_KEEP:]
+                or answers.completed != expected_answers.completed):
+            mismatches += 1
+    resume.sort()
+
+    print(f"{args.sessions} sessions with {args.answered} answers and {2 * args.answered} chat messages each")
+    print(f"resident:  {(resident - before) / args.sessions / 1024:8.1f} KiB per session")
+    print(f"evicted:   {(after_evict - before) / args.sessions / 1024:8.2f} KiB per session in memory, "
+          f"{disk_bytes / max(evicted, 1) / 1024:.2f} KiB per snapshot on disk")
+    print(f"eviction:  {evict_seconds / max(evicted, 1) * 1e6:8.0f} us per session ({evicted} evicted)")
+    print(f"resume:    p50 {statistics.median(resume):.0f} us, p99 {resume[int(len(resume) * 0.99)]:.0f} us, "
+          f"{mismatches} mismatches")
+    sys.exit(1 if mismatches or evicted != args.sessions else 0)
+
+
+if __name__ == '__main__':
+    main()
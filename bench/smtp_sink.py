@@ -0,0 +1,123 @@
+import argparse
+import socketserver
+import threading
+
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line):
+        self.wfile.write(line.encode('ascii') + b'\r\n')
+        self.wfile.flush()
+
+    def handle(self):
+        self._reply('220 aino-smtp-sink ready')
+        mail_from = None
+        recipients = []
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            line = raw.decode('utf-8', 'replace').rstrip('\r\n')
+            command = line[:4].upper()
+
+            if command in ('EHLO', 'HELO'):
+                if command == 'EHLO':
+                    self.wfile.write(b'250-aino-smtp-sink\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME\r\n')
+                    self.wfile.flush()
+                else:
+                    self._reply('250 aino-smtp-sink')
+            elif command == 'AUTH':
+                mechanism = line.split()[1].upper() if len(line.split()) > 1 else ''
+                if mechanism == 'LOGIN':
+                    self._reply('334 VXNlcm5hbWU6')
+                    self.rfile.readline()
+                    self._reply('334 UGFzc3dvcmQ6')
+                    self.rfile.readline()
+                elif mechanism == 'PLAIN' and len(line.split()) < 3:
+                    self._reply('334 ')
+                    self.rfile.readline()
+                self._reply('235 Authentication successful')
+            elif command == 'MAIL':
+                mail_from = line.split(':', 1)[1].strip()
+                recipients = []
+                self._reply('250 OK')
+            elif command == 'RCPT':
+                recipients.append(line.split(':', 1)[1].strip())
+                self._reply('250 OK')
+            elif command == 'DATA':
+                self._reply('354 End data with <CR><LF>.<CR><LF>')
+                size = 0
+                while True:
+                    data_line = self.rfile.readline()
+                    if not data_line or data_line in (b'.\r\n', b'.\n'):
+                        break
+                    size += len(data_line)
+                self.server.deliver(mail_from, recipients, size)
+                self._reply('250 OK: queued')
+            elif command == 'RSET':
+                mail_from = None
+                recipients = []
+                self._reply('250 OK')
+            elif command == 'NOOP':
+                self._reply('250 OK')
+            elif command == 'QUIT':
+                self._reply('221 Bye')
+                return
+            elif command == 'STAR':
+                self._reply('454 TLS not available on the sink; set SMTP_STARTTLS=0')
+            else:
+                self._reply('502 Command not implemented')
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 64
+
+    def __init__(self, host='127.0.0.1', port=0, verbose=False):
+        super().__init__((host, port), SMTPSinkHandler)
+        self.verbose = verbose
+        self.messages = 0
+        self.bytes_received = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def deliver(self, mail_from, recipients, size):
+        with self._lock:
+            self.messages += 1
+            self.bytes_received += size
+        if self.verbose:
+            print(f"Received message from {mail_from} to {', '.join(recipients)} ({size} bytes)")
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name='smtp-sink', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local SMTP sink that accepts and discards all mail.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=2525)
+    args = parser.parse_args()
+
+    server = SMTPSink(args.host, args.port, verbose=True)
+    print(f"SMTP sink listening on {args.host}:{server.port}")
+    print(f"Point the app at it with: SMTP_SERVER={args.host} SMTP_PORT={server.port} SMTP_STARTTLS=0")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
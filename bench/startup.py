@@ -0,0 +1,125 @@
+import argparse
+import io
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ('openai', 'httpx', 'yaml', 'docx', 'markdown', 'smtplib', 'weasyprint')
+
+MEASURE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import app
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    'import_ms': elapsed * 1000,
+    'maxrss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'modules': len(sys.modules),
+    'heavy': [name for name in %r if name in sys.modules],
+}))
+"""
+
+FIRST_REQUEST = """
+import json, resource, time
+start = time.perf_counter()
+import app
+client = app.app.test_client()
+client.get('/api/business-plan-structure')
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    'first_request_ms': elapsed * 1000,
+    'maxrss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+}))
+"""
+
+
+def bench_environment():
+    env = dict(os.environ)
+    env.update({
+        'OPENAI_API_KEY': 'mock-key',
+        'ASSISTANT_ID': 'asst_mock',
+        'SMTP_SERVER': '127.0.0.1',
+        'SMTP_USERNAME': 'mock',
+        'SMTP_PASSWORD': 'mock',
+        'FROM_EMAIL': 'bench@ainoespoo.com',
+    })
+    return env
+
+
+def export_revision(ref, destination):
+    archive = subprocess.run(
+        ['git', 'archive', '--format=tar', ref],
+        cwd=BASE_DIR, check=True, capture_output=True,
+    ).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(destination)
+    config_path = os.path.join(BASE_DIR, 'config', 'config.py')
+    if os.path.exists(config_path):
+        shutil.copyfile(config_path, os.path.join(destination, 'config', 'config.py'))
+
+
+def run_once(tree, script):
+    result = subprocess.run(
+        [sys.executable, '-c', script],
+        cwd=tree, env=bench_environment(), capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Startup probe failed in {tree}:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure(tree, runs):
+    imports = [run_once(tree, MEASURE % (HEAVY_MODULES,)) for _ in range(runs)]
+    first_requests = [run_once(tree, FIRST_REQUEST) for _ in range(runs)]
+    return {
+        'import_ms': statistics.median(r['import_ms'] for r in imports),
+        'import_rss_mb': statistics.median(r['maxrss_kb'] for r in imports) / 1024,
+        'first_request_ms': statistics.median(r['first_request_ms'] for r in first_requests),
+        'first_request_rss_mb': statistics.median(r['maxrss_kb'] for r in first_requests) / 1024,
+        'modules': imports[-1]['modules'],
+        'heavy': imports[-1]['heavy'],
+    }
+
+
+def print_row(label, row):
+    print(
+        f"{label:<14}{row['import_ms']:>11.1f}{row['import_rss_mb']:>11.1f}"
+        f"{row['first_request_ms']:>13.1f}{row['first_request_rss_mb']:>12.1f}{row['modules']:>9}  "
+        f"{', '.join(row['heavy']) or '-'}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure cold-start import time and RSS of app.py, optionally against another git revision.",
+    )
+    parser.add_argument('--runs', type=int, default=5, help="Fresh interpreter runs per measurement (median).")
+    parser.add_argument('--compare', metavar='REF', help="Also measure this git revision, e.g. HEAD~1.")
+    args = parser.parse_args()
+
+    results = {}
+    workdir = None
+    try:
+        if args.compare:
+            workdir = tempfile.mkdtemp(prefix='aino-startup-')
+            export_revision(args.compare, workdir)
+            results[args.compare] = measure(workdir, args.runs)
+        results['working tree'] = measure(BASE_DIR, args.runs)
+    finally:
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{'':<14}{'import ms':>11}{'RSS MB':>11}{'1st req ms':>13}{'RSS MB':>12}{'modules':>9}  heavy modules loaded")
+    for label, row in results.items():
+        print_row(label, row)
+
+
+if __name__ == '__main__':
+    main()
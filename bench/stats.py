@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import defaultdict
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+class LatencyRecorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(list)
+        self._errors = defaultdict(int)
+        self.started_at = time.perf_counter()
+        self.finished_at = None
+
+    def record(self, route, seconds, ok=True):
+        with self._lock:
+            self._samples[route].append(seconds)
+            if not ok:
+                self._errors[route] += 1
+
+    def stop(self):
+        self.finished_at = time.perf_counter()
+
+    def wall_seconds(self):
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return max(end - self.started_at, 1e-9)
+
+    def summary(self):
+        wall = self.wall_seconds()
+        routes = {}
+        with self._lock:
+            for route, samples in sorted(self._samples.items()):
+                routes[route] = {
+                    'count': len(samples),
+                    'errors': self._errors.get(route, 0),
+                    'p50_ms': percentile(samples, 50) * 1000,
+                    'p95_ms': percentile(samples, 95) * 1000,
+                    'p99_ms': percentile(samples, 99) * 1000,
+                    'mean_ms': sum(samples) / len(samples) * 1000,
+                    'rps': len(samples) / wall,
+                }
+            total = sum(len(s) for s in self._samples.values())
+            errors = sum(self._errors.values())
+        return {
+            'wall_seconds': wall,
+            'total_requests': total,
+            'total_errors': errors,
+            'rps': total / wall,
+            'routes': routes,
+        }
+
+
+def format_summary(summary):
+    header = f"{'route':<34}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'rps':>9}"
+    lines = [header, '-' * len(header)]
+    for route, row in summary['routes'].items():
+        lines.append(
+            f"{route:<34}{row['count']:>7}{row['errors']:>8}"
+            f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['rps']:>9.1f}"
+        )
+    lines.append('-' * len(header))
+    lines.append(
+        f"total: {summary['total_requests']} requests, {summary['total_errors']} errors, "
+        f"{summary['wall_seconds']:.2f}s wall, {summary['rps']:.1f} req/s"
+    )
+    return '\n'.join(lines)
+
+
+def compare_summaries(baseline, current, tolerance=0.2):
+    regressions = []
+    for route, row in current['routes'].items():
+        base = baseline.get('routes', {}).get(route)
+        if not base:
+            continue
+        for key in ('p50_ms', 'p95_ms', 'p99_ms'):
+            if base[key] > 0 and row[key] > base[key] * (1 + tolerance):
+                regressions.append(f"{route} {key}: {base[key]:.1f} -> {row[key]:.1f}")
+        if row['errors'] > base['errors']:
+            regressions.append(f"{route} errors: {base['errors']} -> {row['errors']}")
+    return regressions
+
+
+def format_comparison(baseline, current):
+    header = (f"{'route':<34}{'count':>7}{'errors':>11}{'p50 ms':>20}{'p95 ms':>20}{'p99 ms':>20}")
+    lines = [header, '-' * len(header)]
+    for route in sorted(set(baseline.get('routes', {})) | set(current['routes'])):
+        base = baseline.get('routes', {}).get(route)
+        row = current['routes'].get(route)
+        if not base or not row:
+            lines.append(f"{route:<34}{'only in ' + ('current' if row else 'baseline'):>27}")
+            continue
+        cells = []
+        for key in ('p50_ms', 'p95_ms', 'p99_ms'):
+            delta = (row[key] - base[key]) / base[key] * 100 if base[key] > 0 else 0.0
+            cells.append(f"{base[key]:>7.1f}>{row[key]:<7.1f}{delta:>+5.0f}%")
+        errors = f"{base['errors']}>{row['errors']}"
+        lines.append(f"{route:<34}{row['count']:>7}{errors:>11}" + ''.join(f"{cell:>20}" for cell in cells))
+    lines.append('-' * len(header))
+    lines.append(
+        f"requests/s: {baseline.get('rps', 0.0):.1f} -> {current['rps']:.1f}, "
+        f"errors: {baseline.get('total_errors', 0)} -> {current['total_errors']}"
+    )
+    return '\n'.join(lines)
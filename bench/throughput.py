@@ -0,0 +1,59 @@
+import argparse
+import os
+import sys
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from bench.run import HttpClient
+from bench.stats import LatencyRecorder, format_summary
+
+ROUTES = {
+    'tts': ('POST', '/api/tts', {'text': 'Thanks! What will you sell, and who will buy it?'}),
+    'structure': ('GET', '/api/business-plan-structure', None),
+    'health': ('GET', '/healthz', None),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Hammer stateless routes of a running server with concurrent clients and report throughput.",
+    )
+    parser.add_argument('--url', default='http://127.0.0.1:5001')
+    parser.add_argument('--concurrency', type=int, default=16, help="Concurrent client connections.")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds to run.")
+    parser.add_argument('--routes', default='tts,structure',
+                        help=f"Comma-separated mix of: {', '.join(ROUTES)}. Clients cycle through it.")
+    args = parser.parse_args()
+
+    mix = [ROUTES[name.strip()] for name in args.routes.split(',') if name.strip()]
+    recorder = LatencyRecorder()
+    deadline = time.perf_counter() + args.duration
+
+    def worker(offset):
+        client = HttpClient(args.url)
+        index = offset
+        while time.perf_counter() < deadline:
+            method, path, payload = mix[index % len(mix)]
+            index += 1
+            start = time.perf_counter()
+            try:
+                status, _ = client.request(method, path, payload)
+            except OSError:
+                status = 599
+            recorder.record(path, time.perf_counter() - start, ok=status < 400)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    recorder.stop()
+    print(format_summary(recorder.summary()))
+
+
+if __name__ == '__main__':
+    main()
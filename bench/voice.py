@@ -0,0 +1,258 @@
+import argparse
+import http.client
+import json
+import logging
+import math
+import os
+import random
+import shutil
+import statistics
+import struct
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import wave
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+SAMPLE_RATE = 16000
+CHUNK_MS = 100
+TRAILING_SILENCE_S = 1.5
+
+# Each utterance is a list of phrase lengths in seconds; phrases are separated by short breathing pauses.
+UTTERANCES = [
+    [1.2, 0.8],
+    [0.9],
+    [1.4, 1.1, 0.9],
+    [1.6, 1.2],
+    [1.0, 1.3],
+    [0.8, 1.5, 1.2],
+]
+PHRASE_PAUSE_S = 0.35
+
+
+def synthesize(utterances, seed=7):
+    """Prerecorded-style test audio: voiced phrases (a harmonic tone with syllable-rate loudness changes) over
+    low background noise. Returns (pcm, [speech end offset in seconds per utterance])."""
+    rng = random.Random(seed)
+    samples = []
+    speech_ends = []
+
+    def noise(seconds):
+        samples.extend(rng.gauss(0, 60) for _ in range(int(seconds * SAMPLE_RATE)))
+
+    noise(0.5)
+    for phrases in utterances:
+        for index, length in enumerate(phrases):
+            if index:
+                noise(PHRASE_PAUSE_S)
+            pitch = rng.uniform(110, 220)
+            for n in range(int(length * SAMPLE_RATE)):
+                t = n / SAMPLE_RATE
+                envelope = 0.55 + 0.45 * math.sin(2 * math.pi * 4 * t)
+                voice = sum(math.sin(2 * math.pi * pitch * k * t) / k for k in (1, 2, 3))
+                samples.append(4000 * envelope * voice + rng.gauss(0, 60))
+        speech_ends.append(len(samples) / SAMPLE_RATE)
+        noise(TRAILING_SILENCE_S)
+    pcm = struct.pack(f'<{len(samples)}h', *(max(-32768, min(32767, int(s))) for s in samples))
+    return pcm, speech_ends
+
+
+def load_wav(path):
+    with wave.open(path, 'rb') as clip:
+        if clip.getnchannels() != 1 or clip.getsampwidth() != 2 or clip.getframerate() != SAMPLE_RATE:
+            raise SystemExit(f"{path} must be 16 kHz, 16-bit mono PCM")
+        return clip.readframes(clip.getnframes())
+
+
+def clip_bytes(pcm, start_s, end_s):
+    start, end = int(start_s * SAMPLE_RATE) * 2, int(end_s * SAMPLE_RATE) * 2
+    return pcm[start:end]
+
+
+def wav_file(pcm):
+    from services.voice_service import pcm_to_wav
+    return pcm_to_wav(pcm, SAMPLE_RATE)
+
+
+def post(port, url, body, headers):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    connection.request('POST', url, body=body, headers=headers)
+    response = connection.getresponse()
+    data = json.loads(response.read())
+    connection.close()
+    if response.status != 200:
+        raise RuntimeError(f"{url} returned {response.status}: {data}")
+    return data
+
+
+def run_upload(port, pcm, speech_ends):
+    """Press-and-hold as before: the clip is uploaded when the user lets go (here: right at the end of speech),
+    transcribed whole, and only then sent to /api/chat."""
+    session_id = uuid.uuid4().hex
+    rows = []
+    start_s = 0.0
+    for end_s in speech_ends:
+        clip = wav_file(clip_bytes(pcm, start_s, end_s))
+        boundary = uuid.uuid4().hex
+        body = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"audio\"; filename=\"recording.wav\"\r\n"
+                f"Content-Type: audio/wav\r\n\r\n").encode('utf-8') + clip + f"\r\n--{boundary}--\r\n".encode('utf-8')
+        started = time.perf_counter()
+        text = post(port, '/api/transcribe', body, {'Content-Type': f'multipart/form-data; boundary={boundary}',
+                                                     'X-Session-Id': session_id})['text']
+        transcript_ms = (time.perf_counter() - started) * 1000
+        post(port, '/api/chat', json.dumps({'message': text}), {'Content-Type': 'application/json',
+                                                                 'X-Session-Id': session_id})
+        reply_ms = (time.perf_counter() - started) * 1000
+        rows.append({'transcript_ms': transcript_ms, 'first_token_ms': reply_ms, 'reply_ms': reply_ms})
+        start_s = end_s + TRAILING_SILENCE_S
+    return rows, len(speech_ends)
+
+
+def run_streaming(port, pcm, speech_ends, hold=False):
+    """Streaming voice over /ws: audio is sent in real time in CHUNK_MS pieces, as a browser captures it.
+
+    Hands-free, the whole recording is streamed and the server's VAD decides where utterances end. With hold,
+    each utterance is its own press-and-hold: voice_stop is sent the moment speech ends.
+    """
+    from simple_websocket import Client
+
+    ws = Client.connect(f"ws://127.0.0.1:{port}/ws", headers={'X-Session-Id': uuid.uuid4().hex})
+    while json.loads(ws.receive(timeout=10))['type'] != 'progress':
+        pass
+    events = []
+    stopped = threading.Event()
+
+    def receive():
+        while True:
+            try:
+                data = ws.receive(timeout=60)
+            except Exception:
+                return
+            if data is None:
+                return
+            if isinstance(data, str):
+                event = json.loads(data)
+                events.append((time.perf_counter(), event))
+                if event.get('type') == 'voice' and event.get('state') == 'off':
+                    stopped.set()
+
+    def stream(audio):
+        chunk_bytes = SAMPLE_RATE * CHUNK_MS // 1000 * 2
+        started = time.perf_counter()
+        for index in range(0, len(audio), chunk_bytes):
+            # A chunk can only leave the browser once all of it has been captured.
+            delay = started + min(index + chunk_bytes, len(audio)) / 2 / SAMPLE_RATE - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            ws.send(audio[index:index + chunk_bytes])
+        return started
+
+    threading.Thread(target=receive, daemon=True).start()
+    speech_end_times = []
+    if hold:
+        start_s = 0.0
+        for end_s in speech_ends:
+            stopped.clear()
+            ws.send(json.dumps({'type': 'voice_start', 'sample_rate': SAMPLE_RATE, 'tts': False}))
+            stream(clip_bytes(pcm, start_s, end_s))
+            speech_end_times.append(time.perf_counter())
+            ws.send(json.dumps({'type': 'voice_stop'}))
+            stopped.wait(timeout=60)
+            start_s = end_s + TRAILING_SILENCE_S
+    else:
+        ws.send(json.dumps({'type': 'voice_start', 'sample_rate': SAMPLE_RATE, 'tts': False}))
+        started = stream(pcm)
+        speech_end_times = [started + end_s for end_s in speech_ends]
+        ws.send(json.dumps({'type': 'voice_stop'}))
+        stopped.wait(timeout=60)
+    ws.close()
+
+    finals = [(at, event) for at, event in events if event['type'] == 'transcript' and event['final']]
+    tokens = [at for at, event in events if event['type'] == 'token']
+    replies = [at for at, event in events if event['type'] == 'reply']
+    rows = []
+    for speech_end, (final_at, final) in zip(speech_end_times, finals):
+        first_token = next(at for at in tokens if at >= final_at)
+        reply = next(at for at in replies if at >= final_at)
+        rows.append({'transcript_ms': (final_at - speech_end) * 1000, 'first_token_ms': (first_token - speech_end) * 1000,
+                     'reply_ms': (reply - speech_end) * 1000, 'wait_ms': final['wait_ms']})
+    return rows, len(finals)
+
+
+def start_app():
+    from werkzeug.serving import make_server
+    from app import app
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, name='voice-bench-app', daemon=True).start()
+    return server
+
+
+def main():
+    from bench.mock_openai import MockOpenAIServer, add_latency_arguments, parse_latencies
+    from bench.run import prepare_environment
+    from bench.smtp_sink import SMTPSink
+
+    parser = argparse.ArgumentParser(
+        description="Speak a prerecorded conversation into the app twice: press-and-hold upload (/api/transcribe, "
+                    "then /api/chat) and streaming voice over /ws, and report the time from the end of speech to "
+                    "the transcript, the first reply token and the full reply.",
+    )
+    parser.add_argument('--visits', type=int, default=2, help="Times to play the recording per mode.")
+    parser.add_argument('--wav', help="Use this 16 kHz 16-bit mono recording; --speech-end gives its utterance ends.")
+    parser.add_argument('--speech-end', type=float, action='append', default=[], metavar='SECONDS',
+                        help="End of an utterance in --wav, in seconds (repeat per utterance).")
+    add_latency_arguments(parser)
+    args = parser.parse_args()
+
+    if args.wav:
+        pcm, speech_ends = load_wav(args.wav), args.speech_end
+    else:
+        pcm, speech_ends = synthesize(UTTERANCES)
+
+    latencies = parse_latencies(args.latency or ['chat=fixed:800', 'whisper=fixed:400+40/tok'])
+    mock = MockOpenAIServer(latencies=latencies).start()
+    sink = SMTPSink().start()
+    workdir = tempfile.mkdtemp(prefix='aino-voice-')
+    answers_yaml_path = os.path.join(workdir, 'improved_business_plan.yaml')
+    shutil.copyfile(os.path.join(BASE_DIR, 'config', 'improved_business_plan.yaml'), answers_yaml_path)
+    prepare_environment(mock, sink, answers_yaml_path)
+    server = start_app()
+    results = {}
+    try:
+        modes = (('upload', run_upload), ('hold', lambda *a: run_streaming(*a, hold=True)),
+                 ('handsfree', run_streaming))
+        for label, run in modes:
+            rows, detected = [], []
+            for _ in range(args.visits):
+                visit_rows, count = run(server.port, pcm, speech_ends)
+                rows.extend(visit_rows)
+                detected.append(count)
+            results[label] = (rows, detected)
+    finally:
+        server.shutdown()
+        mock.stop()
+        sink.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{len(speech_ends)} utterances x {args.visits} visits, {len(pcm) / 2 / SAMPLE_RATE:.1f} s of audio, "
+          f"medians from the end of speech (ms)")
+    print(f"{'':<10}{'utterances':>11}{'transcript':>12}{'first token':>13}{'reply':>8}{'segment wait':>14}")
+    for label, (rows, detected) in results.items():
+        def median(key):
+            values = [row[key] for row in rows if key in row]
+            return f"{statistics.median(values):.0f}" if values else '-'
+        print(f"{label:<10}{min(detected):>5}/{len(speech_ends):<5}{median('transcript_ms'):>12}"
+              f"{median('first_token_ms'):>13}{median('reply_ms'):>8}{median('wait_ms'):>14}")
+    if any(min(detected) != len(speech_ends) for _, detected in results.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+import argparse
+import os
+
+from services.asset_service import DIST_DIR, FINGERPRINTED_ASSETS, STATIC_DIR, build_manifest
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Copy static assets to content-hashed filenames under static/dist/ and write "
+                    "static/dist/manifest.json so pages can reference them with long-lived cache headers.",
+    )
+    parser.add_argument('--static-dir', default=STATIC_DIR, help="Static directory to fingerprint.")
+    parser.add_argument('--prune', action='store_true',
+                        help="Delete hashed files from earlier builds. Keep them while old pages may still be open.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    manifest = build_manifest(args.static_dir, FINGERPRINTED_ASSETS)
+    for source, hashed in sorted(manifest.items()):
+        size = os.path.getsize(os.path.join(args.static_dir, hashed))
+        print(f"{source} -> {hashed} ({size} bytes)")
+
+    if args.prune:
+        current = {os.path.normpath(hashed) for hashed in manifest.values()}
+        dist_dir = os.path.join(args.static_dir, DIST_DIR)
+        for root, _, files in os.walk(dist_dir):
+            for name in files:
+                relative = os.path.normpath(os.path.relpath(os.path.join(root, name), args.static_dir))
+                if name != 'manifest.json' and relative not in current:
+                    os.remove(os.path.join(root, name))
+                    print(f"Removed {relative}")
+
+
+if __name__ == '__main__':
+    main()
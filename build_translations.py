@@ -0,0 +1,122 @@
+import argparse
+import json
+import os
+
+from models.catalog import Catalog
+from services.business_plan_service import load_business_plan_sections
+from services.catalog_registry import DEFAULT_TENANT, list_tenants, tenant_exists, tenant_paths
+from services.language_service import (
+    LANGUAGES,
+    DEFAULT_LANGUAGE,
+    collect_source_phrases,
+    get_translation_path,
+    language_name,
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Translate every checklist label/fill and fixed UI message once and store them in "
+                    "config/translations/<code>.json for the web app to serve; each other tenant gets the phrases "
+                    "only its checklist has in <tenant dir>/translations/<code>.json.",
+    )
+    parser.add_argument('languages', nargs='*',
+                        help=f"Language codes (default: all of {', '.join(sorted(set(LANGUAGES) - {DEFAULT_LANGUAGE}))}).")
+    parser.add_argument('--tenant', action='append', help="Tenant to translate; repeat for several (default: all).")
+    parser.add_argument('--model', default='gpt-4o-mini', help="OpenAI chat model used for translation.")
+    parser.add_argument('--batch-size', type=int, default=40, help="Phrases per translation request.")
+    parser.add_argument('--prune', action='store_true', help="Drop cached phrases that are no longer used.")
+    return parser.parse_args()
+
+
+def translate_batch(client, model, code, phrases):
+    prompt = (
+        f"Translate each string in the JSON array below from English to {language_name(code)}. "
+        "They are questions, hints and messages shown to entrepreneurs filling in a business plan. "
+        "Keep the tone friendly and plain, keep placeholders, numbers and punctuation style. "
+        'Return a JSON object {"translations": [...]} with exactly one translation per input string, '
+        "in the same order.\n\n"
+        + json.dumps(phrases, ensure_ascii=False)
+    )
+    response = client.chat.completions.create(
+        model=model,
+        messages=[
+            {'role': 'system', 'content': 'You are a professional translator. Reply with JSON only.'},
+            {'role': 'user', 'content': prompt}
+        ],
+        temperature=0.2,
+        response_format={'type': 'json_object'}
+    )
+    translations = json.loads(response.choices[0].message.content).get('translations', [])
+    if len(translations) != len(phrases):
+        raise ValueError(f"Expected {len(phrases)} translations, got {len(translations)}")
+    return dict(zip(phrases, translations))
+
+
+def read_phrases(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('phrases', {})
+
+
+def build_tenant(client, args, tenant, codes):
+    sources = collect_source_phrases(Catalog.from_sections(load_business_plan_sections(tenant_paths(tenant)[0])))
+
+    for code in codes:
+        path = get_translation_path(code, tenant)
+        phrases = read_phrases(path)
+        # Phrases the default build already translated are looked up there, so a tenant only pays for its own.
+        inherited = {} if tenant == DEFAULT_TENANT else read_phrases(get_translation_path(code))
+        wanted = [phrase for phrase in sources if phrase not in inherited]
+
+        missing = [phrase for phrase in wanted if phrase not in phrases]
+        for start in range(0, len(missing), args.batch_size):
+            batch = missing[start:start + args.batch_size]
+            phrases.update(translate_batch(client, args.model, code, batch))
+            print(f"{tenant}/{code}: translated {min(start + len(batch), len(missing))}/{len(missing)} phrases")
+
+        if args.prune:
+            phrases = {phrase: phrases[phrase] for phrase in wanted if phrase in phrases}
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'language': code,
+                'name': language_name(code),
+                'tenant': tenant,
+                'model': args.model,
+                'phrases': phrases
+            }, f, ensure_ascii=False, indent=1)
+        print(f"{tenant}/{code}: {len(phrases)} phrases written to {path}")
+
+
+def main():
+    args = parse_args()
+    from services.openai_client import get_client
+
+    codes = []
+    for code in args.languages or sorted(LANGUAGES):
+        code = code.lower()
+        if code not in LANGUAGES or code == DEFAULT_LANGUAGE:
+            if args.languages:
+                print(f"Skipping unsupported language '{code}'")
+            continue
+        codes.append(code)
+
+    tenants = []
+    for tenant in args.tenant or list_tenants():
+        if not tenant_exists(tenant):
+            print(f"Skipping unknown tenant '{tenant}'")
+            continue
+        tenants.append(tenant)
+    # The default tenant goes first: the others only translate what it does not already have.
+    tenants.sort(key=lambda tenant: tenant != DEFAULT_TENANT)
+
+    client = get_client()
+    for tenant in tenants:
+        build_tenant(client, args, tenant, codes)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,16 @@
 import argparse
 
-from markdown import markdown
-from weasyprint import HTML
+
+def render_pdf(input_file: str, output_file: str) -> str:
+    from markdown import markdown
+    from weasyprint import HTML
+
+    with open(input_file, "r", encoding="utf-8") as f:
+        md_text = f.read()
+
+    html_text = markdown(md_text)
+    HTML(string=html_text).write_pdf(output_file)
+    return output_file
 
 
 def main() -> None:
@@ -13,11 +22,7 @@ def main() -> None:
 
     args = parser.parse_args()
 
-    with open(args.input_file, "r", encoding="utf-8") as f:
-        md_text = f.read()
-
-    html_text = markdown(md_text)
-    HTML(string=html_text).write_pdf(args.output_file)
+    render_pdf(args.input_file, args.output_file)
 
     print(f"PDF created: {args.output_file}")
 
@@ -1,8 +1,17 @@
 import argparse
+import hashlib
+import json
 import os
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Iterator, Optional
 
 import yaml
-from openai import OpenAI
+
+RENDER_FORMATS = ("docx", "pdf")
 
 
 def parse_args() -> argparse.Namespace:
@@ -35,6 +44,49 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="If set, prints the filled markdown instead of writing a file.",
     )
+    batch = parser.add_argument_group("batch mode")
+    batch.add_argument(
+        "--batch-input",
+        help="Directory of answer YAML files, or a JSONL file with one {\"id\": ..., \"answers\": {...}} "
+             "object per line. Enables batch mode.",
+    )
+    batch.add_argument(
+        "--output-dir",
+        default=os.path.join(base_dir, "filled"),
+        help="Directory the filled plans (<id>.md and rendered files) are written to in batch mode.",
+    )
+    batch.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Concurrent OpenAI fill requests in batch mode.",
+    )
+    batch.add_argument(
+        "--render",
+        action="append",
+        choices=RENDER_FORMATS,
+        default=[],
+        help="Also render each filled plan to this format (repeatable).",
+    )
+    batch.add_argument(
+        "--render-workers",
+        type=int,
+        default=os.cpu_count() or 2,
+        help="Processes used for DOCX/PDF rendering in batch mode.",
+    )
+    batch.add_argument(
+        "--checkpoint",
+        help="Checkpoint file recording finished plans (default: <output-dir>/.checkpoint.jsonl).",
+    )
+    batch.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate every plan even if the checkpoint says it is up to date.",
+    )
+    batch.add_argument(
+        "--summary-json",
+        help="Write the batch summary (counts, throughput, failures) to this JSON file.",
+    )
     return parser.parse_args()
 
 
@@ -80,8 +132,12 @@ def build_messages(template_markdown: str, answers: dict) -> str:
 def call_openai_filling_model(
     model: str,
     prompt: str,
+    client=None,
 ) -> str:
-    client = OpenAI()
+    if client is None:
+        from openai import OpenAI
+
+        client = OpenAI()
     response = client.responses.create(
         model=model,
         input=prompt,
@@ -100,6 +156,166 @@ def call_openai_filling_model(
     return content
 
 
+def answers_key(template_markdown: str, model: str, answers: dict) -> str:
+    payload = json.dumps([template_markdown, model, answers], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def iter_answer_sets(path: str) -> Iterator[tuple[str, dict]]:
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            stem, ext = os.path.splitext(name)
+            if ext in (".yaml", ".yml"):
+                yield stem, load_yaml_answers(os.path.join(path, name))
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if "answers" in record:
+                yield str(record.get("id", line_number)), record["answers"]
+            else:
+                yield str(line_number), record
+
+
+def load_checkpoint(path: str) -> dict[str, dict]:
+    done: dict[str, dict] = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            done[entry["id"]] = entry
+    return done
+
+
+def render_outputs(markdown_path: str, formats: list[str]) -> list[str]:
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if project_dir not in sys.path:
+        sys.path.insert(0, project_dir)
+    stem = os.path.splitext(markdown_path)[0]
+    outputs = []
+    for output_format in formats:
+        output_path = f"{stem}.{output_format}"
+        if output_format == "docx":
+            from services.docx_service import render_docx
+
+            with open(markdown_path, "r", encoding="utf-8") as f:
+                render_docx(f.read(), output_path)
+        else:
+            from business_plan.create_pdf_from_filled_business_plan import render_pdf
+
+            render_pdf(markdown_path, output_path)
+        outputs.append(output_path)
+    return outputs
+
+
+def run_batch(args: argparse.Namespace, template_markdown: str) -> dict:
+    from openai import OpenAI
+
+    started = time.perf_counter()
+    os.makedirs(args.output_dir, exist_ok=True)
+    checkpoint_path = args.checkpoint or os.path.join(args.output_dir, ".checkpoint.jsonl")
+    done = {} if args.force else load_checkpoint(checkpoint_path)
+    formats = list(dict.fromkeys(args.render))
+
+    def output_paths(set_id: str) -> list[str]:
+        stem = os.path.join(args.output_dir, set_id)
+        return [f"{stem}.md"] + [f"{stem}.{output_format}" for output_format in formats]
+
+    groups: dict[str, list[str]] = {}
+    answers_by_key: dict[str, dict] = {}
+    total = skipped = 0
+    for set_id, answers in iter_answer_sets(args.batch_input):
+        total += 1
+        key = answers_key(template_markdown, args.model, answers)
+        entry = done.get(set_id)
+        if entry and entry.get("key") == key and all(os.path.exists(p) for p in output_paths(set_id)):
+            skipped += 1
+            continue
+        groups.setdefault(key, []).append(set_id)
+        answers_by_key[key] = answers
+
+    print(f"{total} answer sets: {skipped} up to date, {len(groups)} unique plans to fill")
+
+    client = OpenAI()
+    checkpoint_lock = threading.Lock()
+    failures: list[dict] = []
+    filled = 0
+
+    def fill(key: str) -> str:
+        prompt = build_messages(template_markdown, answers_by_key[key])
+        filled_markdown = call_openai_filling_model(args.model, prompt, client=client)
+        markdown_path = os.path.join(args.output_dir, f"{groups[key][0]}.md")
+        with open(markdown_path, "w", encoding="utf-8") as f:
+            f.write(filled_markdown)
+        return markdown_path
+
+    def finish(key: str, started_at: float) -> None:
+        nonlocal filled
+        first_id = groups[key][0]
+        for set_id in groups[key][1:]:
+            for source, target in zip(output_paths(first_id), output_paths(set_id)):
+                shutil.copyfile(source, target)
+        with checkpoint_lock, open(checkpoint_path, "a", encoding="utf-8") as f:
+            for set_id in groups[key]:
+                f.write(json.dumps({
+                    "id": set_id,
+                    "key": key,
+                    "outputs": output_paths(set_id),
+                    "seconds": round(time.perf_counter() - started_at, 3),
+                }) + "\n")
+            filled += len(groups[key])
+
+    def fail(key: str, stage: str, error: Exception) -> None:
+        print(f"Failed to {stage} {', '.join(groups[key])}: {error}")
+        failures.extend({"id": set_id, "stage": stage, "error": str(error)} for set_id in groups[key])
+
+    render_pool = ProcessPoolExecutor(max_workers=args.render_workers) if formats else None
+    renders = {}
+    try:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as fill_pool:
+            fills = {fill_pool.submit(fill, key): (key, time.perf_counter()) for key in groups}
+            for future in as_completed(fills):
+                key, started_at = fills[future]
+                try:
+                    markdown_path = future.result()
+                except Exception as e:
+                    fail(key, "fill", e)
+                    continue
+                if render_pool is None:
+                    finish(key, started_at)
+                else:
+                    renders[render_pool.submit(render_outputs, markdown_path, formats)] = (key, started_at)
+        for future in as_completed(renders):
+            key, started_at = renders[future]
+            try:
+                future.result()
+            except Exception as e:
+                fail(key, "render", e)
+                continue
+            finish(key, started_at)
+    finally:
+        if render_pool is not None:
+            render_pool.shutdown()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "answer_sets": total,
+        "skipped": skipped,
+        "unique_plans": len(groups),
+        "filled": filled,
+        "failed": len(failures),
+        "seconds": round(elapsed, 2),
+        "plans_per_minute": round(filled / elapsed * 60, 1) if elapsed else 0.0,
+        "failures": failures,
+    }
+
+
 def main() -> None:
     args = parse_args()
     api_key = os.getenv("OPENAI_API_KEY")
@@ -107,6 +323,21 @@ def main() -> None:
         raise RuntimeError("OPENAI_API_KEY environment variable must be set.")
     with open(args.template_markdown, "r", encoding="utf-8") as f:
         template_markdown = f.read()
+    if args.batch_input:
+        summary = run_batch(args, template_markdown)
+        print(
+            f"Filled {summary['filled']} plans ({summary['unique_plans']} unique) in {summary['seconds']}s, "
+            f"{summary['plans_per_minute']} plans/min; {summary['skipped']} up to date, "
+            f"{summary['failed']} failed"
+        )
+        for failure in summary["failures"]:
+            print(f"  {failure['id']}: {failure['stage']} failed: {failure['error']}")
+        if args.summary_json:
+            with open(args.summary_json, "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=2)
+        if summary["failed"]:
+            sys.exit(1)
+        return
     answers = load_yaml_answers(args.answers_yaml)
     prompt = build_messages(template_markdown, answers)
     if args.dry_run:
@@ -0,0 +1,176 @@
+from constants import FORM_STEPS
+
+
+class Question:
+    __slots__ = ('id', 'label', 'fill', 'index', 'optional', 'section_id', 'template_section', 'hints')
+
+    def __init__(self, id, label, fill, index, optional, section_id, template_section=None, hints=''):
+        self.id = id
+        self.label = label
+        self.fill = fill
+        self.index = index
+        self.optional = optional
+        self.section_id = section_id
+        # The report template section its answer goes to and extra words for answer routing, if the catalog sets them.
+        self.template_section = template_section
+        self.hints = hints
+
+    def localized(self, label, fill):
+        return Question(self.id, label, fill, self.index, self.optional, self.section_id, self.template_section,
+                        self.hints)
+
+    def to_dict(self):
+        return {'id': self.id, 'label': self.label, 'fill': self.fill}
+
+
+class Section:
+    __slots__ = ('id', 'title', 'description', 'core_questions', 'optional_questions', 'core_mask', 'optional_mask')
+
+    def __init__(self, id, title, description, core_questions, optional_questions):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.core_questions = tuple(core_questions)
+        self.optional_questions = tuple(optional_questions)
+        self.core_mask = _mask(self.core_questions)
+        self.optional_mask = _mask(self.optional_questions)
+
+    @property
+    def questions(self):
+        return self.core_questions + self.optional_questions
+
+
+class Catalog:
+    __slots__ = ('sections', 'questions', 'by_id', 'core_mask', 'optional_mask', 'version', '_progress_template',
+                 '_id_lists')
+
+    def __init__(self, sections, version=0):
+        self.sections = tuple(sections)
+        self.version = version
+        self.questions = tuple(q for section in self.sections for q in section.questions)
+        self.by_id = {question.id: question for question in self.questions}
+        self.core_mask = _mask(q for q in self.questions if not q.optional)
+        self.optional_mask = _mask(q for q in self.questions if q.optional)
+        self._progress_template = None
+        self._id_lists = {0: ()}
+
+    @classmethod
+    def from_sections(cls, sections, version=0):
+        built = []
+        index = 0
+        for section in sections:
+            groups = []
+            for key, optional in (('core_questions', False), ('optional_questions', True)):
+                group = []
+                for question in section[key]:
+                    group.append(Question(question['id'], question['label'], question['fill'], index, optional,
+                                          section['id'], question.get('section'), question.get('hints', '')))
+                    index += 1
+                groups.append(group)
+            built.append(Section(section['id'], section['title'], section['description'], *groups))
+        return cls(built, version)
+
+    def __iter__(self):
+        return iter(self.sections)
+
+    def __len__(self):
+        return len(self.sections)
+
+    def localized(self, translate):
+        sections = []
+        for section in self.sections:
+            sections.append(Section(
+                section.id,
+                translate(section.title),
+                translate(section.description),
+                [q.localized(translate(q.label), translate(q.fill)) for q in section.core_questions],
+                [q.localized(translate(q.label), translate(q.fill)) for q in section.optional_questions]
+            ))
+        return Catalog(sections, self.version)
+
+    def answers_from(self, form_data):
+        answers = AnswerBitmap(version=self.version)
+        for question in self.questions:
+            answers.mark(question, form_data.get(question.id))
+        return answers
+
+    def current_question(self, answers):
+        open_questions = ~(answers.completed | answers.skipped) & (self.core_mask | self.optional_mask)
+        if not open_questions:
+            return None
+        return self.questions[(open_questions & -open_questions).bit_length() - 1]
+
+    def ids(self, bits):
+        ids = self._id_lists.get(bits)
+        if ids is None:
+            ids = self._id_lists[bits] = tuple(q.id for q in self.questions if bits >> q.index & 1)
+        return ids
+
+    def progress(self, form_data, answers):
+        if self._progress_template is None:
+            self._progress_template = [{
+                'section_id': section.id,
+                'title': section.title,
+                'description': section.description,
+                'core_total': len(section.core_questions),
+                'optional_total': len(section.optional_questions),
+                'core_questions': [q.to_dict() for q in section.core_questions],
+                'optional_questions': [q.to_dict() for q in section.optional_questions],
+            } for section in self.sections]
+
+        completed = answers.completed
+        skipped = answers.skipped
+        progress = [{
+            'section_id': 'section_0',
+            'title': 'Section 0: Basic Information',
+            'description': 'Your company and background details',
+            'core_completed': [step['id'] for step in FORM_STEPS if form_data.get(step['id'])],
+            'core_total': len(FORM_STEPS),
+            'optional_completed': [],
+            'optional_total': 0,
+            'core_questions': [],
+            'optional_questions': [],
+            'core_skipped': [],
+            'optional_skipped': []
+        }]
+        for section, static in zip(self.sections, self._progress_template):
+            progress.append({
+                **static,
+                'core_completed': self.ids(completed & section.core_mask),
+                'optional_completed': self.ids(completed & section.optional_mask),
+                'core_skipped': self.ids(skipped & section.core_mask),
+                'optional_skipped': self.ids(skipped & section.optional_mask),
+            })
+        return progress
+
+
+class AnswerBitmap:
+    __slots__ = ('completed', 'skipped', 'version')
+
+    def __init__(self, completed=0, skipped=0, version=0):
+        self.completed = completed
+        self.skipped = skipped
+        self.version = version
+
+    def mark(self, question, value):
+        bit = 1 << question.index
+        if value:
+            self.completed |= bit
+            self.skipped &= ~bit
+        elif value == '':
+            self.skipped |= bit
+            self.completed &= ~bit
+        else:
+            self.completed &= ~bit
+            self.skipped &= ~bit
+
+    def clear(self):
+        self.completed = 0
+        self.skipped = 0
+
+
+def _mask(questions):
+    mask = 0
+    for question in questions:
+        mask |= 1 << question.index
+    return mask
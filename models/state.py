@@ -1,14 +1,234 @@
-from services.business_plan_service import load_business_plan_from_yaml
+import os
+import json
+import time
+import zlib
+import hashlib
+import secrets
+import tempfile
+import threading
+from flask import g, has_request_context, request
+from models.catalog import AnswerBitmap
+from services.analytics_service import record_session
+from services.business_plan_service import get_current_business_plan_question
+from services.catalog_registry import DEFAULT_TENANT, current_tenant, get_tenant_catalog, tenant_exists
 
-form_data = {}
-chat_history = []
-question_retries = {}
-business_plan_sections = load_business_plan_from_yaml()
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
+SESSION_HEADER = 'X-Session-Id'
+SESSION_COOKIE = 'aino_session'
+DEFAULT_SESSION_ID = 'default'
+MAX_SESSION_ID_LENGTH = 128
+SESSION_COOKIE_MAX_AGE = int(os.environ.get('SESSION_COOKIE_MAX_AGE', 90 * 86400))
 
-def reset_state():
-    global form_data, chat_history, question_retries
-    form_data = {}
-    chat_history = []
-    question_retries = {}
+SESSION_SNAPSHOT_DIR = os.environ.get('SESSION_SNAPSHOT_DIR', os.path.join(BASE_DIR, 'sessions'))
+SESSION_IDLE_TTL = float(os.environ.get('SESSION_IDLE_TTL', 1800))
+SESSION_SWEEP_INTERVAL = float(os.environ.get('SESSION_SWEEP_INTERVAL', 60))
+SESSION_HISTORY_KEEP = int(os.environ.get('SESSION_HISTORY_KEEP', 10))
+SNAPSHOT_VERSION = 1
 
+_sessions = {}
+_sessions_lock = threading.Lock()
+_last_seen = {}
+_sweeper = None
+_session_stats = {'evicted': 0, 'rehydrated': 0, 'snapshot_bytes': 0, 'snapshot_errors': 0}
+
+
+def get_catalog(tenant=None):
+    return get_tenant_catalog(tenant)
+
+
+def state_backend():
+    return 'process'
+
+
+def get_session_id():
+    session_id = DEFAULT_SESSION_ID
+    if has_request_context():
+        session_id = request.headers.get(SESSION_HEADER) or request.cookies.get(SESSION_COOKIE)
+        if not session_id:
+            # A browser on its first request: give it its own conversation; the cookie goes out with the response.
+            session_id = g.get('new_session_id')
+            if session_id is None:
+                session_id = g.new_session_id = secrets.token_urlsafe(18)
+        session_id = session_id[:MAX_SESSION_ID_LENGTH].replace('/', '_')
+    # Sessions of other tenants live under their own key, so the same browser keeps one conversation per tenant.
+    tenant = current_tenant()
+    return session_id if tenant == DEFAULT_TENANT else f'{tenant}/{session_id}'
+
+
+def issue_session_cookie(response):
+    """Set the session cookie on a response when this request started a new session."""
+    session_id = g.get('new_session_id') if has_request_context() else None
+    if session_id:
+        response.set_cookie(SESSION_COOKIE, session_id, max_age=SESSION_COOKIE_MAX_AGE, httponly=True,
+                            samesite='Lax', secure=request.is_secure)
+    return response
+
+
+def session_tenant(session_id):
+    tenant, separator, _ = session_id.partition('/')
+    return tenant if separator and tenant_exists(tenant) else DEFAULT_TENANT
+
+
+def get_conversation(session_id=None, catalog=None):
+    session_id = session_id or get_session_id()
+    _last_seen[session_id] = time.monotonic()
+    conversation = _sessions.get(session_id)
+    if conversation is None:
+        with _sessions_lock:
+            conversation = _sessions.get(session_id)
+            if conversation is None:
+                conversation = _sessions[session_id] = load_snapshot(session_id) or ({}, [], {}, AnswerBitmap())
+        if SESSION_IDLE_TTL > 0 and _sweeper is None:
+            _start_sweeper()
+    catalog = catalog or get_catalog(session_tenant(session_id))
+    session_answers = conversation[3]
+    if session_answers.version != catalog.version:
+        # The tenant's catalog was reloaded: question indexes may have moved, so rebuild from the saved answers.
+        rebuilt = catalog.answers_from(conversation[0])
+        session_answers.completed, session_answers.skipped = rebuilt.completed, rebuilt.skipped
+        session_answers.version = catalog.version
+    return conversation
+
+
+def get_form_data(session_id=None):
+    return get_conversation(session_id)[0]
+
+
+def session_count():
+    return len(_sessions)
+
+
+def get_session_stats():
+    stats = dict(_session_stats)
+    stats['resident'] = len(_sessions)
+    stats['idle_ttl_s'] = SESSION_IDLE_TTL
+    return stats
+
+
+def reset_state(session_id=None):
+    session_id = session_id or get_session_id()
+    conversation = get_conversation(session_id)
+    session_form_data, session_chat_history, session_question_retries, session_answers = conversation
+    tenant = session_tenant(session_id)
+    record_session(session_id, tenant, get_catalog(tenant), conversation, outcome='reset')
+    session_form_data.clear()
+    session_chat_history.clear()
+    session_question_retries.clear()
+    session_answers.clear()
+    try:
+        os.remove(snapshot_path(session_id))
+    except FileNotFoundError:
+        pass
+
+
+def snapshot_path(session_id):
+    digest = hashlib.sha256(session_id.encode('utf-8')).hexdigest()[:32]
+    return os.path.join(SESSION_SNAPSHOT_DIR, f'{digest}.snap')
+
+
+def encode_snapshot(session_id, conversation):
+    session_form_data, session_chat_history, session_question_retries, session_answers = conversation
+    question_id = None
+    if session_form_data:
+        catalog = get_catalog(session_tenant(session_id))
+        if session_answers.version != catalog.version:
+            session_answers = None
+        _, question, _ = get_current_business_plan_question(session_form_data, catalog, session_answers)
+        question_id = question.id if question else None
+    snapshot = {
+        'v': SNAPSHOT_VERSION,
+        'id': session_id,
+        'saved_at': int(time.time()),
+        'form_data': session_form_data,
+        'retries': session_question_retries,
+        'question': question_id,
+        'history': [[message['role'][0], message['content']]
+                    for message in session_chat_history[-SESSION_HISTORY_KEEP:]],
+    }
+    return zlib.compress(json.dumps(snapshot, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def decode_snapshot(data):
+    snapshot = json.loads(zlib.decompress(data))
+    if snapshot.get('v') != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported session snapshot version: {snapshot.get('v')}")
+    roles = {'u': 'user', 'a': 'assistant', 's': 'system'}
+    chat_history = [{'role': roles[role], 'content': content} for role, content in snapshot['history']]
+    session_answers = get_catalog(session_tenant(snapshot['id'])).answers_from(snapshot['form_data'])
+    return snapshot['id'], (snapshot['form_data'], chat_history, snapshot['retries'], session_answers)
+
+
+def save_snapshot(session_id, conversation):
+    data = encode_snapshot(session_id, conversation)
+    os.makedirs(SESSION_SNAPSHOT_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=SESSION_SNAPSHOT_DIR, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, snapshot_path(session_id))
+    return len(data)
+
+
+def load_snapshot(session_id):
+    path = snapshot_path(session_id)
+    try:
+        with open(path, 'rb') as f:
+            stored_id, conversation = decode_snapshot(f.read())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        _session_stats['snapshot_errors'] += 1
+        print(f"Error loading session snapshot {path}: {str(e)}")
+        return None
+    if stored_id != session_id:
+        return None
+    os.remove(path)
+    _session_stats['rehydrated'] += 1
+    return conversation
+
+
+def evict_idle_sessions(idle_ttl=None):
+    idle_ttl = SESSION_IDLE_TTL if idle_ttl is None else idle_ttl
+    cutoff = time.monotonic() - idle_ttl
+    candidates = [session_id for session_id in list(_sessions) if _last_seen.get(session_id, 0) <= cutoff]
+    evicted = 0
+    for session_id in candidates:
+        with _sessions_lock:
+            conversation = _sessions.get(session_id)
+            if conversation is None or _last_seen.get(session_id, 0) > cutoff:
+                continue
+            try:
+                if any(conversation[:3]):
+                    _session_stats['snapshot_bytes'] += save_snapshot(session_id, conversation)
+            except Exception as e:
+                _session_stats['snapshot_errors'] += 1
+                print(f"Error saving session snapshot: {str(e)}")
+                continue
+            tenant = session_tenant(session_id)
+            record_session(session_id, tenant, get_catalog(tenant), conversation)
+            del _sessions[session_id]
+            _last_seen.pop(session_id, None)
+            evicted += 1
+    _session_stats['evicted'] += evicted
+    return evicted
+
+
+def snapshot_all_sessions():
+    return evict_idle_sessions(idle_ttl=-1)
+
+
+def _start_sweeper():
+    global _sweeper
+    with _sessions_lock:
+        if _sweeper is None:
+            _sweeper = threading.Thread(target=_sweep_loop, name='session-sweeper', daemon=True)
+            _sweeper.start()
+
+
+def _sweep_loop():
+    while True:
+        time.sleep(SESSION_SWEEP_INTERVAL)
+        try:
+            evict_idle_sessions()
+        except Exception as e:
+            print(f"Error evicting idle sessions: {str(e)}")
@@ -0,0 +1,107 @@
+import time
+from flask import request, jsonify
+from models.state import get_catalog
+from routes.usage import is_admin_request
+from services.analytics_service import catalog_key
+from services.analytics_query import catalog_stats, list_catalogs, tenant_totals, window_start
+from services.archive_search import SEARCH_MAX_PER_PAGE, get_archived_conversation, search
+from services.catalog_registry import DEFAULT_TENANT, tenant_exists
+from services.relevance_service import get_numpy
+
+
+def _page_args(default_per_page):
+    try:
+        page = int(request.args.get('page') or 1)
+        per_page = int(request.args.get('per_page') or default_per_page)
+    except ValueError:
+        return None
+    return (page, per_page) if page >= 1 and per_page >= 1 else None
+
+
+def register_admin_routes(app):
+    @app.route('/api/admin/stats', methods=['GET'])
+    def admin_stats():
+        if not is_admin_request():
+            return jsonify({'error': 'Admin token required'}), 403
+        if not get_numpy():
+            return jsonify({'error': 'Session analytics need the numpy package'}), 503
+        started = time.perf_counter()
+        tenant = (request.args.get('tenant') or DEFAULT_TENANT).strip().lower()
+        if not tenant_exists(tenant):
+            return jsonify({'error': f"Unknown tenant: {tenant}"}), 404
+        try:
+            days = float(request.args.get('days') or 0)
+        except ValueError:
+            return jsonify({'error': 'days must be a number'}), 400
+        since = window_start(days)
+        current = get_catalog(tenant)
+        catalog = request.args.get('catalog') or catalog_key(current)[0]
+        try:
+            stats = catalog_stats(catalog, since)
+            totals = tenant_totals(tenant, since)
+            catalogs = list_catalogs(tenant)
+        except Exception as e:
+            print(f"Error computing session analytics: {str(e)}")
+            return jsonify({'error': 'Could not compute session analytics'}), 500
+        if stats is not None:
+            questions = []
+            for question in stats['questions']:
+                known = current.by_id.get(question['question_id'])
+                questions.append({**question, 'label': known.label if known else None})
+            stats = {**stats, 'questions': questions}
+        return jsonify({
+            'tenant': tenant,
+            'catalog': catalog,
+            'since': since,
+            'totals': totals,
+            'catalogs': catalogs,
+            'stats': stats,
+            'query_ms': round((time.perf_counter() - started) * 1000, 2)
+        })
+
+    @app.route('/api/admin/archive/search', methods=['GET'])
+    def archive_search():
+        if not is_admin_request():
+            return jsonify({'error': 'Admin token required'}), 403
+        paging = _page_args(20)
+        if paging is None:
+            return jsonify({'error': 'page and per_page must be positive integers'}), 400
+        started = time.perf_counter()
+        query = request.args.get('q', '')
+        industry = request.args.get('industry', '')
+        location = request.args.get('location', '')
+        tenant = (request.args.get('tenant') or '').strip().lower() or None
+        sort = request.args.get('sort') or 'relevance'
+        if sort not in ('relevance', 'recent'):
+            return jsonify({'error': 'sort must be relevance or recent'}), 400
+        try:
+            found = search(query, industry, location, tenant, *paging, sort=sort)
+        except Exception as e:
+            print(f"Error searching conversation archive: {str(e)}")
+            return jsonify({'error': 'Could not search the conversation archive'}), 500
+        return jsonify({
+            'q': query,
+            'industry': industry,
+            'location': location,
+            'tenant': tenant,
+            'page': paging[0],
+            'per_page': min(paging[1], SEARCH_MAX_PER_PAGE),
+            **found,
+            'query_ms': round((time.perf_counter() - started) * 1000, 2)
+        })
+
+    @app.route('/api/admin/archive/conversations/<int:conversation_id>', methods=['GET'])
+    def archived_conversation(conversation_id):
+        if not is_admin_request():
+            return jsonify({'error': 'Admin token required'}), 403
+        paging = _page_args(50)
+        if paging is None:
+            return jsonify({'error': 'page and per_page must be positive integers'}), 400
+        try:
+            conversation = get_archived_conversation(conversation_id, *paging)
+        except Exception as e:
+            print(f"Error reading conversation archive: {str(e)}")
+            return jsonify({'error': 'Could not read the conversation archive'}), 500
+        if conversation is None:
+            return jsonify({'error': 'Conversation not found'}), 404
+        return jsonify({'page': paging[0], 'conversation': conversation})
@@ -0,0 +1,62 @@
+from flask import request, url_for
+from services.asset_service import (
+    COMPRESS_MIN_SIZE,
+    HTTP_COMPRESSION,
+    IMMUTABLE_CACHE_CONTROL,
+    asset_path,
+    choose_encoding,
+    compress,
+    compress_static,
+    is_compressible,
+    is_fingerprinted,
+    record_compression
+)
+
+
+def register_asset_routes(app):
+    @app.context_processor
+    def asset_helpers():
+        def asset_url(filename):
+            return url_for('static', filename=asset_path(filename, use_manifest=not app.debug))
+        return {'asset_url': asset_url}
+
+    @app.after_request
+    def cache_and_compress(response):
+        is_static = request.endpoint == 'static'
+        if is_static and response.status_code in (200, 304) and is_fingerprinted(request.view_args.get('filename', '')):
+            response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+
+        if not HTTP_COMPRESSION or not is_compressible(response.mimetype):
+            return response
+        response.vary.add('Accept-Encoding')
+        if response.status_code == 304:
+            etag, _ = response.get_etag()
+            if etag and choose_encoding(request.accept_encodings):
+                response.set_etag(etag, weak=True)
+            return response
+        if (response.status_code != 200 or 'Content-Encoding' in response.headers
+                or 'Content-Range' in response.headers or request.method == 'HEAD'):
+            return response
+        if response.is_streamed and not is_static:
+            return response
+        if response.content_length is not None and response.content_length < COMPRESS_MIN_SIZE:
+            return response
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        response.direct_passthrough = False
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return response
+        etag, _ = response.get_etag()
+        if is_static and etag:
+            body = compress_static((request.path, etag), data, encoding)
+        else:
+            body = compress(data, encoding)
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        if etag:
+            response.set_etag(etag, weak=True)
+        record_compression(len(data), len(body))
+        return response
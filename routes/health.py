@@ -0,0 +1,55 @@
+from flask import jsonify
+from models.state import get_catalog, get_session_stats, state_backend
+from services.lifecycle import request_started, request_finished, in_flight, is_draining
+from services.log_service import get_log_stats
+from services.circuit_breaker import degraded_features, get_breaker_states
+from services.asset_service import get_compression_stats
+from services.prefetch_service import get_prefetch_stats
+from services.catalog_registry import get_catalog_stats
+from services.analytics_service import get_analytics_stats
+from services.archive_service import get_archive_stats
+from services.render_service import get_render_stats
+from routes.usage import is_admin_request
+
+
+def register_health_routes(app):
+    @app.before_request
+    def track_request_start():
+        request_started()
+
+    @app.teardown_request
+    def track_request_end(exc):
+        request_finished()
+
+    @app.route('/healthz', methods=['GET'])
+    def liveness():
+        return jsonify({'status': 'ok'})
+
+    @app.route('/readyz', methods=['GET'])
+    def readiness():
+        checks = {'draining': is_draining(), 'catalog_loaded': False}
+        try:
+            checks['catalog_loaded'] = bool(get_catalog())
+        except Exception as e:
+            checks['catalog_error'] = str(e)
+        ready = checks['catalog_loaded'] and not checks['draining']
+        status = 'ready' if ready else 'unavailable'
+        # Probes only need the status; the internals are for operators with the admin token.
+        if not is_admin_request():
+            return jsonify({'status': status}), 200 if ready else 503
+        return jsonify({
+            'status': status,
+            'checks': checks,
+            'in_flight': max(0, in_flight() - 1),
+            'state_backend': state_backend(),
+            'sessions': get_session_stats(),
+            'logging': get_log_stats(),
+            'compression': get_compression_stats(),
+            'prefetch': get_prefetch_stats(),
+            'catalogs': get_catalog_stats(),
+            'analytics': get_analytics_stats(),
+            'archive': get_archive_stats(),
+            'rendering': get_render_stats(),
+            'degraded': degraded_features(),
+            'breakers': get_breaker_states()
+        }), 200 if ready else 503
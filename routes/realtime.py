@@ -0,0 +1,205 @@
+import json
+import os
+import time
+from flask import g
+from constants import FORM_STEPS, TIERS
+from models.state import get_conversation, get_catalog, get_session_id
+from routes.routes import run_chat_turn
+from services.business_plan_service import (
+    is_initial_form_complete,
+    get_business_plan_progress,
+    calculate_points,
+    get_current_tier
+)
+from services.chat_service import stream_tts_audio
+from services.circuit_breaker import degraded_features, is_available
+from services.language_service import get_message, get_session_language, localize_sections
+from services.lifecycle import is_draining
+from services.prefetch_service import note_audio_wanted, take_prefetched_audio
+from services.usage_service import is_over_budget
+from services.voice_service import VoiceStream, parse_sample_rate
+
+WS_IDLE_TIMEOUT = float(os.environ.get('WS_IDLE_TIMEOUT', 600))
+WS_POLL_INTERVAL = float(os.environ.get('WS_POLL_INTERVAL', 5))
+WS_AUDIO_FRAME_BYTES = 16384
+
+PROGRESS_FIELDS = ('core_completed', 'optional_completed', 'core_skipped', 'optional_skipped')
+
+
+def send_json(ws, frame_type, **fields):
+    ws.send(json.dumps({'type': frame_type, **fields}))
+
+
+def progress_snapshot():
+    form_data, _, _, answers = get_conversation()
+    catalog = get_catalog()
+    points = calculate_points(form_data, catalog, answers)
+    return {
+        'completed_steps': [step['id'] for step in FORM_STEPS if form_data.get(step['id'])],
+        'business_plan_progress': get_business_plan_progress(
+            form_data,
+            localize_sections(catalog, get_session_language(form_data)),
+            answers
+        ),
+        'initial_form_complete': is_initial_form_complete(form_data),
+        'email': form_data.get('email'),
+        'points': points,
+        'current_tier': get_current_tier(points, TIERS)['id'],
+        'tiers': TIERS
+    }
+
+
+def section_state(business_plan_progress):
+    return {section['section_id']: tuple(tuple(section[field]) for field in PROGRESS_FIELDS)
+            for section in business_plan_progress}
+
+
+def progress_delta(payload, view):
+    """Only the sections whose answered/skipped lists changed, plus the small per-turn fields."""
+    language_code = get_session_language(payload['form_data'])
+    sections = section_state(payload['business_plan_progress'])
+    delta = {
+        'sections': [{'section_id': section_id, **dict(zip(PROGRESS_FIELDS, map(list, state)))}
+                     for section_id, state in sections.items() if view['sections'].get(section_id) != state],
+        'completed_steps': payload['completed_steps'],
+        'initial_form_complete': payload['initial_form_complete'],
+        'email': payload['form_data'].get('email'),
+        'email_collected': payload['email_collected'],
+        'report_sent': payload['report_sent'],
+        'points': payload['points'],
+        'current_tier': payload['current_tier']
+    }
+    if language_code != view['language'] or sections.keys() != view['sections'].keys():
+        # Titles were re-localized or the catalog reloaded: resend the whole list once.
+        delta['business_plan_progress'] = payload['business_plan_progress']
+    view.update(language=language_code, sections=sections)
+    return delta
+
+
+def send_audio(ws, text):
+    prefetched = take_prefetched_audio(get_session_id(), text)
+    if prefetched:
+        send_json(ws, 'audio', format='mp3')
+        for offset in range(0, len(prefetched), WS_AUDIO_FRAME_BYTES):
+            ws.send(prefetched[offset:offset + WS_AUDIO_FRAME_BYTES])
+        send_json(ws, 'audio_end', bytes=len(prefetched))
+        return
+    try:
+        audio = stream_tts_audio(text)
+    except Exception as e:
+        print(f"TTS stream error: {str(e)}")
+        send_json(ws, 'audio_error', degraded=not is_available('tts'))
+        return
+    send_json(ws, 'audio', format='mp3')
+    total = 0
+    try:
+        for frame in audio:
+            ws.send(frame)
+            total += len(frame)
+    except Exception as e:
+        print(f"TTS stream interrupted after {total} bytes: {str(e)}")
+        audio.close()
+    send_json(ws, 'audio_end', bytes=total)
+
+
+def handle_message(ws, data, view):
+    g.pop('llm_calls', None)
+
+    def on_token(text):
+        send_json(ws, 'token', text=text)
+
+    if data.get('tts'):
+        note_audio_wanted(get_session_id())
+    send_json(ws, 'turn_start')
+    payload, status = run_chat_turn(data.get('message', ''), on_token=on_token)
+    if status != 200:
+        send_json(ws, 'error', status=status, error=payload['error'])
+        return
+    send_json(ws, 'reply', response=payload['response'], degraded=payload['degraded'])
+    send_json(ws, 'progress', **progress_delta(payload, view))
+
+    if data.get('tts') and 'tts' not in payload['degraded'] and not is_over_budget():
+        send_audio(ws, payload['response'])
+
+
+def handle_voice_events(ws, events, tts, view):
+    for event in events:
+        if event[0] == 'speech_start':
+            send_json(ws, 'voice', state='speech')
+        elif event[0] == 'partial':
+            send_json(ws, 'transcript', text=event[1], final=False)
+        elif event[0] == 'utterance':
+            _, text, wait_ms = event
+            send_json(ws, 'transcript', text=text, final=True, wait_ms=wait_ms)
+            if text:
+                handle_message(ws, {'message': text, 'tts': tts}, view)
+            send_json(ws, 'voice', state='listening')
+
+
+def start_voice(ws, data):
+    if not is_available('transcription'):
+        form_data = get_conversation()[0]
+        send_json(ws, 'error', status=503, degraded=True,
+                  error=get_message('voice_unavailable', get_session_language(form_data)))
+        return None
+    sample_rate = parse_sample_rate(data.get('sample_rate'))
+    if sample_rate is None:
+        form_data = get_conversation()[0]
+        send_json(ws, 'error', status=400,
+                  error=get_message('unsupported_sample_rate', get_session_language(form_data)))
+        return None
+    send_json(ws, 'voice', state='listening')
+    return VoiceStream(sample_rate)
+
+
+def register_realtime_routes(app):
+    try:
+        from flask_sock import Sock
+    except ImportError:
+        print("Warning: flask-sock is not installed; the /ws session channel is disabled and the page falls back "
+              "to HTTP requests.")
+        return
+
+    sock = Sock(app)
+
+    @sock.route('/ws')
+    def session_channel(ws):
+        snapshot = progress_snapshot()
+        view = {'language': get_session_language(get_conversation()[0]),
+                'sections': section_state(snapshot['business_plan_progress'])}
+        send_json(ws, 'ready', degraded=degraded_features())
+        send_json(ws, 'progress', **snapshot)
+        last_active = time.monotonic()
+        voice = None
+        voice_tts = False
+
+        while not is_draining():
+            message = ws.receive(timeout=WS_POLL_INTERVAL)
+            if message is None:
+                if time.monotonic() - last_active > WS_IDLE_TIMEOUT:
+                    break
+                continue
+            last_active = time.monotonic()
+            if isinstance(message, bytes):
+                # Microphone audio: 16-bit little-endian mono PCM at the rate given in voice_start.
+                if voice is not None:
+                    handle_voice_events(ws, voice.feed(message), voice_tts, view)
+                continue
+            try:
+                data = json.loads(message)
+            except (TypeError, ValueError):
+                form_data = get_conversation()[0]
+                send_json(ws, 'error', status=400,
+                          error=get_message('message_required', get_session_language(form_data)))
+                continue
+            if data.get('type') == 'ping':
+                send_json(ws, 'pong')
+            elif data.get('type') == 'message':
+                handle_message(ws, data, view)
+            elif data.get('type') == 'voice_start':
+                voice, voice_tts = start_voice(ws, data), bool(data.get('tts'))
+            elif data.get('type') == 'voice_stop' and voice is not None:
+                handle_voice_events(ws, voice.flush(), voice_tts, view)
+                voice = None
+                send_json(ws, 'voice', state='off')
+        ws.close()
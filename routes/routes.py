@@ -1,9 +1,18 @@
-from flask import render_template, request, jsonify, send_file
+from flask import Response, make_response, render_template, request, jsonify
 import re
 import base64
-import os
+import time
 from constants import FORM_STEPS, TIERS
-from models.state import form_data, chat_history, question_retries, business_plan_sections, reset_state
+from models.state import (
+    get_conversation,
+    get_form_data,
+    get_session_id,
+    get_catalog,
+    issue_session_cookie,
+    reset_state,
+    session_tenant
+)
+from services.catalog_registry import TENANT_COOKIE, current_tenant, on_catalog_swap, tenant_exists
 from services.business_plan_service import (
     is_initial_form_complete,
     get_current_business_plan_question,
@@ -11,287 +20,561 @@ from services.business_plan_service import (
     calculate_points,
     get_current_tier
 )
-from services.validation_service import validate_answer, is_gibberish
+from services.validation_service import validate_answer, validate_answers, is_gibberish
+from services.extraction_service import extract_email, extract_onboarding_answers
+from services.relevance_service import ROUTE_MIN_WORDS, route_answer
 from services.chat_service import get_openai_response, get_tts_audio, transcribe_audio
+from services.prefetch_service import (
+    cancel_prefetch,
+    schedule_prefetch,
+    take_prefetched_audio,
+    take_prefetched_reply
+)
 from services.email_service import send_report_email
-from services.yaml_service import update_yaml_with_answer, get_yaml_path
-from services.docx_service import create_docx_from_form_data
+from services.analytics_service import note_retry, record_session
+from services.archive_service import archive_turn
+from services.yaml_service import update_yaml_with_answer, update_yaml_with_answers, get_yaml_path
+from services.import_service import IMPORT_MAX_BYTES, PlanImportError, parse_plan
+from services.docx_service import create_docx_bytes
+from services.pdf_service import create_pdf_from_form_data
+from services.render_service import RenderBusyError, RenderTimeoutError, RenderWorkerError
+from services.log_service import log_event, get_llm_calls, session_tag
+from services.usage_service import is_over_budget
+from services.circuit_breaker import CircuitOpenError, degraded_features, is_available
+from services.asset_service import content_hash
+from services.language_service import (
+    get_message,
+    get_session_language,
+    language_name,
+    localize_question,
+    localize_sections,
+    normalize_language,
+    resolve_language
+)
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+_structure_bodies = {}
+
+
+@on_catalog_swap
+def _drop_structure_bodies(tenant, old_catalog):
+    for key in [key for key in _structure_bodies if key[0] == tenant]:
+        _structure_bodies.pop(key, None)
+
+
+def _stream_document(data, mimetype, filename):
+    """Send rendered document bytes in DOWNLOAD_CHUNK_SIZE pieces instead of through a file-like copy."""
+    chunks = (data[start:start + DOWNLOAD_CHUNK_SIZE] for start in range(0, len(data), DOWNLOAD_CHUNK_SIZE))
+    response = Response(chunks, mimetype=mimetype, direct_passthrough=True)
+    response.headers['Content-Length'] = str(len(data))
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    return response
+
+
+def run_chat_turn(user_message, on_token=None):
+    """One chat turn for the current session; returns (payload, status). on_token receives the reply as it streams."""
+    turn_started = time.perf_counter()
+    # One catalog for the whole turn, even if the tenant's catalog is swapped while it runs.
+    catalog = get_catalog()
+    form_data, chat_history, question_retries, answers = get_conversation(catalog=catalog)
+    fresh_conversation = not chat_history
+    user_message = (user_message or '').strip()
+    
+    if not user_message:
+        return {'error': get_message('message_required', get_session_language(form_data))}, 400
+    if is_over_budget():
+        return {'error': get_message('usage_limit', get_session_language(form_data))}, 429
+    
+    initial_form_complete = is_initial_form_complete(form_data)
+    current_step = None
+    answer_valid = True
+    question_info = None
+    is_retry = False
+    is_skipping = False
+    verdict = None
+    filled_steps = []
+    timings = {}
+    
+    if not initial_form_complete:
+        for step in FORM_STEPS:
+            if not form_data.get(step['id']):
+                current_step = step['id']
+                break
+        
+        slots, answer_text = extract_onboarding_answers(user_message, current_step, form_data)
+        form_data.update(slots)
+        filled_steps = list(slots)
+        user_message_clean = (answer_text or '').strip()
+        
+        is_nonsensical = False
+        if len(user_message_clean) > 3:
+            if user_message_clean.isdigit() or user_message_clean.replace(' ', '').isdigit():
+                is_nonsensical = True
+            elif len(set(user_message_clean.replace(' ', ''))) < 3 and len(user_message_clean) > 5:
+                is_nonsensical = True
+            elif is_gibberish(user_message_clean):
+                is_nonsensical = True
+        
+        verdict = 'nonsensical' if is_nonsensical else 'accepted'
+        if is_nonsensical:
+            is_retry = not slots
+        elif current_step == 'company_name' and len(user_message_clean) > 1:
+            form_data['company_name'] = answer_text
+        elif current_step == 'language' and user_message_clean:
+            previous_messages = [m['content'] for m in chat_history if m['role'] == 'user']
+            language_code = resolve_language(answer_text, previous_messages)
+            form_data['language'] = language_name(language_code) if language_code else answer_text
+        elif current_step == 'sphere' and len(user_message_clean) > 2:
+            form_data['sphere'] = answer_text
+        elif current_step == 'education' and len(user_message_clean) > 2:
+            form_data['education'] = answer_text
+        elif current_step == 'experience' and len(user_message_clean) > 0:
+            form_data['experience'] = answer_text
+        elif current_step == 'location' and len(user_message_clean) > 2:
+            form_data['location'] = answer_text
+        if answer_text and form_data.get(current_step):
+            filled_steps.insert(0, current_step)
+        
+        if filled_steps and filled_steps != [current_step]:
+            verdict = 'extracted'
+            next_step = next((step['id'] for step in FORM_STEPS if not form_data.get(step['id'])), None)
+            current_step = next_step or FORM_STEPS[-1]['id']
+    else:
+        section, question, question_type = get_current_business_plan_question(form_data, catalog, answers)
+        if section and question:
+            current_step = f"bp_{question.id}"
+            question_info = question
+            
+            if len(user_message.strip()) > 2:
+                started = time.perf_counter()
+                routed, answer_text = route_answer(user_message, question, catalog, answers)
+                timings['routing_ms'] = round((time.perf_counter() - started) * 1000, 2)
+                for routed_question, routed_text in routed.items():
+                    form_data[routed_question.id] = routed_text
+                    answers.mark(routed_question, routed_text)
+                    update_yaml_with_answer(get_yaml_path(), routed_question.label, routed_text)
+                    question_retries.pop(f"bp_{routed_question.id}", None)
+                filled_steps = [routed_question.id for routed_question in routed]
+                
+                answer_valid = False
+                if not routed or len(answer_text.split()) >= ROUTE_MIN_WORDS:
+                    started = time.perf_counter()
+                    answer_valid = validate_answer(answer_text, current_step, question_info)
+                    timings['validation_ms'] = round((time.perf_counter() - started) * 1000, 1)
+                verdict = 'routed' if routed else 'valid' if answer_valid else 'invalid'
+
+                if answer_valid:
+                    form_data[question.id] = answer_text
+                    answers.mark(question, answer_text)
+                    yaml_path = get_yaml_path()
+                    update_yaml_with_answer(yaml_path, question.label, answer_text)
+                    if current_step in question_retries:
+                        del question_retries[current_step]
+                elif not routed:
+                    retry_count = question_retries.get(current_step, 0)
+                    if retry_count < 1:
+                        question_retries[current_step] = retry_count + 1
+                        is_retry = True
+                        note_retry(get_session_id(), question.id)
+                    else:
+                        if current_step in question_retries:
+                            del question_retries[current_step]
+                        form_data[question.id] = ''
+                        answers.mark(question, '')
+                        section, next_question, _ = get_current_business_plan_question(form_data, catalog, answers)
+                        if next_question:
+                            current_step = f"bp_{next_question.id}"
+                            is_skipping = True
+        else:
+            current_step = 'bp_complete'
+    
+    if not form_data.get('email'):
+        email = extract_email(user_message)
+        if email:
+            form_data['email'] = email
+    
+    if current_step is None:
+        current_step = 'complete' if not initial_form_complete else 'bp_complete'
+    
+    session_id = get_session_id()
+    prediction = None
+    if verdict == 'valid' or is_retry:
+        _, next_question, _ = get_current_business_plan_question(form_data, catalog, answers)
+        if next_question:
+            prediction = ('retry' if is_retry else 'ask', next_question.id, get_session_language(form_data),
+                          catalog.version)
+    started = time.perf_counter()
+    prefetched = take_prefetched_reply(session_id, prediction, invalid=verdict == 'invalid')
+    timings['prefetch_wait_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    
+    started = time.perf_counter()
+    response = get_openai_response(
+        user_message, 
+        current_step, 
+        form_data, 
+        chat_history, 
+        catalog,
+        is_retry=is_retry, 
+        is_skipping=is_skipping,
+        on_token=on_token,
+        filled_steps=filled_steps if verdict in ('extracted', 'routed') else None,
+        prefetched=prefetched
+    )
+    timings['reply_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    
+    completed_steps = []
+    for step in FORM_STEPS:
+        if form_data.get(step['id']):
+            completed_steps.append(step['id'])
+    
+    business_plan_progress = get_business_plan_progress(
+        form_data,
+        localize_sections(catalog, get_session_language(form_data)),
+        answers
+    )
+    
+    email_collected = form_data.get('email') is not None
+    report_sent = False
+    
+    if email_collected and initial_form_complete and not form_data.get('report_sent'):
+        section, question, _ = get_current_business_plan_question(form_data, catalog, answers)
+        if not section:
+            started = time.perf_counter()
+            try:
+                send_report_email(form_data, catalog)
+                form_data['report_sent'] = True
+                report_sent = True
+            except Exception as e:
+                print(f"Error sending email: {str(e)}")
+            timings['report_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    
+    points = calculate_points(form_data, catalog, answers)
+    current_tier = get_current_tier(points, TIERS)
+    
+    if is_initial_form_complete(form_data):
+        schedule_prefetch(session_id, form_data, chat_history, question_retries, answers, catalog)
+        if current_step.startswith('bp_') and catalog.current_question(answers) is None:
+            record_session(session_id, session_tenant(session_id), catalog,
+                           (form_data, chat_history, question_retries, answers))
+    
+    archive_turn(session_id, session_tenant(session_id), form_data, user_message, response['message'],
+                 step=current_step, answered=filled_steps, fresh=fresh_conversation)
+    
+    llm_calls = get_llm_calls()
+    timings['total_ms'] = round((time.perf_counter() - turn_started) * 1000, 1)
+    log_event(
+        'chat_turn',
+        session=session_tag(session_id),
+        step=current_step,
+        verdict=verdict,
+        prefetch_hit=prefetched is not None,
+        retry=is_retry,
+        skipping=is_skipping,
+        slots_filled=len(filled_steps),
+        message_chars=len(user_message),
+        report_sent=report_sent,
+        timings=timings,
+        llm_calls=len(llm_calls),
+        prompt_tokens=sum(call['prompt_tokens'] for call in llm_calls),
+        completion_tokens=sum(call['completion_tokens'] for call in llm_calls),
+        llm=llm_calls,
+        template_reply=response.get('degraded', False)
+    )
+    
+    return {
+        'response': response['message'],
+        'completed_steps': completed_steps,
+        'business_plan_progress': business_plan_progress,
+        'initial_form_complete': initial_form_complete,
+        'form_data': form_data.copy(),
+        'email_collected': email_collected,
+        'report_sent': report_sent,
+        'points': points,
+        'current_tier': current_tier['id'],
+        'tiers': TIERS,
+        'degraded': degraded_features()
+    }, 200
+
+
+def run_plan_import(filename, data):
+    """Fill the current session from an uploaded YAML or DOCX plan; returns (payload, status).
+
+    Answers are validated in batches rather than one LLM call each, and accepted ones replace what the session
+    had. Onboarding details found in the file only fill steps that are still empty. The conversation then carries
+    on at the first question that is still open.
+    """
+    turn_started = time.perf_counter()
+    catalog = get_catalog()
+    form_data, chat_history, question_retries, answers = get_conversation(catalog=catalog)
+    fresh_conversation = not chat_history
+    language_code = get_session_language(form_data)
+    if is_over_budget():
+        return {'error': get_message('usage_limit', language_code)}, 429
+    timings = {}
+    
+    started = time.perf_counter()
+    try:
+        parsed, onboarding, unmatched = parse_plan(filename, data, catalog)
+    except PlanImportError as e:
+        return {'error': f"{get_message('plan_import_failed', language_code)}: {str(e)}"}, 400
+    except Exception as e:
+        import traceback
+        print(f"Plan import error: {traceback.format_exc()}")
+        return {'error': f"{get_message('plan_import_failed', language_code)}: {str(e)}"}, 500
+    timings['parse_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    
+    items = [(catalog.by_id[question_id], answer) for question_id, answer in parsed.items()]
+    started = time.perf_counter()
+    verdicts = validate_answers(items)
+    timings['validation_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    
+    session_id = get_session_id()
+    cancel_prefetch(session_id)
+    onboarding_filled = []
+    for step, value in onboarding.items():
+        if not form_data.get(step):
+            form_data[step] = value
+            onboarding_filled.append(step)
+    imported = []
+    rejected = []
+    for (question, answer), valid in zip(items, verdicts):
+        if not valid:
+            rejected.append(question.id)
+            continue
+        form_data[question.id] = answer
+        answers.mark(question, answer)
+        question_retries.pop(f"bp_{question.id}", None)
+        imported.append(question)
+    update_yaml_with_answers(get_yaml_path(), [(question.label, form_data[question.id]) for question in imported])
+    
+    next_question = None
+    if is_initial_form_complete(form_data):
+        _, question, _ = get_current_business_plan_question(form_data, catalog, answers)
+        if question:
+            next_question = localize_question(question, language_code).to_dict()
+    
+    # The history only notes the upload so later prompts stay small; the archive keeps the imported text.
+    user_message = f"[{filename or 'upload'}] " + '\n\n'.join(
+        f"{question.label}: {form_data[question.id]}" for question in imported
+    )
+    reply = get_message('plan_imported', language_code)
+    chat_history.append({'role': 'user', 'content': f"[{filename or 'upload'}]"})
+    chat_history.append({'role': 'assistant', 'content': reply})
+    
+    if is_initial_form_complete(form_data):
+        schedule_prefetch(session_id, form_data, chat_history, question_retries, answers, catalog)
+        if catalog.current_question(answers) is None:
+            record_session(session_id, session_tenant(session_id), catalog,
+                           (form_data, chat_history, question_retries, answers))
+    archive_turn(session_id, session_tenant(session_id), form_data, user_message, reply, step='import',
+                 answered=onboarding_filled + [question.id for question in imported], fresh=fresh_conversation)
+    
+    points = calculate_points(form_data, catalog, answers)
+    current_tier = get_current_tier(points, TIERS)
+    llm_calls = get_llm_calls()
+    timings['total_ms'] = round((time.perf_counter() - turn_started) * 1000, 1)
+    log_event(
+        'plan_import',
+        session=session_tag(session_id),
+        file_bytes=len(data),
+        imported=len(imported),
+        rejected=len(rejected),
+        unmatched=len(unmatched),
+        onboarding=len(onboarding_filled),
+        timings=timings,
+        llm_calls=len(llm_calls),
+        prompt_tokens=sum(call['prompt_tokens'] for call in llm_calls),
+        completion_tokens=sum(call['completion_tokens'] for call in llm_calls),
+        llm=llm_calls
+    )
+    
+    return {
+        'response': reply,
+        'imported': [question.id for question in imported],
+        'rejected': rejected,
+        'unmatched': unmatched,
+        'onboarding': onboarding_filled,
+        'next_question': next_question,
+        'completed_steps': [step['id'] for step in FORM_STEPS if form_data.get(step['id'])],
+        'business_plan_progress': get_business_plan_progress(
+            form_data, localize_sections(catalog, language_code), answers
+        ),
+        'initial_form_complete': is_initial_form_complete(form_data),
+        'form_data': form_data.copy(),
+        'points': points,
+        'current_tier': current_tier['id'],
+        'tiers': TIERS,
+        'timings': timings,
+        'llm_calls': len(llm_calls)
+    }, 200
 
 
 def register_routes(app):
+    app.after_request(issue_session_cookie)
+
     @app.route('/')
     def index():
-        return render_template('index.html', steps=FORM_STEPS)
+        # Start the visitor's session with the page, so later requests all carry its cookie.
+        get_session_id()
+        response = make_response(render_template('index.html', steps=FORM_STEPS))
+        tenant = (request.args.get('tenant') or '').strip().lower()
+        if tenant and tenant_exists(tenant):
+            response.set_cookie(TENANT_COOKIE, tenant, samesite='Lax')
+        return response
 
     @app.route('/api/business-plan-structure', methods=['GET'])
     def get_business_plan_structure():
-        empty_form_data = {}
-        business_plan_progress = get_business_plan_progress(empty_form_data, business_plan_sections)
-        return jsonify({
-            'business_plan_progress': business_plan_progress
-        })
+        form_data = get_form_data()
+        tenant = current_tenant()
+        catalog = get_catalog(tenant)
+        language_code = normalize_language(request.args.get('lang', '')) or get_session_language(form_data)
+        localized = localize_sections(catalog, language_code)
+        cached = _structure_bodies.get((tenant, language_code))
+        if cached is None or cached[0] is not localized:
+            empty_form_data = {}
+            business_plan_progress = get_business_plan_progress(empty_form_data, localized)
+            body = jsonify({
+                'business_plan_progress': business_plan_progress
+            }).get_data()
+            cached = _structure_bodies[(tenant, language_code)] = (
+                localized, body, f"{tenant}-{language_code}-{content_hash(body)}"
+            )
+        response = app.response_class(cached[1], mimetype='application/json')
+        response.set_etag(cached[2])
+        # The language can come from the session, so shared caches must not keep it.
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response.make_conditional(request)
 
     @app.route('/api/chat', methods=['POST'])
     def chat():
         data = request.json
-        user_message = data.get('message', '').strip()
-        
-        if not user_message:
-            return jsonify({'error': 'Message is required'}), 400
-        
-        initial_form_complete = is_initial_form_complete(form_data)
-        current_step = None
-        answer_valid = True
-        question_info = None
-        is_retry = False
-        is_skipping = False
-        
-        if not initial_form_complete:
-            for step in FORM_STEPS:
-                if not form_data.get(step['id']):
-                    current_step = step['id']
-                    break
-            
-            user_message_clean = user_message.strip()
-            
-            is_nonsensical = False
-            if len(user_message_clean) > 3:
-                if user_message_clean.isdigit() or user_message_clean.replace(' ', '').isdigit():
-                    is_nonsensical = True
-                elif len(set(user_message_clean.replace(' ', ''))) < 3 and len(user_message_clean) > 5:
-                    is_nonsensical = True
-                elif is_gibberish(user_message_clean):
-                    is_nonsensical = True
-            
-            if is_nonsensical:
-                is_retry = True
-            elif current_step == 'company_name' and len(user_message_clean) > 1:
-                form_data['company_name'] = user_message
-            elif current_step == 'language':
-                lang_map = {
-                    'english': 'English',
-                    'spanish': 'Spanish',
-                    'french': 'French',
-                    'german': 'German'
-                }
-                user_lower = user_message.lower()
-                for key, value in lang_map.items():
-                    if key in user_lower:
-                        form_data['language'] = value
-                        break
-                if not form_data.get('language'):
-                    form_data['language'] = user_message
-            elif current_step == 'sphere' and len(user_message_clean) > 2:
-                form_data['sphere'] = user_message
-            elif current_step == 'education' and len(user_message_clean) > 2:
-                form_data['education'] = user_message
-            elif current_step == 'experience' and len(user_message_clean) > 0:
-                form_data['experience'] = user_message
-            elif current_step == 'location' and len(user_message_clean) > 2:
-                form_data['location'] = user_message
-        else:
-            section, question, question_type = get_current_business_plan_question(form_data, business_plan_sections)
-            if section and question:
-                current_step = f"bp_{question['id']}"
-                question_info = question
-                
-                if len(user_message.strip()) > 2:
-                    answer_valid = validate_answer(user_message, current_step, question_info)
-                    
-                    if answer_valid:
-                        form_data[question['id']] = user_message
-                        yaml_path = get_yaml_path()
-                        update_yaml_with_answer(yaml_path, question['label'], user_message)
-                        if current_step in question_retries:
-                            del question_retries[current_step]
-                    else:
-                        retry_count = question_retries.get(current_step, 0)
-                        if retry_count < 1:
-                            question_retries[current_step] = retry_count + 1
-                            is_retry = True
-                        else:
-                            if current_step in question_retries:
-                                del question_retries[current_step]
-                            form_data[question['id']] = ''
-                            section, next_question, _ = get_current_business_plan_question(form_data, business_plan_sections)
-                            if next_question:
-                                current_step = f"bp_{next_question['id']}"
-                                is_skipping = True
-            else:
-                current_step = 'bp_complete'
-        
-        if not form_data.get('email'):
-            email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            email_match = re.search(email_pattern, user_message)
-            if email_match:
-                form_data['email'] = email_match.group()
-            elif '@' in user_message and len(user_message.strip()) > 5:
-                potential_email = user_message.strip()
-                if '.' in potential_email.split('@')[1] if '@' in potential_email else False:
-                    form_data['email'] = potential_email
-        
-        if current_step is None:
-            current_step = 'complete' if not initial_form_complete else 'bp_complete'
-        
-        response = get_openai_response(
-            user_message, 
-            current_step, 
-            form_data, 
-            chat_history, 
-            business_plan_sections,
-            is_retry=is_retry, 
-            is_skipping=is_skipping
-        )
-        
-        completed_steps = []
-        for step in FORM_STEPS:
-            if form_data.get(step['id']):
-                completed_steps.append(step['id'])
-        
-        business_plan_progress = get_business_plan_progress(form_data, business_plan_sections)
-        
-        email_collected = form_data.get('email') is not None
-        report_sent = False
-        
-        if email_collected and initial_form_complete and not form_data.get('report_sent'):
-            section, question, _ = get_current_business_plan_question(form_data, business_plan_sections)
-            if not section:
-                try:
-                    send_report_email(form_data, business_plan_sections)
-                    form_data['report_sent'] = True
-                    report_sent = True
-                except Exception as e:
-                    print(f"Error sending email: {str(e)}")
+        payload, status = run_chat_turn(data.get('message', ''))
+        return jsonify(payload), status
+
+    @app.route('/api/import', methods=['POST'])
+    def import_plan():
+        language_code = get_session_language(get_form_data())
+        if 'file' not in request.files:
+            return jsonify({'error': get_message('no_plan_file', language_code)}), 400
         
-        points = calculate_points(form_data, business_plan_sections)
-        current_tier = get_current_tier(points, TIERS)
+        plan_file = request.files['file']
+        if plan_file.filename == '':
+            return jsonify({'error': get_message('no_plan_file', language_code)}), 400
         
-        return jsonify({
-            'response': response['message'],
-            'completed_steps': completed_steps,
-            'business_plan_progress': business_plan_progress,
-            'initial_form_complete': initial_form_complete,
-            'form_data': form_data.copy(),
-            'email_collected': email_collected,
-            'report_sent': report_sent,
-            'points': points,
-            'current_tier': current_tier['id'],
-            'tiers': TIERS
-        })
+        payload, status = run_plan_import(plan_file.filename, plan_file.read(IMPORT_MAX_BYTES + 1))
+        return jsonify(payload), status
 
     @app.route('/api/tts', methods=['POST'])
     def text_to_speech():
+        form_data = get_form_data()
         data = request.json
         text = data.get('text', '').strip()
         
         if not text:
-            return jsonify({'error': 'Text is required'}), 400
+            return jsonify({'error': get_message('text_required', get_session_language(form_data))}), 400
+        if is_over_budget():
+            return jsonify({'error': get_message('usage_limit', get_session_language(form_data))}), 429
+        if not is_available('tts'):
+            return jsonify({'error': get_message('tts_unavailable', get_session_language(form_data)),
+                            'degraded': True}), 503
         
         try:
-            audio_data = get_tts_audio(text)
+            audio_data = take_prefetched_audio(get_session_id(), text) or get_tts_audio(text)
             audio_base64 = base64.b64encode(audio_data).decode('utf-8')
             
             return jsonify({
                 'audio': audio_base64,
                 'format': 'mp3'
             })
+        except CircuitOpenError:
+            return jsonify({'error': get_message('tts_unavailable', get_session_language(form_data)),
+                            'degraded': True}), 503
         except Exception as e:
             import traceback
             error_details = traceback.format_exc()
             print(f"TTS error: {error_details}")
-            return jsonify({'error': f'TTS failed: {str(e)}'}), 500
+            return jsonify({'error': f"{get_message('tts_failed', get_session_language(form_data))}: {str(e)}"}), 500
 
     @app.route('/api/transcribe', methods=['POST'])
     def transcribe():
+        form_data = get_form_data()
+        language_code = get_session_language(form_data)
         if 'audio' not in request.files:
-            return jsonify({'error': 'No audio file provided'}), 400
+            return jsonify({'error': get_message('no_audio_provided', language_code)}), 400
         
         audio_file = request.files['audio']
         if audio_file.filename == '':
-            return jsonify({'error': 'No audio file selected'}), 400
+            return jsonify({'error': get_message('no_audio_selected', language_code)}), 400
+        if not is_available('transcription'):
+            return jsonify({'error': get_message('voice_unavailable', language_code), 'degraded': True}), 503
         
         try:
             transcription = transcribe_audio(audio_file)
             return jsonify({'text': transcription})
+        except CircuitOpenError:
+            return jsonify({'error': get_message('voice_unavailable', language_code), 'degraded': True}), 503
         except Exception as e:
             import traceback
             error_details = traceback.format_exc()
             print(f"Transcription error: {error_details}")
-            return jsonify({'error': f'Transcription failed: {str(e)}'}), 500
+            return jsonify({'error': f"{get_message('transcription_failed', language_code)}: {str(e)}"}), 500
 
     @app.route('/api/send-report', methods=['POST'])
     def send_report_manual():
+        form_data = get_form_data()
         data = request.json
         email = data.get('email', '').strip() if data else ''
+        report_format = 'pdf' if data and str(data.get('format', '')).lower() == 'pdf' else 'docx'
+        language_code = get_session_language(form_data)
         
         if not email:
             if form_data.get('email'):
                 email = form_data['email']
             else:
-                return jsonify({'error': 'Email address is required. Please provide your email first.'}), 400
+                return jsonify({'error': get_message('email_required', language_code)}), 400
         
         email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
         if not re.match(email_pattern, email):
-            return jsonify({'error': 'Invalid email address format.'}), 400
+            return jsonify({'error': get_message('invalid_email', language_code)}), 400
         
         report_data = form_data.copy()
         report_data['email'] = email
         
         try:
-            send_report_email(report_data, business_plan_sections)
+            send_report_email(report_data, get_catalog(), report_format=report_format)
             if not form_data.get('email'):
                 form_data['email'] = email
-            return jsonify({'success': True, 'message': 'Report sent successfully!'})
+            return jsonify({'success': True, 'message': get_message('report_sent', language_code)})
         except Exception as e:
-            return jsonify({'error': f'Failed to send report: {str(e)}'}), 500
+            return jsonify({'error': f"{get_message('report_failed', language_code)}: {str(e)}"}), 500
 
     @app.route('/api/download-report', methods=['GET'])
     def download_report():
-        docx_path = None
+        form_data = get_form_data()
         try:
-            print(f"DEBUG ROUTE: form_data id: {id(form_data)}, type: {type(form_data)}")
-            print(f"DEBUG ROUTE: form_data contents: {form_data}")
-            print(f"DEBUG ROUTE: form_data keys: {list(form_data.keys())}")
-            docx_path = create_docx_from_form_data(form_data, business_plan_sections)
+            if request.args.get('format', 'docx').lower() == 'pdf':
+                pdf_data = create_pdf_from_form_data(form_data, get_catalog())
+                return _stream_document(pdf_data, 'application/pdf', 'business_plan.pdf')
             
-            if docx_path and os.path.exists(docx_path):
-                def remove_file():
-                    try:
-                        if docx_path and os.path.exists(docx_path):
-                            os.remove(docx_path)
-                    except Exception as e:
-                        print(f"Error removing temporary DOCX file: {str(e)}")
-                
-                response = send_file(
-                    docx_path,
-                    mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-                    as_attachment=True,
-                    download_name='business_plan.docx'
-                )
-                
-                try:
-                    if hasattr(response, 'call_on_close'):
-                        response.call_on_close(remove_file)
-                except:
-                    import threading
-                    threading.Timer(30.0, remove_file).start()
-                
-                return response
-            else:
-                return jsonify({'error': 'Failed to generate document'}), 500
+            docx_data = create_docx_bytes(form_data, get_catalog())
+            return _stream_document(
+                docx_data,
+                'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+                'business_plan.docx'
+            )
+        except (RenderBusyError, RenderTimeoutError, RenderWorkerError) as e:
+            print(f"Document download error: {str(e)}")
+            return jsonify({'error': get_message('document_busy', get_session_language(form_data))}), 503
         except Exception as e:
             import traceback
             error_details = traceback.format_exc()
             print(f"Document download error: {error_details}")
-            if docx_path and os.path.exists(docx_path):
-                try:
-                    os.remove(docx_path)
-                except:
-                    pass
-            return jsonify({'error': f'Failed to generate document: {str(e)}'}), 500
+            return jsonify({'error': f"{get_message('document_failed', get_session_language(form_data))}: {str(e)}"}), 500
 
     @app.route('/api/reset', methods=['POST'])
     def reset():
+        cancel_prefetch(get_session_id())
         reset_state()
         return jsonify({'success': True})
 
@@ -0,0 +1,38 @@
+import os
+import hmac
+from flask import request, jsonify
+from services.usage_service import get_usage_summary, get_budget_status
+from models.state import get_session_id
+
+USAGE_GROUP_FIELDS = ('session', 'stage', 'model')
+
+
+def is_admin_request():
+    token = os.environ.get('ADMIN_TOKEN', '')
+    if not token:
+        return False
+    supplied = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+    return hmac.compare_digest(supplied.encode('utf-8'), token.encode('utf-8'))
+
+
+def register_usage_routes(app):
+    @app.route('/api/usage', methods=['GET'])
+    def usage_summary():
+        group_by = [field.strip() for field in request.args.get('group_by', 'stage,model').split(',') if field.strip()]
+        unknown = [field for field in group_by if field not in USAGE_GROUP_FIELDS]
+        if unknown or not group_by:
+            return jsonify({'error': f"group_by must use: {', '.join(USAGE_GROUP_FIELDS)}"}), 400
+        
+        scope = request.args.get('scope', 'session')
+        if scope == 'all':
+            if not is_admin_request():
+                return jsonify({'error': 'Admin token required for scope=all'}), 403
+            return jsonify({'scope': 'all', 'group_by': group_by, 'usage': get_usage_summary(group_by)})
+        
+        session_id = get_session_id()
+        return jsonify({
+            'scope': 'session',
+            'group_by': group_by,
+            'usage': get_usage_summary(group_by, session_id=session_id),
+            'budget': get_budget_status(session_id)
+        })
@@ -0,0 +1,126 @@
+import argparse
+import importlib.util
+import os
+import signal
+import sys
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Serve the app with a production multi-threaded server (gunicorn).",
+    )
+    parser.add_argument('--bind', default=os.environ.get('BIND', '0.0.0.0:5001'),
+                        help="Address to listen on (default: 0.0.0.0:5001, env BIND).")
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WEB_CONCURRENCY', 1)),
+                        help="Worker processes (env WEB_CONCURRENCY). Needs a shared state backend when > 1.")
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('WEB_THREADS', 8)),
+                        help="Threads per worker for the gthread worker class (env WEB_THREADS).")
+    parser.add_argument('--worker-class', default=os.environ.get('WEB_WORKER_CLASS', 'gthread'),
+                        choices=['gthread', 'gevent', 'sync'],
+                        help="gthread (default) or gevent (requires the gevent package) for many slow LLM calls.")
+    parser.add_argument('--worker-connections', type=int, default=200,
+                        help="Concurrent connections per gevent worker.")
+    parser.add_argument('--timeout', type=int, default=int(os.environ.get('WEB_TIMEOUT', 120)),
+                        help="Seconds a worker may be silent before it is restarted.")
+    parser.add_argument('--graceful-timeout', type=int, default=int(os.environ.get('WEB_GRACEFUL_TIMEOUT', 90)),
+                        help="Seconds to let in-flight requests (LLM calls) finish after SIGTERM.")
+    parser.add_argument('--keepalive', type=int, default=5)
+    parser.add_argument('--access-log', action='store_true', help="Write an access log line per request to stdout.")
+    return parser.parse_args()
+
+
+def check_state_backend(workers):
+    from models.state import state_backend
+
+    backend = state_backend()
+    if workers > 1 and backend == 'process':
+        print(
+            f"Refusing to start {workers} workers: conversation state is process-global "
+            f"(state backend '{backend}'), so requests of one user would land on workers "
+            "with different state. Use --workers 1 and scale with --threads instead."
+        )
+        sys.exit(2)
+
+
+def check_translations():
+    from services.catalog_registry import list_tenants
+    from services.language_service import DEFAULT_LANGUAGE, LANGUAGES, get_translation_path
+
+    codes = sorted(code for code in LANGUAGES if code != DEFAULT_LANGUAGE)
+    for tenant in list_tenants():
+        missing = [code for code in codes if not os.path.isfile(get_translation_path(code, tenant))]
+        if missing:
+            print(f"Warning: tenant {tenant} has no translations for {', '.join(missing)}; its checklist is shown "
+                  f"in English there. Run python build_translations.py on deploy.")
+
+
+def post_worker_init(worker):
+    from services.lifecycle import start_draining
+    from models.state import get_catalog
+    from services.catalog_registry import list_tenants
+
+    get_catalog()
+    for tenant in list_tenants()[1:]:
+        try:
+            get_catalog(tenant)
+        except Exception as e:
+            print(f"Error loading catalog for tenant {tenant}: {str(e)}")
+    original_handler = worker.handle_exit
+
+    def handle_exit(sig, frame):
+        start_draining()
+        original_handler(sig, frame)
+
+    signal.signal(signal.SIGTERM, handle_exit)
+
+
+def worker_exit(server, worker):
+    from services.lifecycle import in_flight, wait_for_idle
+    from models.state import snapshot_all_sessions
+
+    if not wait_for_idle(timeout=server.cfg.graceful_timeout):
+        server.log.warning("Worker %s exiting with %s requests still in flight", worker.pid, in_flight())
+    server.log.info("Worker %s saved %s sessions to disk", worker.pid, snapshot_all_sessions())
+
+
+def main():
+    args = parse_args()
+    check_state_backend(args.workers)
+    check_translations()
+
+    if args.worker_class == 'gevent' and importlib.util.find_spec('gevent') is None:
+        print("The gevent worker class requires the gevent package: pip install gevent")
+        sys.exit(2)
+
+    from gunicorn.app.base import BaseApplication
+
+    class AinoApplication(BaseApplication):
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app import app
+            return app
+
+    AinoApplication({
+        'bind': args.bind,
+        'workers': args.workers,
+        'threads': args.threads,
+        'worker_class': args.worker_class,
+        'worker_connections': args.worker_connections,
+        'timeout': args.timeout,
+        'graceful_timeout': args.graceful_timeout,
+        'keepalive': args.keepalive,
+        'post_worker_init': post_worker_init,
+        'worker_exit': worker_exit,
+        'accesslog': '-' if args.access_log else None,
+    }).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+import json
+import time
+import threading
+from services.analytics_service import OUTCOMES, STOPPED_COMPLETE, STOPPED_ONBOARDING, TIER_IDS, connect
+from services.relevance_service import get_numpy
+
+_columns = {}
+_query_lock = threading.Lock()
+_results = {}
+_connection = None
+_connection_lock = threading.Lock()
+
+
+def _get_connection():
+    global _connection
+    if _connection is None:
+        with _connection_lock:
+            if _connection is None:
+                _connection = connect()
+    return _connection
+
+
+class CatalogColumns:
+    """Every session recorded against one catalog as NumPy columns, loaded once and then topped up by seq.
+
+    Rows keep their position when a session's record is replaced, so a refresh only reads what changed.
+    """
+
+    def __init__(self, catalog, question_ids):
+        np = get_numpy()
+        self.catalog = catalog
+        self.question_ids = question_ids
+        self.width = (len(question_ids) + 7) // 8
+        self.seq = 0
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.finished_at = np.zeros(0, dtype=np.int64)
+        self.outcome = np.zeros(0, dtype=np.int8)
+        self.stopped_at = np.zeros(0, dtype=np.int16)
+        self.points = np.zeros(0, dtype=np.int32)
+        self.tier = np.zeros(0, dtype=np.int8)
+        self.completed = np.zeros((0, self.width), dtype=np.uint8)
+        self.skipped = np.zeros((0, self.width), dtype=np.uint8)
+        self.retried = np.zeros((0, self.width), dtype=np.uint8)
+
+    def refresh(self, connection):
+        np = get_numpy()
+        rows = connection.execute(
+            'SELECT id, seq, finished_at, outcome, stopped_at, points, tier, completed, skipped, retried '
+            'FROM sessions WHERE catalog = ? AND seq > ? ORDER BY id',
+            (self.catalog, self.seq)
+        ).fetchall()
+        if not rows:
+            return 0
+        ids, seqs, finished_at, outcome, stopped_at, points, tier, completed, skipped, retried = zip(*rows)
+        ids = np.array(ids, dtype=np.int64)
+        fresh = {
+            'finished_at': np.array(finished_at, dtype=np.int64),
+            'outcome': np.array(outcome, dtype=np.int8),
+            'stopped_at': np.array(stopped_at, dtype=np.int16),
+            'points': np.array(points, dtype=np.int32),
+            'tier': np.array(tier, dtype=np.int8),
+            'completed': np.frombuffer(b''.join(completed), dtype=np.uint8).reshape(-1, self.width),
+            'skipped': np.frombuffer(b''.join(skipped), dtype=np.uint8).reshape(-1, self.width),
+            'retried': np.frombuffer(b''.join(retried), dtype=np.uint8).reshape(-1, self.width),
+        }
+        # Replaced records update their row in place; new sessions always have higher ids and are appended.
+        positions = np.searchsorted(self.ids, ids)
+        known = positions < len(self.ids)
+        known[known] = self.ids[positions[known]] == ids[known]
+        for name, values in fresh.items():
+            column = getattr(self, name)
+            column[positions[known]] = values[known]
+            setattr(self, name, np.concatenate([column, values[~known]]))
+        self.ids = np.concatenate([self.ids, ids[~known]])
+        self.seq = max(self.seq, max(seqs))
+        return len(rows)
+
+
+def question_counts(bitmaps, count):
+    """How many rows have each of the first count bits set, for a (rows, bytes) array of little-endian bitmaps.
+
+    Each byte column is reduced to a 256-bin histogram first, so the per-bit work does not grow with the rows.
+    """
+    np = get_numpy()
+    bits = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1, bitorder='little').astype(np.int64)
+    totals = [np.bincount(bitmaps[:, column], minlength=256) @ bits for column in range(bitmaps.shape[1])]
+    return np.concatenate(totals)[:count] if totals else np.zeros(count, dtype=np.int64)
+
+
+def percentile(histogram, q):
+    """The q-th percentile of the values a bincount histogram was built from."""
+    np = get_numpy()
+    total = histogram.sum()
+    return int(np.searchsorted(histogram.cumsum(), max(1, int(np.ceil(total * q / 100))))) if total else None
+
+
+def summarize(columns, since=None):
+    """Funnel and per-question statistics over the sessions in columns, optionally only those finished since."""
+    np = get_numpy()
+    count = len(columns.question_ids)
+    rows = columns.finished_at >= since if since else slice(None)
+    outcome = columns.outcome[rows]
+    stopped_at = columns.stopped_at[rows]
+    points = columns.points[rows]
+    sessions = len(outcome)
+
+    in_checklist = stopped_at >= 0
+    stopped = np.bincount(stopped_at[in_checklist], minlength=count)[:count]
+    finished = int((stopped_at == STOPPED_COMPLETE).sum())
+    reached = finished + stopped[::-1].cumsum()[::-1]
+    abandoned = outcome == OUTCOMES.index('abandoned')
+    dropped = np.bincount(stopped_at[abandoned & in_checklist], minlength=count)[:count]
+    answered = question_counts(columns.completed[rows], count)
+    skipped = question_counts(columns.skipped[rows], count)
+    retried = question_counts(columns.retried[rows], count)
+
+    def rate(part, whole):
+        return [round(float(p) / float(w), 4) if w else None for p, w in zip(part, whole)]
+
+    questions = [{
+        'question_id': question_id,
+        'reached': int(reached[index]),
+        'answered': int(answered[index]),
+        'skipped': int(skipped[index]),
+        'retried': int(retried[index]),
+        'dropped': int(dropped[index]),
+    } for index, question_id in enumerate(columns.question_ids)]
+    for name, part in (('answer_rate', answered), ('skip_rate', skipped), ('retry_rate', retried),
+                       ('drop_rate', dropped)):
+        for question, value in zip(questions, rate(part, reached)):
+            question[name] = value
+
+    tiers = np.bincount(columns.tier[rows], minlength=len(TIER_IDS))
+    outcomes = np.bincount(outcome, minlength=len(OUTCOMES))
+    histogram = np.bincount(points) if sessions else np.zeros(0, dtype=np.int64)
+    return {
+        'sessions': sessions,
+        'outcomes': {name: int(outcomes[index]) for index, name in enumerate(OUTCOMES)},
+        'onboarding_dropped': int((abandoned & (stopped_at == STOPPED_ONBOARDING)).sum()),
+        'finished_checklist': finished,
+        'questions': questions,
+        'points': {
+            'mean': round(float(points.mean()), 2) if sessions else None,
+            'p50': percentile(histogram, 50),
+            'p90': percentile(histogram, 90),
+            'histogram': histogram.tolist(),
+        },
+        'tiers': {tier_id: int(tiers[index]) for index, tier_id in enumerate(TIER_IDS)},
+    }
+
+
+def list_catalogs(tenant):
+    with _query_lock:
+        rows = _get_connection().execute(
+            'SELECT catalog, question_ids, first_seen FROM catalogs WHERE tenant = ? ORDER BY first_seen', (tenant,)
+        ).fetchall()
+    return [{'catalog': catalog, 'questions': len(json.loads(question_ids)), 'first_seen': first_seen}
+            for catalog, question_ids, first_seen in rows]
+
+
+def tenant_totals(tenant, since=None):
+    """Outcome and tier counts across every catalog the tenant has had."""
+    np = get_numpy()
+    outcomes = np.zeros(len(OUTCOMES), dtype=np.int64)
+    tiers = np.zeros(len(TIER_IDS), dtype=np.int64)
+    with _query_lock:
+        catalogs = [row[0] for row in _get_connection().execute(
+            'SELECT catalog FROM catalogs WHERE tenant = ?', (tenant,)
+        )]
+        for catalog in catalogs:
+            columns = _get_columns(catalog)
+            rows = columns.finished_at >= since if since else slice(None)
+            outcomes += np.bincount(columns.outcome[rows], minlength=len(OUTCOMES))
+            tiers += np.bincount(columns.tier[rows], minlength=len(TIER_IDS))
+    return {
+        'sessions': int(outcomes.sum()),
+        'outcomes': {name: int(outcomes[index]) for index, name in enumerate(OUTCOMES)},
+        'tiers': {tier_id: int(tiers[index]) for index, tier_id in enumerate(TIER_IDS)},
+    }
+
+
+def _get_columns(catalog):
+    connection = _get_connection()
+    columns = _columns.get(catalog)
+    if columns is None:
+        row = connection.execute('SELECT question_ids FROM catalogs WHERE catalog = ?', (catalog,)).fetchone()
+        if row is None:
+            return None
+        columns = _columns[catalog] = CatalogColumns(catalog, json.loads(row[0]))
+    columns.refresh(connection)
+    return columns
+
+
+def catalog_stats(catalog, since=None):
+    """summarize() for one catalog, recomputed only when new records arrived or the window moved."""
+    with _query_lock:
+        columns = _get_columns(catalog)
+        if columns is None:
+            return None
+        key = (catalog, since)
+        cached = _results.get(key)
+        if cached is not None and cached[0] == columns.seq:
+            return cached[1]
+        result = summarize(columns, since)
+        if len(_results) > 64:
+            _results.clear()
+        _results[key] = (columns.seq, result)
+        return result
+
+
+def window_start(days):
+    """Start of a window of days, rounded to the minute so repeated queries share a cached result."""
+    if not days:
+        return None
+    return int(time.time() - days * 86400) // 60 * 60
@@ -0,0 +1,268 @@
+import os
+import json
+import time
+import queue
+import atexit
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from constants import TIERS
+from services.business_plan_service import calculate_points, get_current_tier, is_initial_form_complete
+from services.language_service import get_session_language
+from services.log_service import session_tag
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ANALYTICS_DB_PATH = os.environ.get('ANALYTICS_DB_PATH', os.path.join(BASE_DIR, 'analytics', 'sessions.sqlite3'))
+ANALYTICS_QUEUE_SIZE = int(os.environ.get('ANALYTICS_QUEUE_SIZE', 10000))
+ANALYTICS_MAX_SESSIONS = int(os.environ.get('ANALYTICS_MAX_SESSIONS', 10000))
+ANALYTICS_BATCH_SIZE = 512
+
+OUTCOMES = ('completed', 'abandoned', 'reset')
+STOPPED_COMPLETE = -1
+STOPPED_ONBOARDING = -2
+TIER_IDS = [tier['id'] for tier in TIERS]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS catalogs (
+    catalog TEXT PRIMARY KEY,
+    tenant TEXT NOT NULL,
+    question_ids TEXT NOT NULL,
+    first_seen INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    session TEXT NOT NULL UNIQUE,
+    seq INTEGER NOT NULL,
+    tenant TEXT NOT NULL,
+    catalog TEXT NOT NULL,
+    finished_at INTEGER NOT NULL,
+    outcome INTEGER NOT NULL,
+    stopped_at INTEGER NOT NULL,
+    points INTEGER NOT NULL,
+    tier INTEGER NOT NULL,
+    language TEXT NOT NULL,
+    completed BLOB NOT NULL,
+    skipped BLOB NOT NULL,
+    retried BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_by_catalog_seq ON sessions (catalog, seq);
+"""
+
+_UPSERT = """
+INSERT INTO sessions (session, seq, tenant, catalog, finished_at, outcome, stopped_at, points, tier, language,
+                      completed, skipped, retried)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(session) DO UPDATE SET
+    seq = excluded.seq, tenant = excluded.tenant, catalog = excluded.catalog, finished_at = excluded.finished_at,
+    outcome = excluded.outcome, stopped_at = excluded.stopped_at, points = excluded.points, tier = excluded.tier,
+    language = excluded.language, completed = excluded.completed, skipped = excluded.skipped,
+    retried = excluded.retried
+"""
+
+_RENAME = """
+UPDATE sessions SET session = ?, seq = ?, tenant = ?, catalog = ?, finished_at = ?, outcome = ?, stopped_at = ?,
+    points = ?, tier = ?, language = ?, completed = ?, skipped = ?, retried = ?
+WHERE session = ?
+"""
+
+_queue = queue.Queue(maxsize=ANALYTICS_QUEUE_SIZE)
+_stats = {'queued': 0, 'written': 0, 'dropped': 0, 'write_errors': 0}
+_stats_lock = threading.Lock()
+_retried = OrderedDict()
+_retried_lock = threading.Lock()
+_catalog_keys = {}
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def _count(key, amount=1):
+    with _stats_lock:
+        _stats[key] += amount
+
+
+def analytics_enabled():
+    return bool(ANALYTICS_DB_PATH)
+
+
+def connect(path=None):
+    path = path or ANALYTICS_DB_PATH
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def catalog_key(catalog):
+    """Sessions are comparable question by question only within one list of question ids."""
+    cached = _catalog_keys.get(id(catalog))
+    if cached is None or cached[0] is not catalog:
+        question_ids = [question.id for question in catalog.questions]
+        key = hashlib.sha256(json.dumps(question_ids).encode('utf-8')).hexdigest()[:16]
+        cached = _catalog_keys[id(catalog)] = (catalog, key, question_ids)
+    return cached[1], cached[2]
+
+
+def pack_bits(bits, count):
+    return bits.to_bytes((count + 7) // 8, 'little')
+
+
+def note_retry(session_id, question_id):
+    with _retried_lock:
+        retried = _retried.setdefault(session_id, set())
+        _retried.move_to_end(session_id)
+        retried.add(question_id)
+        while len(_retried) > ANALYTICS_MAX_SESSIONS:
+            _retried.popitem(last=False)
+
+
+def build_record(session_id, tenant, catalog, conversation, outcome=None, finished_at=None):
+    """One row for the sessions table from a conversation as it stands now."""
+    form_data, _, _, answers = conversation
+    key, question_ids = catalog_key(catalog)
+    if answers.version != catalog.version:
+        answers = catalog.answers_from(form_data)
+    question = catalog.current_question(answers)
+    if not is_initial_form_complete(form_data):
+        stopped_at = STOPPED_ONBOARDING
+    else:
+        stopped_at = STOPPED_COMPLETE if question is None else question.index
+    if outcome is None:
+        outcome = 'completed' if stopped_at == STOPPED_COMPLETE else 'abandoned'
+    with _retried_lock:
+        retried_ids = set(_retried.get(session_id, ()))
+    retried = 0
+    for question_id in retried_ids:
+        if question_id in catalog.by_id:
+            retried |= 1 << catalog.by_id[question_id].index
+    points = calculate_points(form_data, catalog, answers)
+    count = len(question_ids)
+    return {
+        'session': session_tag(session_id),
+        'tenant': tenant,
+        'catalog': key,
+        'question_ids': question_ids,
+        'finished_at': int(finished_at if finished_at is not None else time.time()),
+        'outcome': OUTCOMES.index(outcome),
+        'stopped_at': stopped_at,
+        'points': points,
+        'tier': TIER_IDS.index(get_current_tier(points, TIERS)['id']),
+        'language': get_session_language(form_data),
+        'completed': pack_bits(answers.completed, count),
+        'skipped': pack_bits(answers.skipped, count),
+        'retried': pack_bits(retried, count),
+    }
+
+
+def record_session(session_id, tenant, catalog, conversation, outcome=None):
+    """Queue the session's current state as its finalized record; later records of the same session replace it.
+
+    A reset closes the attempt: its record is kept under its own key and the next attempt starts a new one.
+    """
+    if not analytics_enabled():
+        return False
+    form_data = conversation[0]
+    if not form_data:
+        return False
+    try:
+        record = build_record(session_id, tenant, catalog, conversation, outcome)
+    except Exception as e:
+        print(f"Error building analytics record: {str(e)}")
+        return False
+    if outcome == 'reset':
+        if record['stopped_at'] == STOPPED_COMPLETE:
+            record['outcome'] = OUTCOMES.index('completed')
+        record['replaces'] = record['session']
+        record['session'] = f"{record['session']}@{time.time_ns()}"
+        with _retried_lock:
+            _retried.pop(session_id, None)
+    return enqueue(record)
+
+
+def enqueue(record):
+    if _writer is None:
+        _start_writer()
+    try:
+        _queue.put_nowait(record)
+    except queue.Full:
+        _count('dropped')
+        return False
+    _count('queued')
+    return True
+
+
+def write_records(connection, records, seq):
+    """Upsert records in one transaction, numbering them from seq + 1; returns the last number used."""
+    catalogs = {}
+    rows = []
+    with connection:
+        for record in records:
+            seq += 1
+            catalogs.setdefault(record['catalog'], record)
+            values = (record['session'], seq, record['tenant'], record['catalog'], record['finished_at'],
+                      record['outcome'], record['stopped_at'], record['points'], record['tier'], record['language'],
+                      record['completed'], record['skipped'], record['retried'])
+            if record.get('replaces'):
+                # Earlier records of the batch may be the attempt being closed; write them first.
+                connection.executemany(_UPSERT, rows)
+                rows = []
+                if connection.execute(_RENAME, values + (record['replaces'],)).rowcount:
+                    continue
+            rows.append(values)
+        connection.executemany(_UPSERT, rows)
+        connection.executemany(
+            'INSERT OR IGNORE INTO catalogs (catalog, tenant, question_ids, first_seen) VALUES (?, ?, ?, ?)',
+            [(key, record['tenant'], json.dumps(record['question_ids']), record['finished_at'])
+             for key, record in catalogs.items()]
+        )
+    return seq
+
+
+def _start_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_write_loop, name='analytics-writer', daemon=True)
+            _writer.start()
+            atexit.register(flush)
+
+
+def _write_loop():
+    connection = connect()
+    seq = connection.execute('SELECT COALESCE(MAX(seq), 0) FROM sessions').fetchone()[0]
+    while True:
+        batch = [_queue.get()]
+        while len(batch) < ANALYTICS_BATCH_SIZE:
+            try:
+                batch.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            seq = write_records(connection, batch, seq)
+            _count('written', len(batch))
+        except Exception as e:
+            _count('write_errors', len(batch))
+            print(f"Error writing analytics records: {str(e)}")
+        finally:
+            for _ in batch:
+                _queue.task_done()
+
+
+def flush(timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while _queue.unfinished_tasks:
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def get_analytics_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['pending'] = _queue.qsize()
+    stats['path'] = ANALYTICS_DB_PATH or None
+    return stats
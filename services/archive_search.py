@@ -0,0 +1,223 @@
+import os
+import re
+import json
+import threading
+from services.archive_service import connect
+
+SEARCH_MAX_PER_PAGE = 100
+SEARCH_RANK_LIMIT = int(os.environ.get('ARCHIVE_RANK_LIMIT', 20000))
+MESSAGES_MAX_PER_PAGE = 200
+SNIPPET_TOKENS = 12
+
+_TERM_PATTERN = re.compile(r'\w+\*?')
+
+_connection = None
+_connection_lock = threading.Lock()
+_query_lock = threading.Lock()
+
+_CONVERSATION_COLUMNS = 'c.id, c.tenant, c.company, c.industry, c.location, c.language, c.started_at, ' \
+                        'c.updated_at, c.turns'
+
+
+def _get_connection():
+    global _connection
+    if _connection is None:
+        with _connection_lock:
+            if _connection is None:
+                _connection = connect()
+    return _connection
+
+
+def match_expression(text, column=None):
+    """An FTS5 query that requires every word of text, as typed; a trailing * matches word prefixes.
+
+    Words are quoted so input such as 'AND', '-' or unbalanced quotes cannot change the query or fail to parse.
+    """
+    terms = []
+    for term in _TERM_PATTERN.findall(text or ''):
+        prefix = term.endswith('*')
+        terms.append('"' + term.rstrip('*') + '"' + ('*' if prefix else ''))
+    if not terms:
+        return None
+    expression = ' '.join(terms)
+    return f'{column} : ({expression})' if column else expression
+
+
+def _conversation(row):
+    return {
+        'conversation': row[0],
+        'tenant': row[1],
+        'company': row[2],
+        'industry': row[3],
+        'location': row[4],
+        'language': row[5],
+        'started_at': row[6],
+        'updated_at': row[7],
+        'turns': row[8],
+    }
+
+
+def _newest_matches(connection, text, where, params, offset, per_page):
+    """The page of conversations whose latest matching message is newest, walking matches newest first.
+
+    The walk stops once the page and one more conversation are found, so its cost does not grow with the number
+    of matches; the total is only known when it reached the end.
+    """
+    cursor = connection.execute(f"""
+        SELECT turns_fts.rowid, t.conversation
+        FROM turns_fts JOIN turns t ON t.id = turns_fts.rowid
+        {'JOIN conversations c ON c.id = t.conversation' if where else ''}
+        WHERE turns_fts MATCH ? {'AND ' + where if where else ''}
+        ORDER BY turns_fts.rowid DESC
+    """, [text] + params)
+    newest = {}
+    wanted = offset + per_page + 1
+    while len(newest) < wanted:
+        chunk = cursor.fetchmany(1000)
+        if not chunk:
+            break
+        for rowid, conversation in chunk:
+            newest.setdefault(conversation, rowid)
+            if len(newest) >= wanted:
+                break
+    cursor.close()
+    ids = list(newest)[offset:offset + per_page]
+    found = {}
+    if ids:
+        found = {row[0]: row for row in connection.execute(
+            f"SELECT {_CONVERSATION_COLUMNS} FROM conversations c WHERE c.id IN ({', '.join('?' * len(ids))})", ids
+        )}
+    rows = [found[conversation] + (None, None, newest[conversation]) for conversation in ids]
+    return rows, None if len(newest) >= wanted else len(newest)
+
+
+def _counted_page(connection, sql, params, offset, per_page):
+    """A page of a query whose last column is count(*) OVER (), and that count."""
+    rows = connection.execute(sql, params + [per_page, offset]).fetchall()
+    if rows:
+        return rows, rows[0][-1]
+    # Past the last page; count from the first one.
+    first = connection.execute(sql, params + [1, 0]).fetchone() if offset else None
+    return rows, first[-1] if first else 0
+
+
+def search(query=None, industry=None, location=None, tenant=None, page=1, per_page=20, sort='relevance'):
+    """Archived conversations matching keywords in the entrepreneur's messages and their industry and location.
+
+    Keyword matches are grouped by conversation and ranked by the best-matching message (BM25), with a snippet of
+    it. Scoring costs time for every matching message, so words found in more than SEARCH_RANK_LIMIT messages,
+    which BM25 gives almost no weight anyway, list the conversations that used them most recently instead, as
+    does sort='recent'. Profile-only searches are ranked by the profile match; no criteria lists the latest
+    conversations. total is None when the recency walk stopped before counting every match.
+    """
+    text = match_expression(query)
+    profile = ' AND '.join(expression for expression in (match_expression(industry, 'industry'),
+                                                          match_expression(location, 'location')) if expression)
+    per_page = max(1, min(per_page, SEARCH_MAX_PER_PAGE))
+    offset = (max(page, 1) - 1) * per_page
+    filters = []
+    params = []
+    if tenant:
+        filters.append('c.tenant = ?')
+        params.append(tenant)
+    if text and profile:
+        filters.append('c.id IN (SELECT rowid FROM profiles_fts WHERE profiles_fts MATCH ?)')
+        params.append(profile)
+    where = ' AND '.join(filters)
+
+    with _query_lock:
+        connection = _get_connection()
+        matched = None
+        if text:
+            matched = connection.execute('SELECT count(*) FROM turns_fts WHERE turns_fts MATCH ?',
+                                         (text,)).fetchone()[0]
+        if text and (sort == 'recent' or matched > SEARCH_RANK_LIMIT):
+            order = 'recent'
+            rows, total = _newest_matches(connection, text, where, params, offset, per_page)
+        elif text:
+            order = 'relevance'
+            rows, total = _counted_page(connection, f"""
+                WITH hits AS (
+                    SELECT t.conversation AS conversation, min(turns_fts.rank) AS score, count(*) AS hits,
+                           turns_fts.rowid AS best
+                    FROM turns_fts JOIN turns t ON t.id = turns_fts.rowid
+                    WHERE turns_fts MATCH ?
+                    GROUP BY t.conversation
+                )
+                SELECT {_CONVERSATION_COLUMNS}, hits.score, hits.hits, hits.best, count(*) OVER ()
+                FROM hits JOIN conversations c ON c.id = hits.conversation
+                {'WHERE ' + where if where else ''}
+                ORDER BY hits.score LIMIT ? OFFSET ?
+            """, [text] + params, offset, per_page)
+        elif profile:
+            order = 'relevance'
+            rows, total = _counted_page(connection, f"""
+                SELECT {_CONVERSATION_COLUMNS}, profiles_fts.rank, NULL, NULL, count(*) OVER ()
+                FROM profiles_fts JOIN conversations c ON c.id = profiles_fts.rowid
+                WHERE profiles_fts MATCH ? {'AND ' + where if where else ''}
+                ORDER BY profiles_fts.rank LIMIT ? OFFSET ?
+            """, [profile] + params, offset, per_page)
+        else:
+            order = 'recent'
+            rows = connection.execute(f"""
+                SELECT {_CONVERSATION_COLUMNS}, NULL, NULL, NULL
+                FROM conversations c {'WHERE ' + where if where else ''}
+                ORDER BY c.updated_at DESC LIMIT ? OFFSET ?
+            """, params + [per_page, offset]).fetchall()
+            total = connection.execute(f"SELECT count(*) FROM conversations c {'WHERE ' + where if where else ''}",
+                                       params).fetchone()[0]
+
+        snippets = {}
+        best = [row[11] for row in rows if row[11] is not None]
+        if best:
+            snippets = dict(connection.execute(
+                f"SELECT rowid, snippet(turns_fts, 0, '[', ']', '…', {SNIPPET_TOKENS}) FROM turns_fts "
+                f"WHERE turns_fts MATCH ? AND rowid IN ({', '.join('?' * len(best))})",
+                [text] + best
+            ).fetchall())
+
+    results = []
+    for row in rows:
+        result = _conversation(row)
+        result['score'] = round(-row[9], 4) if row[9] is not None else None
+        result['hits'] = row[10]
+        result['snippet'] = snippets.get(row[11])
+        results.append(result)
+    return {
+        'order': order,
+        'matched_messages': matched,
+        'total': total,
+        'more': total is None or offset + len(results) < total,
+        'results': results,
+    }
+
+
+def get_archived_conversation(conversation_id, page=1, per_page=50):
+    """One archived conversation with its collected answers and a page of its messages, oldest first."""
+    per_page = max(1, min(per_page, MESSAGES_MAX_PER_PAGE))
+    offset = (max(page, 1) - 1) * per_page
+    with _query_lock:
+        connection = _get_connection()
+        row = connection.execute(
+            f'SELECT {_CONVERSATION_COLUMNS}, c.form_data FROM conversations c WHERE c.id = ?', (conversation_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        messages = connection.execute(
+            'SELECT id, role, step, answered, content, created_at FROM turns WHERE conversation = ? '
+            'ORDER BY id LIMIT ? OFFSET ?', (conversation_id, per_page, offset)
+        ).fetchall()
+        total = connection.execute('SELECT count(*) FROM turns WHERE conversation = ?',
+                                   (conversation_id,)).fetchone()[0]
+    conversation = _conversation(row)
+    conversation['form_data'] = json.loads(row[9])
+    conversation['message_count'] = total
+    conversation['messages'] = [{
+        'message': message_id,
+        'role': role,
+        'step': step,
+        'answered': json.loads(answered) if answered else [],
+        'content': content,
+        'created_at': created_at,
+    } for message_id, role, step, answered, content, created_at in messages]
+    return conversation
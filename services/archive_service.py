@@ -0,0 +1,233 @@
+import os
+import json
+import time
+import queue
+import atexit
+import sqlite3
+import threading
+from collections import OrderedDict
+from services.log_service import session_tag
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ARCHIVE_DB_PATH = os.environ.get('ARCHIVE_DB_PATH', os.path.join(BASE_DIR, 'archive', 'conversations.sqlite3'))
+ARCHIVE_QUEUE_SIZE = int(os.environ.get('ARCHIVE_QUEUE_SIZE', 10000))
+ARCHIVE_OPEN_CONVERSATIONS = int(os.environ.get('ARCHIVE_OPEN_CONVERSATIONS', 10000))
+ARCHIVE_BATCH_SIZE = 512
+
+PROFILE_FIELDS = ('company_name', 'sphere', 'location')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    id INTEGER PRIMARY KEY,
+    session TEXT NOT NULL,
+    tenant TEXT NOT NULL,
+    open INTEGER NOT NULL DEFAULT 1,
+    started_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
+    turns INTEGER NOT NULL DEFAULT 0,
+    company TEXT NOT NULL DEFAULT '',
+    industry TEXT NOT NULL DEFAULT '',
+    location TEXT NOT NULL DEFAULT '',
+    language TEXT NOT NULL DEFAULT '',
+    form_data TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS conversations_open_by_session ON conversations (session) WHERE open = 1;
+CREATE INDEX IF NOT EXISTS conversations_by_tenant ON conversations (tenant, updated_at);
+CREATE INDEX IF NOT EXISTS conversations_by_updated ON conversations (updated_at);
+CREATE TABLE IF NOT EXISTS turns (
+    id INTEGER PRIMARY KEY,
+    conversation INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    step TEXT,
+    answered TEXT,
+    content TEXT NOT NULL,
+    created_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS turns_by_conversation ON turns (conversation, id);
+CREATE VIRTUAL TABLE IF NOT EXISTS turns_fts USING fts5(
+    content, content='turns', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+-- Only what the entrepreneur wrote is indexed; the assistant's questions would match every conversation.
+CREATE TRIGGER IF NOT EXISTS turns_fts_insert AFTER INSERT ON turns WHEN new.role = 'user' BEGIN
+    INSERT INTO turns_fts (rowid, content) VALUES (new.id, new.content);
+END;
+CREATE VIRTUAL TABLE IF NOT EXISTS profiles_fts USING fts5(
+    company, industry, location, tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+_queue = queue.Queue(maxsize=ARCHIVE_QUEUE_SIZE)
+_stats = {'queued': 0, 'written': 0, 'dropped': 0, 'write_errors': 0, 'conversations': 0}
+_stats_lock = threading.Lock()
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def _count(key, amount=1):
+    with _stats_lock:
+        _stats[key] += amount
+
+
+def archive_enabled():
+    return bool(ARCHIVE_DB_PATH)
+
+
+def connect(path=None):
+    path = path or ARCHIVE_DB_PATH
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def archive_turn(session_id, tenant, form_data, user_message, reply, step=None, answered=None, fresh=False):
+    """Queue one chat turn for the archive. fresh marks the first turn of a conversation, e.g. after a reset."""
+    if not archive_enabled():
+        return False
+    record = {
+        'session': session_tag(session_id),
+        'tenant': tenant,
+        'fresh': fresh,
+        'at': int(time.time()),
+        'step': step,
+        'answered': answered or None,
+        'user': user_message,
+        'reply': reply or '',
+        'form_data': dict(form_data),
+    }
+    if _writer is None:
+        _start_writer()
+    try:
+        _queue.put_nowait(record)
+    except queue.Full:
+        _count('dropped')
+        return False
+    _count('queued')
+    return True
+
+
+class ArchiveWriter:
+    """Writes queued turns in batches, remembering each session's open conversation and its indexed profile."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.open = OrderedDict()
+
+    def _conversation(self, record):
+        session = record['session']
+        known = self.open.get(session)
+        if known is not None and not record['fresh']:
+            self.open.move_to_end(session)
+            return known
+        if record['fresh']:
+            # A new attempt: whatever the session had open before is finished.
+            self.connection.execute('UPDATE conversations SET open = 0 WHERE session = ? AND open = 1', (session,))
+            row = None
+        else:
+            row = self.connection.execute(
+                'SELECT id, company, industry, location FROM conversations WHERE session = ? AND open = 1 '
+                'ORDER BY id DESC LIMIT 1', (session,)
+            ).fetchone()
+        if row is None:
+            cursor = self.connection.execute(
+                'INSERT INTO conversations (session, tenant, started_at, updated_at) VALUES (?, ?, ?, ?)',
+                (session, record['tenant'], record['at'], record['at'])
+            )
+            row = (cursor.lastrowid, '', '', '')
+            _count('conversations')
+        known = self.open[session] = [row[0], tuple(row[1:])]
+        while len(self.open) > ARCHIVE_OPEN_CONVERSATIONS:
+            self.open.popitem(last=False)
+        return known
+
+    def write(self, records):
+        turns = []
+        conversations = {}
+        profiles = {}
+        with self.connection:
+            self.connection.execute('BEGIN IMMEDIATE')
+            for record in records:
+                known = self._conversation(record)
+                conversation = known[0]
+                form_data = record['form_data']
+                turns.append((conversation, 'user', record['step'],
+                               json.dumps(record['answered']) if record['answered'] else None, record['user'],
+                               record['at']))
+                turns.append((conversation, 'assistant', record['step'], None, record['reply'], record['at']))
+                profile = tuple(str(form_data.get(field) or '') for field in PROFILE_FIELDS)
+                if profile != known[1]:
+                    known[1] = profile
+                    profiles[conversation] = profile
+                previous = conversations.get(conversation)
+                conversations[conversation] = (
+                    record['at'], (previous[1] if previous else 0) + 1, profile,
+                    str(form_data.get('language') or ''), form_data
+                )
+            self.connection.executemany(
+                'INSERT INTO turns (conversation, role, step, answered, content, created_at) VALUES (?, ?, ?, ?, ?, ?)',
+                turns
+            )
+            self.connection.executemany(
+                'UPDATE conversations SET updated_at = ?, turns = turns + ?, company = ?, industry = ?, '
+                'location = ?, language = ?, form_data = ? WHERE id = ?',
+                [(at, count) + profile + (language, json.dumps(form_data, ensure_ascii=False), conversation)
+                 for conversation, (at, count, profile, language, form_data) in conversations.items()]
+            )
+            self.connection.executemany('DELETE FROM profiles_fts WHERE rowid = ?',
+                                        [(conversation,) for conversation in profiles])
+            self.connection.executemany(
+                'INSERT INTO profiles_fts (rowid, company, industry, location) VALUES (?, ?, ?, ?)',
+                [(conversation,) + profile for conversation, profile in profiles.items()]
+            )
+        return len(turns)
+
+
+def _start_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_write_loop, name='archive-writer', daemon=True)
+            _writer.start()
+            atexit.register(flush)
+
+
+def _write_loop():
+    writer = ArchiveWriter(connect())
+    while True:
+        batch = [_queue.get()]
+        while len(batch) < ARCHIVE_BATCH_SIZE:
+            try:
+                batch.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            writer.write(batch)
+            _count('written', len(batch))
+        except Exception as e:
+            # The batch's conversations may have been rolled back; look them up again next time.
+            writer.open.clear()
+            _count('write_errors', len(batch))
+            print(f"Error writing conversation archive: {str(e)}")
+        finally:
+            for _ in batch:
+                _queue.task_done()
+
+
+def flush(timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while _queue.unfinished_tasks:
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def get_archive_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['pending'] = _queue.qsize()
+    stats['path'] = ARCHIVE_DB_PATH or None
+    return stats
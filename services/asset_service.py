@@ -0,0 +1,130 @@
+import os
+import json
+import gzip
+import hashlib
+import threading
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATIC_DIR = os.path.join(BASE_DIR, 'static')
+DIST_DIR = 'dist'
+MANIFEST_PATH = os.environ.get('ASSET_MANIFEST', os.path.join(STATIC_DIR, DIST_DIR, 'manifest.json'))
+
+FINGERPRINTED_ASSETS = ('css/style.css', 'js/chat.js')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+HTTP_COMPRESSION = os.environ.get('HTTP_COMPRESSION', '1') != '0'
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+GZIP_LEVEL = int(os.environ.get('GZIP_LEVEL', 6))
+BROTLI_QUALITY = int(os.environ.get('BROTLI_QUALITY', 5))
+STATIC_BROTLI_QUALITY = int(os.environ.get('STATIC_BROTLI_QUALITY', 11))
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'image/svg+xml')
+
+_manifest = None
+_brotli = None
+_static_bodies = {}
+_static_lock = threading.Lock()
+_compression_stats = {'responses': 0, 'bytes_in': 0, 'bytes_out': 0, 'static_hits': 0}
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def fingerprinted_name(filename, data):
+    stem, ext = os.path.splitext(filename)
+    return f"{DIST_DIR}/{stem}.{content_hash(data)}{ext}"
+
+
+def build_manifest(static_dir=STATIC_DIR, assets=FINGERPRINTED_ASSETS):
+    manifest = {}
+    for filename in assets:
+        with open(os.path.join(static_dir, filename), 'rb') as f:
+            data = f.read()
+        hashed = fingerprinted_name(filename, data)
+        destination = os.path.join(static_dir, hashed)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        with open(destination, 'wb') as f:
+            f.write(data)
+        manifest[filename] = hashed
+    with open(os.path.join(static_dir, DIST_DIR, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def get_manifest():
+    global _manifest
+    if _manifest is None:
+        try:
+            with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+                _manifest = json.load(f)
+        except FileNotFoundError:
+            _manifest = {}
+        except Exception as e:
+            print(f"Error loading asset manifest {MANIFEST_PATH}: {str(e)}")
+            _manifest = {}
+    return _manifest
+
+
+def asset_path(filename, use_manifest=True):
+    if not use_manifest:
+        return filename
+    return get_manifest().get(filename, filename)
+
+
+def is_fingerprinted(filename):
+    return filename.startswith(f"{DIST_DIR}/") and filename in get_manifest().values()
+
+
+def get_brotli():
+    global _brotli
+    if _brotli is None:
+        try:
+            import brotli
+            _brotli = brotli
+        except ImportError:
+            _brotli = False
+    return _brotli
+
+
+def choose_encoding(accept_encodings):
+    if accept_encodings['br'] and get_brotli():
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress(data, encoding, static=False):
+    if encoding == 'br':
+        return get_brotli().compress(data, quality=STATIC_BROTLI_QUALITY if static else BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=9 if static else GZIP_LEVEL, mtime=0)
+
+
+def compress_static(key, data, encoding):
+    cached = _static_bodies.get((key, encoding))
+    if cached is not None:
+        _compression_stats['static_hits'] += 1
+        return cached
+    body = compress(data, encoding, static=True)
+    with _static_lock:
+        _static_bodies[(key, encoding)] = body
+    return body
+
+
+def is_compressible(mimetype):
+    return bool(mimetype) and mimetype.startswith(COMPRESSIBLE_TYPES)
+
+
+def record_compression(bytes_in, bytes_out):
+    _compression_stats['responses'] += 1
+    _compression_stats['bytes_in'] += bytes_in
+    _compression_stats['bytes_out'] += bytes_out
+
+
+def get_compression_stats():
+    stats = dict(_compression_stats)
+    stats['enabled'] = HTTP_COMPRESSION
+    stats['brotli'] = bool(get_brotli())
+    stats['min_size'] = COMPRESS_MIN_SIZE
+    stats['ratio'] = round(stats['bytes_out'] / stats['bytes_in'], 3) if stats['bytes_in'] else None
+    return stats
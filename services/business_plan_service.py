@@ -1,12 +1,60 @@
 import os
 import re
+import json
 from utils.helpers import slugify
 from constants import FORM_STEPS
 
+CATALOG_CACHE_VERSION = 2
 
-def load_business_plan_from_yaml():
+
+def get_business_plan_yaml_path():
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    yaml_path = os.path.join(base_dir, 'config', 'improved_business_plan.yaml')
+    return os.path.join(base_dir, 'config', 'improved_business_plan.yaml')
+
+
+def get_catalog_cache_path(yaml_path):
+    name = os.path.splitext(os.path.basename(yaml_path))[0]
+    return os.path.join(os.path.dirname(yaml_path), '__pycache__', f'{name}.catalog.json')
+
+
+def load_business_plan_sections(yaml_path=None):
+    if yaml_path is None:
+        yaml_path = get_business_plan_yaml_path()
+    stat = os.stat(yaml_path)
+    cache_path = get_catalog_cache_path(yaml_path)
+    
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if (cached.get('version') == CATALOG_CACHE_VERSION
+                and cached.get('mtime_ns') == stat.st_mtime_ns
+                and cached.get('size') == stat.st_size):
+            return cached['sections']
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    sections = load_business_plan_from_yaml(yaml_path)
+    
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': CATALOG_CACHE_VERSION,
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'sections': sections
+            }, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: could not write catalog cache {cache_path}: {str(e)}")
+    
+    return sections
+
+
+def load_business_plan_from_yaml(yaml_path=None):
+    if yaml_path is None:
+        yaml_path = get_business_plan_yaml_path()
     
     with open(yaml_path, 'r', encoding='utf-8') as f:
         content = f.read()
@@ -71,6 +119,7 @@ def load_business_plan_from_yaml():
                 
                 i += 1
                 fill_text = ""
+                extras = {}
                 while i < len(lines):
                     next_line = lines[i].strip()
                     if not next_line or next_line.startswith('#'):
@@ -94,7 +143,11 @@ def load_business_plan_from_yaml():
                                     break
                                 fill_text += ' ' + cont_line
                                 i += 1
-                    elif next_line.startswith('why:') or next_line.startswith('answer:'):
+                    elif next_line.startswith(('section:', 'hints:')):
+                        key, value = next_line.split(':', 1)
+                        extras[key] = value.strip().strip('"')
+                    elif re.match(r'"([^"]+)":', next_line):
+                        i -= 1
                         break
                     i += 1
                 
@@ -104,6 +157,7 @@ def load_business_plan_from_yaml():
                         'label': question_label,
                         'fill': fill_text
                     }
+                    question.update((key, value) for key, value in extras.items() if value)
                     current_questions.append(question)
         
         i += 1
@@ -114,32 +168,12 @@ def load_business_plan_from_yaml():
     return sections
 
 
-def calculate_points(form_data, business_plan_sections):
-    points = 0
-    
-    if form_data.get('company_name') and form_data.get('company_name') != '':
-        points += 1
-    if form_data.get('language') and form_data.get('language') != '':
-        points += 1
-    if form_data.get('sphere') and form_data.get('sphere') != '':
-        points += 1
-    if form_data.get('education') and form_data.get('education') != '':
-        points += 1
-    if form_data.get('experience') and form_data.get('experience') != '':
-        points += 1
-    if form_data.get('location') and form_data.get('location') != '':
-        points += 1
-    
-    for section in business_plan_sections:
-        for question in section['core_questions']:
-            question_value = form_data.get(question['id'])
-            if question_value and question_value != '':
-                points += 3
-        for question in section['optional_questions']:
-            question_value = form_data.get(question['id'])
-            if question_value and question_value != '':
-                points += 5
-    
+def calculate_points(form_data, catalog, answers=None):
+    if answers is None:
+        answers = catalog.answers_from(form_data)
+    points = sum(1 for step in FORM_STEPS if form_data.get(step['id']))
+    points += 3 * (answers.completed & catalog.core_mask).bit_count()
+    points += 5 * (answers.completed & catalog.optional_mask).bit_count()
     return points
 
 
@@ -156,67 +190,18 @@ def is_initial_form_complete(form_data):
     return all(form_data.get(step['id']) and form_data.get(step['id']) != '' for step in FORM_STEPS)
 
 
-def get_current_business_plan_question(form_data, business_plan_sections):
-    for section in business_plan_sections:
-        for question in section['core_questions']:
-            question_value = form_data.get(question['id'])
-            if question_value is None:
-                return section, question, 'core'
-        for question in section['optional_questions']:
-            question_value = form_data.get(question['id'])
-            if question_value is None:
-                return section, question, 'optional'
-    return None, None, None
-
+def get_current_business_plan_question(form_data, catalog, answers=None):
+    if answers is None:
+        question = next((q for q in catalog.questions if form_data.get(q.id) is None), None)
+    else:
+        question = catalog.current_question(answers)
+    if question is None:
+        return None, None, None
+    section = next(section for section in catalog.sections if section.id == question.section_id)
+    return section, question, 'optional' if question.optional else 'core'
 
-def get_business_plan_progress(form_data, business_plan_sections):
-    progress = []
-    
-    preliminary_progress = {
-        'section_id': 'section_0',
-        'title': 'Section 0: Basic Information',
-        'description': 'Your company and background details',
-        'core_completed': [],
-        'core_total': len(FORM_STEPS),
-        'optional_completed': [],
-        'optional_total': 0,
-        'core_questions': [],
-        'optional_questions': [],
-        'core_skipped': [],
-        'optional_skipped': []
-    }
-    for step in FORM_STEPS:
-        step_value = form_data.get(step['id'])
-        if step_value and step_value != '':
-            preliminary_progress['core_completed'].append(step['id'])
-    progress.append(preliminary_progress)
-    
-    for section in business_plan_sections:
-        section_progress = {
-            'section_id': section['id'],
-            'title': section['title'],
-            'description': section['description'],
-            'core_completed': [],
-            'core_total': len(section['core_questions']),
-            'optional_completed': [],
-            'optional_total': len(section['optional_questions']),
-            'core_questions': section['core_questions'],
-            'optional_questions': section['optional_questions'],
-            'core_skipped': [],
-            'optional_skipped': []
-        }
-        for question in section['core_questions']:
-            question_value = form_data.get(question['id'])
-            if question_value == '':
-                section_progress['core_skipped'].append(question['id'])
-            elif question_value and question_value != '':
-                section_progress['core_completed'].append(question['id'])
-        for question in section['optional_questions']:
-            question_value = form_data.get(question['id'])
-            if question_value == '':
-                section_progress['optional_skipped'].append(question['id'])
-            elif question_value and question_value != '':
-                section_progress['optional_completed'].append(question['id'])
-        progress.append(section_progress)
-    return progress
 
+def get_business_plan_progress(form_data, catalog, answers=None):
+    if answers is None:
+        answers = catalog.answers_from(form_data)
+    return catalog.progress(form_data, answers)
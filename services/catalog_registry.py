@@ -0,0 +1,229 @@
+import os
+import re
+import json
+import time
+import hashlib
+import itertools
+import threading
+import contextvars
+from flask import has_request_context, request
+from models.catalog import Catalog
+from services.business_plan_service import get_business_plan_yaml_path, load_business_plan_sections
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TENANT_HEADER = 'X-Tenant-Id'
+TENANT_COOKIE = 'aino_tenant'
+DEFAULT_TENANT = 'default'
+TENANT_CATALOG_FILE = 'business_plan.yaml'
+TENANT_TEMPLATE_FILE = 'business_plan_template.md'
+
+TENANTS_DIR = os.environ.get('TENANTS_DIR', os.path.join(BASE_DIR, 'config', 'tenants'))
+CATALOG_WATCH_INTERVAL = float(os.environ.get('CATALOG_WATCH_INTERVAL', 2.0))
+
+_TENANT_PATTERN = re.compile(r'^[a-z0-9][a-z0-9_-]{0,63}$')
+_tenant_var = contextvars.ContextVar('tenant', default=DEFAULT_TENANT)
+
+_entries = {}
+_reload_lock = threading.RLock()
+_listeners = []
+_warmers = []
+_versions = itertools.count(1)
+_watcher = None
+_reload_stats = {'loads': 0, 'swaps': 0, 'unchanged': 0, 'failed': 0, 'last_reload_ms': None,
+                 'max_reload_ms': 0.0}
+
+
+class TenantCatalog:
+    """A tenant's compiled catalog and the files it came from; a reload replaces the whole entry."""
+
+    __slots__ = ('tenant', 'catalog', 'yaml_path', 'template_path', 'signature', 'fingerprint', 'loaded_at')
+
+    def __init__(self, tenant, catalog, yaml_path, template_path, signature, fingerprint):
+        self.tenant = tenant
+        self.catalog = catalog
+        self.yaml_path = yaml_path
+        self.template_path = template_path
+        self.signature = signature
+        self.fingerprint = fingerprint
+        self.loaded_at = time.time()
+
+
+def default_template_path():
+    return os.path.join(BASE_DIR, 'business_plan', 'business_plan_template.md')
+
+
+def tenant_paths(tenant):
+    if tenant == DEFAULT_TENANT:
+        return get_business_plan_yaml_path(), default_template_path()
+    directory = os.path.join(TENANTS_DIR, tenant)
+    template_path = os.path.join(directory, TENANT_TEMPLATE_FILE)
+    if not os.path.isfile(template_path):
+        template_path = default_template_path()
+    return os.path.join(directory, TENANT_CATALOG_FILE), template_path
+
+
+def tenant_exists(tenant):
+    if tenant == DEFAULT_TENANT or tenant in _entries:
+        return True
+    return bool(_TENANT_PATTERN.match(tenant)) and os.path.isfile(tenant_paths(tenant)[0])
+
+
+def current_tenant():
+    if has_request_context():
+        tenant = (request.headers.get(TENANT_HEADER) or request.cookies.get(TENANT_COOKIE) or '').strip().lower()
+        if tenant and tenant_exists(tenant):
+            return tenant
+        return DEFAULT_TENANT
+    return _tenant_var.get()
+
+
+def bind_tenant(tenant):
+    """Make current_tenant() answer tenant outside a request, in work done on a request's behalf."""
+    return _tenant_var.set(tenant)
+
+
+def list_tenants():
+    tenants = [DEFAULT_TENANT]
+    try:
+        names = sorted(os.listdir(TENANTS_DIR))
+    except OSError:
+        names = []
+    for name in names:
+        if name != DEFAULT_TENANT and _TENANT_PATTERN.match(name) and os.path.isfile(tenant_paths(name)[0]):
+            tenants.append(name)
+    return tenants
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _compile(tenant):
+    yaml_path, template_path = tenant_paths(tenant)
+    signature = _signature(yaml_path)
+    sections = load_business_plan_sections(yaml_path)
+    if not any(section['core_questions'] or section['optional_questions'] for section in sections):
+        raise ValueError(f"No questions found in {yaml_path}")
+    fingerprint = hashlib.sha256(
+        json.dumps(sections, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    ).hexdigest()
+    catalog = Catalog.from_sections(sections, version=next(_versions))
+    return TenantCatalog(tenant, catalog, yaml_path, template_path, signature, fingerprint)
+
+
+def on_catalog_swap(listener):
+    """Call listener(tenant, old_catalog) after a tenant's catalog is replaced, to drop caches built from it."""
+    _listeners.append(listener)
+    return listener
+
+
+def on_catalog_compiled(warmer):
+    """Call warmer(catalog) on every newly compiled catalog before it is swapped in, off the request path."""
+    _warmers.append(warmer)
+    return warmer
+
+
+def reload_tenant(tenant):
+    """Recompile a tenant's catalog and swap it in if its questions changed.
+
+    Requests keep reading the entry they already hold while the new one is built; the swap is a single dict
+    assignment. A catalog that fails to compile leaves the previous one in place.
+    """
+    with _reload_lock:
+        started = time.perf_counter()
+        previous = _entries.get(tenant)
+        try:
+            entry = _compile(tenant)
+        except Exception as e:
+            _reload_stats['failed'] += 1
+            if previous is None:
+                raise
+            print(f"Error reloading catalog for tenant {tenant}: {str(e)}")
+            return previous
+        if previous is None:
+            _reload_stats['loads'] += 1
+        elif entry.fingerprint == previous.fingerprint:
+            # Only the file changed (e.g. comments or formatting); keep the catalog and everything built on it.
+            _reload_stats['unchanged'] += 1
+            entry.catalog = previous.catalog
+        else:
+            _reload_stats['swaps'] += 1
+        if previous is None or entry.catalog is not previous.catalog:
+            for warmer in _warmers:
+                try:
+                    warmer(entry.catalog)
+                except Exception as e:
+                    print(f"Error preparing catalog for tenant {tenant}: {str(e)}")
+        reload_ms = round((time.perf_counter() - started) * 1000, 2)
+        _reload_stats['last_reload_ms'] = reload_ms
+        _reload_stats['max_reload_ms'] = max(_reload_stats['max_reload_ms'], reload_ms)
+        _entries[tenant] = entry
+
+    if previous is not None and entry.catalog is not previous.catalog:
+        print(f"Catalog for tenant {tenant} reloaded: {len(entry.catalog.questions)} questions in {reload_ms} ms")
+        for listener in _listeners:
+            try:
+                listener(tenant, previous.catalog)
+            except Exception as e:
+                print(f"Error invalidating caches for tenant {tenant}: {str(e)}")
+    return entry
+
+
+def get_tenant_entry(tenant=None):
+    tenant = tenant or current_tenant()
+    entry = _entries.get(tenant)
+    if entry is None:
+        with _reload_lock:
+            entry = _entries.get(tenant)
+            if entry is None:
+                entry = reload_tenant(tenant)
+        if CATALOG_WATCH_INTERVAL > 0 and _watcher is None:
+            _start_watcher()
+    return entry
+
+
+def get_tenant_catalog(tenant=None):
+    return get_tenant_entry(tenant).catalog
+
+
+def check_for_changes():
+    """Reload every loaded tenant whose catalog file changed since it was compiled; returns the tenants reloaded."""
+    reloaded = []
+    for tenant, entry in list(_entries.items()):
+        try:
+            changed = _signature(entry.yaml_path) != entry.signature
+        except OSError as e:
+            print(f"Error checking catalog for tenant {tenant}: {str(e)}")
+            continue
+        if changed:
+            reload_tenant(tenant)
+            reloaded.append(tenant)
+    return reloaded
+
+
+def get_catalog_stats():
+    stats = dict(_reload_stats)
+    stats['tenants'] = {tenant: {'version': entry.catalog.version, 'questions': len(entry.catalog.questions),
+                                 'loaded_at': int(entry.loaded_at)}
+                        for tenant, entry in list(_entries.items())}
+    stats['watch_interval_s'] = CATALOG_WATCH_INTERVAL
+    return stats
+
+
+def _start_watcher():
+    global _watcher
+    with _reload_lock:
+        if _watcher is None:
+            _watcher = threading.Thread(target=_watch_loop, name='catalog-watcher', daemon=True)
+            _watcher.start()
+
+
+def _watch_loop():
+    while True:
+        time.sleep(CATALOG_WATCH_INTERVAL)
+        try:
+            check_for_changes()
+        except Exception as e:
+            print(f"Error watching catalogs: {str(e)}")
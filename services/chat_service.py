@@ -1,25 +1,31 @@
-from openai import OpenAI
-import os
-import sys
 from constants import FORM_STEPS
 from services.business_plan_service import get_current_business_plan_question
+from services.llm_policy import call_llm, chat_request, chat_stream_request, policy_client
+from services.language_service import (
+    DEFAULT_LANGUAGE,
+    get_message,
+    get_session_language,
+    language_name,
+    localize_question,
+    translate
+)
 
-try:
-    from config.config import OPENAI_API_KEY
-except ImportError:
-    OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY', '')
+PREFETCH_NOTE = (" You cannot see the user's latest answer: thank them for it in a few words without mentioning "
+                 "any details, then ask the question.")
+PREFETCH_RETRY_NOTE = " You cannot see the user's latest answer; do not quote or describe it."
 
-if not OPENAI_API_KEY:
-    print("Warning: OPENAI_API_KEY not found. Please set it in config/config.py or as an environment variable.")
-    sys.exit(1)
 
-client = OpenAI(api_key=OPENAI_API_KEY)
-
-
-def get_step_prompt(current_step, form_data, business_plan_sections, is_retry=False, is_skipping=False):
+def get_step_prompt(current_step, form_data, business_plan_sections, is_retry=False, is_skipping=False,
+                    filled_steps=None):
+    language_code = get_session_language(form_data)
+    language_note = ""
+    if language_code != DEFAULT_LANGUAGE:
+        language_note = f" Always reply in {language_name(language_code)}."
+    
     if current_step and current_step.startswith('bp_'):
         section, question, question_type = get_current_business_plan_question(form_data, business_plan_sections)
         if section and question:
+            question = localize_question(question, language_code)
             context_parts = []
             if form_data.get('company_name'):
                 context_parts.append(f"Company: {form_data['company_name']}")
@@ -28,8 +34,9 @@ def get_step_prompt(current_step, form_data, business_plan_sections, is_retry=Fa
             
             context = f"Context: {', '.join(context_parts)}. " if context_parts else ""
             
-            section_info = f"We're working on {section['title']} - {section['description']}."
-            question_instruction = f"Ask about: {question['label']}. {question['fill']}"
+            section_info = (f"We're working on {translate(section.title, language_code)} - "
+                            f"{translate(section.description, language_code)}.")
+            question_instruction = f"Ask about: {question.label}. {question.fill}"
             
             if question_type == 'optional':
                 question_instruction += " (This is an optional deeper dive question - they can skip if they prefer.)"
@@ -39,14 +46,19 @@ def get_step_prompt(current_step, form_data, business_plan_sections, is_retry=Fa
                 retry_note = " The user's previous answer didn't seem to address the question properly or was unclear (it might have been random numbers, gibberish, or unrelated text). Please politely let them know you didn't understand their answer and ask the same question again. Be encouraging and supportive. If they don't answer properly this time, we'll move on to the next question."
             elif is_skipping:
                 retry_note = " The user didn't provide a clear answer to the previous question after two attempts, so we're moving on. Please ask the next question naturally and encouragingly."
+            if filled_steps:
+                labels = [localize_question(business_plan_sections.by_id[step], language_code).label
+                          for step in filled_steps if step in business_plan_sections.by_id]
+                retry_note += (f" Their last message also answered other questions ({'; '.join(labels)}); "
+                               "briefly acknowledge that, then ask the question above.")
             
             return f"""You are a friendly business advisor assistant helping create a comprehensive business plan. {context}
 {section_info}
-Now ask them: "{question['label']}" - {question['fill']}{retry_note}
-Keep responses concise (1-2 sentences) and conversational. Be encouraging and supportive. Make sure to actually ask the question directly."""
+Now ask them: "{question.label}" - {question.fill}{retry_note}
+Keep responses concise (1-2 sentences) and conversational. Be encouraging and supportive. Make sure to actually ask the question directly.{language_note}"""
         else:
-            return """You are a friendly business advisor assistant. All business plan questions have been completed.
-Thank them for their thorough responses and let them know their business plan information has been collected."""
+            return f"""You are a friendly business advisor assistant. All business plan questions have been completed.
+Thank them for their thorough responses and let them know their business plan information has been collected.{language_note}"""
     
     step_descriptions = {
         'company_name': "Ask for the company name. Be friendly and welcoming.",
@@ -77,28 +89,39 @@ Thank them for their thorough responses and let them know their business plan in
     
     current_task = step_descriptions.get(current_step, "Continue the conversation naturally.")
     
+    answered_note = ""
+    if filled_steps:
+        labels = [step['label'] for step in FORM_STEPS if step['id'] in filled_steps]
+        answered_note = (f" Their last message answered several questions at once ({', '.join(labels)}); "
+                         "briefly acknowledge them and do not ask for them again.")
+        if not form_data.get(current_step):
+            return f"""You are a friendly business form assistant helping to collect information. {context}
+Current task: {current_task}{answered_note}
+Keep responses concise (1-2 sentences) and conversational. Ask only this one question.{language_note}"""
+    
     if current_step == 'location':
         section, question, _ = get_current_business_plan_question(form_data, business_plan_sections)
         if section and question:
+            question = localize_question(question, language_code)
             return f"""You are a friendly business form assistant helping to collect information. {context}
-Current task: {current_task}
-After collecting the location, congratulate them on completing the initial form. Then immediately ask them the first business plan question: "{question['label']}". {question['fill']}
-Keep responses concise (1-2 sentences) and conversational."""
+Current task: {current_task}{answered_note}
+After collecting the location, congratulate them on completing the initial form. Then immediately ask them the first business plan question: "{question.label}". {question.fill}
+Keep responses concise (1-2 sentences) and conversational.{language_note}"""
         else:
             return f"""You are a friendly business form assistant helping to collect information. {context}
-Current task: {current_task}
+Current task: {current_task}{answered_note}
 After collecting the location, congratulate them on completing the initial form and introduce the business plan checklist.
-Keep responses concise (1-2 sentences) and conversational."""
+Keep responses concise (1-2 sentences) and conversational.{language_note}"""
     elif current_step == 'complete':
         if not form_data.get('email'):
             return f"""You are a friendly business form assistant. All required information has been collected:
 {', '.join(collected_info)}
 Now, please ask for their email address so we can send them a summary report of the information they provided.
-Keep responses concise and conversational."""
+Keep responses concise and conversational.{language_note}"""
         else:
             return f"""You are a friendly business form assistant. All information including email has been collected.
 Thank them for completing the form and let them know that a report will be sent to their email address shortly.
-Keep responses concise and conversational."""
+Keep responses concise and conversational.{language_note}"""
     else:
         next_steps = []
         for step in FORM_STEPS:
@@ -118,12 +141,69 @@ Keep responses concise and conversational."""
         return f"""You are a friendly business form assistant helping to collect information. {context}
 Current task: {current_task}{retry_note_initial}{next_hint}
 Keep responses concise (1-2 sentences) and conversational. 
-Acknowledge their input and naturally move to the next question."""
+Acknowledge their input and naturally move to the next question.{language_note}"""
 
 
-def get_openai_response(user_message, current_step, form_data, chat_history, business_plan_sections, is_retry=False, is_skipping=False):
+def get_template_reply(current_step, form_data, business_plan_sections, is_retry=False, is_skipping=False):
+    language_code = get_session_language(form_data)
+    parts = []
+    if is_retry:
+        parts.append(get_message('retry_prompt', language_code))
+    elif is_skipping:
+        parts.append(get_message('skip_prompt', language_code))
+    
+    next_step = next((step['id'] for step in FORM_STEPS if not form_data.get(step['id'])), None)
+    if next_step:
+        parts.append(get_message(f'ask_{next_step}', language_code))
+    else:
+        section, question, _ = get_current_business_plan_question(form_data, business_plan_sections)
+        if section and question:
+            question = localize_question(question, language_code)
+            parts.append(f"{question.label}: {question.fill}")
+        elif not form_data.get('email'):
+            parts.append(get_message('ask_email', language_code))
+        else:
+            parts.append(get_message('form_complete', language_code))
+    return ' '.join(parts)
+
+
+def _stream_reply(messages, on_token):
+    response = call_llm('chat_stream', "gpt-4o-mini", chat_stream_request(
+        messages=messages,
+        temperature=0.7,
+        max_tokens=200
+    ), local_fallback=lambda: None)
+    if response is None:
+        return None
+    pieces = []
     try:
-        context_message = get_step_prompt(current_step, form_data, business_plan_sections, is_retry=is_retry, is_skipping=is_skipping)
+        for piece in response:
+            pieces.append(piece)
+            on_token(piece)
+    except Exception as e:
+        # Keep whatever already reached the client; an empty reply falls back to the template.
+        print(f"Chat stream interrupted after {len(pieces)} tokens: {e}")
+    return ''.join(pieces).strip() or None
+
+
+def prefetch_reply(current_step, form_data, chat_history, business_plan_sections, is_retry=False):
+    """Phrase the next reply before the user has answered; None when the model is unavailable."""
+    note = PREFETCH_RETRY_NOTE if is_retry else PREFETCH_NOTE
+    messages = [{'role': 'system', 'content': get_step_prompt(current_step, form_data, business_plan_sections,
+                                                              is_retry=is_retry) + note}]
+    messages.extend(chat_history[-10:])
+    response = call_llm('prefetch', "gpt-4o-mini", chat_request(
+        messages=messages,
+        temperature=0.7,
+        max_tokens=200
+    ), local_fallback=lambda: None)
+    return response.choices[0].message.content.strip() if response is not None else None
+
+
+def get_openai_response(user_message, current_step, form_data, chat_history, business_plan_sections, is_retry=False, is_skipping=False, filled_steps=None, on_token=None, prefetched=None):
+    try:
+        context_message = get_step_prompt(current_step, form_data, business_plan_sections, is_retry=is_retry, is_skipping=is_skipping,
+                                          filled_steps=filled_steps)
         
         system_message = {
             'role': 'system',
@@ -140,14 +220,26 @@ def get_openai_response(user_message, current_step, form_data, chat_history, bus
             'content': user_message
         })
         
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=messages,
-            temperature=0.7,
-            max_tokens=200
-        )
+        if prefetched:
+            ai_message = prefetched
+            if on_token:
+                on_token(ai_message)
+        elif on_token:
+            ai_message = _stream_reply(messages, on_token)
+        else:
+            response = call_llm('chat', "gpt-4o-mini", chat_request(
+                messages=messages,
+                temperature=0.7,
+                max_tokens=200
+            ), local_fallback=lambda: None)
+            ai_message = response.choices[0].message.content.strip() if response is not None else None
         
-        ai_message = response.choices[0].message.content.strip()
+        degraded = ai_message is None
+        if degraded:
+            ai_message = get_template_reply(current_step, form_data, business_plan_sections,
+                                            is_retry=is_retry, is_skipping=is_skipping)
+            if on_token:
+                on_token(ai_message)
         
         chat_history.append({
             'role': 'user',
@@ -183,29 +275,64 @@ def get_openai_response(user_message, current_step, form_data, chat_history, bus
                     break
             
             if next_step_idx == 'complete':
-                return {'message': ai_message, 'step': 'complete'}
+                return {'message': ai_message, 'step': 'complete', 'degraded': degraded}
             elif next_step_idx is not None:
-                return {'message': ai_message, 'step': FORM_STEPS[next_step_idx]['id']}
+                return {'message': ai_message, 'step': FORM_STEPS[next_step_idx]['id'], 'degraded': degraded}
         
-        return {'message': ai_message, 'step': current_step}
+        return {'message': ai_message, 'step': current_step, 'degraded': degraded}
     
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
         print(f"Chat API error: {error_details}")
         return {
-            'message': f"I apologize, but I encountered an error. Please try again. Error: {str(e)}",
-            'step': current_step
+            'message': get_message('chat_error', get_session_language(form_data)),
+            'step': current_step,
+            'degraded': True
         }
 
 
-def get_tts_audio(text):
-    audio_response = client.audio.speech.create(
-        model="tts-1",
-        voice="alloy",
-        input=text
-    )
-    return audio_response.read()
+def get_tts_audio(text, stage='tts'):
+    def request(model, timeout):
+        audio_response = policy_client(timeout).audio.speech.create(
+            model=model,
+            voice="alloy",
+            input=text
+        )
+        return audio_response.read()
+
+    return call_llm(stage, "tts-1", request, characters=len(text))
+
+
+class AudioStream:
+    """Speech audio read from an open streaming response, chunk by chunk as the API sends it."""
+
+    def __init__(self, manager, response):
+        self._manager = manager
+        self._response = response
+
+    def __iter__(self):
+        try:
+            yield from self._response.iter_bytes()
+        finally:
+            self.close()
+
+    def close(self):
+        manager, self._manager = self._manager, None
+        if manager is not None:
+            manager.__exit__(None, None, None)
+
+
+def stream_tts_audio(text):
+    def request(model, timeout):
+        manager = policy_client(timeout).audio.speech.with_streaming_response.create(
+            model=model,
+            voice="alloy",
+            input=text
+        )
+        return AudioStream(manager, manager.__enter__())
+
+    return call_llm('tts_stream', "tts-1", request, characters=len(text))
 
 
 def transcribe_audio(audio_file):
@@ -215,10 +342,16 @@ def transcribe_audio(audio_file):
     
     filename = audio_file.filename or 'audio.webm'
     content_type = audio_file.content_type or 'audio/webm'
-    
-    transcription = client.audio.transcriptions.create(
-        model="whisper-1",
-        file=(filename, file_content, content_type)
-    )
-    return transcription.text
+    return transcribe_clip(file_content, filename, content_type)
 
+
+def transcribe_clip(file_content, filename, content_type):
+    def request(model, timeout):
+        return policy_client(timeout).audio.transcriptions.create(
+            model=model,
+            file=(filename, file_content, content_type),
+            response_format='verbose_json'
+        )
+
+    transcription = call_llm('transcription', "whisper-1", request, audio_bytes=len(file_content))
+    return transcription.text
@@ -0,0 +1,177 @@
+import os
+import time
+import threading
+
+BREAKER_FAILURES = int(os.environ.get('BREAKER_FAILURES', 10))
+BREAKER_SLOW_CALLS = int(os.environ.get('BREAKER_SLOW_CALLS', 5))
+BREAKER_COOLDOWN = float(os.environ.get('BREAKER_COOLDOWN', 30.0))
+BREAKER_MAX_COOLDOWN = float(os.environ.get('BREAKER_MAX_COOLDOWN', 300.0))
+BREAKER_PROBE_INTERVAL = float(os.environ.get('BREAKER_PROBE_INTERVAL', 1.0))
+
+# Latency SLO per dependency; a success slower than this counts as a breach.
+BREAKER_SLO_MS = {
+    'chat': float(os.environ.get('BREAKER_CHAT_SLO_MS', 6000)),
+    'tts': float(os.environ.get('BREAKER_TTS_SLO_MS', 6000)),
+    'transcription': float(os.environ.get('BREAKER_TRANSCRIPTION_SLO_MS', 10000)),
+}
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+_breakers = {}
+_probes = {}
+_breakers_lock = threading.Lock()
+_prober = None
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, dependency):
+        super().__init__(f"{dependency} is unavailable (circuit open)")
+        self.dependency = dependency
+
+
+class CircuitBreaker:
+    def __init__(self, dependency):
+        self.dependency = dependency
+        self.slo_ms = BREAKER_SLO_MS.get(dependency)
+        self.state = CLOSED
+        self.failures = 0
+        self.slow_calls = 0
+        self.cooldown = BREAKER_COOLDOWN
+        self.opened_at = None
+        self.retry_at = 0.0
+        self.trial_in_flight = False
+        self.last_error = None
+        self.stats = {'opened': 0, 'closed': 0, 'short_circuited': 0, 'probes': 0, 'probe_failures': 0}
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if (self.state == OPEN and self.dependency not in _probes and not self.trial_in_flight
+                    and time.monotonic() >= self.retry_at):
+                self.state = HALF_OPEN
+                self.trial_in_flight = True
+                return True
+            self.stats['short_circuited'] += 1
+            return False
+
+    def record_success(self, seconds):
+        with self._lock:
+            self.failures = 0
+            if self.slo_ms and seconds * 1000 > self.slo_ms:
+                self.slow_calls += 1
+                if self.state == HALF_OPEN or (self.state == CLOSED and self.slow_calls >= BREAKER_SLOW_CALLS):
+                    self._open(f"{self.slow_calls} calls slower than {self.slo_ms:.0f} ms")
+                return
+            self.slow_calls = 0
+            if self.state == HALF_OPEN:
+                self._close()
+
+    def record_failure(self, error):
+        with self._lock:
+            self.failures += 1
+            self.last_error = f"{error.__class__.__name__}: {error}"[:200]
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= BREAKER_FAILURES):
+                self._open(self.last_error)
+
+    def _open(self, reason):
+        if self.state == HALF_OPEN:
+            self.cooldown = min(self.cooldown * 2, BREAKER_MAX_COOLDOWN)
+        elif self.state == CLOSED:
+            self.stats['opened'] += 1
+            self.opened_at = time.time()
+            print(f"Circuit for {self.dependency} opened: {reason}")
+        self.state = OPEN
+        self.trial_in_flight = False
+        self.retry_at = time.monotonic() + self.cooldown
+        _start_prober()
+
+    def _close(self):
+        print(f"Circuit for {self.dependency} closed after {time.time() - (self.opened_at or time.time()):.0f}s")
+        self.state = CLOSED
+        self.failures = 0
+        self.slow_calls = 0
+        self.cooldown = BREAKER_COOLDOWN
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.stats['closed'] += 1
+
+    def probe_due(self):
+        with self._lock:
+            if self.state != OPEN or self.trial_in_flight or time.monotonic() < self.retry_at:
+                return False
+            self.state = HALF_OPEN
+            self.trial_in_flight = True
+            self.stats['probes'] += 1
+            return True
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'consecutive_slow_calls': self.slow_calls,
+                'slo_ms': self.slo_ms,
+                'opened_at': self.opened_at,
+                'retry_in_s': round(max(self.retry_at - time.monotonic(), 0.0), 1) if self.state != CLOSED else None,
+                'last_error': self.last_error,
+                **self.stats
+            }
+
+
+def get_breaker(dependency):
+    breaker = _breakers.get(dependency)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(dependency, CircuitBreaker(dependency))
+    return breaker
+
+
+def register_probe(dependency, probe):
+    _probes[dependency] = probe
+
+
+def is_available(dependency):
+    return get_breaker(dependency).state == CLOSED
+
+
+def degraded_features():
+    return sorted(dependency for dependency, breaker in list(_breakers.items()) if breaker.state != CLOSED)
+
+
+def get_breaker_states():
+    return {dependency: breaker.snapshot() for dependency, breaker in sorted(_breakers.items())}
+
+
+def _start_prober():
+    global _prober
+    if _prober is None:
+        with _breakers_lock:
+            if _prober is None:
+                _prober = threading.Thread(target=_probe_loop, name='breaker-probe', daemon=True)
+                _prober.start()
+
+
+def _probe_loop():
+    while True:
+        time.sleep(BREAKER_PROBE_INTERVAL)
+        for dependency, breaker in list(_breakers.items()):
+            probe = _probes.get(dependency)
+            if probe is None or not breaker.probe_due():
+                continue
+            started = time.perf_counter()
+            try:
+                probe()
+            except Exception as e:
+                breaker.stats['probe_failures'] += 1
+                breaker.record_failure(e)
+                continue
+            breaker.record_success(time.perf_counter() - started)
+
+
+def reset_breakers():
+    with _breakers_lock:
+        _breakers.clear()
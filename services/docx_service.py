@@ -1,28 +1,68 @@
+import io
 import os
 import tempfile
 import re
-import yaml
-from openai import OpenAI
-import sys
-import markdown
+import json
+import time
+import hashlib
+import threading
+import contextvars
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from html.parser import HTMLParser
+from services.catalog_registry import get_tenant_entry
+from services.log_service import log_event
+from services.llm_policy import call_llm, chat_request
+from services.render_service import render_document
 
-try:
-    from config.config import OPENAI_API_KEY
-except ImportError:
-    OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY', '')
+FILLED_MARKDOWN_CACHE_SIZE = 32
+FILL_MODE = os.environ.get('BUSINESS_PLAN_FILL_MODE', 'sections')
+FILL_CONCURRENCY = int(os.environ.get('BUSINESS_PLAN_FILL_CONCURRENCY', 12))
+FILL_MODEL = 'gpt-4o'
 
-if not OPENAI_API_KEY:
-    print("Warning: OPENAI_API_KEY not found. Please set it in config/config.py or as an environment variable.")
-    sys.exit(1)
+# Report template section of each default checklist answer. A catalog question's "section:" takes precedence.
+TEMPLATE_SECTION_ANSWERS = {
+    'Background information': [
+        'Background information (company basics)', 'Company Name', 'Business Sphere / Industry', 'Industry',
+        'Location',
+    ],
+    'Business idea': ['Business idea'],
+    'Competence / skills': ['Competence / skills', 'Education', 'Experience / Background'],
+    'SWOT-analysis': ['SWOT-analysis'],
+    'Products and services': ['Products and services'],
+    'To whom and why?': [
+        'Customers (segments)', 'Customer purchase motives', 'Customer Purchase Criteria', 'Customer Risks',
+    ],
+    'How do I operate?': [
+        'Sales and marketing channels', 'Market entry and launch plan', 'Production and logistics (goods)',
+        'Delivery operations (services)', 'Distribution network',
+    ],
+    'Operating environment': [
+        'Competitive situation and competitors', 'Other third parties and partners important to the company',
+        'Potential risks in the operating environment',
+    ],
+    'Vision': ['Vision (3–5 years)', 'Internationalization plans'],
+    'Other things to consider': [
+        'Permits and notices', 'Insurance and contracts', 'Intellectual property rights', 'Contracts (key contracts)',
+    ],
+    'My business': ['Initial financing and startup costs', 'Profitability Timeline'],
+}
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+_filled_markdown_cache = OrderedDict()
+_filled_markdown_lock = threading.Lock()
+_fill_pool = None
+_fill_pool_lock = threading.Lock()
+_docx_renderer = None
+_docx_render_lock = threading.Lock()
 
 
 def load_yaml_answers(yaml_path):
     with open(yaml_path, "r", encoding="utf-8") as f:
         content = f.read()
-    
+    return parse_yaml_answers(content)
+
+
+def parse_yaml_answers(content):
     answers = {}
     lines = content.split('\n')
     i = 0
@@ -45,7 +85,9 @@ def load_yaml_answers(yaml_path):
                     if answer and answer.strip():
                         answers[question_label] = answer.strip()
                     break
-                elif next_line and not next_line.startswith('#') and ':' in next_line:
+                elif re.match(r'"([^"]+)":', next_line):
+                    # The next question starts; this one has no answer. Look at its header again.
+                    i -= 1
                     break
                 i += 1
         i += 1
@@ -98,19 +140,16 @@ def fill_business_plan_markdown_from_answers(template_path, answers):
     if not answers:
         raise ValueError("No answers provided. Please answer some questions first.")
     
-    print(f"Using {len(answers)} answers: {list(answers.keys())}")
-    
     prompt = build_filling_prompt(template_markdown, answers)
     
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
+        response = call_llm('fill', FILL_MODEL, chat_request(
             messages=[
                 {'role': 'system', 'content': 'You are a helpful assistant that fills business plan templates with provided answers.'},
                 {'role': 'user', 'content': prompt}
             ],
             temperature=0.3
-        )
+        ))
         filled_markdown = response.choices[0].message.content.strip()
         return filled_markdown
     except Exception as e:
@@ -118,6 +157,120 @@ def fill_business_plan_markdown_from_answers(template_path, answers):
         raise
 
 
+def split_template_sections(template_markdown):
+    preamble = []
+    sections = []
+    for line in template_markdown.split('\n'):
+        if line.startswith('## '):
+            title = re.sub(r'^\d+\.\s*', '', line[3:].strip())
+            sections.append((title, [line]))
+        elif sections:
+            sections[-1][1].append(line)
+        else:
+            preamble.append(line)
+    
+    def clean(lines):
+        text = '\n'.join(lines).strip()
+        while text.endswith('---'):
+            text = text[:-3].rstrip()
+        return text
+    
+    return clean(preamble), [(title, clean(lines)) for title, lines in sections]
+
+
+def template_sections(business_plan_sections):
+    return {question.label: question.template_section for question in business_plan_sections.questions
+            if question.template_section}
+
+
+def route_answers(section_titles, answers, sections_by_label=None):
+    routed = {title: {} for title in section_titles}
+    unrouted = dict(answers)
+    for label, title in (sections_by_label or {}).items():
+        if label in unrouted and title in routed:
+            routed[title][label] = unrouted.pop(label)
+    for title in section_titles:
+        for label in TEMPLATE_SECTION_ANSWERS.get(title, []):
+            if label in unrouted:
+                routed[title][label] = unrouted.pop(label)
+    if unrouted and section_titles:
+        routed[section_titles[-1]].update(unrouted)
+    return routed
+
+
+def fill_preamble(preamble, answers):
+    company_name = answers.get('Company Name')
+    lines = []
+    for line in preamble.split('\n'):
+        if '...' in line:
+            if not company_name:
+                continue
+            line = line.replace('...', company_name)
+        lines.append(line)
+    return '\n'.join(lines).strip()
+
+
+def build_section_filling_prompt(section_markdown, answers):
+    import yaml
+    yaml_text = yaml.safe_dump(answers, sort_keys=False, allow_unicode=True)
+    return (
+        "Fill this business plan section with the answers below. Keep the heading and formatting, "
+        "remove questions, fields and '...' placeholders without an answer, use blank lines around "
+        "headings, lists and tables, no <br> tags. Return only the section markdown.\n\n"
+        f"```markdown\n{section_markdown}\n```\n\n"
+        f"```yaml\n{yaml_text}```\n"
+    )
+
+
+def fill_section(section_markdown, answers):
+    response = call_llm('fill', FILL_MODEL, chat_request(
+        messages=[
+            {'role': 'system', 'content': 'You fill business plan templates with provided answers.'},
+            {'role': 'user', 'content': build_section_filling_prompt(section_markdown, answers)}
+        ],
+        temperature=0.3
+    ))
+    filled = response.choices[0].message.content.strip()
+    fence = re.match(r'^```(?:markdown)?\n(.*)\n```$', filled, re.S)
+    return fence.group(1).strip() if fence else filled
+
+
+def _get_fill_pool():
+    global _fill_pool
+    if _fill_pool is None:
+        with _fill_pool_lock:
+            if _fill_pool is None:
+                _fill_pool = ThreadPoolExecutor(max_workers=FILL_CONCURRENCY, thread_name_prefix='plan-fill')
+    return _fill_pool
+
+
+def fill_business_plan_markdown_by_section(template_path, answers, sections_by_label=None):
+    with open(template_path, "r", encoding="utf-8") as f:
+        template_markdown = f.read()
+    
+    if not answers:
+        raise ValueError("No answers provided. Please answer some questions first.")
+    
+    preamble, sections = split_template_sections(template_markdown)
+    routed = route_answers([title for title, _ in sections], answers, sections_by_label)
+    jobs = []
+    for title, section_markdown in sections:
+        if routed[title]:
+            context = contextvars.copy_context()
+            jobs.append((title, _get_fill_pool().submit(context.run, fill_section, section_markdown, routed[title])))
+    
+    parts = [fill_preamble(preamble, answers)]
+    for title, future in jobs:
+        try:
+            parts.append(future.result())
+        except Exception as e:
+            print(f"Error filling business plan section '{title}': {str(e)}")
+            for _, pending in jobs:
+                pending.cancel()
+            raise
+    return '\n\n---\n\n'.join(part for part in parts if part)
+
+
 class HTMLToDocxParser(HTMLParser):
     def __init__(self, doc):
         super().__init__()
@@ -188,23 +341,15 @@ class HTMLToDocxParser(HTMLParser):
             self.current_run.text += data
 
 
-def create_docx_from_form_data(form_data, business_plan_sections, output_docx_path=None):
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    template_path = os.path.join(base_dir, 'business_plan', 'business_plan_template.md')
-    
-    if not os.path.exists(template_path):
-        raise FileNotFoundError(f"Template not found: {template_path}")
-    
+def get_template_path(tenant=None):
+    return get_tenant_entry(tenant).template_path
+
+
+def collect_answers(form_data, business_plan_sections):
     if not form_data:
         raise ValueError("Form data is empty. Please start a conversation and answer some questions first.")
     
-    print(f"DEBUG: form_data type: {type(form_data)}, keys: {list(form_data.keys()) if form_data else 'None'}")
-    print(f"DEBUG: form_data items: {[(k, str(v)[:50] if v else None) for k, v in (form_data.items() if form_data else [])]}")
-    print(f"DEBUG: business_plan_sections count: {len(business_plan_sections) if business_plan_sections else 0}")
-    
     answers = {}
-    total_questions_checked = 0
-    question_ids_looked_for = []
     
     initial_form_mapping = {
         'company_name': 'Company Name',
@@ -218,40 +363,11 @@ def create_docx_from_form_data(form_data, business_plan_sections, output_docx_pa
         value = form_data.get(key)
         if value and isinstance(value, str) and value.strip() and value != '':
             answers[label] = value.strip()
-            print(f"DEBUG: Added initial form field '{label}': {value[:50]}")
-    
-    for section in business_plan_sections:
-        for question in section.get('core_questions', []):
-            total_questions_checked += 1
-            question_id = question.get('id')
-            question_label = question.get('label')
-            if not question_id:
-                continue
-            question_ids_looked_for.append(question_id)
-            answer = form_data.get(question_id)
-            print(f"DEBUG: Looking for question_id='{question_id}', label='{question_label}', found in form_data: {question_id in form_data}, value: {str(answer)[:50] if answer else 'None'}")
-            if answer and isinstance(answer, str) and answer.strip() and answer != '':
-                answers[question_label] = answer.strip()
-                print(f"DEBUG: ✓ Found answer for '{question_label}': {answer[:50]}")
-        for question in section.get('optional_questions', []):
-            total_questions_checked += 1
-            question_id = question.get('id')
-            question_label = question.get('label')
-            if not question_id:
-                continue
-            question_ids_looked_for.append(question_id)
-            answer = form_data.get(question_id)
-            print(f"DEBUG: Looking for optional question_id='{question_id}', label='{question_label}', found in form_data: {question_id in form_data}, value: {str(answer)[:50] if answer else 'None'}")
-            if answer and isinstance(answer, str) and answer.strip() and answer != '':
-                answers[question_label] = answer.strip()
-                print(f"DEBUG: ✓ Found optional answer for '{question_label}': {answer[:50]}")
     
-    print(f"DEBUG: Question IDs we looked for: {question_ids_looked_for[:10]}... (showing first 10)")
-    print(f"DEBUG: Form data keys: {list(form_data.keys())}")
-    print(f"DEBUG: Matching keys: {set(question_ids_looked_for) & set(form_data.keys())}")
-    
-    print(f"DEBUG: Checked {total_questions_checked} questions, found {len(answers)} answers")
-    print(f"DEBUG: Final answers dict keys: {list(answers.keys())}")
+    for question in business_plan_sections.questions:
+        answer = form_data.get(question.id)
+        if answer and isinstance(answer, str) and answer.strip() and answer != '':
+            answers[question.label] = answer.strip()
     
     if not answers:
         available_keys = list(form_data.keys()) if form_data else []
@@ -266,41 +382,127 @@ def create_docx_from_form_data(form_data, business_plan_sections, output_docx_pa
         else:
             raise ValueError(f"No valid business plan answers found. Form data has keys: {available_keys}. Please make sure you've answered some business plan questions.")
     
-    print(f"Loaded {len(answers)} answers from form_data: {list(answers.keys())}")
+    return answers
+
+
+def get_filled_markdown(form_data, business_plan_sections):
+    template_path = get_template_path()
     
-    filled_markdown = fill_business_plan_markdown_from_answers(template_path, answers)
+    if not os.path.exists(template_path):
+        raise FileNotFoundError(f"Template not found: {template_path}")
     
-    if output_docx_path is None:
-        temp_dir = tempfile.gettempdir()
-        output_docx_path = os.path.join(temp_dir, f'business_plan_{os.getpid()}.docx')
+    answers = collect_answers(form_data, business_plan_sections)
+    sections_by_label = template_sections(business_plan_sections)
+    cache_key = hashlib.sha256(
+        json.dumps(
+            [FILL_MODE, template_path, os.stat(template_path).st_mtime_ns, answers, sections_by_label],
+            sort_keys=True, ensure_ascii=False
+        ).encode('utf-8')
+    ).hexdigest()
     
-    try:
+    with _filled_markdown_lock:
+        cached = _filled_markdown_cache.get(cache_key)
+        if cached is not None:
+            _filled_markdown_cache.move_to_end(cache_key)
+            log_event('report_fill', mode=FILL_MODE, answers=len(answers), cached=True)
+            return cached
+    
+    started = time.perf_counter()
+    if FILL_MODE == 'sections':
+        filled_markdown = fill_business_plan_markdown_by_section(template_path, answers, sections_by_label)
+    else:
+        filled_markdown = fill_business_plan_markdown_from_answers(template_path, answers)
+    log_event('report_fill', mode=FILL_MODE, answers=len(answers), cached=False,
+              fill_ms=round((time.perf_counter() - started) * 1000, 1))
+    
+    with _filled_markdown_lock:
+        _filled_markdown_cache[cache_key] = filled_markdown
+        while len(_filled_markdown_cache) > FILLED_MARKDOWN_CACHE_SIZE:
+            _filled_markdown_cache.popitem(last=False)
+    
+    return filled_markdown
+
+
+class DocxRenderer:
+    """Renders filled markdown to DOCX bytes, reusing one converter and one loaded base document.
+
+    Opening python-docx's default template costs about as much as converting the markdown, so the document is
+    loaded once and its body cleared before each render. Not thread-safe; callers serialize.
+    """
+
+    def __init__(self):
+        import markdown
         from docx import Document
         from docx.shared import Pt
         
-        doc = Document()
-        
-        style = doc.styles['Normal']
-        font = style.font
+        self.markdown = markdown.Markdown(extensions=['extra', 'tables', 'nl2br'])
+        self.document = Document()
+        font = self.document.styles['Normal'].font
         font.name = 'Calibri'
         font.size = Pt(11)
+        body = self.document.element.body
+        self.keep = set(body.iterchildren())
+    
+    def render(self, filled_markdown):
+        self.markdown.reset()
+        html_content = self.markdown.convert(filled_markdown)
+        body = self.document.element.body
+        for child in list(body.iterchildren()):
+            if child not in self.keep:
+                body.remove(child)
         
-        md = markdown.Markdown(extensions=['extra', 'tables', 'nl2br'])
-        html_content = md.convert(filled_markdown)
-        
-        parser = HTMLToDocxParser(doc)
+        parser = HTMLToDocxParser(self.document)
         parser.feed(html_content)
         
-        doc.save(output_docx_path)
-        
-    except ImportError:
-        raise ImportError(
-            "python-docx is required for DOCX generation. "
-            "Install it with: pip install python-docx markdown"
-        )
+        output = io.BytesIO()
+        self.document.save(output)
+        return output.getvalue()
+
+
+def get_docx_renderer():
+    global _docx_renderer
+    if _docx_renderer is None:
+        try:
+            _docx_renderer = DocxRenderer()
+        except ImportError:
+            raise ImportError(
+                "python-docx is required for DOCX generation. "
+                "Install it with: pip install python-docx markdown"
+            )
+    return _docx_renderer
+
+
+def render_docx_bytes(filled_markdown):
+    return render_document('docx', filled_markdown)
+
+
+def render_docx(filled_markdown, output_docx_path):
+    try:
+        with _docx_render_lock:
+            data = get_docx_renderer().render(filled_markdown)
+        with open(output_docx_path, 'wb') as f:
+            f.write(data)
     except Exception as e:
         print(f"Error creating DOCX: {str(e)}")
         raise
     
     return output_docx_path
 
+
+def create_docx_from_form_data(form_data, business_plan_sections, output_docx_path=None, filled_markdown=None):
+    if filled_markdown is None:
+        filled_markdown = get_filled_markdown(form_data, business_plan_sections)
+    
+    if output_docx_path is None:
+        fd, output_docx_path = tempfile.mkstemp(prefix='business_plan_', suffix='.docx')
+        os.close(fd)
+    
+    with open(output_docx_path, 'wb') as f:
+        f.write(render_docx_bytes(filled_markdown))
+    return output_docx_path
+
+
+def create_docx_bytes(form_data, business_plan_sections, filled_markdown=None):
+    if filled_markdown is None:
+        filled_markdown = get_filled_markdown(form_data, business_plan_sections)
+    return render_docx_bytes(filled_markdown)
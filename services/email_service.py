@@ -1,11 +1,7 @@
 import os
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
 from datetime import datetime
-from services.docx_service import create_docx_from_form_data
+from services.docx_service import get_filled_markdown, render_docx_bytes
+from services.pdf_service import render_pdf_bytes
 from services.yaml_service import get_yaml_path
 
 
@@ -40,7 +36,13 @@ Thank you for providing your information!
     return report
 
 
-def send_report_email(form_data, business_plan_sections, yaml_path=None):
+def send_report_email(form_data, business_plan_sections, yaml_path=None, report_format='docx'):
+    import smtplib
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+    from email.mime.base import MIMEBase
+    from email import encoders
+
     try:
         from config.config import SMTP_SERVER, SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD, FROM_EMAIL
     except ImportError:
@@ -72,42 +74,34 @@ def send_report_email(form_data, business_plan_sections, yaml_path=None):
     
     msg.attach(MIMEText(report_text, 'plain'))
     
-    docx_path = None
     try:
-        docx_path = create_docx_from_form_data(form_data, business_plan_sections)
-        if docx_path and os.path.exists(docx_path):
-            with open(docx_path, 'rb') as attachment:
-                part = MIMEBase('application', 'octet-stream')
-                part.set_payload(attachment.read())
-            
+        filled_markdown = get_filled_markdown(form_data, business_plan_sections)
+        if report_format == 'pdf':
+            attachment_data = render_pdf_bytes(filled_markdown)
+        else:
+            attachment_data = render_docx_bytes(filled_markdown)
+        
+        if attachment_data:
+            part = MIMEBase('application', 'octet-stream')
+            part.set_payload(attachment_data)
             encoders.encode_base64(part)
             part.add_header(
                 'Content-Disposition',
-                f'attachment; filename=business_plan.docx',
+                f'attachment; filename=business_plan.{report_format}',
             )
             msg.attach(part)
     except Exception as e:
-        print(f"Warning: Could not create or attach DOCX: {str(e)}")
+        print(f"Warning: Could not create or attach {report_format.upper()}: {str(e)}")
     
     try:
         with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
+            if os.environ.get('SMTP_STARTTLS', '1') != '0':
+                server.starttls()
             server.login(SMTP_USERNAME, SMTP_PASSWORD)
             server.sendmail(sender, receiver, msg.as_string())
         
-        if docx_path and os.path.exists(docx_path):
-            try:
-                os.remove(docx_path)
-            except:
-                pass
-        
         return True
     except Exception as e:
         print(f"Error sending email: {str(e)}")
-        if docx_path and os.path.exists(docx_path):
-            try:
-                os.remove(docx_path)
-            except:
-                pass
         raise
 
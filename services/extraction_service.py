@@ -0,0 +1,439 @@
+import re
+import time
+from constants import FORM_STEPS
+from services.language_service import LANGUAGES, language_for_name, language_name
+
+# Gazetteers. Entries ending in '*' are Finnish/Swedish stems that take case endings (Espoossa, leipomomme).
+CITIES = {
+    'Espoo': ['espoo*', 'esbo*'],
+    'Helsinki': ['helsinki*', 'helsingi*', 'helsingfors*'],
+    'Vantaa': ['vantaa*', 'vanda*'],
+    'Kauniainen': ['kauniai*', 'grankulla*'],
+    'Kirkkonummi': ['kirkkonummi*', 'kyrkslätt*'],
+    'Porvoo': ['porvoo*', 'borgå*'],
+    'Turku': ['turku*', 'turu*', 'åbo*'],
+    'Tampere': ['tampere*', 'tammerfors*'],
+    'Oulu': ['oulu*', 'uleåborg*'],
+    'Lahti': ['lahti*', 'lahde*'],
+    'Kuopio': ['kuopio*'],
+    'Jyväskylä': ['jyväskylä*'],
+    'Vaasa': ['vaasa*', 'vasa'],
+    'Pori': ['pori', 'porissa', 'porin'],
+    'Joensuu': ['joensuu*'],
+    'Lappeenranta': ['lappeenrann*', 'lappeenranta*'],
+    'Hämeenlinna': ['hämeenlinna*', 'hämeenlinn*'],
+    'Rovaniemi': ['rovaniemi*', 'rovaniem*'],
+    'Seinäjoki': ['seinäjo*'],
+    'Kotka': ['kotka*'],
+    'Mikkeli': ['mikkeli*', 'mikkel*'],
+    'Lohja': ['lohja*'],
+    'Hyvinkää': ['hyvinkää*'],
+    'Järvenpää': ['järvenpää*'],
+    'Kerava': ['kerava*'],
+    'Sipoo': ['sipoo*', 'sibbo'],
+    'Tuusula': ['tuusula*'],
+    'Nurmijärvi': ['nurmijärve*', 'nurmijärvi*'],
+    'Tallinn': ['tallinn*'],
+    'Stockholm': ['stockholm*', 'tukholma*'],
+}
+
+DISTRICTS = {
+    'Espoo': ['leppävaara*', 'tapiola*', 'matinkylä*', 'otaniemi*', 'keilaniemi*', 'espoonlahti*',
+              'espoon keskus*', 'kivenlahti*', 'olari*', 'niittykumpu*', 'kauklahti*', 'soukka*', 'saunalahti*',
+              'kalajärvi*', 'perkkaa*', 'suurpelto*', 'haukilahti*', 'westend', 'laajalahti*', 'karakallio*'],
+    'Helsinki': ['kallio*', 'kamppi*', 'pasila*', 'töölö*', 'vuosaari*', 'malmi*', 'herttoniemi*',
+                 'kalasatama*', 'punavuori*', 'itäkeskus*'],
+    'Vantaa': ['tikkurila*', 'myyrmäki*', 'aviapolis', 'martinlaakso*', 'hakunila*'],
+}
+
+INDUSTRIES = {
+    'Food and beverage': ['bakery', 'bakeries', 'cafe', 'café', 'coffee shop', 'coffee', 'restaurant', 'catering',
+                          'food truck', 'food', 'bistro', 'pizzeria', 'brewery', 'bar', 'pub', 'leipomo*',
+                          'kahvila*', 'ravintola*', 'pitopalvelu*'],
+    'Retail': ['online store', 'online shop', 'e-commerce', 'ecommerce', 'webshop', 'retail', 'boutique', 'shop',
+               'store', 'verkkokauppa*', 'kauppa*', 'myymälä*'],
+    'Information technology': ['software', 'saas', 'mobile app', 'app development', 'web development',
+                               'it company', 'it services', 'it consulting', 'game studio', 'games', 'cybersecurity',
+                               'ohjelmisto*', 'ohjelmointi*'],
+    'Consulting': ['consulting', 'consultancy', 'advisory', 'konsultointi*', 'konsulttiyritys*'],
+    'Construction': ['construction', 'renovation', 'carpentry', 'plumbing', 'electrical installation',
+                     'painting company', 'rakennus*', 'remontti*', 'remontoi*', 'putkityö*'],
+    'Beauty and wellness': ['hair salon', 'hairdresser', 'barber', 'barbershop', 'beauty salon', 'beauty', 'spa',
+                            'massage', 'nail salon', 'fitness', 'gym', 'personal trainer', 'personal training',
+                            'yoga', 'kampaamo*', 'parturi*', 'kauneushoitola*', 'hieronta*', 'kuntosali*'],
+    'Health care': ['clinic', 'dental', 'physiotherapy', 'physiotherapist', 'home care', 'elderly care', 'nursing',
+                    'hoiva*', 'fysioterapia*', 'terveyspalvelu*'],
+    'Cleaning services': ['cleaning', 'janitorial', 'siivous*', 'siivouspalvelu*'],
+    'Transport and logistics': ['transport', 'logistics', 'delivery service', 'courier', 'taxi', 'moving company',
+                                'kuljetus*', 'muutto*', 'taksi*'],
+    'Education and training': ['tutoring', 'language school', 'driving school', 'online courses', 'coaching',
+                               'valmennus*', 'koulutuspalvelu*'],
+    'Creative and media': ['photography', 'graphic design', 'design studio', 'marketing agency', 'advertising',
+                           'video production', 'media production', 'music', 'valokuvaus*', 'mainostoimisto*'],
+    'Tourism and hospitality': ['hotel', 'hostel', 'tourism', 'travel agency', 'guided tours', 'bed and breakfast',
+                                'matkailu*', 'majoitus*'],
+    'Crafts and manufacturing': ['manufacturing', 'furniture', 'handmade', 'handicraft', 'crafts', 'jewelry',
+                                 'jewellery', 'textile', 'woodwork', 'käsityö*', 'huonekalu*'],
+    'Agriculture and gardening': ['farm', 'farming', 'agriculture', 'gardening', 'landscaping', 'maatila*',
+                                  'puutarha*'],
+    'Finance and accounting': ['accounting', 'bookkeeping', 'financial services', 'insurance', 'tilitoimisto*',
+                               'kirjanpito*'],
+    'Real estate': ['real estate', 'property management', 'kiinteistö*'],
+    'Childcare': ['daycare', 'childcare', 'päiväkoti*'],
+    'Automotive': ['car repair', 'auto repair', 'car wash', 'tire service', 'autokorjaamo*', 'autopesu*'],
+}
+
+EDUCATION_TERMS = [
+    'bachelor', 'master', 'mba', 'bba', 'emba', 'phd', 'ph.d', 'doctorate', 'doctoral', 'bsc', 'msc', 'b.sc',
+    'm.sc', 'degree', 'diploma', 'vocational', 'high school', 'upper secondary', 'secondary school', 'university',
+    'polytechnic', 'college', 'graduated', 'studied', 'studying', 'self-taught', 'self taught', 'amk', 'yliopisto*',
+    'ammattikorkeakoulu*', 'ammattikoulu*', 'ammattitutkinto*', 'lukio*', 'ylioppilas*', 'tradenomi*',
+    'insinööri*', 'maisteri*', 'kandidaatti*', 'tohtori*', 'examen', 'universitet*', 'gymnasie*',
+]
+
+NUMBER_WORDS = {
+    'a': 1, 'an': 1, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7, 'eight': 8,
+    'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12, 'fifteen': 15, 'twenty': 20, 'thirty': 30,
+    'yksi': 1, 'yhden': 1, 'kaksi': 2, 'kolme': 3, 'neljä': 4, 'viisi': 5, 'kuusi': 6, 'seitsemän': 7,
+    'kahdeksan': 8, 'yhdeksän': 9, 'kymmenen': 10, 'ett': 1, 'två': 2, 'tre': 3, 'fyra': 4, 'fem': 5, 'tio': 10,
+}
+YEAR_UNITS = ('year', 'years', 'yr', 'yrs', 'vuotta', 'vuoden', 'vuosi', 'år')
+MONTH_UNITS = ('month', 'months', 'kuukautta', 'kuukauden', 'kk', 'månader')
+
+COMPANY_SUFFIXES = ('oyj', 'oy', 'abp', 'ab', 'ky', 'tmi', 'ay', 'ltd', 'llc', 'inc', 'gmbh', 'oü', 'ry', 'osk')
+
+_SEGMENT_SPLIT = re.compile(r'[,;\n!?]+|\.(?=\s|$)|\s+-\s+')
+_NAME_WORD = r"[A-ZÄÖÅ0-9][\w&'’.-]*"
+_COMPANY_SUFFIX_PATTERN = re.compile(
+    rf"(?<!\w)((?:{_NAME_WORD}\s+){{0,4}}{_NAME_WORD}\s+(?i:{'|'.join(COMPANY_SUFFIXES)})\.?)(?!\w)"
+)
+_COMPANY_NAMED_PATTERN = re.compile(
+    r"(?:(?:company|business|firm|startup)(?:'s)?\s+(?:name\s+)?(?:is\s+)?(?:called|named|is)|"
+    r"(?:it's|it\s+is|we're|we\s+are)\s+called|yritykse(?:ni|mme)\s+nimi\s+on|nimeltään|heter)\s+"
+    r"[\"“']?([^,.;!?\"”\n]{2,60}?)[\"”']?(?=\s+(?:and|in|from|located|based|with|ja|i)\b|[,.;!?\n]|$)",
+    re.IGNORECASE,
+)
+_EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_LANGUAGE_SEGMENT_PATTERN = re.compile(
+    r'^(?:(?:in|prefer|preferably|language(?:\s+is)?|language:|kieli|på|auf|en)\s+)?(.+?)'
+    r'(?:\s+(?:please|language|preferred|thanks|kiitos|tack))?$',
+    re.IGNORECASE,
+)
+_LANGUAGE_PHRASE_PATTERN = re.compile(
+    r'(?:\b(?:speak|use|prefer|talk\s+in|chat\s+in|continue\s+in|reply\s+in|answer\s+in|language\s+is)\s+)'
+    r'(' + '|'.join(sorted({re.escape(alias) for info in LANGUAGES.values()
+                            for alias in info['aliases'] + [info['name'].lower()]}, key=len, reverse=True)) + r')(?!\w)',
+    re.IGNORECASE,
+)
+_BASED_IN_PATTERN = re.compile(
+    r'\b(?:based|located|situated|operating)\s+in\s+([A-ZÄÖÅ][a-zäöå]+(?:[ -][A-ZÄÖÅ][a-zäöå]+)?)'
+)
+_NUMBER = r'\d{1,2}(?:[.,]\d)?|' + '|'.join(sorted(NUMBER_WORDS, key=len, reverse=True))
+_DURATION_PATTERN = re.compile(
+    rf"(?<!\w)({_NUMBER})\s*\+?\s*(?:-\s*)?({'|'.join(YEAR_UNITS + MONTH_UNITS)})(?!\w)", re.IGNORECASE
+)
+_SINCE_PATTERN = re.compile(r'\b(?:since|from|vuodesta|sedan)\s+((?:19|20)\d{2})\b', re.IGNORECASE)
+_NO_EXPERIENCE_PATTERN = re.compile(
+    r"\b(?:no\s+(?:prior\s+|previous\s+|business\s+|real\s+)?experience|never\s+(?:run|had|owned)\s+a\s+business|"
+    r"first\s+(?:business|company|time)|ei\s+(?:aiempaa\s+|yhtään\s+)?kokemusta|ingen\s+erfarenhet)\b",
+    re.IGNORECASE,
+)
+_EXPERIENCE_CONTEXT = re.compile(
+    r'\b(?:experience|experienced|worked|working|work|career|in\s+business|industry|field|trade|kokemus\w*|'
+    r'työskennel\w*|alalla|erfarenhet|branschen)\b',
+    re.IGNORECASE,
+)
+# Words that tie a place or an industry to the venture, and an education to the writer. A slot other than the one
+# being asked for is only filled from a segment with such a cue, or from a bare list item like "Espoo" or "bakery".
+_VENTURE_CONTEXT = re.compile(
+    r"\b(?:we|we're|our|us|company|business|startup|firm|services?|open\w*|start\w*|launch\w*|run\w*|operat\w*|"
+    r"based|located|situated|yrity\w*|toimi\w*|sijait\w*|perusta\w*|avaa\w*|palvelu\w*|vi|vår\w*|företag\w*|"
+    r"belägen)\b",
+    re.IGNORECASE,
+)
+_PERSONAL_CONTEXT = re.compile(
+    r'\b(?:i|my|me|olen|opiskel\w*|valmistu\w*|minulla|jag|min|mitt)\b', re.IGNORECASE
+)
+_FILLER_WORDS = frozenset(('a', 'an', 'the', 'in', 'at', 'from', 'on', 'of', 'and', '&', 'small', 'local', 'new',
+                           'ja', 'och', 'en', 'ett'))
+_WORD = re.compile(r"[\w&']+")
+_AGE_CONTEXT = re.compile(r'\b(?:old|ago|aged|age|vanha|sitten|sedan)\b', re.IGNORECASE)
+# A greeting and "my name is ..." introduce the person, not the company.
+_INTRO_PATTERN = re.compile(
+    r"^\s*(?:(?:hi|hello|hey|hei|moi|moikka|terve|hej|hallo|good\s+(?:morning|afternoon|evening)|huomenta|päivää|"
+    r"thanks|thank\s+you|kiitos|ok|okay)(?:\s+there)?(?:[\s,!.]+|$))?"
+    r"(?:(?:my\s+name\s+is|my\s+name's|i\s+am|i'm|nimeni\s+on|minä\s+olen|olen|jag\s+heter|jag\s+är)\s+"
+    r"(?-i:[A-ZÄÖÅ][\w'-]*)(?:\s+(?-i:[A-ZÄÖÅ][\w'-]*))?(?:\s+here)?(?:[\s,!.]+(?:and\s+)?|$))?",
+    re.IGNORECASE,
+)
+
+
+def _gazetteer_pattern(terms):
+    parts = []
+    for term in sorted(terms, key=len, reverse=True):
+        stem = term.rstrip('*')
+        body = re.escape(stem).replace(r'\ ', r'\s+')
+        parts.append(body + (r'\w{0,6}' if term.endswith('*') else r'(?:e?s)?'))
+    return re.compile(r'(?<!\w)(' + '|'.join(parts) + r')(?!\w)', re.IGNORECASE)
+
+
+def _gazetteer_lookup(groups):
+    terms = sorted(((term.rstrip('*').lower(), value) for value, entries in groups.items() for term in entries),
+                   key=lambda item: -len(item[0]))
+
+    def lookup(matched):
+        matched = ' '.join(matched.lower().split())
+        for stem, value in terms:
+            if matched.startswith(stem):
+                return stem, value
+        return matched, None
+    return lookup
+
+
+_CITY_PATTERN = _gazetteer_pattern([term for terms in CITIES.values() for term in terms])
+_CITY_LOOKUP = _gazetteer_lookup(CITIES)
+_DISTRICT_PATTERN = _gazetteer_pattern([term for terms in DISTRICTS.values() for term in terms])
+_DISTRICT_LOOKUP = _gazetteer_lookup(DISTRICTS)
+_INDUSTRY_PATTERN = _gazetteer_pattern([term for terms in INDUSTRIES.values() for term in terms])
+_INDUSTRY_LOOKUP = _gazetteer_lookup(INDUSTRIES)
+_EDUCATION_PATTERN = _gazetteer_pattern(EDUCATION_TERMS)
+
+
+class _Claims:
+    """Character spans already used by a slot, so one phrase never fills two slots."""
+
+    def __init__(self):
+        self.spans = []
+
+    def free(self, start, end, ignore=()):
+        return all(end <= s or start >= e for s, e in self.spans if (s, e) not in ignore)
+
+    def take(self, start, end):
+        self.spans.append((start, end))
+
+    def first_free(self, pattern, text, group=1, accept=None):
+        for match in pattern.finditer(text):
+            if self.free(match.start(group), match.end(group)) and (accept is None or accept(match)):
+                return match
+        return None
+
+
+def split_segments(text):
+    segments = []
+    start = 0
+    for match in _SEGMENT_SPLIT.finditer(text):
+        if text[start:match.start()].strip():
+            segments.append((start, match.start()))
+        start = match.end()
+    if text[start:].strip():
+        segments.append((start, len(text)))
+    return segments
+
+
+def _segment_of(segments, position):
+    for start, end in segments:
+        if start <= position < end:
+            return start, end
+    return 0, 0
+
+
+def _listed(segment, patterns):
+    """True if a segment is nothing but terms of patterns, e.g. "a game studio in Otaniemi"."""
+    for pattern in patterns:
+        segment = pattern.sub(' ', segment)
+    return all(word in _FILLER_WORDS for word in _WORD.findall(segment.lower()))
+
+
+def _cue(text, segments, context, patterns):
+    """Accept a match only if its segment has a context word or is a bare list of patterns' terms."""
+    def accept(match):
+        start, end = _segment_of(segments, match.start())
+        return bool(context.search(text[start:end])) or _listed(text[start:end], patterns)
+    return accept
+
+
+def company_text(text):
+    """Text given for the company name, without a leading greeting or self-introduction."""
+    return _INTRO_PATTERN.sub('', text, count=1).strip(' ,.!')
+
+
+def parse_number(value):
+    value = value.lower()
+    if value in NUMBER_WORDS:
+        return NUMBER_WORDS[value]
+    number = float(value.replace(',', '.'))
+    return int(number) if number.is_integer() else number
+
+
+def format_duration(amount, unit):
+    if unit.lower() in MONTH_UNITS:
+        return f"{amount} month{'' if amount == 1 else 's'}"
+    return f"{amount} year{'' if amount == 1 else 's'}"
+
+
+def extract_email(text):
+    match = _EMAIL_PATTERN.search(text)
+    if match:
+        return match.group()
+    stripped = text.strip()
+    if '@' in stripped and len(stripped) > 5 and '.' in stripped.split('@')[1]:
+        return stripped
+    return None
+
+
+def _extract_company(text, claims):
+    match = claims.first_free(_COMPANY_NAMED_PATTERN, text) or claims.first_free(_COMPANY_SUFFIX_PATTERN, text)
+    if not match:
+        return None
+    claims.take(match.start(1), match.end(1))
+    return match.group(1).strip()
+
+
+def _extract_language(text, segments, claims):
+    for start, end in segments:
+        segment = text[start:end].strip()
+        core = _LANGUAGE_SEGMENT_PATTERN.match(segment)
+        code = language_for_name(core.group(1)) if core else None
+        if code and claims.free(start, end):
+            claims.take(start, end)
+            return language_name(code)
+    match = claims.first_free(_LANGUAGE_PHRASE_PATTERN, text)
+    if match:
+        claims.take(match.start(1), match.end(1))
+        return language_name(language_for_name(match.group(1)))
+    return None
+
+
+def _extract_location(text, claims, accept=None):
+    district = claims.first_free(_DISTRICT_PATTERN, text, accept=accept)
+    city = claims.first_free(_CITY_PATTERN, text, accept=accept)
+    if district:
+        claims.take(district.start(1), district.end(1))
+        stem, city_name = _DISTRICT_LOOKUP(district.group(1))
+        if city:
+            claims.take(city.start(1), city.end(1))
+        return f"{stem.title()}, {city_name}"
+    if city:
+        claims.take(city.start(1), city.end(1))
+        return _CITY_LOOKUP(city.group(1))[1]
+    match = claims.first_free(_BASED_IN_PATTERN, text)
+    if match:
+        claims.take(match.start(1), match.end(1))
+        return match.group(1)
+    return None
+
+
+def _extract_experience(text, segments, claims, accept=None):
+    match = claims.first_free(_NO_EXPERIENCE_PATTERN, text, group=0)
+    if match:
+        claims.take(match.start(), match.end())
+        return 'No prior experience'
+    for match in _DURATION_PATTERN.finditer(text):
+        start, end = _segment_of(segments, match.start())
+        if not claims.free(match.start(), match.end()) or _AGE_CONTEXT.search(text[start:end]):
+            continue
+        if accept and not accept(match):
+            continue
+        claims.take(match.start(), match.end())
+        return format_duration(parse_number(match.group(1)), match.group(2))
+    for match in _SINCE_PATTERN.finditer(text):
+        start, end = _segment_of(segments, match.start())
+        if claims.free(match.start(), match.end()) and _EXPERIENCE_CONTEXT.search(text[start:end]):
+            claims.take(match.start(), match.end())
+            year = int(match.group(1))
+            return f"{format_duration(max(time.localtime().tm_year - year, 0), 'years')} (since {year})"
+    return None
+
+
+def _extract_education(text, segments, claims, accept=None):
+    match = claims.first_free(_EDUCATION_PATTERN, text, accept=accept)
+    if not match:
+        return None
+    start, end = _segment_of(segments, match.start())
+    claims.take(match.start(1), match.end(1))
+    value = text[start:end].strip()
+    return value[:1].upper() + value[1:]
+
+
+def _extract_sphere(text, claims, accept=None):
+    match = claims.first_free(_INDUSTRY_PATTERN, text, accept=accept)
+    if not match:
+        return None
+    claims.take(match.start(1), match.end(1))
+    _, sector = _INDUSTRY_LOOKUP(match.group(1))
+    term = ' '.join(match.group(1).lower().split())
+    return sector if term in sector.lower() else f"{sector} ({term})"
+
+
+def extract_slots(text, form_data=None, reserved=None, current_step=None):
+    """Every onboarding slot that can be read from one message, plus the segments no other step's slot used.
+
+    Any place, industry, school or duration answers the current step. For the other steps it needs a cue, so
+    "I studied at a university in Helsinki" gives an education but no location.
+    """
+    form_data = form_data or {}
+    segments = split_segments(text)
+    claims = _Claims()
+    if reserved:
+        claims.take(*reserved)
+    email = _EMAIL_PATTERN.search(text)
+    if email:
+        claims.take(email.start(), email.end())
+
+    def cue(slot, context, *patterns):
+        return None if slot == current_step else _cue(text, segments, context, patterns)
+
+    venture_terms = (_DISTRICT_PATTERN, _CITY_PATTERN, _INDUSTRY_PATTERN)
+    extractors = (
+        ('company_name', lambda: _extract_company(text, claims)),
+        ('language', lambda: _extract_language(text, segments, claims)),
+        ('location', lambda: _extract_location(text, claims, cue('location', _VENTURE_CONTEXT, *venture_terms))),
+        ('experience', lambda: _extract_experience(text, segments, claims,
+                                                   cue('experience', _EXPERIENCE_CONTEXT, _DURATION_PATTERN))),
+        ('education', lambda: _extract_education(text, segments, claims,
+                                                 cue('education', _PERSONAL_CONTEXT, _EDUCATION_PATTERN))),
+        ('sphere', lambda: _extract_sphere(text, claims, cue('sphere', _VENTURE_CONTEXT, *venture_terms))),
+    )
+    slots = {}
+    own = ()
+    for slot, extract in extractors:
+        taken = len(claims.spans)
+        value = extract()
+        if slot == current_step:
+            own = claims.spans[taken:]
+        if value and not form_data.get(slot):
+            slots[slot] = value
+
+    leftover = [text[start:end].strip() for start, end in segments if claims.free(start, end, ignore=own)]
+    return slots, segments, leftover
+
+
+def extract_onboarding_answers(text, current_step, form_data):
+    """Split one onboarding message into slots filled directly and the text left for the current step.
+
+    A message with a single segment that does not answer the current step is kept whole for that step, as before,
+    so a company called "Espoo Pizza" is not mistaken for a location and an industry.
+    """
+    slots, segments, leftover = extract_slots(text, form_data, current_step=current_step)
+    if current_step in slots:
+        # The step being asked keeps the person's own words for the report; a label such as
+        # "Food and beverage (bakery)" only fills steps answered in passing. The company name already is the
+        # person's words and the language has to stay a name the app can resolve.
+        if current_step not in ('company_name', 'language'):
+            slots[current_step] = text.strip() if len(segments) <= 1 else ', '.join(leftover) or text.strip()
+        return _ordered(slots), None
+    if current_step == 'company_name':
+        # Asked for the name, people lead with it: "Aino Coffee, Espoo" names the company, not the industry.
+        # "Hello, my name is Pekka" names nobody's company.
+        first = next((segment for segment in segments if company_text(text[segment[0]:segment[1]])), None)
+        if first is None or len(segments) <= 1:
+            return {}, company_text(text) or None
+        slots, segments, leftover = extract_slots(text, form_data, reserved=first, current_step=current_step)
+        return _ordered(slots), company_text(text[first[0]:first[1]])
+    if len(segments) <= 1:
+        return {}, text
+    return _ordered(slots), ', '.join(leftover) or None
+
+
+def _ordered(slots):
+    return {step['id']: slots[step['id']] for step in FORM_STEPS if step['id'] in slots}
@@ -0,0 +1,203 @@
+import io
+import os
+import re
+import threading
+from services.docx_service import parse_yaml_answers
+from utils.helpers import slugify
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_MAX_BYTES = int(os.environ.get('IMPORT_MAX_BYTES', 2 * 1024 * 1024))
+IMPORT_MAX_ANSWER_CHARS = 4000
+DOCX_TEMPLATE_PATH = os.path.join(BASE_DIR, 'business_plan', 'business_plan_template.docx')
+
+# Headings, fields and table labels of business_plan_template.docx whose text answers a checklist question with
+# a different label. Anything else is matched to a question with the same label, or reported as unmatched.
+DOCX_QUESTION_LABELS = {
+    'Customers': 'Customers (segments)',
+    'Customer purchase criteria': 'Customer Purchase Criteria',
+    'Customer risks': 'Customer Risks',
+    'Sales and marketing': 'Sales and marketing channels',
+    'Defining the customer need': 'Sales and marketing channels',
+    'Production and logistics': 'Production and logistics (goods)',
+    'Market entry and distribution network': 'Market entry and launch plan',
+    'Target market and target groups': 'Market entry and launch plan',
+    'Competitors': 'Competitive situation and competitors',
+    'Competitive situation': 'Competitive situation and competitors',
+    'Vision': 'Vision (3–5 years)',
+    'My business': 'Initial financing and startup costs',
+    'Background information': 'Background information (company basics)',
+}
+
+# Fields of the template's background section that also answer an onboarding step.
+DOCX_ONBOARDING_FIELDS = {
+    'The name of the business': 'company_name',
+    'Company (planned) name': 'company_name',
+    'Industry': 'sphere',
+    'Postal district': 'location',
+}
+
+_HEADING_NUMBER = re.compile(r'^\d+\.\s*')
+
+_template_lines = None
+_template_lock = threading.Lock()
+
+
+class PlanImportError(ValueError):
+    """The uploaded file cannot be read as a business plan."""
+
+
+def _normalize(text):
+    return ' '.join(text.replace('’', "'").split()).rstrip(':').strip().lower()
+
+
+def _catalog_question(catalog, key):
+    label = DOCX_QUESTION_LABELS.get(key, key)
+    return catalog.by_id.get(slugify(label))
+
+
+def parse_yaml_plan(data, catalog):
+    """Answers from a filled checklist in the improved_business_plan.yaml shape, keyed by question id."""
+    try:
+        content = data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        raise PlanImportError('The YAML file is not UTF-8 text')
+    answers = {}
+    unmatched = []
+    for label, answer in parse_yaml_answers(content).items():
+        question = catalog.by_id.get(slugify(label))
+        if question is None:
+            unmatched.append(label)
+        else:
+            answers[question.id] = answer
+    if not answers and not unmatched:
+        raise PlanImportError('No answers found in the YAML file')
+    return answers, {}, unmatched
+
+
+def _docx_blocks(document):
+    """(style, lines) for each paragraph and table cell of a document, in reading order."""
+    from docx.table import Table
+    from docx.text.paragraph import Paragraph
+
+    for child in document.element.body.iterchildren():
+        tag = child.tag.rsplit('}', 1)[-1]
+        if tag == 'p':
+            paragraph = Paragraph(child, document)
+            yield paragraph.style.name if paragraph.style is not None else '', paragraph.text.split('\n')
+        elif tag == 'tbl':
+            seen = set()
+            for row in Table(child, document).rows:
+                for cell in row.cells:
+                    if cell._tc in seen:
+                        continue
+                    seen.add(cell._tc)
+                    yield 'cell', [line for paragraph in cell.paragraphs for line in paragraph.text.split('\n')]
+
+
+def _get_template_lines():
+    """Normalized lines of the blank DOCX template: guidance and labels, never answers."""
+    global _template_lines
+    if _template_lines is None:
+        with _template_lock:
+            if _template_lines is None:
+                from docx import Document
+                lines = set()
+                for _, block in _docx_blocks(Document(DOCX_TEMPLATE_PATH)):
+                    lines.update(_normalize(line) for line in block if line.strip())
+                _template_lines = frozenset(lines)
+    return _template_lines
+
+
+def parse_docx_plan(data, catalog):
+    """Answers from a business plan written into business_plan_template.docx, keyed by question id.
+
+    Text the template already contains is left out. What remains is attributed to the closest heading, field
+    or table label that names a question; several parts of one question are joined under their labels.
+    """
+    from docx import Document
+
+    try:
+        document = Document(io.BytesIO(data))
+    except Exception:
+        raise PlanImportError('The file is not a readable DOCX document')
+    template = _get_template_lines()
+    headings = {}
+    parts = []
+    onboarding = {}
+
+    def add(keys, text):
+        if parts and parts[-1][0] == keys:
+            parts[-1][1].append(text)
+        else:
+            parts.append((keys, [text]))
+
+    for style, lines in _docx_blocks(document):
+        level = re.match(r'Heading (\d)', style)
+        if level:
+            depth = int(level.group(1))
+            headings = {key: value for key, value in headings.items() if key < depth}
+            headings[depth] = _HEADING_NUMBER.sub('', ' '.join(lines).strip())
+            continue
+        if style == 'Title':
+            continue
+        context = tuple(headings[depth] for depth in sorted(headings, reverse=True))
+        cell_label = None
+        for line in lines:
+            text = line.strip()
+            if not text:
+                continue
+            label, separator, value = text.partition(':')
+            if style == 'cell' and cell_label is None and _normalize(label) in template:
+                # A table cell is headed by its label, e.g. "Customers:" or a SWOT quadrant's title.
+                cell_label = label.strip()
+            if _normalize(text) in template:
+                continue
+            if separator and _normalize(label) in template:
+                value = value.strip()
+                if not value:
+                    continue
+                step = DOCX_ONBOARDING_FIELDS.get(label.strip())
+                if step and step not in onboarding:
+                    onboarding[step] = value
+                if not context or context[-1] == 'Background information':
+                    add(('Background information',), f"{label.strip()}: {value}")
+                    continue
+                add(((label.strip(),) + context), value)
+                continue
+            add(((cell_label,) if cell_label else ()) + context, text)
+
+    grouped = {}
+    unmatched = []
+    for keys, texts in parts:
+        question = next((found for found in (_catalog_question(catalog, key) for key in keys) if found), None)
+        if question is None:
+            if keys:
+                unmatched.append(keys[0])
+            continue
+        grouped.setdefault(question.id, {}).setdefault(keys[0], []).extend(texts)
+
+    answers = {}
+    for question_id, pieces in grouped.items():
+        if len(pieces) == 1:
+            answers[question_id] = '\n'.join(next(iter(pieces.values())))
+        else:
+            answers[question_id] = '\n'.join(f"{label}: {' '.join(texts)}" for label, texts in pieces.items())
+    if not answers and not onboarding:
+        raise PlanImportError('No answers found in the DOCX document')
+    return answers, onboarding, list(dict.fromkeys(unmatched))
+
+
+def parse_plan(filename, data, catalog):
+    """(answers by question id, onboarding slots, unmatched labels) from an uploaded YAML or DOCX plan."""
+    if len(data) > IMPORT_MAX_BYTES:
+        raise PlanImportError(f"The file is larger than {IMPORT_MAX_BYTES // 1024} KB")
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension == '.docx' or data[:2] == b'PK':
+        answers, onboarding, unmatched = parse_docx_plan(data, catalog)
+    elif extension in ('.yaml', '.yml', ''):
+        answers, onboarding, unmatched = parse_yaml_plan(data, catalog)
+    else:
+        raise PlanImportError('Upload a .yaml or .docx file')
+    answers = {question_id: answer[:IMPORT_MAX_ANSWER_CHARS] for question_id, answer in answers.items()}
+    return answers, onboarding, unmatched
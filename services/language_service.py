@@ -0,0 +1,334 @@
+import os
+import re
+import json
+import threading
+from services.catalog_registry import DEFAULT_TENANT, TENANTS_DIR, current_tenant, on_catalog_swap
+
+DEFAULT_LANGUAGE = 'en'
+
+LANGUAGES = {
+    'en': {
+        'name': 'English',
+        'aliases': ['english', 'englanti', 'engelska', 'inglés', 'ingles', 'anglais', 'englisch', 'английский'],
+        'stopwords': ['the', 'and', 'is', 'are', 'we', 'i', 'my', 'our', 'to', 'of', 'in', 'for', 'with', 'will',
+                      'have', 'it', 'that', 'this', 'would', 'like', 'be', 'you'],
+    },
+    'fi': {
+        'name': 'Finnish',
+        'aliases': ['finnish', 'suomi', 'suomea', 'suomeksi', 'suomen kieli', 'finska', 'finnois', 'finnisch',
+                    'финский'],
+        'stopwords': ['ja', 'on', 'ei', 'että', 'se', 'minä', 'olen', 'meidän', 'me', 'mutta', 'kun', 'myös',
+                      'haluan', 'yritys', 'yritykseni', 'minun', 'olla', 'tai', 'kuin', 'vuotta', 'ovat', 'tämä'],
+    },
+    'sv': {
+        'name': 'Swedish',
+        'aliases': ['swedish', 'svenska', 'ruotsi', 'ruotsia', 'ruotsiksi', 'suédois', 'schwedisch', 'sueco',
+                    'шведский'],
+        'stopwords': ['och', 'är', 'jag', 'det', 'att', 'en', 'ett', 'vi', 'på', 'med', 'för', 'inte', 'som',
+                      'har', 'min', 'vår', 'företag', 'av', 'till', 'år'],
+    },
+    'et': {
+        'name': 'Estonian',
+        'aliases': ['estonian', 'eesti', 'eesti keel', 'viro', 'estniska', 'эстонский'],
+        'stopwords': ['ja', 'on', 'ei', 'ma', 'mina', 'meie', 'see', 'et', 'aga', 'ka', 'minu', 'ettevõte',
+                      'olen', 'aastat', 'või', 'kui'],
+    },
+    'ru': {
+        'name': 'Russian',
+        'aliases': ['russian', 'русский', 'по-русски', 'venäjä', 'ryska', 'ruso', 'russe', 'russisch'],
+        'stopwords': ['и', 'в', 'не', 'на', 'я', 'мы', 'что', 'это', 'с', 'мой', 'наш', 'компания', 'лет',
+                      'для', 'у', 'по'],
+    },
+    'uk': {
+        'name': 'Ukrainian',
+        'aliases': ['ukrainian', 'українська', 'українською', 'ukraina', 'ukrainska', 'украинский'],
+        'stopwords': ['і', 'та', 'в', 'не', 'на', 'я', 'ми', 'що', 'це', 'з', 'мій', 'наш', 'компанія', 'років',
+                      'для', 'у'],
+    },
+    'es': {
+        'name': 'Spanish',
+        'aliases': ['spanish', 'español', 'espanol', 'castellano', 'espanja', 'spanska', 'espagnol', 'spanisch'],
+        'stopwords': ['el', 'la', 'de', 'que', 'y', 'en', 'los', 'las', 'un', 'una', 'es', 'mi', 'nuestro',
+                      'empresa', 'con', 'para', 'por', 'años', 'tengo', 'soy'],
+    },
+    'fr': {
+        'name': 'French',
+        'aliases': ['french', 'français', 'francais', 'ranska', 'franska', 'francés', 'französisch'],
+        'stopwords': ['le', 'la', 'les', 'de', 'des', 'et', 'est', 'je', 'nous', 'un', 'une', 'mon', 'notre',
+                      'entreprise', 'avec', 'pour', 'dans', 'ans', 'suis', 'pas'],
+    },
+    'de': {
+        'name': 'German',
+        'aliases': ['german', 'deutsch', 'saksa', 'tyska', 'alemán', 'aleman', 'allemand', 'немецкий'],
+        'stopwords': ['der', 'die', 'das', 'und', 'ist', 'ich', 'wir', 'nicht', 'ein', 'eine', 'mein', 'unser',
+                      'firma', 'unternehmen', 'mit', 'für', 'jahre', 'bin', 'habe', 'auf'],
+    },
+    'pt': {
+        'name': 'Portuguese',
+        'aliases': ['portuguese', 'português', 'portugues', 'portugali', 'portugisiska', 'portugués'],
+        'stopwords': ['o', 'a', 'de', 'que', 'e', 'em', 'um', 'uma', 'é', 'eu', 'nós', 'meu', 'nossa',
+                      'empresa', 'com', 'para', 'anos', 'não', 'tenho'],
+    },
+    'it': {
+        'name': 'Italian',
+        'aliases': ['italian', 'italiano', 'italia', 'italienska', 'italien', 'italienisch'],
+        'stopwords': ['il', 'lo', 'la', 'di', 'che', 'e', 'è', 'un', 'una', 'io', 'noi', 'mio', 'nostra',
+                      'azienda', 'con', 'per', 'anni', 'non', 'sono', 'ho'],
+    },
+    'tr': {
+        'name': 'Turkish',
+        'aliases': ['turkish', 'türkçe', 'turkce', 'turkki', 'turkiska'],
+        'stopwords': ['ve', 'bir', 'bu', 'da', 'de', 'ben', 'biz', 'için', 'ile', 'şirket', 'benim', 'yıl',
+                      'çok', 'var', 'değil'],
+    },
+    'so': {
+        'name': 'Somali',
+        'aliases': ['somali', 'soomaali', 'af soomaali', 'somalia', 'somaliska'],
+        'stopwords': ['iyo', 'waa', 'ka', 'ku', 'aan', 'waxaan', 'shirkad', 'ganacsi', 'sanadood', 'in', 'oo'],
+    },
+    'ar': {
+        'name': 'Arabic',
+        'aliases': ['arabic', 'العربية', 'عربي', 'arabia', 'arabiska', 'arabe', 'arabisch'],
+        'stopwords': [],
+    },
+    'fa': {
+        'name': 'Persian',
+        'aliases': ['persian', 'farsi', 'فارسی', 'persia', 'persiska'],
+        'stopwords': [],
+    },
+    'zh': {
+        'name': 'Chinese',
+        'aliases': ['chinese', 'mandarin', '中文', '汉语', '普通话', 'kiina', 'kinesiska'],
+        'stopwords': [],
+    },
+}
+
+_WORD_PATTERN = re.compile(r"[^\W\d_]+", re.UNICODE)
+_ARABIC_SCRIPT = re.compile(r'[؀-ۿ]')
+_PERSIAN_LETTERS = re.compile(r'[پچژگکی]')
+_CJK_SCRIPT = re.compile(r'[一-鿿]')
+_CYRILLIC_SCRIPT = re.compile(r'[Ѐ-ӿ]')
+_UKRAINIAN_LETTERS = re.compile(r'[іїєґ]', re.IGNORECASE)
+_FINNISH_LETTERS = re.compile(r'[äö]', re.IGNORECASE)
+
+_STOPWORDS = {code: frozenset(info['stopwords']) for code, info in LANGUAGES.items()}
+_ALIASES = sorted(
+    ((alias, code) for code, info in LANGUAGES.items() for alias in info['aliases'] + [info['name'].lower()]),
+    key=lambda item: -len(item[0])
+)
+_ALIAS_PATTERNS = [
+    (re.compile(r'(?<!\w)' + re.escape(alias) + r'(?!\w)', re.IGNORECASE), code) for alias, code in _ALIASES
+]
+_ALIAS_CODES = dict(_ALIASES)
+_CODE_PATTERN = re.compile(r'^\s*(' + '|'.join(LANGUAGES) + r')(?:[-_][a-z]{2})?\s*$', re.IGNORECASE)
+
+UI_MESSAGES = {
+    'message_required': 'Message is required',
+    'text_required': 'Text is required',
+    'no_audio_provided': 'No audio file provided',
+    'no_audio_selected': 'No audio file selected',
+    'no_plan_file': 'No business plan file provided',
+    'plan_import_failed': 'Could not import the business plan',
+    'plan_imported': "Your business plan has been imported. Let's continue with the questions that are still open.",
+    'email_required': 'Email address is required. Please provide your email first.',
+    'invalid_email': 'Invalid email address format.',
+    'report_sent': 'Report sent successfully!',
+    'chat_error': 'I apologize, but I encountered an error. Please try again.',
+    'tts_failed': 'TTS failed',
+    'transcription_failed': 'Transcription failed',
+    'report_failed': 'Failed to send report',
+    'document_failed': 'Failed to generate document',
+    'document_busy': 'Many reports are being prepared right now. Please try again in a moment.',
+    'usage_limit': 'This conversation has reached its usage limit. Please contact us to continue.',
+    'tts_unavailable': 'Audio replies are temporarily unavailable.',
+    'voice_unavailable': 'Voice input is temporarily unavailable. Please type your answer.',
+    'unsupported_sample_rate': 'This microphone sample rate is not supported. Please type your answer.',
+    'retry_prompt': "Sorry, I didn't quite understand that answer.",
+    'skip_prompt': "Let's move on to the next question.",
+    'ask_company_name': 'What is the name of your company?',
+    'ask_language': 'Which language would you like to use?',
+    'ask_sphere': 'Which industry or business sphere does your company operate in?',
+    'ask_education': 'What is your educational background?',
+    'ask_experience': 'How many years of business experience do you have?',
+    'ask_location': 'Where is your business located?',
+    'ask_email': 'Please share your email address so we can send you a summary report.',
+    'form_complete': 'Thank you! Your report will be sent to your email address shortly.',
+}
+
+_translation_cache = {}
+_merged_translations = {}
+_translation_lock = threading.Lock()
+_localized_catalogs = {}
+
+
+def detect_language(text):
+    if not text or not text.strip():
+        return None
+    if _CJK_SCRIPT.search(text):
+        return 'zh'
+    if _ARABIC_SCRIPT.search(text):
+        return 'fa' if _PERSIAN_LETTERS.search(text) else 'ar'
+    if _CYRILLIC_SCRIPT.search(text):
+        return 'uk' if _UKRAINIAN_LETTERS.search(text) else 'ru'
+
+    words = [word.lower() for word in _WORD_PATTERN.findall(text)]
+    if not words:
+        return None
+
+    scores = {}
+    for code, stopwords in _STOPWORDS.items():
+        if stopwords:
+            scores[code] = sum(1 for word in words if word in stopwords)
+    if _FINNISH_LETTERS.search(text):
+        scores['fi'] = scores.get('fi', 0) + 1
+
+    best_code = max(scores, key=scores.get)
+    best_score = scores[best_code]
+    if best_score == 0:
+        return None
+    runner_up = max((score for code, score in scores.items() if code != best_code), default=0)
+    if best_score == runner_up:
+        return None
+    return best_code
+
+
+def normalize_language(value):
+    if not value:
+        return None
+    code_match = _CODE_PATTERN.match(value)
+    if code_match:
+        return code_match.group(1).lower()
+    for pattern, code in _ALIAS_PATTERNS:
+        if pattern.search(value):
+            return code
+    return None
+
+
+def language_for_name(value):
+    return _ALIAS_CODES.get(value.strip().lower()) if value else None
+
+
+def resolve_language(user_message, previous_messages=()):
+    code = normalize_language(user_message)
+    if code:
+        return code
+    code = detect_language(user_message)
+    if code:
+        return code
+    text = ' '.join(previous_messages)
+    return detect_language(text)
+
+
+def language_name(code):
+    info = LANGUAGES.get(code)
+    return info['name'] if info else None
+
+
+def get_session_language(form_data):
+    return normalize_language(form_data.get('language', '')) or DEFAULT_LANGUAGE
+
+
+def get_translations_dir(tenant=DEFAULT_TENANT):
+    if tenant != DEFAULT_TENANT:
+        return os.path.join(TENANTS_DIR, tenant, 'translations')
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_dir, 'config', 'translations')
+
+
+def get_translation_path(code, tenant=DEFAULT_TENANT):
+    return os.path.join(get_translations_dir(tenant), f'{code}.json')
+
+
+def _read_translations(code, tenant):
+    path = get_translation_path(code, tenant)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime = None
+
+    key = (tenant, code)
+    cached = _translation_cache.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with _translation_lock:
+        cached = _translation_cache.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        phrases = {}
+        if mtime is not None:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    phrases = json.load(f).get('phrases', {})
+            except (OSError, ValueError) as e:
+                print(f"Warning: could not load translations for '{code}' of tenant {tenant}: {str(e)}")
+        _translation_cache[key] = (mtime, phrases)
+        return phrases
+
+
+def load_translations(code, tenant=None):
+    """Translated phrases for a language: the tenant's own checklist over the default checklist and UI messages."""
+    if not code or code == DEFAULT_LANGUAGE:
+        return {}
+    tenant = tenant or current_tenant()
+    phrases = _read_translations(code, DEFAULT_TENANT)
+    if tenant == DEFAULT_TENANT:
+        return phrases
+    own = _read_translations(code, tenant)
+    if not own:
+        return phrases
+    key = (tenant, code)
+    cached = _merged_translations.get(key)
+    if cached and cached[0] is phrases and cached[1] is own:
+        return cached[2]
+    merged = {**phrases, **own}
+    _merged_translations[key] = (phrases, own, merged)
+    return merged
+
+
+def translate(text, code):
+    if not text or not code or code == DEFAULT_LANGUAGE:
+        return text
+    return load_translations(code).get(text, text)
+
+
+def get_message(key, code=None):
+    return translate(UI_MESSAGES[key], code)
+
+
+def localize_question(question, code):
+    if not code or code == DEFAULT_LANGUAGE:
+        return question
+    return question.localized(translate(question.label, code), translate(question.fill, code))
+
+
+def localize_sections(catalog, code):
+    if not code or code == DEFAULT_LANGUAGE:
+        return catalog
+    phrases = load_translations(code)
+    if not phrases:
+        return catalog
+    cached = _localized_catalogs.get((code, id(catalog)))
+    if cached and cached[0] is phrases and cached[1] is catalog:
+        return cached[2]
+    localized = catalog.localized(lambda text: phrases.get(text, text) if text else text)
+    _localized_catalogs[(code, id(catalog))] = (phrases, catalog, localized)
+    return localized
+
+
+@on_catalog_swap
+def _drop_localized_catalogs(tenant, old_catalog):
+    for key in [key for key, cached in list(_localized_catalogs.items()) if cached[1] is old_catalog]:
+        _localized_catalogs.pop(key, None)
+
+
+def collect_source_phrases(catalog):
+    phrases = list(UI_MESSAGES.values())
+    for section in catalog.sections:
+        phrases.append(section.title)
+        if section.description:
+            phrases.append(section.description)
+        for question in section.questions:
+            phrases.append(question.label)
+            phrases.append(question.fill)
+    return list(dict.fromkeys(phrases))
@@ -0,0 +1,37 @@
+import threading
+
+_lock = threading.Condition()
+_in_flight = 0
+_draining = threading.Event()
+
+
+def request_started():
+    global _in_flight
+    with _lock:
+        _in_flight += 1
+
+
+def request_finished():
+    global _in_flight
+    with _lock:
+        _in_flight = max(0, _in_flight - 1)
+        if _in_flight == 0:
+            _lock.notify_all()
+
+
+def in_flight():
+    with _lock:
+        return _in_flight
+
+
+def start_draining():
+    _draining.set()
+
+
+def is_draining():
+    return _draining.is_set()
+
+
+def wait_for_idle(timeout=None):
+    with _lock:
+        return _lock.wait_for(lambda: _in_flight == 0, timeout=timeout)
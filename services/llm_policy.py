@@ -0,0 +1,315 @@
+import os
+import time
+import random
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from services.usage_service import record_usage
+from services.circuit_breaker import OPEN, CircuitOpenError, get_breaker, register_probe
+
+
+def _env(stage, name, default, cast=float):
+    value = os.environ.get(f'LLM_{stage.upper()}_{name}')
+    if value is None or value == '':
+        return default
+    return cast(value) if cast else value
+
+
+def _policy(stage, dependency, deadline, timeout, retries, hedge, fallback_model=None):
+    return {
+        'dependency': dependency,
+        'deadline': _env(stage, 'DEADLINE', deadline),
+        'timeout': _env(stage, 'TIMEOUT', timeout),
+        'retries': _env(stage, 'RETRIES', retries, int),
+        'hedge': _env(stage, 'HEDGE', '1' if hedge else '0', None) not in ('0', 'false', 'no'),
+        'fallback_model': _env(stage, 'FALLBACK_MODEL', fallback_model, None) or None,
+    }
+
+
+POLICIES = {
+    'chat': _policy('chat', 'chat', deadline=20.0, timeout=8.0, retries=2, hedge=True),
+    'chat_stream': _policy('chat_stream', 'chat', deadline=20.0, timeout=8.0, retries=2, hedge=False),
+    'validation': _policy('validation', 'chat', deadline=6.0, timeout=3.0, retries=1, hedge=True),
+    'validation_batch': _policy('validation_batch', 'chat', deadline=20.0, timeout=10.0, retries=1, hedge=False),
+    'fill': _policy('fill', 'chat', deadline=120.0, timeout=60.0, retries=1, hedge=False,
+                    fallback_model='gpt-4o-mini'),
+    'tts': _policy('tts', 'tts', deadline=20.0, timeout=10.0, retries=1, hedge=True),
+    'tts_stream': _policy('tts_stream', 'tts', deadline=20.0, timeout=10.0, retries=1, hedge=False),
+    'prefetch': _policy('prefetch', 'chat', deadline=20.0, timeout=8.0, retries=1, hedge=False),
+    'prefetch_tts': _policy('prefetch_tts', 'tts', deadline=20.0, timeout=10.0, retries=0, hedge=False),
+    'transcription': _policy('transcription', 'transcription', deadline=30.0, timeout=20.0, retries=1,
+                             hedge=False),
+}
+
+LLM_HEDGE_MIN_SAMPLES = int(os.environ.get('LLM_HEDGE_MIN_SAMPLES', 20))
+LLM_HEDGE_MIN_DELAY = float(os.environ.get('LLM_HEDGE_MIN_DELAY', 0.25))
+LLM_HEDGE_MAX_RATIO = float(os.environ.get('LLM_HEDGE_MAX_RATIO', 0.1))
+LLM_RETRY_BASE_DELAY = float(os.environ.get('LLM_RETRY_BASE_DELAY', 0.25))
+LLM_FALLBACK_TIMEOUT = float(os.environ.get('LLM_FALLBACK_TIMEOUT', 15.0))
+LLM_POOL_SIZE = int(os.environ.get('LLM_POOL_SIZE', 64))
+
+TRANSIENT_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+_latencies = {}
+_counters = {}
+_state_lock = threading.Lock()
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class ChatStream:
+    """A streamed chat completion whose first chunk has arrived; iterating yields the text deltas."""
+
+    def __init__(self, stream, first_chunk):
+        self.model = first_chunk.model
+        self.usage = first_chunk.usage
+        self.on_complete = None
+        self._stream = stream
+        self._first_chunk = first_chunk
+
+    def __iter__(self):
+        try:
+            chunk = self._first_chunk
+            iterator = iter(self._stream)
+            while chunk is not None:
+                if chunk.usage:
+                    self.usage = chunk.usage
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                chunk = next(iterator, None)
+        finally:
+            self.close()
+
+    def close(self):
+        stream, self._stream = self._stream, None
+        if stream is None:
+            return
+        stream.close()
+        if self.on_complete:
+            self.on_complete(self)
+
+
+class LLMUnavailableError(Exception):
+    def __init__(self, stage, error):
+        super().__init__(f"{stage} call failed: {error}")
+        self.stage = stage
+        self.error = error
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=LLM_POOL_SIZE, thread_name_prefix='llm-call')
+    return _pool
+
+
+def _count(stage, key):
+    with _state_lock:
+        counters = _counters.setdefault(stage, {
+            'calls': 0, 'attempts': 0, 'retries': 0, 'hedges': 0, 'hedge_wins': 0, 'timeouts': 0,
+            'fallback_model': 0, 'fallback_local': 0, 'failures': 0, 'short_circuited': 0
+        })
+        counters[key] += 1
+
+
+def is_transient(error):
+    import openai
+
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in TRANSIENT_STATUS_CODES
+    return isinstance(error, (TimeoutError, ConnectionError))
+
+
+def hedge_delay(stage):
+    with _state_lock:
+        samples = sorted(_latencies.get(stage, ()))
+    if len(samples) < LLM_HEDGE_MIN_SAMPLES:
+        return None
+    return max(samples[int(len(samples) * 0.95) - 1], LLM_HEDGE_MIN_DELAY)
+
+
+def _hedge_allowed(stage):
+    with _state_lock:
+        counters = _counters.get(stage, {})
+        return counters.get('hedges', 0) < counters.get('calls', 0) * LLM_HEDGE_MAX_RATIO + 1
+
+
+def _attempt(stage, model, request, timeout, usage_fields):
+    _count(stage, 'attempts')
+    breaker = get_breaker(POLICIES[stage]['dependency'])
+    started = time.perf_counter()
+    try:
+        response = request(model, timeout)
+    except Exception as e:
+        if is_transient(e):
+            breaker.record_failure(e)
+        raise
+    elapsed = time.perf_counter() - started
+    breaker.record_success(elapsed)
+    with _state_lock:
+        _latencies.setdefault(stage, deque(maxlen=200)).append(elapsed)
+    if isinstance(response, ChatStream):
+        # Tokens are only known once the stream is drained; the breaker above judged time to first chunk.
+        response.on_complete = lambda stream: record_usage(stage, model, time.perf_counter() - started, stream,
+                                                           **usage_fields)
+    else:
+        record_usage(stage, model, elapsed, response if hasattr(response, 'usage') or hasattr(response, 'duration') else None,
+                     **usage_fields)
+    return response
+
+
+def _hedged_attempt(stage, model, request, timeout, usage_fields):
+    delay = hedge_delay(stage)
+    if delay is None or delay >= timeout or not _hedge_allowed(stage):
+        return _attempt(stage, model, request, timeout, usage_fields)
+
+    started = time.monotonic()
+    pool = _get_pool()
+    first = pool.submit(contextvars.copy_context().run, _attempt, stage, model, request, timeout, usage_fields)
+    done, _ = wait([first], timeout=delay)
+    if done:
+        return first.result()
+
+    _count(stage, 'hedges')
+    remaining = max(timeout - (time.monotonic() - started), 0.1)
+    second = pool.submit(contextvars.copy_context().run, _attempt, stage, model, request, remaining, usage_fields)
+    pending = {first, second}
+    error = None
+    while pending:
+        done, pending = wait(pending, timeout=max(timeout - (time.monotonic() - started), 0), return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        for future in done:
+            try:
+                response = future.result()
+            except Exception as e:
+                error = e
+                continue
+            if future is second:
+                _count(stage, 'hedge_wins')
+            return response
+    raise error or TimeoutError(f"{stage} call exceeded {timeout:.1f}s")
+
+
+def call_llm(stage, model, request, local_fallback=None, **usage_fields):
+    policy = POLICIES[stage]
+    _count(stage, 'calls')
+    breaker = get_breaker(policy['dependency'])
+    if not breaker.allow():
+        _count(stage, 'short_circuited')
+        if local_fallback is not None:
+            _count(stage, 'fallback_local')
+            return local_fallback()
+        raise CircuitOpenError(policy['dependency'])
+    deadline = time.monotonic() + policy['deadline']
+    last_error = None
+
+    for attempt in range(policy['retries'] + 1):
+        timeout = min(policy['timeout'], deadline - time.monotonic())
+        if timeout <= 0 or (attempt and breaker.state == OPEN):
+            break
+        try:
+            if policy['hedge']:
+                return _hedged_attempt(stage, model, request, timeout, usage_fields)
+            return _attempt(stage, model, request, timeout, usage_fields)
+        except Exception as e:
+            last_error = e
+            if isinstance(e, TimeoutError) or e.__class__.__name__ == 'APITimeoutError':
+                _count(stage, 'timeouts')
+            if not is_transient(e):
+                break
+            backoff = random.uniform(0, LLM_RETRY_BASE_DELAY * (2 ** attempt))
+            if attempt < policy['retries'] and time.monotonic() + backoff < deadline:
+                _count(stage, 'retries')
+                time.sleep(backoff)
+
+    print(f"LLM {stage} call failed on {model}: {str(last_error)}")
+    fallback_model = policy['fallback_model']
+    if fallback_model and fallback_model != model and breaker.allow():
+        try:
+            response = _attempt(stage, fallback_model, request, LLM_FALLBACK_TIMEOUT, usage_fields)
+            _count(stage, 'fallback_model')
+            return response
+        except Exception as e:
+            print(f"LLM {stage} fallback model {fallback_model} failed: {str(e)}")
+            last_error = e
+    if local_fallback is not None:
+        _count(stage, 'fallback_local')
+        return local_fallback()
+    _count(stage, 'failures')
+    raise LLMUnavailableError(stage, last_error)
+
+
+def policy_client(timeout):
+    from services.openai_client import get_client
+    return get_client().with_options(max_retries=0, timeout=timeout)
+
+
+def chat_request(**kwargs):
+    def request(model, timeout):
+        return policy_client(timeout).chat.completions.create(model=model, **kwargs)
+    return request
+
+
+def chat_stream_request(**kwargs):
+    def request(model, timeout):
+        stream = policy_client(timeout).chat.completions.create(
+            model=model, stream=True, stream_options={'include_usage': True}, **kwargs
+        )
+        try:
+            first_chunk = next(iter(stream))
+        except BaseException:
+            stream.close()
+            raise
+        return ChatStream(stream, first_chunk)
+    return request
+
+
+def _probe_chat():
+    policy_client(5.0).chat.completions.create(
+        model='gpt-4o-mini', messages=[{'role': 'user', 'content': 'ping'}], max_tokens=1
+    )
+
+
+def _probe_tts():
+    policy_client(5.0).audio.speech.create(model='tts-1', voice='alloy', input='ok').read()
+
+
+def _probe_transcription():
+    import io
+    import wave
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as clip:
+        clip.setnchannels(1)
+        clip.setsampwidth(2)
+        clip.setframerate(16000)
+        clip.writeframes(b'\x00\x00' * 1600)
+    policy_client(10.0).audio.transcriptions.create(
+        model='whisper-1', file=('probe.wav', buffer.getvalue(), 'audio/wav')
+    )
+
+
+register_probe('chat', _probe_chat)
+register_probe('tts', _probe_tts)
+register_probe('transcription', _probe_transcription)
+
+
+def get_policy_stats():
+    with _state_lock:
+        stats = {stage: dict(counters) for stage, counters in _counters.items()}
+        for stage, samples in _latencies.items():
+            ordered = sorted(samples)
+            if ordered:
+                stats.setdefault(stage, {})['p95_ms'] = round(ordered[int(len(ordered) * 0.95) - 1] * 1000, 1)
+    return stats
+
+
+def reset_policy_stats():
+    with _state_lock:
+        _latencies.clear()
+        _counters.clear()
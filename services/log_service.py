@@ -0,0 +1,157 @@
+import os
+import re
+import json
+import time
+import queue
+import atexit
+import random
+import hashlib
+import threading
+from flask import g, has_request_context
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LOG_PATH = os.environ.get('AINO_LOG_PATH', os.path.join(BASE_DIR, 'logs', 'turns.jsonl'))
+LOG_MAX_BYTES = int(os.environ.get('AINO_LOG_MAX_BYTES', 10 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.environ.get('AINO_LOG_BACKUP_COUNT', 5))
+LOG_QUEUE_SIZE = int(os.environ.get('AINO_LOG_QUEUE_SIZE', 10000))
+LOG_SAMPLE_RATE = float(os.environ.get('AINO_LOG_SAMPLE_RATE', 1.0))
+LOG_BATCH_SIZE = 512
+
+_EMAIL_PATTERN = re.compile(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}')
+_PHONE_PATTERN = re.compile(r'(?<!\w)\+?\d[\d ().-]{6,}\d(?!\w)')
+
+_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+_stats = {'queued': 0, 'written': 0, 'dropped': 0, 'sampled_out': 0, 'rotations': 0, 'write_errors': 0}
+_stats_lock = threading.Lock()
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def _count(key, amount=1):
+    with _stats_lock:
+        _stats[key] += amount
+
+
+def redact(value):
+    if isinstance(value, str):
+        return _PHONE_PATTERN.sub('<phone>', _EMAIL_PATTERN.sub('<email>', value))
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(item) for item in value]
+    return value
+
+
+def session_tag(session_id):
+    return hashlib.sha256(session_id.encode('utf-8')).hexdigest()[:12]
+
+
+def logging_enabled():
+    return bool(LOG_PATH)
+
+
+def log_event(event, sampled=True, **fields):
+    if not LOG_PATH:
+        return False
+    if sampled and LOG_SAMPLE_RATE < 1.0 and random.random() >= LOG_SAMPLE_RATE:
+        _count('sampled_out')
+        return False
+    if _writer is None:
+        _start_writer()
+    fields['ts'] = time.time()
+    fields['event'] = event
+    try:
+        _queue.put_nowait(fields)
+    except queue.Full:
+        _count('dropped')
+        return False
+    _count('queued')
+    return True
+
+
+def note_llm_call(kind, response, seconds):
+    if not has_request_context():
+        return
+    usage = getattr(response, 'usage', None)
+    calls = g.setdefault('llm_calls', [])
+    calls.append({
+        'kind': kind,
+        'model': getattr(response, 'model', None),
+        'ms': round(seconds * 1000, 1),
+        'prompt_tokens': getattr(usage, 'prompt_tokens', 0) or 0,
+        'completion_tokens': getattr(usage, 'completion_tokens', 0) or 0,
+    })
+
+
+def get_llm_calls():
+    if not has_request_context():
+        return []
+    return g.get('llm_calls', [])
+
+
+def _start_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_write_loop, name='jsonl-log-writer', daemon=True)
+            _writer.start()
+            atexit.register(flush)
+
+
+def _rotate(log_file):
+    log_file.close()
+    for index in range(LOG_BACKUP_COUNT - 1, 0, -1):
+        source = f"{LOG_PATH}.{index}"
+        if os.path.exists(source):
+            os.replace(source, f"{LOG_PATH}.{index + 1}")
+    if LOG_BACKUP_COUNT > 0:
+        os.replace(LOG_PATH, f"{LOG_PATH}.1")
+    else:
+        os.remove(LOG_PATH)
+    _count('rotations')
+    return open(LOG_PATH, 'a', encoding='utf-8')
+
+
+def _write_loop():
+    os.makedirs(os.path.dirname(os.path.abspath(LOG_PATH)), exist_ok=True)
+    log_file = open(LOG_PATH, 'a', encoding='utf-8')
+    while True:
+        batch = [_queue.get()]
+        while len(batch) < LOG_BATCH_SIZE:
+            try:
+                batch.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            lines = [json.dumps(redact(record), ensure_ascii=False, separators=(',', ':'), default=str)
+                     for record in batch]
+            log_file.write('\n'.join(lines) + '\n')
+            log_file.flush()
+            _count('written', len(batch))
+            if LOG_MAX_BYTES > 0 and log_file.tell() >= LOG_MAX_BYTES:
+                log_file = _rotate(log_file)
+        except Exception as e:
+            _count('write_errors', len(batch))
+            print(f"Error writing log records: {str(e)}")
+        finally:
+            for _ in batch:
+                _queue.task_done()
+
+
+def flush(timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while _queue.unfinished_tasks:
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def get_log_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['pending'] = _queue.qsize()
+    stats['path'] = LOG_PATH or None
+    stats['sample_rate'] = LOG_SAMPLE_RATE
+    return stats
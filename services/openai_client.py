@@ -0,0 +1,25 @@
+import os
+import sys
+import threading
+
+try:
+    from config.config import OPENAI_API_KEY
+except ImportError:
+    OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY', '')
+
+if not OPENAI_API_KEY:
+    print("Warning: OPENAI_API_KEY not found. Please set it in config/config.py or as an environment variable.")
+    sys.exit(1)
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from openai import OpenAI
+                _client = OpenAI(api_key=OPENAI_API_KEY)
+    return _client
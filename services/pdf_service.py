@@ -0,0 +1,60 @@
+from services.render_service import render_document
+
+REPORT_CSS = """
+@page {
+    size: A4;
+    margin: 2cm 2cm 2.2cm 2cm;
+    @bottom-center { content: counter(page); font-size: 9pt; color: #666; }
+}
+body { font-family: Calibri, Carlito, 'DejaVu Sans', sans-serif; font-size: 11pt; line-height: 1.45; color: #1a1a1a; }
+h1 { font-size: 22pt; margin: 0 0 0.6em 0; color: #0b3d91; }
+h2 { font-size: 15pt; margin: 1.4em 0 0.5em 0; color: #0b3d91; border-bottom: 1px solid #d0d7e2; padding-bottom: 0.2em; }
+h3 { font-size: 12.5pt; margin: 1.1em 0 0.4em 0; }
+table { width: 100%; border-collapse: collapse; margin: 0.8em 0; }
+th, td { border: 1px solid #c8ced8; padding: 6px 8px; vertical-align: top; text-align: left; }
+th { background: #eef2f8; }
+hr { border: none; border-top: 1px solid #d0d7e2; margin: 1.2em 0; }
+ul, ol { margin: 0.3em 0 0.6em 1.2em; }
+"""
+
+_renderer = None
+
+
+class PDFRenderer:
+    def __init__(self):
+        import markdown
+        from weasyprint import CSS
+        from weasyprint.text.fonts import FontConfiguration
+        
+        self.markdown = markdown.Markdown(extensions=['extra', 'tables', 'sane_lists'])
+        self.font_config = FontConfiguration()
+        self.stylesheet = CSS(string=REPORT_CSS, font_config=self.font_config)
+    
+    def render(self, filled_markdown):
+        from weasyprint import HTML
+        
+        self.markdown.reset()
+        body = self.markdown.convert(filled_markdown)
+        html = (
+            '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Business Plan</title></head>'
+            f'<body>{body}</body></html>'
+        )
+        return HTML(string=html).write_pdf(stylesheets=[self.stylesheet], font_config=self.font_config)
+
+
+def get_renderer():
+    global _renderer
+    if _renderer is None:
+        _renderer = PDFRenderer()
+    return _renderer
+
+
+def render_pdf_bytes(filled_markdown, timeout=None):
+    return render_document('pdf', filled_markdown, timeout=timeout)
+
+
+def create_pdf_from_form_data(form_data, business_plan_sections, filled_markdown=None):
+    if filled_markdown is None:
+        from services.docx_service import get_filled_markdown
+        filled_markdown = get_filled_markdown(form_data, business_plan_sections)
+    return render_pdf_bytes(filled_markdown)
@@ -0,0 +1,252 @@
+import contextvars
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from services.business_plan_service import get_current_business_plan_question
+from services.catalog_registry import bind_tenant, current_tenant
+from services.chat_service import get_tts_audio, prefetch_reply
+from services.circuit_breaker import is_available
+from services.language_service import get_session_language
+from services.lifecycle import is_draining
+from services.usage_service import bind_session, is_over_budget
+
+PREFETCH_ENABLED = os.environ.get('PREFETCH', '1').lower() not in ('0', 'false', 'no')
+PREFETCH_WORKERS = int(os.environ.get('PREFETCH_WORKERS', 8))
+PREFETCH_MAX_PENDING = int(os.environ.get('PREFETCH_MAX_PENDING', 32))
+PREFETCH_MAX_WASTE = int(os.environ.get('PREFETCH_MAX_WASTE', 4))
+PREFETCH_WAIT = float(os.environ.get('PREFETCH_WAIT', 10.0))
+PREFETCH_TTL = float(os.environ.get('PREFETCH_TTL', 900))
+PREFETCH_MAX_SESSIONS = int(os.environ.get('PREFETCH_MAX_SESSIONS', 10000))
+
+_slots = OrderedDict()
+_slots_lock = threading.Lock()
+_stats = {'scheduled': 0, 'hits': 0, 'late_hits': 0, 'misses': 0, 'cancelled': 0, 'wasted_calls': 0,
+          'failed': 0, 'skipped_budget': 0, 'skipped_busy': 0, 'audio_hits': 0, 'saved_ms': 0.0}
+_stats_lock = threading.Lock()
+_pending = 0
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix='prefetch')
+    return _pool
+
+
+def _count(key, amount=1):
+    with _stats_lock:
+        _stats[key] += amount
+
+
+class Prediction:
+    """One speculated reply: its text and, when the session listens to replies, its audio."""
+
+    def __init__(self, key, with_audio):
+        self.key = key
+        self.with_audio = with_audio
+        self.created = time.monotonic()
+        self.cancelled = False
+        self.started = None
+        self.text = None
+        self.text_ms = None
+        self.audio = None
+        self.audio_ms = None
+        self.text_ready = threading.Event()
+        self.done = threading.Event()
+        self.future = None
+
+    def calls(self):
+        return (self.started is not None) + (self.audio is not None)
+
+
+class Slot:
+    """Per-session predictions for the next turn plus the outcomes that decide how much to speculate."""
+
+    def __init__(self):
+        self.predictions = []
+        self.served = None
+        self.audio_wanted = False
+        self.invalid_answers = 0
+        self.hits = {'ask': 0, 'retry': 0}
+        self.wasted = {'ask': 0, 'retry': 0}
+
+    def over_budget(self, variant):
+        return self.wasted[variant] - self.hits[variant] > PREFETCH_MAX_WASTE
+
+
+def _slot(session_id, create=True):
+    with _slots_lock:
+        slot = _slots.get(session_id)
+        if slot is None and create:
+            slot = _slots[session_id] = Slot()
+            while len(_slots) > PREFETCH_MAX_SESSIONS:
+                _discard(_slots.popitem(last=False)[1])
+        elif slot is not None:
+            _slots.move_to_end(session_id)
+        return slot
+
+
+def _discard(slot, predictions=None, keep=None):
+    """Cancel every prediction except keep and charge the calls already spent on them to the slot."""
+    global _pending
+    wasted = 0
+    for prediction in slot.predictions if predictions is None else predictions:
+        if prediction is keep:
+            continue
+        prediction.cancelled = True
+        if prediction.future is not None and prediction.future.cancel():
+            with _stats_lock:
+                _stats['cancelled'] += 1
+                _pending -= 1
+        else:
+            slot.wasted[prediction.key[0]] += prediction.calls()
+            wasted += prediction.calls()
+    if wasted:
+        _count('wasted_calls', wasted)
+
+
+def _run(session_id, tenant, prediction, current_step, form_data, chat_history, catalog, is_retry):
+    global _pending
+    bind_session(session_id)
+    bind_tenant(tenant)
+    try:
+        prediction.started = time.perf_counter()
+        text = prefetch_reply(current_step, form_data, chat_history, catalog, is_retry=is_retry)
+        prediction.text_ms = (time.perf_counter() - prediction.started) * 1000
+        prediction.text = text
+        prediction.text_ready.set()
+        if text and prediction.with_audio and not prediction.cancelled and is_available('tts'):
+            started = time.perf_counter()
+            prediction.audio = get_tts_audio(text, stage='prefetch_tts')
+            prediction.audio_ms = (time.perf_counter() - started) * 1000
+    except Exception as e:
+        print(f"Prefetch error: {str(e)}")
+        _count('failed')
+    finally:
+        prediction.text_ready.set()
+        prediction.done.set()
+        with _stats_lock:
+            _pending -= 1
+
+
+def _submit(session_id, slot, key, current_step, form_data, chat_history, catalog, is_retry=False):
+    global _pending
+    with _stats_lock:
+        if _pending >= PREFETCH_MAX_PENDING:
+            _stats['skipped_busy'] += 1
+            return
+        _pending += 1
+        _stats['scheduled'] += 1
+    prediction = Prediction(key, slot.audio_wanted and not is_retry)
+    # A fresh context: the finished request's context must not leak into the worker. Its tenant is carried over,
+    # so the prompt is phrased with that tenant's translations.
+    prediction.future = _get_pool().submit(contextvars.Context().run, _run, session_id, current_tenant(), prediction,
+                                           current_step, dict(form_data), list(chat_history), catalog, is_retry)
+    slot.predictions.append(prediction)
+
+
+def schedule_prefetch(session_id, form_data, chat_history, question_retries, answers, catalog):
+    """Start phrasing the replies the next answer most likely leads to while the user reads and types.
+
+    The next question is asked after a valid answer; its retry variant is only phrased for sessions that
+    have already given an unclear answer, and only while a retry is still allowed for the question.
+    """
+    if not PREFETCH_ENABLED or is_draining() or is_over_budget() or not is_available('chat'):
+        return
+    _, question, _ = get_current_business_plan_question(form_data, catalog, answers)
+    if question is None:
+        return
+    slot = _slot(session_id)
+    language_code = get_session_language(form_data)
+    answered = dict(form_data)
+    answered[question.id] = '(answered)'
+    _, next_question, _ = get_current_business_plan_question(answered, catalog)
+    if next_question is not None and slot.over_budget('ask'):
+        _count('skipped_budget')
+    elif next_question is not None:
+        _submit(session_id, slot, ('ask', next_question.id, language_code, catalog.version), f"bp_{question.id}",
+                answered, chat_history, catalog)
+    current_step = f"bp_{question.id}"
+    if not slot.invalid_answers or current_step in question_retries:
+        return
+    if slot.over_budget('retry'):
+        _count('skipped_budget')
+    else:
+        _submit(session_id, slot, ('retry', question.id, language_code, catalog.version), current_step, form_data,
+                chat_history, catalog, is_retry=True)
+
+
+def take_prefetched_reply(session_id, key=None, invalid=False):
+    """The speculated reply for this turn's outcome, or None; every other prediction is cancelled."""
+    slot = _slot(session_id, create=False)
+    if slot is None:
+        return None
+    with _slots_lock:
+        predictions, slot.predictions = slot.predictions, []
+    if invalid:
+        slot.invalid_answers += 1
+    match = next((p for p in predictions if p.key == key and time.monotonic() - p.created <= PREFETCH_TTL), None)
+    _discard(slot, predictions, keep=match)
+    slot.served = None
+    if match is None:
+        if predictions:
+            _count('misses')
+        return None
+
+    waited = time.perf_counter()
+    if not match.text_ready.wait(PREFETCH_WAIT) or not match.text:
+        _discard(slot, [match])
+        _count('misses')
+        return None
+    waited_ms = (time.perf_counter() - waited) * 1000
+    _count('late_hits' if waited_ms >= 1 else 'hits')
+    _count('saved_ms', max(0.0, (match.text_ms or 0.0) - waited_ms))
+    slot.hits[match.key[0]] += 1
+    slot.served = match
+    return match.text
+
+
+def take_prefetched_audio(session_id, text):
+    """Audio synthesized ahead for the reply just served, when that is the text being spoken."""
+    slot = _slot(session_id)
+    slot.audio_wanted = True
+    prediction = slot.served
+    if prediction is None or not prediction.with_audio or prediction.text != text:
+        return None
+    started = time.perf_counter()
+    if not prediction.done.wait(PREFETCH_WAIT) or not prediction.audio:
+        return None
+    slot.served = None
+    _count('audio_hits')
+    _count('saved_ms', max(0.0, (prediction.audio_ms or 0.0) - (time.perf_counter() - started) * 1000))
+    return prediction.audio
+
+
+def note_audio_wanted(session_id):
+    _slot(session_id).audio_wanted = True
+
+
+def cancel_prefetch(session_id):
+    with _slots_lock:
+        slot = _slots.pop(session_id, None)
+    if slot is not None:
+        _discard(slot)
+
+
+def get_prefetch_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+        stats['pending'] = _pending
+    resolved = stats['hits'] + stats['late_hits'] + stats['misses']
+    stats['hit_rate'] = round((stats['hits'] + stats['late_hits']) / resolved, 3) if resolved else None
+    stats['saved_ms'] = round(stats['saved_ms'], 1)
+    stats['sessions'] = len(_slots)
+    stats['enabled'] = PREFETCH_ENABLED
+    return stats
@@ -0,0 +1,212 @@
+import math
+import os
+import re
+import threading
+import zlib
+from services.catalog_registry import on_catalog_compiled, on_catalog_swap
+
+RELEVANCE_DIMENSIONS = 1 << 14
+ROUTE_MIN_SCORE = float(os.environ.get('ROUTE_MIN_SCORE', 0.12))
+ROUTE_MARGIN = float(os.environ.get('ROUTE_MARGIN', 0.04))
+ROUTE_MIN_WORDS = 4
+LABEL_WEIGHT = 2.0
+
+# Everyday words people use for each topic that the question text itself does not contain, for the default
+# checklist. A catalog question's own "hints:" replace these.
+QUESTION_HINTS = {
+    'business_idea': "sell offer idea concept open start shop company customers buy",
+    'vision_35_years': "future years grow growth dream become expand locations employees goal long term impact",
+    'competence_skills': "worked years experience trained studied degree background passion know skills certified",
+    'industry': "industry market trends seasonal seasonality regulation technology sector prices",
+    'customers_segments': "customers families students offices companies people consumers businesses b2b b2c age "
+                          "target audience locals",
+    'customer_purchase_motives': "problem need want desire pain convenient save time why buy value",
+    'products_and_services': "product products service services menu price prices euro eur € cost per hour "
+                             "subscription package charge costs unit",
+    'competitive_situation_and_competitors': "competitors competitor competition chains alternatives rival "
+                                             "better than others choose us instead",
+    'customer_purchase_criteria': "criteria compare choosing factors important ranking quality speed price "
+                                  "reviews",
+    'customer_risks': "hesitate hesitation stop buying trust doubts barrier worry concerns reduce risk",
+    'market_entry_and_launch_plan': "first steps launch opening first month months website contact pilot "
+                                    "first customer plan",
+    'sales_and_marketing_channels': "marketing channels instagram facebook tiktok linkedin google ads "
+                                    "advertising social media word mouth flyers newsletter seo events",
+    'production_and_logistics_goods': "suppliers supplier wholesale ingredients materials shipping delivery "
+                                      "stock inventory order lead times",
+    'delivery_operations_services': "opening hours schedule capacity week tools software booking appointments "
+                                    "deliver",
+    'distribution_network': "resellers retailers marketplace wolt foodora amazon etsy distributors partners "
+                            "commission share",
+    'other_third_parties_and_partners_important_to_the_company': "accountant lawyer bookkeeping advisor "
+                                                                 "subcontractor partners rely",
+    'internationalization_plans': "abroad international sweden estonia germany export countries foreign "
+                                  "expand outside finland",
+    'initial_financing_and_startup_costs': "loan savings funding grant startup money invest investment equipment "
+                                           "buy need start costs cash",
+    'swot_analysis': "strengths weaknesses opportunities threats strength weakness opportunity threat",
+    'background_information_company_basics': "oy tmi toiminimi osakeyhtiö sole trader limited company owner "
+                                             "owners ownership percent legal form",
+    'profitability_timeline': "break even profit profitable monthly fixed costs rent salaries sales month "
+                              "runway",
+    'potential_risks_in_the_operating_environment': "recession downturn economy regulation changes inflation "
+                                                    "energy prices external risks backup",
+    'intellectual_property_rights': "trademark brand name domain patent copyright registered logo design",
+    'permits_and_notices': "permit permits license licence food authority registration notification health "
+                           "inspection",
+    'insurance_and_contracts': "insurance liability insured premium policy coverage",
+    'contracts_key_contracts': "contract contracts lease landlord agreement signed terms termination",
+}
+
+STOPWORDS = frozenset("""
+a an and are as at be but by can could do does for from had has have i if in into is it its just me my
+no not of on or our ours so some than that the their them then there these they this to too us very was
+we were what when where which who why will with would you your yours about also all any been being each
+how more most other over such only own same should now e g eg etc
+""".split())
+
+_WORD_PATTERN = re.compile(r"[^\W\d_]{2,}|€|\d+")
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+|\n+|;\s*')
+_SUFFIXES = ('ing', 'ers', 'ies', 'ed', 'es', 'er', 'ly', 's')
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+_numpy = None
+
+
+def get_numpy():
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            print("Warning: numpy is not installed; answers are only matched against the current question.")
+            _numpy = False
+    return _numpy
+
+
+def stem(word):
+    for suffix in _SUFFIXES:
+        if len(word) > len(suffix) + 3 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
+
+
+def tokens(text):
+    words = [stem(word) for word in _WORD_PATTERN.findall(text.lower()) if word not in STOPWORDS]
+    words = ['#num' if word.isdigit() else word for word in words]
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+
+def _bucket(token):
+    return zlib.crc32(token.encode('utf-8')) % RELEVANCE_DIMENSIONS
+
+
+def split_sentences(text):
+    return [sentence.strip() for sentence in _SENTENCE_SPLIT.split(text) if sentence.strip()]
+
+
+class RelevanceIndex:
+    """Hashed TF-IDF vectors for every question's label, fill text and topic hints, one L2-normalized row each."""
+
+    def __init__(self, catalog):
+        np = get_numpy()
+        self.catalog = catalog
+        documents = []
+        for question in catalog.questions:
+            counts = {}
+            for weight, text in ((LABEL_WEIGHT, question.label), (1.0, question.fill),
+                                 (1.0, question.hints or QUESTION_HINTS.get(question.id, ''))):
+                for token in tokens(text):
+                    counts[token] = counts.get(token, 0.0) + weight
+            documents.append(counts)
+
+        document_frequency = np.zeros(RELEVANCE_DIMENSIONS, dtype=np.float32)
+        for counts in documents:
+            document_frequency[list({_bucket(token) for token in counts})] += 1
+        self.idf = (np.log((1 + len(documents)) / (1 + document_frequency)) + 1).astype(np.float32)
+        self.matrix = np.vstack([self._vector(counts) for counts in documents]) if documents else \
+            np.zeros((0, RELEVANCE_DIMENSIONS), dtype=np.float32)
+
+    def _vector(self, counts):
+        np = get_numpy()
+        vector = np.zeros(RELEVANCE_DIMENSIONS, dtype=np.float32)
+        for token, count in counts.items():
+            vector[_bucket(token)] += 1 + math.log(count)
+        vector *= self.idf
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def vectorize(self, texts):
+        np = get_numpy()
+        rows = []
+        for text in texts:
+            counts = {}
+            for token in tokens(text):
+                counts[token] = counts.get(token, 0) + 1
+            rows.append(self._vector(counts))
+        return np.vstack(rows)
+
+    def scores(self, texts, open_mask):
+        """Cosine similarity of each text against every question; closed questions score -1."""
+        np = get_numpy()
+        scores = self.vectorize(texts) @ self.matrix.T
+        scores[:, ~open_mask] = -1.0
+        return scores
+
+    def open_mask(self, answers):
+        np = get_numpy()
+        closed = answers.completed | answers.skipped
+        return np.array([not closed >> question.index & 1 for question in self.catalog.questions], dtype=bool)
+
+
+def get_index(catalog):
+    index = _indexes.get(id(catalog))
+    if index is None or index.catalog is not catalog:
+        with _indexes_lock:
+            index = _indexes.get(id(catalog))
+            if index is None or index.catalog is not catalog:
+                index = _indexes[id(catalog)] = RelevanceIndex(catalog)
+    return index
+
+
+@on_catalog_compiled
+def _build_index(catalog):
+    if get_numpy():
+        get_index(catalog)
+
+
+@on_catalog_swap
+def _drop_index(tenant, old_catalog):
+    with _indexes_lock:
+        _indexes.pop(id(old_catalog), None)
+
+
+def route_answer(text, current_question, catalog, answers):
+    """Split an answer into sentences and send each to the open question it matches best.
+
+    Returns ({question: text} for other questions, the text left for current_question). A sentence only
+    leaves the current question when another open one scores at least ROUTE_MIN_SCORE and beats the current
+    question by ROUTE_MARGIN; everything else stays with the current question, as before.
+    """
+    if not get_numpy() or not catalog.questions:
+        return {}, text
+    sentences = split_sentences(text)
+    if not sentences:
+        return {}, text
+    index = get_index(catalog)
+    scores = index.scores(sentences, index.open_mask(answers))
+    current = current_question.index
+    best = scores.argmax(axis=1)
+
+    routed = {}
+    leftover = []
+    for sentence, row, choice in zip(sentences, scores, best):
+        if (choice != current and row[choice] >= ROUTE_MIN_SCORE and row[choice] - row[current] >= ROUTE_MARGIN
+                and len(sentence.split()) >= ROUTE_MIN_WORDS):
+            question = catalog.questions[choice]
+            routed[question] = f"{routed[question]} {sentence}" if question in routed else sentence
+        else:
+            leftover.append(sentence)
+    return routed, ' '.join(leftover)
@@ -0,0 +1,227 @@
+import os
+import time
+import queue
+import atexit
+import threading
+from multiprocessing import get_context
+
+# PDF_RENDER_* were the names when only PDFs went through the pool.
+RENDER_WORKERS = int(os.environ.get('RENDER_WORKERS', os.environ.get('PDF_RENDER_WORKERS', 2)))
+RENDER_TIMEOUT = float(os.environ.get('RENDER_TIMEOUT', os.environ.get('PDF_RENDER_TIMEOUT', 60)))
+RENDER_MAX_PENDING = int(os.environ.get('RENDER_MAX_PENDING', 4 * max(RENDER_WORKERS, 1)))
+RENDER_QUEUE_TIMEOUT = float(os.environ.get('RENDER_QUEUE_TIMEOUT', 10))
+RENDER_START_TIMEOUT = float(os.environ.get('RENDER_START_TIMEOUT', 60))
+
+KINDS = ('docx', 'pdf')
+
+# Forking a threaded server process can copy a lock held by another thread into the child; start clean instead.
+_context = get_context('spawn')
+_idle = None
+_workers = set()
+_pool_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(RENDER_MAX_PENDING)
+_render_locks = {kind: threading.Lock() for kind in KINDS}
+_stats = {'rendered': 0, 'failed': 0, 'rejected': 0, 'timeouts': 0, 'restarts': 0, 'in_flight': 0,
+          'render_ms': {kind: 0.0 for kind in KINDS}, 'count': {kind: 0 for kind in KINDS}}
+_stats_lock = threading.Lock()
+
+
+class RenderBusyError(Exception):
+    """Every render slot stayed taken for RENDER_QUEUE_TIMEOUT seconds."""
+
+
+class RenderTimeoutError(Exception):
+    """A render took longer than its timeout; the worker running it has been replaced."""
+
+
+class RenderWorkerError(Exception):
+    """The worker process died while rendering; it has been replaced."""
+
+
+def _renderer(kind):
+    if kind == 'docx':
+        from services.docx_service import get_docx_renderer
+        return get_docx_renderer()
+    if kind == 'pdf':
+        from services.pdf_service import get_renderer
+        return get_renderer()
+    raise ValueError(f"Unknown document kind: {kind}")
+
+
+def _warm_worker():
+    # Import the libraries and load the base document and stylesheet before the first job arrives.
+    for kind in KINDS:
+        try:
+            _renderer(kind)
+        except Exception as e:
+            print(f"Render worker could not prepare {kind}: {str(e)}")
+
+
+def _worker_main(connection):
+    _warm_worker()
+    connection.send(('ready', os.getpid()))
+    while True:
+        try:
+            job = connection.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        kind, filled_markdown = job
+        try:
+            connection.send((True, _renderer(kind).render(filled_markdown)))
+        except Exception as e:
+            try:
+                connection.send((False, e))
+            except Exception:
+                connection.send((False, RuntimeError(f"{e.__class__.__name__}: {str(e)}")))
+
+
+class _Worker:
+    """One render process and the pipe to it. A worker whose job hangs or who dies is stopped and replaced alone."""
+
+    def __init__(self):
+        self.connection, child = _context.Pipe()
+        self.process = _context.Process(target=_worker_main, args=(child,), name='render-worker', daemon=True)
+        self.process.start()
+        child.close()
+        self.ready = False
+
+    def render(self, kind, filled_markdown, timeout):
+        if not self.ready:
+            # Starting an interpreter and importing the libraries is not part of the job's time.
+            if not self.connection.poll(RENDER_START_TIMEOUT):
+                raise RenderWorkerError(f"Render worker did not start within {RENDER_START_TIMEOUT:g} s")
+            self.connection.recv()
+            self.ready = True
+        self.connection.send((kind, filled_markdown))
+        if not self.connection.poll(timeout):
+            raise RenderTimeoutError(f"Rendering the {kind} took longer than {timeout:g} s")
+        ok, result = self.connection.recv()
+        if not ok:
+            raise result
+        return result
+
+    def stop(self):
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join(timeout=1)
+        self.connection.close()
+
+
+def _start_worker():
+    worker = _Worker()
+    with _pool_lock:
+        _workers.add(worker)
+    return worker
+
+
+def _replace(worker):
+    _count('restarts')
+    with _pool_lock:
+        _workers.discard(worker)
+    worker.stop()
+    return _start_worker()
+
+
+def _get_idle():
+    global _idle
+    if _idle is None:
+        with _pool_lock:
+            if _idle is None:
+                idle = queue.Queue()
+                for _ in range(RENDER_WORKERS):
+                    worker = _Worker()
+                    _workers.add(worker)
+                    idle.put(worker)
+                _idle = idle
+    return _idle
+
+
+@atexit.register
+def _stop_workers():
+    with _pool_lock:
+        workers = list(_workers)
+        _workers.clear()
+    for worker in workers:
+        worker.stop()
+
+
+def _count(key, amount=1):
+    with _stats_lock:
+        _stats[key] += amount
+
+
+def _finished(kind, started):
+    with _stats_lock:
+        _stats['rendered'] += 1
+        _stats['count'][kind] += 1
+        _stats['render_ms'][kind] += (time.perf_counter() - started) * 1000
+
+
+def render_document(kind, filled_markdown, timeout=None):
+    """Render filled report markdown as 'docx' or 'pdf' bytes off the request thread.
+
+    Documents are built in RENDER_WORKERS spawned processes that keep the libraries imported, so CPU-bound
+    rendering does not hold the GIL the other requests of this worker need. At most RENDER_MAX_PENDING renders
+    are queued or running; beyond that a caller waits up to RENDER_QUEUE_TIMEOUT seconds for a slot and then
+    gets RenderBusyError. A queued render waits here for an idle worker, and one that runs longer than timeout
+    once it has it raises RenderTimeoutError; only that worker is replaced, the others keep rendering.
+    RENDER_WORKERS=0 renders on the calling thread, one document of each kind at a time.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown document kind: {kind}")
+    started = time.perf_counter()
+    if RENDER_WORKERS <= 0:
+        with _render_locks[kind]:
+            data = _renderer(kind).render(filled_markdown)
+        _finished(kind, started)
+        return data
+
+    if not _slots.acquire(timeout=RENDER_QUEUE_TIMEOUT):
+        _count('rejected')
+        raise RenderBusyError(f"{RENDER_MAX_PENDING} documents are already being rendered")
+    _count('in_flight')
+    try:
+        idle = _get_idle()
+        worker = idle.get()
+        try:
+            if not worker.process.is_alive():
+                # Died while idle (killed, out of memory); nothing of this job was lost yet.
+                worker = _replace(worker)
+            data = worker.render(kind, filled_markdown, timeout or RENDER_TIMEOUT)
+        except RenderTimeoutError:
+            _count('timeouts')
+            worker = _replace(worker)
+            raise
+        except (EOFError, BrokenPipeError, ConnectionResetError) as e:
+            _count('failed')
+            worker = _replace(worker)
+            raise RenderWorkerError(f"Render worker stopped while rendering the {kind}: {str(e) or 'EOF'}")
+        except RenderWorkerError:
+            _count('failed')
+            worker = _replace(worker)
+            raise
+        except Exception:
+            _count('failed')
+            raise
+        finally:
+            idle.put(worker)
+        _finished(kind, started)
+        return data
+    finally:
+        _count('in_flight', -1)
+        _slots.release()
+
+
+def get_render_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+        count = dict(_stats['count'])
+        render_ms = dict(_stats['render_ms'])
+    stats['count'] = count
+    stats.pop('render_ms')
+    stats['avg_ms'] = {kind: round(render_ms[kind] / count[kind], 1) if count[kind] else None for kind in KINDS}
+    stats['workers'] = RENDER_WORKERS
+    stats['max_pending'] = RENDER_MAX_PENDING
+    return stats
@@ -0,0 +1,173 @@
+import os
+import threading
+import contextvars
+from collections import OrderedDict
+from flask import has_request_context
+from services.log_service import note_llm_call, session_tag
+
+USAGE_SESSION_TOKEN_BUDGET = int(os.environ.get('USAGE_SESSION_TOKEN_BUDGET', 0))
+USAGE_MAX_SESSIONS = int(os.environ.get('USAGE_MAX_SESSIONS', 10000))
+EVICTED_SESSIONS = '(evicted)'
+UNATTRIBUTED = '(unattributed)'
+
+# USD per million tokens (input, cached input, output), per million characters for TTS, or per million audio
+# seconds for Whisper ($0.006 a minute).
+MODEL_PRICES = {
+    'gpt-4o-mini': (0.15, 0.075, 0.60),
+    'gpt-4o': (2.50, 1.25, 10.00),
+    'gpt-4.1': (2.00, 0.50, 8.00),
+    'tts-1': (15.00, 0.0, 0.0),
+    'whisper-1': (100.00, 0.0, 0.0),
+}
+
+COUNTERS = ('calls', 'prompt_tokens', 'completion_tokens', 'cached_tokens', 'characters', 'audio_bytes',
+            'audio_seconds', 'latency_ms')
+
+_ledger = OrderedDict()
+_evicted = {}
+_ledger_lock = threading.Lock()
+_session_var = contextvars.ContextVar('usage_session', default=None)
+
+
+def current_session():
+    if has_request_context():
+        from models.state import get_session_id
+        return get_session_id()
+    return _session_var.get()
+
+
+def bind_session(session_id):
+    return _session_var.set(session_id)
+
+
+def estimate_cost(model, prompt_tokens=0, completion_tokens=0, cached_tokens=0, characters=0, audio_seconds=0):
+    prices = MODEL_PRICES.get(model)
+    if not prices:
+        return 0.0
+    input_price, cached_price, output_price = prices
+    if characters and not prompt_tokens:
+        return characters * input_price / 1e6
+    if audio_seconds and not prompt_tokens:
+        return audio_seconds * input_price / 1e6
+    return ((prompt_tokens - cached_tokens) * input_price + cached_tokens * cached_price
+            + completion_tokens * output_price) / 1e6
+
+
+def _usage_tokens(response):
+    usage = getattr(response, 'usage', None)
+    if usage is None:
+        return 0, 0, 0
+    prompt_tokens = getattr(usage, 'prompt_tokens', None) or getattr(usage, 'input_tokens', 0) or 0
+    completion_tokens = getattr(usage, 'completion_tokens', None) or getattr(usage, 'output_tokens', 0) or 0
+    details = getattr(usage, 'prompt_tokens_details', None) or getattr(usage, 'input_tokens_details', None)
+    cached_tokens = getattr(details, 'cached_tokens', 0) or 0
+    return prompt_tokens, completion_tokens, cached_tokens
+
+
+def record_usage(stage, model, seconds, response=None, characters=0, audio_bytes=0, session_id=None):
+    prompt_tokens, completion_tokens, cached_tokens = _usage_tokens(response)
+    # A verbose_json transcription reports the length of the clip it heard.
+    audio_seconds = getattr(response, 'duration', None) or 0
+    session_id = session_id or current_session() or UNATTRIBUTED
+    values = (1, prompt_tokens, completion_tokens, cached_tokens, characters, audio_bytes, audio_seconds,
+              seconds * 1000)
+
+    with _ledger_lock:
+        session = _ledger.get(session_id)
+        if session is None:
+            session = _ledger[session_id] = {}
+            while len(_ledger) > USAGE_MAX_SESSIONS:
+                _fold_into_evicted(*_ledger.popitem(last=False))
+        else:
+            _ledger.move_to_end(session_id)
+        row = session.get((stage, model))
+        if row is None:
+            row = session[(stage, model)] = [0] * len(COUNTERS) + [0.0]
+        for index, value in enumerate(values):
+            row[index] += value
+        row[-1] = max(row[-1], seconds * 1000)
+
+    if response is not None:
+        note_llm_call(stage, response, seconds)
+
+
+def _fold_into_evicted(session_id, session):
+    for key, row in session.items():
+        target = _evicted.setdefault(key, [0] * len(COUNTERS) + [0.0])
+        for index in range(len(COUNTERS)):
+            target[index] += row[index]
+        target[-1] = max(target[-1], row[-1])
+
+
+def _summarize(row, model):
+    summary = dict(zip(COUNTERS, row))
+    summary['latency_ms'] = round(summary['latency_ms'], 1)
+    summary['audio_seconds'] = round(summary['audio_seconds'], 1)
+    summary['mean_latency_ms'] = round(summary['latency_ms'] / summary['calls'], 1) if summary['calls'] else 0.0
+    summary['max_latency_ms'] = round(row[-1], 1)
+    summary['total_tokens'] = summary['prompt_tokens'] + summary['completion_tokens']
+    summary['cost_usd'] = round(estimate_cost(
+        model, summary['prompt_tokens'], summary['completion_tokens'], summary['cached_tokens'], summary['characters'],
+        summary['audio_seconds']
+    ), 6)
+    return summary
+
+
+def get_usage_summary(group_by=('stage', 'model'), session_id=None):
+    groups = {}
+    with _ledger_lock:
+        if session_id:
+            sessions = [(session_id, _ledger.get(session_id, {}))]
+        else:
+            sessions = list(_ledger.items()) + [(EVICTED_SESSIONS, _evicted)]
+        for sid, session in sessions:
+            tag = sid if sid in (EVICTED_SESSIONS, UNATTRIBUTED) else session_tag(sid)
+            for (stage, model), row in session.items():
+                fields = {'session': tag, 'stage': stage, 'model': model}
+                key = tuple(fields[name] for name in group_by)
+                group = groups.get(key)
+                if group is None:
+                    group = groups[key] = {'fields': {name: fields[name] for name in group_by}, 'rows': []}
+                group['rows'].append((model, list(row)))
+
+    results = []
+    for group in groups.values():
+        summary = {name: 0 for name in COUNTERS}
+        summary.update(latency_ms=0.0, max_latency_ms=0.0, cost_usd=0.0)
+        for model, row in group['rows']:
+            row_summary = _summarize(row, model)
+            for name in COUNTERS:
+                summary[name] += row_summary[name]
+            summary['max_latency_ms'] = max(summary['max_latency_ms'], row_summary['max_latency_ms'])
+            summary['cost_usd'] += row_summary['cost_usd']
+        summary['total_tokens'] = summary['prompt_tokens'] + summary['completion_tokens']
+        summary['mean_latency_ms'] = round(summary['latency_ms'] / summary['calls'], 1) if summary['calls'] else 0.0
+        summary['latency_ms'] = round(summary['latency_ms'], 1)
+        summary['audio_seconds'] = round(summary['audio_seconds'], 1)
+        summary['cost_usd'] = round(summary['cost_usd'], 6)
+        results.append({**group['fields'], **summary})
+    results.sort(key=lambda item: -item['cost_usd'])
+    return results
+
+
+def get_session_tokens(session_id=None):
+    session_id = session_id or current_session()
+    with _ledger_lock:
+        session = _ledger.get(session_id, {})
+        return sum(row[1] + row[2] for row in session.values())
+
+
+def is_over_budget(session_id=None):
+    if USAGE_SESSION_TOKEN_BUDGET <= 0:
+        return False
+    return get_session_tokens(session_id) >= USAGE_SESSION_TOKEN_BUDGET
+
+
+def get_budget_status(session_id=None):
+    used = get_session_tokens(session_id)
+    return {
+        'tokens_used': used,
+        'token_budget': USAGE_SESSION_TOKEN_BUDGET or None,
+        'tokens_remaining': max(USAGE_SESSION_TOKEN_BUDGET - used, 0) if USAGE_SESSION_TOKEN_BUDGET > 0 else None,
+    }
+
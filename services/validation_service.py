@@ -1,18 +1,17 @@
-from openai import OpenAI
 import os
-import sys
 import re
+import json
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from services.llm_policy import call_llm, chat_request
 
-try:
-    from config.config import OPENAI_API_KEY
-except ImportError:
-    OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY', '')
+HEURISTIC_MIN_WORDS = 3
+VALIDATION_BATCH_SIZE = int(os.environ.get('VALIDATION_BATCH_SIZE', 8))
+VALIDATION_CONCURRENCY = int(os.environ.get('VALIDATION_CONCURRENCY', 4))
 
-if not OPENAI_API_KEY:
-    print("Warning: OPENAI_API_KEY not found. Please set it in config/config.py or as an environment variable.")
-    sys.exit(1)
-
-client = OpenAI(api_key=OPENAI_API_KEY)
+_batch_pool = None
+_batch_pool_lock = threading.Lock()
 
 
 def is_gibberish(text):
@@ -54,6 +53,7 @@ def is_gibberish(text):
     }
     
     words = re.findall(r'\b[a-z]+\b', text_clean)
+    common_word_count = 0
     if words:
         word_count = len(words)
         common_word_count = sum(1 for word in words if word in common_words)
@@ -61,6 +61,10 @@ def is_gibberish(text):
             if len(text_alpha) > 8:
                 return True
     
+    if common_word_count:
+        # Consonant runs are counted across word boundaries ("sells fresh"), so only trust them without real words.
+        return False
+    
     consecutive_consonants = 0
     max_consecutive = 0
     for char in text_alpha:
@@ -76,29 +80,37 @@ def is_gibberish(text):
     return False
 
 
-def validate_answer(user_message, current_step, question_info=None):
-    if not question_info:
-        return True
-    
-    user_message_clean = user_message.strip()
-    
+def heuristic_validation(user_message):
+    return len(re.findall(r'\w+', user_message)) >= HEURISTIC_MIN_WORDS
+
+
+def is_nonsense(user_message_clean):
     if len(user_message_clean) < 2:
-        return False
+        return True
     
     if user_message_clean.isdigit() and len(user_message_clean) > 3:
-        return False
+        return True
     
     if user_message_clean.replace(' ', '').isdigit() and len(user_message_clean.replace(' ', '')) > 3:
-        return False
+        return True
     
     if len(set(user_message_clean.replace(' ', ''))) < 3 and len(user_message_clean) > 5:
-        return False
+        return True
+    
+    return is_gibberish(user_message_clean)
+
+
+def validate_answer(user_message, current_step, question_info=None):
+    if not question_info:
+        return True
+    
+    user_message_clean = user_message.strip()
     
-    if is_gibberish(user_message_clean):
+    if is_nonsense(user_message_clean):
         return False
     
-    question_label = question_info.get('label', '')
-    question_fill = question_info.get('fill', '')
+    question_label = question_info.label
+    question_fill = question_info.fill
     
     validation_prompt = f"""You are validating if a user's answer appropriately addresses a business plan question.
 
@@ -123,19 +135,98 @@ Examples of INVALID answers:
 Respond with ONLY "YES" if the answer is appropriate and addresses the question, or "NO" if it does not address the question properly or is nonsensical."""
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        response = call_llm('validation', "gpt-4o-mini", chat_request(
             messages=[
                 {'role': 'system', 'content': validation_prompt},
                 {'role': 'user', 'content': 'Validate this answer.'}
             ],
             temperature=0.3,
             max_tokens=10
-        )
+        ), local_fallback=lambda: None)
+        if response is None:
+            return heuristic_validation(user_message_clean)
         
         result = response.choices[0].message.content.strip().upper()
         return result.startswith('YES')
     except Exception as e:
         print(f"Validation error: {str(e)}")
-        return True
+        return heuristic_validation(user_message_clean)
+
+
+def _get_batch_pool():
+    global _batch_pool
+    if _batch_pool is None:
+        with _batch_pool_lock:
+            if _batch_pool is None:
+                _batch_pool = ThreadPoolExecutor(max_workers=VALIDATION_CONCURRENCY, thread_name_prefix='validation')
+    return _batch_pool
+
+
+def build_batch_validation_prompt(items):
+    answers = [{'n': number, 'question': question.label, 'context': question.fill, 'answer': answer}
+               for number, (question, answer) in enumerate(items, 1)]
+    return f"""You are validating a user's answers to several business plan questions at once.
+
+For each numbered item, decide whether the answer:
+1. Actually addresses the question being asked
+2. Provides meaningful information relevant to the question
+3. Is not just random numbers, gibberish, or meaningless text
+4. Is not just a generic response, question, or unrelated comment
+
+Judge every item on its own. Respond with a JSON object of the form
+{{"verdicts": [{{"n": 1, "valid": true}}, ...]}} with one entry per item, in the same order.
+
+Items:
+{json.dumps(answers, ensure_ascii=False)}"""
+
+
+def validate_answer_batch(items):
+    """Validate (question, answer) pairs with a single LLM call; returns one bool per pair.
+
+    Answers the cheap checks already reject never reach the model. Verdicts missing from the reply fall back to
+    the word-count heuristic, as validate_answer does when the model is unavailable.
+    """
+    results = [None] * len(items)
+    pending = []
+    for index, (question, answer) in enumerate(items):
+        if is_nonsense(answer.strip()):
+            results[index] = False
+        else:
+            pending.append(index)
+    if not pending:
+        return results
+    
+    verdicts = {}
+    try:
+        response = call_llm('validation_batch', "gpt-4o-mini", chat_request(
+            messages=[
+                {'role': 'system', 'content': build_batch_validation_prompt([items[index] for index in pending])},
+                {'role': 'user', 'content': 'Validate these answers.'}
+            ],
+            temperature=0.3,
+            max_tokens=20 * len(pending) + 20,
+            response_format={'type': 'json_object'}
+        ), local_fallback=lambda: None)
+        if response is not None:
+            for verdict in json.loads(response.choices[0].message.content).get('verdicts', []):
+                if isinstance(verdict, dict) and isinstance(verdict.get('valid'), bool):
+                    verdicts[verdict.get('n')] = verdict['valid']
+    except Exception as e:
+        print(f"Batch validation error: {str(e)}")
+    
+    for number, index in enumerate(pending, 1):
+        valid = verdicts.get(number)
+        results[index] = valid if valid is not None else heuristic_validation(items[index][1].strip())
+    return results
+
+
+def validate_answers(items, batch_size=None):
+    """validate_answer_batch over batches of batch_size pairs, run concurrently; returns one bool per pair."""
+    batch_size = max(1, batch_size or VALIDATION_BATCH_SIZE)
+    batches = [items[start:start + batch_size] for start in range(0, len(items), batch_size)]
+    if len(batches) <= 1:
+        return validate_answer_batch(items) if items else []
+    jobs = [_get_batch_pool().submit(contextvars.copy_context().run, validate_answer_batch, batch)
+            for batch in batches]
+    return [valid for job in jobs for valid in job.result()]
 
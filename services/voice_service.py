@@ -0,0 +1,213 @@
+import array
+import contextvars
+import io
+import math
+import os
+import sys
+import threading
+import time
+import wave
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from services.chat_service import transcribe_clip
+
+VOICE_SAMPLE_RATE = int(os.environ.get('VOICE_SAMPLE_RATE', 16000))
+VOICE_WORKERS = int(os.environ.get('VOICE_WORKERS', 4))
+VOICE_MIN_SAMPLE_RATE = 8000
+VOICE_MAX_SAMPLE_RATE = 48000
+
+VAD_FRAME_MS = 20
+VAD_PREROLL_MS = 200
+VAD_START_MS = int(os.environ.get('VAD_START_MS', 60))
+VAD_SEGMENT_SILENCE_MS = int(os.environ.get('VAD_SEGMENT_SILENCE_MS', 250))
+VAD_END_SILENCE_MS = int(os.environ.get('VAD_END_SILENCE_MS', 600))
+VAD_MIN_SPEECH_MS = int(os.environ.get('VAD_MIN_SPEECH_MS', 200))
+VAD_MAX_SEGMENT_MS = int(os.environ.get('VAD_MAX_SEGMENT_MS', 8000))
+VAD_THRESHOLD_RATIO = float(os.environ.get('VAD_THRESHOLD_RATIO', 3.0))
+VAD_MIN_RMS = float(os.environ.get('VAD_MIN_RMS', 300))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=VOICE_WORKERS, thread_name_prefix='voice-segment')
+    return _pool
+
+
+def parse_sample_rate(value):
+    """The sample rate a client asked for, or None unless it is a whole number of Hz in the supported range."""
+    if value is None or value == '':
+        return VOICE_SAMPLE_RATE
+    if isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    elif isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if type(value) is not int or not VOICE_MIN_SAMPLE_RATE <= value <= VOICE_MAX_SAMPLE_RATE:
+        return None
+    return value
+
+
+def frame_rms(frame):
+    samples = array.array('h', frame)
+    if sys.byteorder == 'big':
+        samples.byteswap()
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(sample * sample for sample in samples) / len(samples))
+
+
+def pcm_to_wav(pcm, sample_rate):
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as clip:
+        clip.setnchannels(1)
+        clip.setsampwidth(2)
+        clip.setframerate(sample_rate)
+        clip.writeframes(pcm)
+    return buffer.getvalue()
+
+
+class EnergyVAD:
+    """Cuts 16-bit mono PCM into speech segments on short pauses and ends the utterance on a long one.
+
+    A frame is voiced when its RMS energy is VAD_THRESHOLD_RATIO times the running noise floor (and at least
+    VAD_MIN_RMS). feed() returns ('speech_start',), ('segment', pcm) and ('utterance_end',) events.
+    """
+
+    def __init__(self, sample_rate=VOICE_SAMPLE_RATE):
+        self.frame_bytes = sample_rate * VAD_FRAME_MS // 1000 * 2
+        # feed() consumes whole frames; an empty frame would never drain the buffer.
+        assert self.frame_bytes > 0, f"Unsupported sample rate: {sample_rate}"
+        self.max_segment_bytes = sample_rate * VAD_MAX_SEGMENT_MS // 1000 * 2
+        self.noise_floor = VAD_MIN_RMS / VAD_THRESHOLD_RATIO
+        self.in_speech = False
+        self.in_utterance = False
+        self._pending = bytearray()
+        self._preroll = deque(maxlen=VAD_PREROLL_MS // VAD_FRAME_MS)
+        self._segment = bytearray()
+        self._voiced_ms = 0
+        self._speech_ms = 0
+        self._silence_ms = 0
+        self._quiet_ms = 0
+
+    def feed(self, pcm):
+        self._pending.extend(pcm)
+        events = []
+        while len(self._pending) >= self.frame_bytes:
+            frame = bytes(self._pending[:self.frame_bytes])
+            del self._pending[:self.frame_bytes]
+            self._frame(frame, events)
+        return events
+
+    def flush(self):
+        events = []
+        if self.in_speech:
+            self._cut(events)
+        if self.in_utterance:
+            self.in_utterance = False
+            events.append(('utterance_end',))
+        self._pending.clear()
+        return events
+
+    def _frame(self, frame, events):
+        rms = frame_rms(frame)
+        voiced = rms >= max(VAD_MIN_RMS, self.noise_floor * VAD_THRESHOLD_RATIO)
+        if self.in_speech:
+            self._segment.extend(frame)
+            if voiced:
+                self._speech_ms += VAD_FRAME_MS
+                self._silence_ms = self._quiet_ms = 0
+            else:
+                self._silence_ms += VAD_FRAME_MS
+                self._quiet_ms += VAD_FRAME_MS
+            if self._silence_ms >= VAD_SEGMENT_SILENCE_MS or len(self._segment) >= self.max_segment_bytes:
+                self._cut(events)
+            return
+
+        self._preroll.append(frame)
+        if voiced:
+            self._voiced_ms += VAD_FRAME_MS
+        else:
+            self._voiced_ms = 0
+            self.noise_floor = 0.95 * self.noise_floor + 0.05 * rms
+        if self._voiced_ms >= VAD_START_MS:
+            self.in_speech = True
+            self._segment = bytearray(b''.join(self._preroll))
+            self._preroll.clear()
+            self._speech_ms = self._voiced_ms
+            self._silence_ms = self._quiet_ms = 0
+            if not self.in_utterance:
+                self.in_utterance = True
+                events.append(('speech_start',))
+        elif self.in_utterance:
+            self._quiet_ms += VAD_FRAME_MS
+            if self._quiet_ms >= VAD_END_SILENCE_MS:
+                self.in_utterance = False
+                events.append(('utterance_end',))
+
+    def _cut(self, events):
+        self.in_speech = False
+        self._voiced_ms = 0
+        if self._speech_ms >= VAD_MIN_SPEECH_MS:
+            events.append(('segment', bytes(self._segment)))
+        self._segment = bytearray()
+        self._speech_ms = 0
+        self._silence_ms = 0
+
+
+class VoiceStream:
+    """Streaming voice input for one connection: segments are transcribed while the user keeps talking.
+
+    feed() and flush() return ('speech_start',), ('partial', text) as segment transcripts arrive, and
+    ('utterance', text, wait_ms) once the utterance ends, wait_ms being how long the last segments held it up.
+    """
+
+    def __init__(self, sample_rate=VOICE_SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self.vad = EnergyVAD(sample_rate)
+        self._segments = []
+        self._reported = 0
+
+    def feed(self, pcm):
+        return self._handle(self.vad.feed(pcm))
+
+    def flush(self):
+        return self._handle(self.vad.flush())
+
+    def _handle(self, vad_events):
+        events = []
+        for event in vad_events:
+            if event[0] == 'speech_start':
+                events.append(event)
+            elif event[0] == 'segment':
+                self._segments.append(_get_pool().submit(contextvars.copy_context().run, self._transcribe, event[1]))
+            elif event[0] == 'utterance_end':
+                events.extend(self._partials())
+                started = time.perf_counter()
+                text = ' '.join(filter(None, (future.result() for future in self._segments)))
+                events.append(('utterance', text, round((time.perf_counter() - started) * 1000, 1)))
+                self._segments = []
+                self._reported = 0
+        events.extend(self._partials())
+        return events
+
+    def _partials(self):
+        events = []
+        while self._reported < len(self._segments) and self._segments[self._reported].done():
+            text = self._segments[self._reported].result()
+            self._reported += 1
+            if text:
+                events.append(('partial', text))
+        return events
+
+    def _transcribe(self, pcm):
+        try:
+            return transcribe_clip(pcm_to_wav(pcm, self.sample_rate), 'segment.wav', 'audio/wav').strip()
+        except Exception as e:
+            print(f"Voice segment transcription error: {str(e)}")
+            return ''
@@ -1,17 +1,60 @@
 import os
 import re
+import shutil
+import tempfile
+import threading
+from services.business_plan_service import get_business_plan_yaml_path
+from services.catalog_registry import DEFAULT_TENANT, TENANTS_DIR, current_tenant
 from utils.helpers import slugify
 
+_yaml_lock = threading.Lock()
+
 
 def update_yaml_with_answer(yaml_path, question_label, answer):
-    if not answer or answer.strip() == '':
+    if not yaml_path or not answer or answer.strip() == '':
         return False
     
-    answer_escaped = answer.replace('"', '\\"').replace('\n', '\\n')
+    with _yaml_lock:
+        return _write_answers(yaml_path, [(question_label, answer)])
+
+
+def update_yaml_with_answers(yaml_path, answers):
+    """Write several (question label, answer) pairs, e.g. an imported plan, reading and writing the file once."""
+    answers = [(label, answer) for label, answer in answers if answer and answer.strip()]
+    if not yaml_path or not answers:
+        return False
     
+    with _yaml_lock:
+        return _write_answers(yaml_path, answers)
+
+
+def _write_answers(yaml_path, answers):
+    if not os.path.exists(yaml_path):
+        shutil.copyfile(get_business_plan_yaml_path(), yaml_path)
     with open(yaml_path, 'r', encoding='utf-8') as f:
         lines = f.readlines()
     
+    updated = False
+    for question_label, answer in answers:
+        updated = _set_answer(lines, question_label, answer) or updated
+    
+    if updated:
+        # Readers of the file must only ever see the old or the new contents.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(yaml_path)), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.writelines(lines)
+            shutil.copymode(yaml_path, tmp_path)
+            os.replace(tmp_path, yaml_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    
+    return updated
+
+
+def _set_answer(lines, question_label, answer):
+    answer_escaped = answer.replace('"', '\\"').replace('\n', '\\n')
     question_id = slugify(question_label)
     updated = False
     i = 0
@@ -36,9 +79,14 @@ def update_yaml_with_answer(yaml_path, question_label, answer):
                         updated = True
                         answer_found = True
                         break
-                    elif stripped_line and not stripped_line.startswith('#') and ':' in stripped_line and not stripped_line.startswith('answer:'):
-                        indent = len(lines[j]) - len(lines[j].lstrip())
-                        lines.insert(j, ' ' * indent + f'answer: "{answer_escaped}"\n')
+                    elif re.match(r'"([^"]+)":', stripped_line):
+                        # The next question starts: add the answer as the last key of this one, after fill and
+                        # why, so the catalog still parses the same.
+                        k = j
+                        while k > i + 1 and not lines[k - 1].strip():
+                            k -= 1
+                        indent = len(lines[i + 1]) - len(lines[i + 1].lstrip())
+                        lines.insert(k, ' ' * indent + f'answer: "{answer_escaped}"\n')
                         updated = True
                         answer_found = True
                         break
@@ -58,14 +106,22 @@ def update_yaml_with_answer(yaml_path, question_label, answer):
         
         i += 1
     
-    if updated:
-        with open(yaml_path, 'w', encoding='utf-8') as f:
-            f.writelines(lines)
-    
     return updated
 
 
 def get_yaml_path():
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    return os.path.join(base_dir, 'config', 'improved_business_plan.yaml')
+    """The copy of the default checklist that answers are written to (ANSWERS_YAML_PATH), or None.
+
+    The checklist files themselves are watched and re-parsed on every change, so answers never go into them;
+    without ANSWERS_YAML_PATH they are kept in the session only. Labels are the default checklist's, so other
+    tenants' answers are not written anywhere.
+    """
+    path = os.environ.get('ANSWERS_YAML_PATH')
+    if not path or current_tenant() != DEFAULT_TENANT:
+        return None
+    path = os.path.realpath(path)
+    if path == os.path.realpath(get_business_plan_yaml_path()) or \
+            path.startswith(os.path.join(os.path.realpath(TENANTS_DIR), '')):
+        return None
+    return path
 
@@ -33,6 +33,7 @@ function addMessage(content, isUser) {
     
     chatMessages.appendChild(messageDiv);
     chatMessages.scrollTop = chatMessages.scrollHeight;
+    return p;
 }
 
 function updateProgress(completedSteps) {
@@ -447,6 +448,8 @@ async function transcribeAndSend(audioBlob) {
         if (response.ok && data.text) {
             messageInput.value = data.text.trim();
             await sendMessage();
+        } else if (data.degraded) {
+            addMessage(data.error, false);
         } else {
             addMessage('Sorry, there was an error transcribing your audio.', false);
         }
@@ -458,9 +461,120 @@ async function transcribeAndSend(audioBlob) {
     }
 }
 
+// Streaming voice: while the session channel is open, the microphone is sent as 16 kHz PCM while it is recorded.
+// The server cuts it into segments on short pauses and transcribes them while the user keeps talking, so only
+// the last few words are left to transcribe when speech ends. Hold the button to talk; a short tap switches to
+// hands-free listening, where the server also decides when an utterance has ended.
+const VOICE_SAMPLE_RATE = 16000;
+const VOICE_TAP_MS = 300;
+let voiceCapture = null;
+
+function canStreamVoice() {
+    return sessionSocketReady && (window.AudioContext || window.webkitAudioContext);
+}
+
+function downsampleToPcm16(input, ratio) {
+    const length = Math.floor(input.length / ratio);
+    const output = new DataView(new ArrayBuffer(length * 2));
+    for (let i = 0; i < length; i++) {
+        const start = Math.floor(i * ratio);
+        const end = Math.min(Math.max(start + 1, Math.floor((i + 1) * ratio)), input.length);
+        let sum = 0;
+        for (let j = start; j < end; j++) {
+            sum += input[j];
+        }
+        const sample = Math.max(-1, Math.min(1, sum / (end - start)));
+        output.setInt16(i * 2, sample < 0 ? sample * 0x8000 : sample * 0x7fff, true);
+    }
+    return output.buffer;
+}
+
+async function startVoiceStream() {
+    await ensureStream();
+    const AudioContextClass = window.AudioContext || window.webkitAudioContext;
+    const context = new AudioContextClass();
+    const source = context.createMediaStreamSource(mediaStream);
+    const processor = context.createScriptProcessor(2048, 1, 1);
+    const ratio = context.sampleRate / VOICE_SAMPLE_RATE;
+    
+    processor.onaudioprocess = (event) => {
+        if (sessionSocketReady) {
+            sessionSocket.send(downsampleToPcm16(event.inputBuffer.getChannelData(0), ratio));
+        }
+    };
+    source.connect(processor);
+    processor.connect(context.destination);
+    
+    sessionSocket.send(JSON.stringify({
+        type: 'voice_start',
+        sample_rate: VOICE_SAMPLE_RATE,
+        tts: audioOutputEnabled
+    }));
+    voiceCapture = { context, source, processor };
+    micButton.classList.add('recording');
+}
+
+function stopVoiceStream() {
+    if (!voiceCapture) return;
+    voiceCapture.processor.disconnect();
+    voiceCapture.source.disconnect();
+    voiceCapture.context.close();
+    voiceCapture = null;
+    if (sessionSocketReady) {
+        sessionSocket.send(JSON.stringify({ type: 'voice_stop' }));
+    }
+    micButton.classList.remove('recording', 'listening');
+}
+
+function handleVoiceFrame(frame) {
+    if (frame.type === 'transcript' && !frame.final) {
+        messageInput.value = messageInput.value ? `${messageInput.value} ${frame.text}` : frame.text;
+    } else if (frame.type === 'transcript') {
+        messageInput.value = '';
+        if (frame.text) {
+            addMessage(frame.text, true);
+            sendButton.disabled = true;
+            pendingTurn = {
+                started: true,
+                bubble: null,
+                degraded: [],
+                finish: () => {
+                    pendingTurn = null;
+                    sendButton.disabled = false;
+                }
+            };
+        }
+    } else if (frame.type === 'voice' && frame.state === 'off') {
+        stopVoiceStream();
+    }
+}
+
 function setupPressAndHold() {
     const start = async (e) => {
         e.preventDefault();
+        if (canStreamVoice()) {
+            if (voiceCapture) {
+                stopVoiceStream();
+                return;
+            }
+            const pressedAt = Date.now();
+            try {
+                await startVoiceStream();
+            } catch (err) {
+                console.error('Error starting voice stream:', err);
+                return;
+            }
+            const release = () => {
+                if (Date.now() - pressedAt < VOICE_TAP_MS) {
+                    micButton.classList.add('listening');
+                } else {
+                    stopVoiceStream();
+                }
+            };
+            window.addEventListener('pointerup', release, { once: true });
+            window.addEventListener('pointercancel', release, { once: true });
+            return;
+        }
         try {
             await ensureStream();
             startRecording();
@@ -492,6 +606,19 @@ function base64ToBlob(base64, mimeType) {
     return new Blob([byteArray], { type: mimeType });
 }
 
+function playAudioBlob(audioBlob) {
+    const audioUrl = URL.createObjectURL(audioBlob);
+    const audio = new Audio(audioUrl);
+    
+    audio.play().catch(error => {
+        console.error('Error playing audio:', error);
+    });
+    
+    audio.onended = () => {
+        URL.revokeObjectURL(audioUrl);
+    };
+}
+
 async function playAudioFromTTS(text) {
     try {
         const response = await fetch('/api/tts', {
@@ -505,23 +632,263 @@ async function playAudioFromTTS(text) {
         const data = await response.json();
         
         if (response.ok && data.audio) {
-            const audioBlob = base64ToBlob(data.audio, `audio/${data.format}`);
-            const audioUrl = URL.createObjectURL(audioBlob);
-            const audio = new Audio(audioUrl);
-            
-            audio.play().catch(error => {
-                console.error('Error playing audio:', error);
-            });
-            
-            audio.onended = () => {
-                URL.revokeObjectURL(audioUrl);
-            };
+            playAudioBlob(base64ToBlob(data.audio, `audio/${data.format}`));
         }
     } catch (error) {
         console.error('TTS error:', error);
     }
 }
 
+function applyChatResult(data) {
+    updateProgress(data.completed_steps);
+    
+    if (data.business_plan_progress && data.business_plan_progress.length > 0) {
+        const initialContainer = document.getElementById('initialProgressContainer');
+        if (initialContainer) {
+            initialContainer.style.display = 'none';
+        }
+        
+        const isNowComplete = data.initial_form_complete;
+        const wasJustCompleted = isNowComplete && !previousInitialFormComplete;
+        
+        const newProgress = data.business_plan_progress || [];
+        
+        if (wasJustCompleted && currentSectionIndex === 0) {
+            currentSectionIndex = 1;
+        } else {
+            newProgress.forEach((sectionProgress, index) => {
+                const sectionId = sectionProgress.section_id;
+                const isComplete = sectionProgress.core_completed.length === sectionProgress.core_total &&
+                    sectionProgress.optional_completed.length === sectionProgress.optional_total;
+                
+                const wasComplete = previousSectionCompletions[sectionId] || false;
+                
+                if (!wasComplete && isComplete && index === currentSectionIndex && index < newProgress.length - 1) {
+                    currentSectionIndex = index + 1;
+                }
+                
+                previousSectionCompletions[sectionId] = isComplete;
+            });
+        }
+        
+        renderBusinessPlanProgress(data.business_plan_progress);
+        
+        previousInitialFormComplete = isNowComplete;
+    }
+    
+    updateTiersAndPoints(data.points, data.current_tier, data.tiers);
+    
+    if (data.form_data && data.form_data.email) {
+        const emailInput = document.getElementById('reportEmailInput');
+        if (emailInput && !emailInput.value.trim()) {
+            emailInput.value = data.form_data.email;
+        }
+    }
+    updateSendReportButton();
+    
+    if (data.report_sent) {
+        setTimeout(() => {
+            addMessage('✓ Business plan has been sent to your email address!', false);
+        }, 1000);
+    }
+    
+    const degraded = data.degraded || [];
+    micButton.disabled = degraded.includes('transcription');
+}
+
+// Session channel: one WebSocket per page carries the message, the streamed reply, progress deltas and the
+// spoken reply, so a turn is a single round trip. Without it (no WebSocket support, flask-sock missing, a proxy
+// that drops upgrades) the page keeps using /api/chat and /api/tts.
+let sessionSocket = null;
+let sessionSocketReady = false;
+let sessionReconnectDelay = 1000;
+let sessionProgress = null;
+let sessionTiers = [];
+let pendingTurn = null;
+let streamedAudio = null;
+
+function connectSessionChannel() {
+    if (!('WebSocket' in window)) {
+        return;
+    }
+    const scheme = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+    const socket = new WebSocket(`${scheme}//${window.location.host}/ws`);
+    socket.binaryType = 'arraybuffer';
+    
+    socket.onmessage = (event) => {
+        if (typeof event.data === 'string') {
+            handleSessionFrame(JSON.parse(event.data));
+        } else if (streamedAudio) {
+            streamedAudio.push(event.data);
+        }
+    };
+    
+    socket.onclose = () => {
+        sessionSocket = null;
+        sessionSocketReady = false;
+        stopVoiceStream();
+        if (pendingTurn && pendingTurn.started) {
+            // The server already has this message; resending it over HTTP would answer it twice.
+            addMessage('Sorry, there was an error connecting to the server.', false);
+            pendingTurn.finish(true);
+        } else if (pendingTurn) {
+            pendingTurn.finish(false);
+        }
+        setTimeout(connectSessionChannel, sessionReconnectDelay);
+        sessionReconnectDelay = Math.min(sessionReconnectDelay * 2, 30000);
+    };
+    
+    sessionSocket = socket;
+}
+
+function mergeSessionProgress(frame) {
+    if (frame.business_plan_progress) {
+        sessionProgress = frame.business_plan_progress;
+    } else if (sessionProgress) {
+        (frame.sections || []).forEach(delta => {
+            const section = sessionProgress.find(s => s.section_id === delta.section_id);
+            if (section) {
+                Object.assign(section, delta);
+            }
+        });
+    }
+    if (frame.tiers) {
+        sessionTiers = frame.tiers;
+    }
+}
+
+function handleSessionFrame(frame) {
+    switch (frame.type) {
+        case 'ready':
+            sessionSocketReady = true;
+            sessionReconnectDelay = 1000;
+            micButton.disabled = (frame.degraded || []).includes('transcription');
+            break;
+        case 'turn_start':
+            if (pendingTurn) {
+                pendingTurn.started = true;
+            }
+            break;
+        case 'token':
+            if (pendingTurn) {
+                if (!pendingTurn.bubble) {
+                    pendingTurn.bubble = addMessage('', false);
+                }
+                pendingTurn.bubble.textContent += frame.text;
+                chatMessages.scrollTop = chatMessages.scrollHeight;
+            }
+            break;
+        case 'reply':
+            if (pendingTurn) {
+                if (!pendingTurn.bubble) {
+                    pendingTurn.bubble = addMessage('', false);
+                }
+                pendingTurn.bubble.textContent = frame.response;
+                pendingTurn.degraded = frame.degraded;
+            }
+            break;
+        case 'progress':
+            mergeSessionProgress(frame);
+            if (pendingTurn) {
+                applyChatResult({
+                    completed_steps: frame.completed_steps,
+                    business_plan_progress: sessionProgress,
+                    initial_form_complete: frame.initial_form_complete,
+                    form_data: { email: frame.email },
+                    report_sent: frame.report_sent,
+                    points: frame.points,
+                    current_tier: frame.current_tier,
+                    tiers: sessionTiers,
+                    degraded: pendingTurn.degraded
+                });
+                pendingTurn.finish(true);
+            }
+            break;
+        case 'error':
+            if (pendingTurn) {
+                addMessage(frame.error || 'Sorry, there was an error processing your message.', false);
+                pendingTurn.finish(true);
+            } else if (frame.degraded && voiceCapture) {
+                addMessage(frame.error, false);
+                stopVoiceStream();
+            }
+            break;
+        case 'voice':
+        case 'transcript':
+            handleVoiceFrame(frame);
+            break;
+        case 'audio':
+            streamedAudio = startStreamedAudio(`audio/${frame.format}`);
+            break;
+        case 'audio_end':
+            if (streamedAudio) {
+                streamedAudio.end();
+                streamedAudio = null;
+            }
+            break;
+    }
+}
+
+function startStreamedAudio(mimeType) {
+    // MediaSource starts playback on the first frame; elsewhere the frames are played once complete.
+    if (!window.MediaSource || !MediaSource.isTypeSupported(mimeType)) {
+        const chunks = [];
+        return {
+            push: (chunk) => chunks.push(chunk),
+            end: () => playAudioBlob(new Blob(chunks, { type: mimeType }))
+        };
+    }
+    const mediaSource = new MediaSource();
+    const audioUrl = URL.createObjectURL(mediaSource);
+    const audio = new Audio(audioUrl);
+    const queue = [];
+    let sourceBuffer = null;
+    let ended = false;
+    
+    function drain() {
+        if (!sourceBuffer || sourceBuffer.updating) {
+            return;
+        }
+        if (queue.length > 0) {
+            sourceBuffer.appendBuffer(queue.shift());
+        } else if (ended && mediaSource.readyState === 'open') {
+            mediaSource.endOfStream();
+        }
+    }
+    
+    mediaSource.addEventListener('sourceopen', () => {
+        sourceBuffer = mediaSource.addSourceBuffer(mimeType);
+        sourceBuffer.addEventListener('updateend', drain);
+        drain();
+    });
+    audio.play().catch(error => {
+        console.error('Error playing audio:', error);
+    });
+    audio.onended = () => {
+        URL.revokeObjectURL(audioUrl);
+    };
+    
+    return {
+        push: (chunk) => { queue.push(chunk); drain(); },
+        end: () => { ended = true; drain(); }
+    };
+}
+
+function sendOverSessionChannel(message) {
+    return new Promise(resolve => {
+        pendingTurn = {
+            started: false,
+            bubble: null,
+            degraded: [],
+            finish: (ok) => {
+                pendingTurn = null;
+                resolve(ok);
+            }
+        };
+        sessionSocket.send(JSON.stringify({ type: 'message', message: message, tts: audioOutputEnabled }));
+    });
+}
+
 async function sendMessage() {
     const message = messageInput.value.trim();
     
@@ -534,6 +901,10 @@ async function sendMessage() {
     sendButton.disabled = true;
     
     try {
+        if (sessionSocketReady && await sendOverSessionChannel(message)) {
+            return;
+        }
+        
         const response = await fetch('/api/chat', {
             method: 'POST',
             headers: {
@@ -545,64 +916,12 @@ async function sendMessage() {
         const data = await response.json();
         
         if (response.ok) {
-            setTimeout(() => {
-                addMessage(data.response, false);
-                updateProgress(data.completed_steps);
-                
-                if (data.business_plan_progress && data.business_plan_progress.length > 0) {
-                    const initialContainer = document.getElementById('initialProgressContainer');
-                    if (initialContainer) {
-                        initialContainer.style.display = 'none';
-                    }
-                    
-                    const isNowComplete = data.initial_form_complete;
-                    const wasJustCompleted = isNowComplete && !previousInitialFormComplete;
-                    
-                    const newProgress = data.business_plan_progress || [];
-                    
-                    if (wasJustCompleted && currentSectionIndex === 0) {
-                        currentSectionIndex = 1;
-                    } else {
-                        newProgress.forEach((sectionProgress, index) => {
-                            const sectionId = sectionProgress.section_id;
-                            const isComplete = sectionProgress.core_completed.length === sectionProgress.core_total &&
-                                sectionProgress.optional_completed.length === sectionProgress.optional_total;
-                            
-                            const wasComplete = previousSectionCompletions[sectionId] || false;
-                            
-                            if (!wasComplete && isComplete && index === currentSectionIndex && index < newProgress.length - 1) {
-                                currentSectionIndex = index + 1;
-                            }
-                            
-                            previousSectionCompletions[sectionId] = isComplete;
-                        });
-                    }
-                    
-                    renderBusinessPlanProgress(data.business_plan_progress);
-                    
-                    previousInitialFormComplete = isNowComplete;
-                }
-                
-                updateTiersAndPoints(data.points, data.current_tier, data.tiers);
-                
-                if (data.form_data && data.form_data.email) {
-                    const emailInput = document.getElementById('reportEmailInput');
-                    if (emailInput && !emailInput.value.trim()) {
-                        emailInput.value = data.form_data.email;
-                    }
-                }
-                updateSendReportButton();
-                
-                if (data.report_sent) {
-                    setTimeout(() => {
-                        addMessage('✓ Business plan has been sent to your email address!', false);
-                    }, 1000);
-                }
-                
-                if (audioOutputEnabled) {
-                    playAudioFromTTS(data.response);
-                }
-            }, 500);
+            addMessage(data.response, false);
+            applyChatResult(data);
+            
+            if (audioOutputEnabled && !(data.degraded || []).includes('tts')) {
+                playAudioFromTTS(data.response);
+            }
         } else {
             addMessage('Sorry, there was an error processing your message.', false);
         }
@@ -727,9 +1046,10 @@ async function loadInitialBusinessPlan() {
 }
 
 loadInitialBusinessPlan();
+connectSessionChannel();
 
-async function downloadReport() {
-    const downloadButton = document.getElementById('downloadReportButton');
+async function downloadReport(format = 'docx') {
+    const downloadButton = document.getElementById(format === 'pdf' ? 'downloadPdfButton' : 'downloadReportButton');
     
     if (!downloadButton) {
         return;
@@ -740,7 +1060,7 @@ async function downloadReport() {
     downloadButton.querySelector('span').textContent = 'Generating...';
     
     try {
-        const response = await fetch('/api/download-report', {
+        const response = await fetch(`/api/download-report?format=${format}`, {
             method: 'GET',
         });
         
@@ -749,7 +1069,7 @@ async function downloadReport() {
             const url = window.URL.createObjectURL(blob);
             const a = document.createElement('a');
             a.href = url;
-            a.download = 'business_plan.docx';
+            a.download = `business_plan.${format}`;
             document.body.appendChild(a);
             a.click();
             window.URL.revokeObjectURL(url);
@@ -777,6 +1097,7 @@ async function downloadReport() {
 
 const sendReportButton = document.getElementById('sendReportButton');
 const downloadReportButton = document.getElementById('downloadReportButton');
+const downloadPdfButton = document.getElementById('downloadPdfButton');
 const emailInput = document.getElementById('reportEmailInput');
 
 if (sendReportButton) {
@@ -784,7 +1105,11 @@ if (sendReportButton) {
 }
 
 if (downloadReportButton) {
-    downloadReportButton.addEventListener('click', downloadReport);
+    downloadReportButton.addEventListener('click', () => downloadReport('docx'));
+}
+
+if (downloadPdfButton) {
+    downloadPdfButton.addEventListener('click', () => downloadReport('pdf'));
 }
 
 if (emailInput) {